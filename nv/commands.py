@@ -34,6 +34,7 @@ from sublime_plugin import WindowCommand
 
 from NeoVintageous.nv import macros
 from NeoVintageous.nv import rc
+from NeoVintageous.nv import shell
 from NeoVintageous.nv.ex.completions import insert_best_cmdline_completion
 from NeoVintageous.nv.ex.completions import on_change_cmdline_completion_prefix
 from NeoVintageous.nv.ex.completions import reset_cmdline_completion_state
@@ -56,9 +57,11 @@ from NeoVintageous.nv.mappings import Mapping
 from NeoVintageous.nv.mappings import mappings_can_resolve
 from NeoVintageous.nv.mappings import mappings_is_incomplete
 from NeoVintageous.nv.mappings import mappings_resolve
+from NeoVintageous.nv.state import clear_view_state
 from NeoVintageous.nv.state import init_state
 from NeoVintageous.nv.state import State
 from NeoVintageous.nv.ui import ui_bell
+from NeoVintageous.nv.ui import ui_bell_count
 from NeoVintageous.nv.ui import ui_cmdline_prompt
 from NeoVintageous.nv.ui import ui_highlight_yank
 from NeoVintageous.nv.ui import ui_highlight_yank_clear
@@ -75,6 +78,7 @@ from NeoVintageous.nv.utils import get_option_scroll
 from NeoVintageous.nv.utils import get_previous_selection
 from NeoVintageous.nv.utils import get_scroll_down_target_pt
 from NeoVintageous.nv.utils import get_scroll_up_target_pt
+from NeoVintageous.nv.utils import get_search_highlighting
 from NeoVintageous.nv.utils import get_search_regions
 from NeoVintageous.nv.utils import gluing_undo_groups
 from NeoVintageous.nv.utils import highest_visible_pt
@@ -93,6 +97,7 @@ from NeoVintageous.nv.utils import previous_non_folded_pt
 from NeoVintageous.nv.utils import regions_transform_extend_to_line_count
 from NeoVintageous.nv.utils import regions_transform_to_first_non_blank
 from NeoVintageous.nv.utils import regions_transformer
+from NeoVintageous.nv.utils import regions_transformer_batched
 from NeoVintageous.nv.utils import regions_transformer_indexed
 from NeoVintageous.nv.utils import regions_transformer_reversed
 from NeoVintageous.nv.utils import replace_sel
@@ -106,8 +111,10 @@ from NeoVintageous.nv.utils import save_previous_selection
 from NeoVintageous.nv.utils import scroll_horizontally
 from NeoVintageous.nv.utils import scroll_viewport_position
 from NeoVintageous.nv.utils import show_if_not_visible
+from NeoVintageous.nv.utils import timed_stage
 from NeoVintageous.nv.utils import translate_char
 from NeoVintageous.nv.utils import VisualBlockSelection
+from NeoVintageous.nv.vi.brackets import find_matching_bracket
 from NeoVintageous.nv.vi.cmd_base import ViMissingCommandDef
 from NeoVintageous.nv.vi.cmd_defs import ViOpenNameSpace
 from NeoVintageous.nv.vi.cmd_defs import ViOpenRegister
@@ -121,12 +128,14 @@ from NeoVintageous.nv.vi.core import ViWindowCommandBase
 from NeoVintageous.nv.vi.keys import KeySequenceTokenizer
 from NeoVintageous.nv.vi.keys import to_bare_command_name
 from NeoVintageous.nv.vi.search import BufferSearchBase
+from NeoVintageous.nv.vi.search import cancel_hilite_incsearch
 from NeoVintageous.nv.vi.search import ExactWordBufferSearchBase
 from NeoVintageous.nv.vi.search import find_in_range
 from NeoVintageous.nv.vi.search import find_wrapping
+from NeoVintageous.nv.vi.search import hilite_incsearch
+from NeoVintageous.nv.vi.search import hilite_search
 from NeoVintageous.nv.vi.search import reverse_find_wrapping
 from NeoVintageous.nv.vi.search import reverse_search
-from NeoVintageous.nv.vi.search import reverse_search_by_pt
 from NeoVintageous.nv.vi.settings import toggle_ctrl_keys
 from NeoVintageous.nv.vi.settings import toggle_side_bar
 from NeoVintageous.nv.vi.settings import toggle_super_keys
@@ -185,11 +194,14 @@ __all__ = [
     '_nv_feed_key',
     '_nv_process_notation',
     '_nv_replace_line',
+    '_nv_shell_apply',
     '_nv_run_cmds',
     '_vi_a',
     '_vi_at',
     '_vi_b',
     '_vi_backtick',
+    '_vi_bang',
+    '_vi_bang_bang',
     '_vi_bar',
     '_vi_big_a',
     '_vi_big_b',
@@ -441,7 +453,7 @@ class _nv_run_cmds(TextCommand):
 class _nv_feed_key(ViWindowCommandBase):
 
     def run(self, key, repeat_count=None, do_eval=True, check_user_mappings=True):
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         _log.info('key evt: %s repeat_count=%s do_eval=%s check_user_mappings=%s', key, repeat_count, do_eval, check_user_mappings)  # noqa: E501
 
@@ -458,8 +470,12 @@ class _nv_feed_key(ViWindowCommandBase):
                     settings.set('command_mode', False)
                     settings.set('inverse_caret_state', False)
                     settings.erase('vintage')
+                    clear_view_state(view)
 
-        _log.debug('key evt took %ss (key=%s repeat_count=%s do_eval=%s check_user_mappings=%s)', '{:.4f}'.format(time.time() - start_time), key, repeat_count, do_eval, check_user_mappings)  # noqa: E501
+        _log.debug('key evt took %ss (key=%s repeat_count=%s do_eval=%s check_user_mappings=%s)', '{:.4f}'.format(time.perf_counter() - start_time), key, repeat_count, do_eval, check_user_mappings)  # noqa: E501
+
+        if feed_key_timing_hook:
+            feed_key_timing_hook('key', time.perf_counter() - start_time)
 
     def _feed_key(self, key, repeat_count=None, do_eval=True, check_user_mappings=True):
         # Args:
@@ -471,9 +487,9 @@ class _nv_feed_key(ViWindowCommandBase):
         #       state's evaluation. For example, this is what the _nv_feed_key
         #       command does.
         #   check_user_mappings (bool):
-        state = self.state
-
-        mode = state.mode
+        with timed_stage(feed_key_timing_hook, 'state'):
+            state = self.state
+            mode = state.mode
 
         _log.debug('mode: %s', mode)
 
@@ -516,7 +532,10 @@ class _nv_feed_key(ViWindowCommandBase):
         # (count), or " (register character), we need to skip the count handler
         # and go straight to resolving the mapping, otherwise it won't resolve.
         # See https://github.com/NeoVintageous/NeoVintageous/issues/434.
-        if not mappings_can_resolve(state.mode, state.partial_sequence + key):
+        with timed_stage(feed_key_timing_hook, 'resolve'):
+            can_resolve = mappings_can_resolve(state.mode, state.partial_sequence + key)
+
+        if not can_resolve:
             if repeat_count:
                 state.action_count = str(repeat_count)
 
@@ -527,12 +546,13 @@ class _nv_feed_key(ViWindowCommandBase):
 
         state.partial_sequence += key
 
-        if check_user_mappings and mappings_is_incomplete(state.mode, state.partial_sequence):
-            _log.debug('found incomplete mapping')
+        with timed_stage(feed_key_timing_hook, 'resolve'):
+            if check_user_mappings and mappings_is_incomplete(state.mode, state.partial_sequence):
+                _log.debug('found incomplete mapping')
 
-            return
+                return
 
-        command = mappings_resolve(state, check_user_mappings=check_user_mappings)
+            command = mappings_resolve(state, check_user_mappings=check_user_mappings)
 
         if isinstance(command, ViOpenRegister):
             state.must_capture_register_name = True
@@ -638,10 +658,11 @@ class _nv_feed_key(ViWindowCommandBase):
             if not command['motion_required']:
                 state.mode = NORMAL
 
-        state.set_command(command)
+        with timed_stage(feed_key_timing_hook, 'state'):
+            state.set_command(command)
 
-        if state.mode == OPERATOR_PENDING:
-            state.reset_partial_sequence()
+            if state.mode == OPERATOR_PENDING:
+                state.reset_partial_sequence()
 
         if do_eval:
             state.eval()
@@ -675,6 +696,14 @@ class _nv_feed_key(ViWindowCommandBase):
         return False
 
 
+# Benchmarks can set this to a callable that is called with the name of a
+# _nv_feed_key stage ('key', 'state', or 'resolve') and the time it took (in
+# seconds). The 'key' stage is the whole key press, and includes the stages
+# recorded by State.eval() through nv.state.eval_timing_hook. The stages are
+# only timed while it is set.
+feed_key_timing_hook = None
+
+
 class _nv_process_notation(ViWindowCommandBase):
 
     def run(self, keys, repeat_count=None, check_user_mappings=True):
@@ -822,6 +851,16 @@ class _nv_replace_line(TextCommand):
         self.view.replace(edit, Region(pt, self.view.line(pt).b), with_what)
 
 
+class _nv_shell_apply(TextCommand):
+
+    # This command is required to apply the output of shell commands. Shell
+    # commands run on a worker thread and may finish long after the ex command
+    # that started them, at which point its edit token is no longer valid.
+
+    def run(self, edit):
+        shell.apply_output(self.view, edit)
+
+
 class _nv_ex_cmd_edit_wrap(TextCommand):
 
     # This command is required to wrap ex commands that need a Sublime Text edit
@@ -1194,6 +1233,9 @@ class _enter_normal_mode(ViTextCommandBase):
         self.view.window().run_command('hide_auto_complete')
         self.view.window().run_command('hide_overlay')
 
+        if not from_init:
+            shell.cancel(self.view)
+
         if ((not from_init and (mode == NORMAL) and not state.sequence) or not is_view(self.view)):
             # When _enter_normal_mode is requested from init_state, we
             # should not hide output panels; hide them only if the user
@@ -2086,6 +2128,43 @@ class _vi_equal_equal(ViTextCommandBase):
         enter_normal_mode(self.view, mode)
 
 
+def _open_filter_cmdline(view, mode, lines):
+    # Like Vim, the filter operator doesn't run anything itself, it opens the
+    # command-line with the range of lines filled in e.g. ":.,.+2!".
+    if mode in (VISUAL, VISUAL_LINE, VISUAL_BLOCK):
+        initial_text = ":'<,'>!"
+    else:
+        enter_normal_mode(view, mode)
+        initial_text = ':.,.+{}!'.format(lines - 1) if lines > 1 else ':.!'
+
+    view.window().run_command('_nv_cmdline', {'initial_text': initial_text})
+
+
+class _vi_bang(ViTextCommandBase):
+
+    def run(self, edit, mode=None, count=1, motion=None):
+        if motion:
+            run_motion(self.view, motion)
+        elif mode not in (VISUAL, VISUAL_LINE, VISUAL_BLOCK):
+            return ui_bell()
+
+        sel = self.view.sel()[0]
+        begin = self.view.line(sel.begin()).a
+        end = max(sel.begin(), sel.end() - 1)
+        lines = row_at(self.view, end) - row_at(self.view, begin) + 1
+
+        if motion:
+            replace_sel(self.view, begin)
+
+        _open_filter_cmdline(self.view, mode, lines)
+
+
+class _vi_bang_bang(ViTextCommandBase):
+
+    def run(self, edit, mode=None, count=1):
+        _open_filter_cmdline(self.view, mode, count)
+
+
 class _vi_greater_than_greater_than(ViTextCommandBase):
 
     def run(self, edit, mode=None, count=1):
@@ -2797,27 +2876,44 @@ class _vi_at(IrreversibleTextCommand):
         if not macros.is_valid_readable_register(name):
             return ui_bell("E354: Invalid register name: '" + name + "'")
 
-        cmds = macros.get_recorded(window, name)
-        if not cmds:
+        plan = macros.get_replay_plan(window, name)
+        if not plan:
             return
 
         macros.set_last_used_register_name(window, name)
 
+        # Like Vim, the replay stops at the first command that fails i.e. rings
+        # the bell. It also stops when a pass through the macro changes nothing
+        # e.g. 10000@q where q is "0xj" stops at the end of the buffer instead
+        # of running the remaining passes as no-ops.
         state = State(self.view)
+        bell_count = ui_bell_count()
+        xpos = None
         for i in range(count):
-            for cmd, args in cmds:
-                if 'xpos' in args:
-                    state.update_xpos(force=True)
-                    args['xpos'] = State(self.view).xpos
-                elif args.get('motion'):
-                    motion = args.get('motion')
-                    if motion and 'motion_args' in motion and 'xpos' in motion['motion_args']:
+            progress = self._progress(window)
+            for cmd, args, motion, xpos_target, keep_xpos in plan:
+                if xpos_target:
+                    if xpos is None or not keep_xpos:
                         state.update_xpos(force=True)
-                        motion = args.get('motion')
-                        motion['motion_args']['xpos'] = State(self.view).xpos
-                        args['motion'] = motion
+                        xpos = state.xpos
+
+                    args = macros.with_xpos(args, xpos_target, xpos)
+
+                if motion:
+                    window.active_view().run_command(cmd, args)
+                else:
+                    window.run_command(cmd, args)
 
-                self.view.window().run_command(cmd, args)
+                if ui_bell_count() != bell_count:
+                    return
+
+            if self._progress(window) == progress:
+                return
+
+    def _progress(self, window):
+        view = window.active_view()
+
+        return (view.id(), view.change_count(), tuple(view.sel()))
 
 
 class _enter_visual_block_mode(ViTextCommandBase):
@@ -3059,10 +3155,10 @@ class _vi_ctrl_x_ctrl_l(ViTextCommandBase):
     MAX_MATCHES = 20
 
     def find_matches(self, prefix, end):
-        escaped = re.escape(prefix)
+        pattern = r'^\s*{0}'.format(re.escape(prefix))
         matches = []  # type: list
         while end > 0:
-            match = reverse_search(self.view, r'^\s*{0}'.format(escaped), 0, end, flags=0)
+            match = reverse_search(self.view, pattern, 0, end, flags=0)
             if (match is None) or (len(matches) == self.MAX_MATCHES):
                 break
             line = self.view.line(match.begin())
@@ -3207,12 +3303,16 @@ class _vi_reverse_find_in_line(ViMotionCommand):
 
 class _vi_slash(ViMotionCommand, BufferSearchBase):
 
+    # The search highlighting to restore if the search is cancelled.
+    _hilite_before = None
+
     def _is_valid_cmdline(self, cmdline):
         return isinstance(cmdline, str) and len(cmdline) > 0 and cmdline[0] == '/'
 
     def run(self, pattern=''):
         self.state.reset_during_init = False
         # TODO Add incsearch option e.g. on_change = self.on_change if 'incsearch' else None
+        self._hilite_before = get_search_highlighting(self.view)
         ui_cmdline_prompt(
             self.view.window(),
             initial_text='/' + pattern,
@@ -3231,6 +3331,7 @@ class _vi_slash(ViMotionCommand, BufferSearchBase):
         state = self.state
         state.sequence += s + '<CR>'
         self.view.erase_regions('vi_inc_search')
+        cancel_hilite_incsearch(self.view)
         state.last_buffer_search_command = 'vi_slash'
         state.motion = ViSearchForwardImpl(term=s)
 
@@ -3247,6 +3348,7 @@ class _vi_slash(ViMotionCommand, BufferSearchBase):
         state = self.state
         flags = self.calculate_flags(s)
         self.view.erase_regions('vi_inc_search')
+        hilite_incsearch(self.view, s, flags)
         start = self.view.sel()[0].b + 1
         end = self.view.size()
 
@@ -3277,6 +3379,12 @@ class _vi_slash(ViMotionCommand, BufferSearchBase):
     def on_cancel(self, force=False):
         state = self.state
         self.view.erase_regions('vi_inc_search')
+        cancel_hilite_incsearch(self.view)
+        if self._hilite_before:
+            hilite_search(self.view, *self._hilite_before)
+        else:
+            clear_search_highlighting(self.view)
+
         state.reset_command_data()
         _nv_cmdline_feed_key.reset_last_history_index()
 
@@ -3323,6 +3431,7 @@ class _vi_slash_impl(ViMotionCommand, BufferSearchBase):
 
         regions_transformer(self.view, f)
         self.hilite(search_string)
+        self.show_count(search_string, match)
 
 
 class _vi_slash_on_parser_done(WindowCommand):
@@ -3447,7 +3556,7 @@ class _vi_j(ViMotionCommand):
                 target_row = min(current_row + count, view.rowcol(view.size())[0])
                 target_pt = view.text_point(target_row, 0)
                 _, xpos = calculate_xpos(view, target_pt, xpos)
-                end = min(self.view.line(target_pt).b, target_pt + xpos)
+                end = min(view.line(target_pt).b, target_pt + xpos)
 
                 if s.a < s.b:
                     s = Region(s.a, end + 1)
@@ -3486,7 +3595,7 @@ class _vi_j(ViMotionCommand):
             visual_block.transform_target(next_line_target_pt)
             return
 
-        regions_transformer(self.view, f)
+        regions_transformer_batched(self.view, f)
 
 
 class _vi_k(ViMotionCommand):
@@ -3516,9 +3625,9 @@ class _vi_k(ViMotionCommand):
                 target_row = max(current_row - count, 0)
                 target_pt = view.text_point(target_row, 0)
                 _, xpos = calculate_xpos(view, target_pt, xpos)
-                end = min(self.view.line(target_pt).b, target_pt + xpos)
+                end = min(view.line(target_pt).b, target_pt + xpos)
                 if s.b >= s.a:
-                    if (self.view.line(s.a).contains(s.b - 1) and not self.view.line(s.a).contains(target_pt)):
+                    if (view.line(s.a).contains(s.b - 1) and not view.line(s.a).contains(target_pt)):
                         s = Region(s.a + 1, end)
                     else:
                         if (target_pt + xpos) < s.a:
@@ -3558,7 +3667,7 @@ class _vi_k(ViMotionCommand):
             visual_block.transform_target(prev_line_target_pt)
             return
 
-        regions_transformer(self.view, f)
+        regions_transformer_batched(self.view, f)
 
 
 class _vi_gg(ViMotionCommand):
@@ -3639,7 +3748,7 @@ class _vi_dollar(ViMotionCommand):
 
             return s
 
-        regions_transformer(self.view, f)
+        regions_transformer_batched(self.view, f)
 
 
 def fixup_eof(view, pt):
@@ -3671,7 +3780,7 @@ class _vi_w(ViMotionCommand):
 
             return s
 
-        regions_transformer(self.view, f)
+        regions_transformer_batched(self.view, f)
 
 
 class _vi_big_w(ViMotionCommand):
@@ -3857,10 +3966,7 @@ class _vi_percent(ViMotionCommand):
                     if not bracket:
                         return
 
-                    if bracket == brackets[0]:
-                        return self.find_balanced_closing_bracket(bracket_pt + 1, brackets)
-                    else:
-                        return self.find_balanced_opening_bracket(bracket_pt, brackets)
+                    return find_matching_bracket(self.view, bracket_pt)
 
                 if mode == VISUAL:
                     found = find_bracket_location(s)
@@ -3975,89 +4081,6 @@ class _vi_percent(ViMotionCommand):
         return (found_brackets[1], (bracket_a, bracket_b),
                 self.view.text_point(caret_row, caret_col + found_brackets[0]))
 
-    def find_balanced_closing_bracket(self, start, brackets, unbalanced=0):
-        # Returns:
-        #   Region|None
-        new_start = start
-        for i in range(unbalanced or 1):
-            next_closing_bracket = find_in_range(
-                self.view,
-                brackets[1],
-                start=new_start,
-                end=self.view.size(),
-                flags=LITERAL
-            )
-
-            if next_closing_bracket is None:  # Unbalanced brackets; nothing we can do.
-                return
-
-            new_start = next_closing_bracket.end()
-
-        nested = 0
-        while True:
-            next_opening_bracket = find_in_range(
-                self.view,
-                brackets[0],
-                start=start,
-                end=next_closing_bracket.end(),
-                flags=LITERAL
-            )
-
-            if not next_opening_bracket:
-                break
-
-            nested += 1
-            start = next_opening_bracket.end()
-
-        if nested > 0:
-            return self.find_balanced_closing_bracket(
-                next_closing_bracket.end(),
-                brackets,
-                nested
-            )
-        else:
-            return next_closing_bracket.begin()
-
-    def find_balanced_opening_bracket(self, start, brackets, unbalanced=0):
-        new_start = start
-        for i in range(unbalanced or 1):
-            prev_opening_bracket = reverse_search_by_pt(
-                self.view, brackets[0],
-                start=0,
-                end=new_start,
-                flags=LITERAL
-            )
-
-            # Unbalanced brackets; nothing we can do.
-            if prev_opening_bracket is None:
-                return
-
-            new_start = prev_opening_bracket.begin()
-
-        nested = 0
-        while True:
-            next_closing_bracket = reverse_search_by_pt(
-                self.view, brackets[1],
-                start=prev_opening_bracket.a,
-                end=start,
-                flags=LITERAL
-            )
-
-            if not next_closing_bracket:
-                break
-
-            nested += 1
-            start = next_closing_bracket.begin()
-
-        if nested > 0:
-            return self.find_balanced_opening_bracket(
-                prev_opening_bracket.begin(),
-                brackets,
-                nested
-            )
-        else:
-            return prev_opening_bracket.begin()
-
 
 class _vi_big_h(ViMotionCommand):
     def run(self, mode=None, count=None):
@@ -4131,6 +4154,7 @@ class _vi_star(ViMotionCommand, ExactWordBufferSearchBase):
             )
 
             if match:
+                matches.append(match)
                 if mode == NORMAL:
                     s = Region(match.begin())
                 elif mode == VISUAL:
@@ -4144,6 +4168,7 @@ class _vi_star(ViMotionCommand, ExactWordBufferSearchBase):
 
         state = self.state
         query = search_string or self.get_query()
+        matches = []
 
         jumplist_update(self.view)
         regions_transformer(self.view, f)
@@ -4152,6 +4177,8 @@ class _vi_star(ViMotionCommand, ExactWordBufferSearchBase):
         if query:
             self.hilite(query)
             state.last_buffer_search = query
+            if matches:
+                self.show_count(query, matches[0])
 
         if not search_string:
             state.last_buffer_search_command = 'vi_star'
@@ -4174,6 +4201,7 @@ class _vi_octothorp(ViMotionCommand, ExactWordBufferSearchBase):
             )
 
             if match:
+                matches.append(match)
                 if mode == NORMAL:
                     s = Region(match.begin())
                 elif mode == VISUAL:
@@ -4187,6 +4215,7 @@ class _vi_octothorp(ViMotionCommand, ExactWordBufferSearchBase):
 
         state = self.state
         query = search_string or self.get_query()
+        matches = []
 
         jumplist_update(self.view)
         start_sel = self.view.sel()[0]
@@ -4196,6 +4225,8 @@ class _vi_octothorp(ViMotionCommand, ExactWordBufferSearchBase):
         if query:
             self.hilite(query)
             state.last_buffer_search = query
+            if matches:
+                self.show_count(query, matches[0])
 
         if not search_string:
             state.last_buffer_search_command = 'vi_octothorp'
@@ -4299,7 +4330,7 @@ class _vi_hat(ViMotionCommand):
 
             return s
 
-        regions_transformer(self.view, f)
+        regions_transformer_batched(self.view, f)
 
 
 class _vi_gj(ViMotionCommand):
@@ -4571,16 +4602,21 @@ class _vi_question_mark_impl(ViMotionCommand, BufferSearchBase):
 
         regions_transformer(self.view, f)
         self.hilite(search_string)
+        self.show_count(search_string, found)
 
 
 class _vi_question_mark(ViMotionCommand, BufferSearchBase):
 
+    # The search highlighting to restore if the search is cancelled.
+    _hilite_before = None
+
     def _is_valid_cmdline(self, cmdline):
         return isinstance(cmdline, str) and len(cmdline) > 0 and cmdline[0] == '?'
 
     def run(self, pattern=''):
         self.state.reset_during_init = False
         # TODO Add incsearch option e.g. on_change = self.on_change if 'incsearch' else None
+        self._hilite_before = get_search_highlighting(self.view)
         ui_cmdline_prompt(
             self.view.window(),
             initial_text='?' + pattern,
@@ -4599,6 +4635,7 @@ class _vi_question_mark(ViMotionCommand, BufferSearchBase):
         state = self.state
         state.sequence += s + '<CR>'
         self.view.erase_regions('vi_inc_search')
+        cancel_hilite_incsearch(self.view)
         state.last_buffer_search_command = 'vi_question_mark'
         state.motion = ViSearchBackwardImpl(term=s)
 
@@ -4614,6 +4651,7 @@ class _vi_question_mark(ViMotionCommand, BufferSearchBase):
 
         flags = self.calculate_flags(s)
         self.view.erase_regions('vi_inc_search')
+        hilite_incsearch(self.view, s, flags)
         state = self.state
         occurrence = reverse_find_wrapping(self.view,
                                            term=s,
@@ -4640,6 +4678,12 @@ class _vi_question_mark(ViMotionCommand, BufferSearchBase):
 
     def on_cancel(self, force=False):
         self.view.erase_regions('vi_inc_search')
+        cancel_hilite_incsearch(self.view)
+        if self._hilite_before:
+            hilite_search(self.view, *self._hilite_before)
+        else:
+            clear_search_highlighting(self.view)
+
         state = self.state
         state.reset_command_data()
         _nv_cmdline_feed_key.reset_last_history_index()
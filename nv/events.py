@@ -20,10 +20,16 @@ from sublime import OP_NOT_EQUAL
 from sublime_plugin import EventListener
 
 from NeoVintageous.nv.modeline import do_modeline
+from NeoVintageous.nv.state import clear_view_state
 from NeoVintageous.nv.state import init_state
 from NeoVintageous.nv.state import State
+from NeoVintageous.nv.utils import clear_search_highlighting
 from NeoVintageous.nv.utils import fix_eol_cursor
 from NeoVintageous.nv.utils import is_view
+from NeoVintageous.nv.vi.brackets import clear_bracket_index
+from NeoVintageous.nv.vi.lines import clear_line_index
+from NeoVintageous.nv.vi.search import clear_search_matches
+from NeoVintageous.nv.vi.tags import clear_tag_index
 from NeoVintageous.nv.vi import settings
 from NeoVintageous.nv.vim import enter_normal_mode
 from NeoVintageous.nv.vim import is_ex_mode
@@ -41,11 +47,11 @@ _cmdline_completions = [
     'bfirst', 'blast', 'bNext', 'bnext', 'bprevious', 'brewind', 'browse',
     'buffers', 'cd', 'close', 'copy', 'cquit', 'delete', 'edit', 'exit',
     'file', 'files', 'global', 'help', 'history', 'let', 'ls', 'move', 'new',
-    'nnoremap', 'nohlsearch', 'noremap', 'nunmap', 'only', 'onoremap',
+    'nnoremap', 'nohlsearch', 'noremap', 'normal', 'nunmap', 'only', 'onoremap',
     'ounmap', 'print', 'pwd', 'qall', 'quit', 'read', 'registers', 'set',
     'setlocal', 'shell', 'snoremap', 'sort', 'split', 'substitute', 'sunmap',
     'tabclose', 'tabfirst', 'tablast', 'tabNext', 'tabnext', 'tabonly',
-    'tabprevious', 'tabrewind', 'unmap', 'unvsplit', 'vnoremap', 'vsplit',
+    'tabprevious', 'tabrewind', 'unmap', 'unvsplit', 'vglobal', 'vnoremap', 'vsplit',
     'vunmap', 'wall', 'wq', 'wqall', 'write', 'xall', 'xit', 'yank'
 ]
 
@@ -222,6 +228,12 @@ class NeoVintageousEvents(EventListener):
 
     def on_close(self, view):
         settings.destroy(view)
+        clear_view_state(view)
+        clear_bracket_index(view)
+        clear_line_index(view)
+        clear_search_highlighting(view)
+        clear_search_matches(view)
+        clear_tag_index(view)
 
     def on_activated(self, view):
 
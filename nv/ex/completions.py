@@ -15,7 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
-import glob
+from collections import OrderedDict
 import os
 import re
 
@@ -41,6 +41,84 @@ _completion_settings = (
 )
 
 
+# Maximum number of directory listings in the cache. The least recently used
+# listings are evicted first.
+_DIR_CACHE_SIZE = 32
+
+# Directory listings keyed by directory. Each listing is the directory mtime
+# and a sorted list of (name, is_dir) tuples. A listing is reused until the
+# directory mtime changes.
+_dir_cache = OrderedDict()  # type: OrderedDict
+
+# The directory, name prefix, and matching entries of the last completion.
+# Typing more of a name narrows these entries rather than listing the
+# directory again. Reset with the completion state.
+_last_matches = None  # type: tuple
+
+
+def _scandir(directory):
+    # type: (str) -> list
+    try:
+        scandir = os.scandir
+    except AttributeError:
+        # Python < 3.5 (Sublime Text 3).
+        return [(name, os.path.isdir(os.path.join(directory, name))) for name in os.listdir(directory)]
+
+    return [(entry.name, entry.is_dir()) for entry in scandir(directory)]
+
+
+def _list_dir(directory):
+    # type: (str) -> list
+    try:
+        mtime = os.stat(directory).st_mtime
+    except OSError:
+        return []
+
+    try:
+        cached_mtime, entries = _dir_cache[directory]
+    except KeyError:
+        pass
+    else:
+        if cached_mtime == mtime:
+            _dir_cache.move_to_end(directory)
+
+            return entries
+
+    try:
+        entries = sorted(_scandir(directory))
+    except OSError:
+        return []
+
+    _dir_cache[directory] = (mtime, entries)
+    _dir_cache.move_to_end(directory)
+    if len(_dir_cache) > _DIR_CACHE_SIZE:
+        _dir_cache.popitem(last=False)
+
+    return entries
+
+
+def _list_matches(start_at):
+    # type: (str) -> list
+    global _last_matches
+
+    directory, name = os.path.split(start_at)
+    directory = directory or os.curdir
+
+    if _last_matches and _last_matches[0] == directory and name.startswith(_last_matches[1]):
+        entries = _last_matches[2]
+    else:
+        entries = _list_dir(directory)
+
+    matches = [entry for entry in entries if entry[0].startswith(name)]
+    _last_matches = (directory, name, matches)
+
+    # Like glob, hidden files only match a name that starts with a dot.
+    if not name.startswith('.'):
+        matches = [entry for entry in matches if not entry[0].startswith('.')]
+
+    return matches
+
+
 def _iter_paths(prefix=None, from_dir=None, only_dirs=False):
     if prefix:
         start_at = os.path.expandvars(os.path.expanduser(prefix))
@@ -55,17 +133,16 @@ def _iter_paths(prefix=None, from_dir=None, only_dirs=False):
         if ('/' in prefix and not prefix_split[0]):
             prefix_len = 0
 
-        for path in sorted(glob.iglob(start_at + '*')):
-            if not only_dirs or os.path.isdir(path):
-                suffix = ('/' if os.path.isdir(path) else '')
-                item = os.path.split(path)[1]
+        for item, is_dir in _list_matches(start_at):
+            if not only_dirs or is_dir:
+                suffix = ('/' if is_dir else '')
                 yield prefix + (item + suffix)[prefix_len:]
     else:
         prefix = from_dir
         start_at = os.path.expandvars(os.path.expanduser(prefix))
-        for path in sorted(glob.iglob(start_at + '*')):
-            if not only_dirs or os.path.isdir(path):
-                yield path[len(start_at):] + ('' if not os.path.isdir(path) else '/')
+        for item, is_dir in _list_matches(start_at):
+            if not only_dirs or is_dir:
+                yield item + ('' if not is_dir else '/')
 
 
 def _parse_cmdline_for_fs(text):
@@ -169,10 +246,13 @@ class _FsCompletion():
 
     @staticmethod
     def reset():
+        global _last_matches
+
         _FsCompletion.prefix = ''
         _FsCompletion.frozen_dir = ''
         _FsCompletion.is_stale = True
         _FsCompletion.items = None
+        _last_matches = None
 
     def run(self, edit):
         _FsCompletion.frozen_dir = (_FsCompletion.frozen_dir or (get_cmdline_cwd() + '/'))
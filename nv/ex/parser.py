@@ -15,6 +15,8 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from collections import OrderedDict
+import copy
 import logging
 
 from NeoVintageous.nv.ex.nodes import CommandLineNode
@@ -54,8 +56,50 @@ class _ParserState:
         return next(self.tokens)
 
 
+# Maximum number of parsed command lines in the cache. The least recently used
+# are evicted first.
+_CACHE_SIZE = 128
+
+# Parsed command lines keyed by source. The cached nodes are templates: they
+# are never handed out, only copies of them are. Parsing doesn't depend on the
+# view, the line ranges are resolved against the view by the ex commands.
+_cache = OrderedDict()  # type: OrderedDict
+
+
 def parse_command_line(source):
     # type: (str) -> CommandLineNode
+    try:
+        template = _cache[source]
+    except KeyError:
+        template = _cache[source] = _parse_command_line(source)
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    else:
+        _cache.move_to_end(source)
+
+    return _copy_command_line(template)
+
+
+def parse_command_line_cache_clear():
+    # type: () -> None
+    _cache.clear()
+
+
+def _copy_command_line(template):
+    # type: (CommandLineNode) -> CommandLineNode
+    # The ex commands are given the command params as keyword arguments, and
+    # some add to them, so the command and its params are copied. The line
+    # range is only modified while parsing, so it's shared.
+    command = template.command
+    if command:
+        command = copy.copy(command)
+        command.params = {k: list(v) if isinstance(v, list) else v for k, v in command.params.items()}
+
+    return CommandLineNode(template.line_range, command)
+
+
+def _parse_command_line(source):
+    # type: (str) -> CommandLineNode
 
     # The parser works its way through the command line by passing the current
     # state to the next parsing function. It stops when no parsing funcion is
@@ -15,8 +15,6 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
-import re
-
 from NeoVintageous.nv.ex.tokens import TokenComma
 from NeoVintageous.nv.ex.tokens import TokenDigits
 from NeoVintageous.nv.ex.tokens import TokenDollar
@@ -28,7 +26,8 @@ from NeoVintageous.nv.ex.tokens import TokenPercent
 from NeoVintageous.nv.ex.tokens import TokenSearchBackward
 from NeoVintageous.nv.ex.tokens import TokenSearchForward
 from NeoVintageous.nv.ex.tokens import TokenSemicolon
-from NeoVintageous.nv.ex_routes import ex_routes
+from NeoVintageous.nv.ex_routes import ex_route_lookup
+from NeoVintageous.nv.regex import regex_compile
 
 
 class _ScannerState:
@@ -137,7 +136,7 @@ class _ScannerState:
         # Raises:
         #   ValueError: If item does not match.
         #   on_error (callable): If item does not match.
-        m = re.compile(pattern).match(self.source, self.position)
+        m = regex_compile(pattern).match(self.source, self.position)
         if m:
             self.position += m.end() - m.start()
 
@@ -159,7 +158,7 @@ class _ScannerState:
         #
         # Args:
         #     pattern (str): A regular expression.
-        m = re.compile(pattern).match(self.source, self.position)
+        m = regex_compile(pattern).match(self.source, self.position)
         if m:
             self.position += m.end() - m.start()
 
@@ -329,8 +328,10 @@ def _scan_command(state):
     #
     # Returns:
     #   Tuple[None, list(TokenEof)]
-    for route, command in ex_routes.items():
-        if state.match(route):
+    for pattern, command in ex_route_lookup(state.source, state.position):
+        m = pattern.match(state.source, state.position)
+        if m:
+            state.position = m.end()
             state.ignore()
 
             cmd = command(state)
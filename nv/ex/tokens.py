@@ -54,14 +54,11 @@ class TokenCommand(Token):
         #                           command "name".
         #   :addressable (bool): Indicates if the command accepts ranges.
         #   :cooperates_with_global (bool): Indicates if the command cooperates
-        #       with the :global command. This is special flag, because ex
-        #       commands don't yet support a global_lines argument. It seems
-        #       that, in Vim, some ex commands work well with :global and others
-        #       ignore :global ranges. However, according to the docs, all ex
-        #       commands should work with :global ranges. At the time of
-        #       writing, the only command that supports the global_lines
-        #       argument is the "print" command e.g. print all lines matching
-        #       \d+ into new buffer: ":%global/\d+/print".
+        #       with the :global command, which runs the command on each line
+        #       that matches its pattern. Commands that accept a global_lines
+        #       argument e.g. "print" and "delete", are given all the lines in
+        #       one call e.g. print all lines matching \d+ into new buffer:
+        #       ":%global/\d+/print".
 
         super().__init__(content=name)
 
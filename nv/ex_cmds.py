@@ -23,12 +23,14 @@ import re
 import stat
 import subprocess
 import sys
+import time
 
 from sublime import DIALOG_CANCEL
 from sublime import DIALOG_YES
 from sublime import ENCODED_POSITION
 from sublime import find_resources
 from sublime import FORCE_GROUP
+from sublime import HIDDEN
 from sublime import LITERAL
 from sublime import load_resource
 from sublime import MONOSPACE_FONT
@@ -46,6 +48,7 @@ from NeoVintageous.nv.goto import goto_line
 from NeoVintageous.nv.history import history
 from NeoVintageous.nv.mappings import mappings_add
 from NeoVintageous.nv.mappings import mappings_remove
+from NeoVintageous.nv.regex import regex_compile
 from NeoVintageous.nv.state import State
 from NeoVintageous.nv.ui import CmdlineOutput
 from NeoVintageous.nv.ui import ui_bell
@@ -57,7 +60,6 @@ from NeoVintageous.nv.utils import next_non_blank
 from NeoVintageous.nv.utils import regions_transformer
 from NeoVintageous.nv.utils import replace_sel
 from NeoVintageous.nv.utils import row_at
-from NeoVintageous.nv.vi.search import view_find_all_in_range
 from NeoVintageous.nv.vi.settings import get_cache_value
 from NeoVintageous.nv.vi.settings import get_cmdline_cwd
 from NeoVintageous.nv.vi.settings import get_ex_global_last_pattern
@@ -294,8 +296,15 @@ def ex_delete(view, edit, register, line_range, global_lines=None, **kwargs):
         size_of_region = r.b - r.a
         deleted_so_far += size_of_region
 
-    # Delete
-    for r in reversed(rs):
+    # Delete, erasing adjacent regions together.
+    erase = []
+    for r in rs:
+        if erase and erase[-1].b == r.a:
+            erase[-1] = Region(erase[-1].a, r.b)
+        else:
+            erase.append(r)
+
+    for r in reversed(erase):
         view.erase(edit, r)
 
     new_sel = view.sel()[-1].b
@@ -395,16 +404,106 @@ def ex_file(view, **kwargs):
     status_message('%s' % msg)
 
 
-def ex_global(window, view, pattern, line_range, cmd='print', **kwargs):
+# The lines marked by :global and :normal are tracked by Sublime Text regions
+# so that they follow the edits made by the command run on each line. The marks
+# are added in chunks, which keeps the cost of looking up the next mark after an
+# edit proportional to the chunk size rather than to the number of marks.
+_MARK_CHUNK_SIZE = 64
+
+_mark_keys_id = 0
+
+
+def _for_each_marked_line(view, lines, callback):
+    # type: (...) -> None
+    #
+    # Call callback(line) for each of the lines in order, where line is the
+    # current full line region of the original line after the edits made by
+    # the previous callbacks. Lines that have been deleted are skipped.
+    #
+    # Args:
+    #   view (sublime.View):
+    #   lines (list[Region]): Full line regions, sorted and not overlapping.
+    #   callback (Callable[[Region], None]):
+    global _mark_keys_id
+    _mark_keys_id += 1
+
+    prefix = '_nv_marks_%s_' % _mark_keys_id
+    keys = []
+    for i in range(0, len(lines), _MARK_CHUNK_SIZE):
+        key = prefix + str(len(keys))
+        view.add_regions(key, lines[i:i + _MARK_CHUNK_SIZE], '', '', HIDDEN)
+        keys.append(key)
+
+    try:
+        for key in keys:
+            marks = view.get_regions(key)
+            change_count = view.change_count()
+            for i in range(len(marks)):
+                if view.change_count() != change_count:
+                    marks = view.get_regions(key)
+                    change_count = view.change_count()
+
+                # A mark that is emptied by an edit is a deleted line.
+                if marks[i].empty():
+                    continue
+
+                callback(view.full_line(marks[i].begin()))
+
+            view.erase_regions(key)
+    finally:
+        for key in keys:
+            view.erase_regions(key)
+
+
+def _find_global_lines(view, pattern, region, invert):
+    # type: (...) -> list
+    #
+    # Return the full line regions, within the region, that match the pattern,
+    # or that don't match the pattern if invert is true.
+    lines = []
+    pos = region.begin()
+    end = region.end()
+    while pos < end:
+        match = view.find(pattern, pos)
+        if match is None or match.b == -1 or match.a >= end:
+            break
+
+        line = view.full_line(match.a)
+        lines.append(line)
+        pos = line.b
+
+    if invert:
+        matched = set(line.a for line in lines)
+        lines = [line for line in view.lines(region) if line.a not in matched]
+        lines = [view.full_line(line) for line in lines if line.a < end]
+
+    return lines
+
+
+def ex_global(window, view, edit, pattern, line_range, cmd='print', forceit=False, **kwargs):
+    # Run a command on the lines that match (or, with :global! and :vglobal,
+    # don't match) the pattern. The whole command runs in the one edit, so the
+    # changes made to all the lines are undone as one.
     if not pattern:
         pattern = get_ex_global_last_pattern()
         if not pattern:
             return status_message('E35: No previous regular expression')
 
-    cmd = parse_command_line(cmd).command
+    try:
+        cmdline = parse_command_line(cmd)
+    except Exception as e:
+        return status_message(str(e))
+
+    subcmd = cmdline.command
+    if not subcmd:
+        return status_message('E492: Not an editor command: %s', cmd)
+
+    if subcmd.target == 'global':
+        return status_message('E147: Cannot do :global recursive')
+
     # The cooperates_with_global flag indicates if a command supports :global.
-    if not cmd.cooperates_with_global:
-        return status_message('command "%s" does not support :global', cmd.target)
+    if not subcmd.cooperates_with_global:
+        return status_message('command "%s" does not support :global', subcmd.target)
 
     # The default line specifier for most commands is the cursor position, but
     # the commands :write and :global have the whole file (1,$) as default.
@@ -413,17 +512,39 @@ def ex_global(window, view, pattern, line_range, cmd='print', **kwargs):
     else:
         region = line_range.resolve(view)
 
-    matches = view_find_all_in_range(view, pattern, region.a, region.b - 1)
-    if not matches:
+    lines = _find_global_lines(view, pattern, region, forceit)
+    if not lines:
         return status_message('Pattern not found: %s', pattern)
 
-    matches = [view.full_line(r.begin()) for r in matches]
-    matches = [[r.a, r.b] for r in matches]
+    set_ex_global_last_pattern(pattern)
 
-    cmd.params['global_lines'] = matches
+    ex_cmd = _get_ex_cmd(subcmd.target)
+    parameters = inspect.signature(ex_cmd).parameters
 
-    do_ex_command(window, cmd.target, cmd.params)
-    set_ex_global_last_pattern(pattern)
+    # Commands that accept the global_lines argument, and are not given a range
+    # of their own, handle all the lines in one call.
+    if 'global_lines' in parameters and cmdline.line_range.is_empty:
+        args = dict(subcmd.params)
+        args['global_lines'] = [[line.a, line.b] for line in lines]
+        if 'edit' in parameters:
+            args['edit'] = edit
+
+        return ex_cmd(window=window, view=view, line_range=cmdline.line_range, **args)
+
+    def _run(line):
+        # The command runs with the cursor on the marked line, which is how its
+        # own range, if any, is resolved.
+        view.sel().clear()
+        view.sel().add(line.begin())
+
+        args = dict(subcmd.params)
+        args.setdefault('forceit', subcmd.forced)
+        if 'edit' in parameters:
+            args['edit'] = edit
+
+        ex_cmd(window=window, view=view, line_range=cmdline.line_range, **args)
+
+    _for_each_marked_line(view, lines, _run)
 
 
 def ex_help(window, subject=None, forceit=False, **kwargs):
@@ -610,6 +731,31 @@ def ex_nohlsearch(view, **kwargs):
     clear_search_highlighting(view)
 
 
+def ex_normal(window, view, line_range, keys, forceit=False, **kwargs):
+    # Execute normal mode commands. With a range, the commands are executed
+    # for each line in the range, with the cursor at the start of the line.
+    def _run(line=None):
+        if line is not None:
+            view.sel().clear()
+            view.sel().add(line.begin())
+
+        window.run_command('_nv_process_notation', {
+            'keys': keys,
+            'check_user_mappings': not forceit
+        })
+
+        # An incomplete command is ended, like Vim, as if <Esc> was typed.
+        enter_normal_mode(window, None)
+
+    if line_range.is_empty:
+        return _run()
+
+    region = line_range.resolve(view)
+    lines = [view.full_line(line) for line in view.lines(region) if line.a < region.end()]
+
+    _for_each_marked_line(view, lines, _run)
+
+
 def ex_noremap(lhs=None, rhs=None, **kwargs):
     if not (lhs and rhs):
         return status_message('Listing key mappings is not implemented')
@@ -737,40 +883,19 @@ def ex_quit(window, view, forceit=False, **kwargs):
         ex_unvsplit(window=window, view=view, forceit=forceit, **kwargs)
 
 
-# TODO [refactor] shell commands to use common os nv.ex.shell commands
 @_init_cwd
 def ex_read(view, edit, line_range, cmd=None, **kwargs):
     r = line_range.resolve(view)
     target_point = min(r.end(), view.size())
 
     if cmd:
-        if platform() == 'linux':
-            # TODO: make shell command configurable.
-            shell_cmd = view.settings().get('linux_shell')
-            shell_cmd = shell_cmd or os.path.expandvars("$SHELL")
-            if not shell_cmd:
-                return status_message('no shell found')
+        def _on_done(view, edit, output):
+            view.insert(edit, target_point, output.strip() + '\n')
 
-            try:
-                p = subprocess.Popen([shell_cmd, '-c', cmd], stdout=subprocess.PIPE)
-            except Exception as e:
-                return status_message('error executing command through shell {}'.format(e))
-
-            view.insert(edit, target_point, p.communicate()[0][:-1].decode('utf-8').strip() + '\n')
-
-        elif platform() == 'windows':
-            # TODO [refactor] shell commands to use common os nv.ex.shell commands
-            from NeoVintageous.nv.shell_windows import get_oem_cp
-            from NeoVintageous.nv.shell_windows import get_startup_info
-            p = subprocess.Popen(['cmd.exe', '/C', cmd],
-                                 stdout=subprocess.PIPE,
-                                 startupinfo=get_startup_info())
-            cp = 'cp' + get_oem_cp()
-            rv = p.communicate()[0].decode(cp)[:-2].strip()
-            view.insert(edit, target_point, rv.strip() + '\n')
-
-        else:
-            return status_message('not implemented')
+        try:
+            shell.read(view, cmd, _on_done)
+        except Exception as e:
+            return status_message('error executing command through shell {}'.format(e))
     else:
         # Read a file into the current view.
         # According to Vim's help, :r should read the current file's content
@@ -905,22 +1030,21 @@ def ex_shell_out(view, edit, cmd, line_range, **kwargs):
 
     try:
         if not line_range.is_empty:
-            shell.filter_thru_shell(
-                view=view,
-                edit=edit,
-                regions=[line_range.resolve(view)],
-                cmd=cmd
-            )
+            shell.filter_thru_shell(view, line_range.resolve(view), cmd)
         else:
-            output = shell.run_and_read(view, cmd)
-            output_view = view.window().create_output_panel('vi_out')
-            output_view.settings().set("line_numbers", False)
-            output_view.settings().set("gutter", False)
-            output_view.settings().set("scroll_past_end", False)
-            output_view = view.window().create_output_panel('vi_out')
-            output_view.run_command('append', {'characters': output, 'force': True, 'scroll_to_end': True})
-            if not view.settings().get('vintageous_shell_silent'):
-                view.window().run_command("show_panel", {"panel": "output.vi_out"})
+            silent = view.settings().get('vintageous_shell_silent')
+
+            def _on_done(view, edit, output):
+                output_view = view.window().create_output_panel('vi_out')
+                output_view.settings().set("line_numbers", False)
+                output_view.settings().set("gutter", False)
+                output_view.settings().set("scroll_past_end", False)
+                output_view = view.window().create_output_panel('vi_out')
+                output_view.run_command('append', {'characters': output, 'force': True, 'scroll_to_end': True})
+                if not silent:
+                    view.window().run_command("show_panel", {"panel": "output.vi_out"})
+
+            shell.read(view, cmd, _on_done)
 
         # TODO: store only successful commands.
         set_ex_shell_last_command(cmd)
@@ -980,7 +1104,7 @@ def ex_substitute(view, edit, line_range, pattern=None, replacement='', flags=No
     computed_flags |= re.IGNORECASE if ('i' in flags) else 0
 
     try:
-        compiled_pattern = re.compile(pattern, flags=computed_flags)
+        compiled_pattern = regex_compile(pattern, computed_flags)
     except Exception as e:
         return status_message('[regex error]: {} ... in pattern {}'.format((str(e), pattern)))
 
@@ -1026,43 +1150,127 @@ def ex_substitute(view, edit, line_range, pattern=None, replacement='', flags=No
 
         return _replace_confirming(view, edit, pattern, compiled_pattern, replacement, replace_count, target_region)
 
-    lines = view.lines(target_region)
-    if not lines:
-        return status_message('E486: Pattern not found: {}'.format(pattern))
+    start_time = time.perf_counter()
 
-    new_lines = []
-    dirty = False
-    for line in lines:
-        line_str = view.substr(line)
-        new_line_str = re.sub(compiled_pattern, replacement, line_str, count=replace_count)
-        new_lines.append(new_line_str)
-        if new_line_str != line_str:
-            dirty = True
+    offset = target_region.begin()
+    changes, substitutions = _substitute_lines(
+        compiled_pattern, replacement, view.substr(target_region), replace_count)
 
-    new_region_text = '\n'.join(new_lines)
-    if view.size() > line.end():
-        new_region_text += '\n'
+    search_time = time.perf_counter() - start_time
 
-    if not dirty:
+    if not substitutions:
         return status_message('E486: Pattern not found: {}'.format(pattern))
 
-    # Reposition cursor before replacing target region so that the cursor
-    # will auto adjust in sync with the replacement.
-    view.sel().clear()
-    view.sel().add(line.begin())
-
-    view.replace(edit, target_region, new_region_text)
+    # Apply the changes bottom-up so that the offsets of the changes that are
+    # yet to be applied are not affected. All the changes are made in the one
+    # edit, and only the changed text is replaced.
+    for begin, end, text in reversed(changes):
+        view.replace(edit, Region(offset + begin, offset + end), text)
 
     # TODO Refactor set position cursor after operation into reusable api.
-    # Put cursor on first non-whitespace char of current line.
-    line = view.line(view.sel()[0].b)
-    if line.size() > 0:
-        pt = view.find('^\\s*', line.begin()).end()
-        view.sel().clear()
-        view.sel().add(pt)
+    # Put cursor on first non-whitespace char of the last substituted line.
+    # The offsets of the changes are from before the edit, so the last one is
+    # moved by the difference in length made by all the changes before it.
+    last_line_begin = offset + changes[-1][0] + sum(len(text) - (end - begin) for begin, end, text in changes[:-1])
+    line = view.line(last_line_begin)
+    view.sel().clear()
+    view.sel().add(view.find('^\\s*', line.begin()).end() if line.size() > 0 else line.begin())
 
     enter_normal_mode(view, None)
 
+    apply_time = time.perf_counter() - start_time - search_time
+
+    _log.debug('substitute took %ss (search=%ss apply=%ss substitutions=%s lines=%s)',
+               '{:.4f}'.format(search_time + apply_time), '{:.4f}'.format(search_time),
+               '{:.4f}'.format(apply_time), substitutions, len(changes))
+
+    if substitute_timing_hook:
+        substitute_timing_hook(search_time, apply_time, substitutions, len(changes))
+
+    # Like Vim, only report when more than 'report' (default 2) substitutions.
+    if substitutions > 2:
+        status_message('%s substitution%s on %s line%s' % (
+            substitutions, '' if substitutions == 1 else 's', len(changes), '' if len(changes) == 1 else 's'))
+
+
+# Benchmarks can set this to a callable that is called after each :substitute
+# with the search and apply times (in seconds), the number of substitutions,
+# and the number of changed lines.
+substitute_timing_hook = None
+
+
+def _substitute_lines(compiled_pattern, replacement, text, count):
+    # type: (...) -> tuple
+    # Substitute the pattern in the lines of text.
+    #
+    # The pattern is searched for across the whole text, and only the lines
+    # that contain a match are substituted. Substitutions are made line by
+    # line, like Vim, so a match can't span more than one line.
+    #
+    # Args:
+    #   compiled_pattern (Pattern):
+    #   replacement (str):
+    #   text (str): Whole lines of text. A trailing newline doesn't start a
+    #       new line.
+    #   count (int): The maximum number of substitutions per line, zero means
+    #       substitute all matches.
+    #
+    # Returns:
+    #   tuple (list, int): The changes, a list of (begin, end, text) tuples
+    #       sorted by offset, where begin and end are the offsets in text of
+    #       the smallest span of a line that changed, and the total number of
+    #       substitutions.
+    changes = []
+    substitutions = 0
+    size = len(text)
+
+    # Offset of the last character that belongs to a line.
+    limit = size - 1 if text.endswith('\n') else size
+
+    search = compiled_pattern.search
+    subn = compiled_pattern.subn
+
+    pos = 0
+    while pos <= limit:
+        match = search(text, pos)
+        if not match or match.start() > limit:
+            break
+
+        line_begin = text.rfind('\n', 0, match.start()) + 1
+        line_end = text.find('\n', match.start())
+        if line_end == -1:
+            line_end = size
+
+        line = text[line_begin:line_end]
+        new_line, n = subn(replacement, line, count=count)
+        if n:
+            substitutions += n
+            if new_line != line:
+                begin, end, new_text = _changed_span(line, new_line)
+                changes.append((line_begin + begin, line_begin + end, new_text))
+
+        pos = line_end + 1
+
+    return changes, substitutions
+
+
+def _changed_span(old, new):
+    # type: (str, str) -> tuple
+    # Returns:
+    #   tuple (int, int, str): The begin and end offsets in old, and the
+    #       replacement text, of the smallest span that changes old to new.
+    prefix = 0
+    max_prefix = min(len(old), len(new))
+    while prefix < max_prefix and old[prefix] == new[prefix]:
+        prefix += 1
+
+    suffix = 0
+    max_suffix = max_prefix - prefix
+    while suffix < max_suffix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+
+    return prefix, len(old) - suffix, new[prefix:len(new) - suffix]
+
 
 def ex_sunmap(lhs, **kwargs):
     try:
@@ -16,6 +16,8 @@
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
 from collections import OrderedDict
+import re
+from string import ascii_letters
 
 from NeoVintageous.nv.ex.tokens import TokenCommand
 
@@ -101,6 +103,7 @@ def _ex_route_close(state):
 def _ex_route_copy(state):
     command = TokenCommand('copy')
     command.addressable = True
+    command.cooperates_with_global = True
     command.params = state.expect_match(r'\s*(?P<address>.+?)\s*$').groupdict()
 
     return command
@@ -203,8 +206,8 @@ def _ex_route_file(state):
     return _literal_route(state, 'file')
 
 
-def _ex_route_global(state):
-    command = _literal_route(state, 'global', forcable=True, addressable=True)
+def _create_global_route(state, name):
+    command = _literal_route(state, name, forcable=True, addressable=True, target='global')
 
     sep = state.consume()
     if sep in tuple('\\"|abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'):
@@ -238,6 +241,10 @@ def _ex_route_global(state):
     return command
 
 
+def _ex_route_global(state):
+    return _create_global_route(state, 'global')
+
+
 def _ex_route_help(state):
     command = TokenCommand('help')
     match = state.expect_match(r'(?P<bang>!)?\s*(?P<subject>.+)?$').groupdict()
@@ -275,6 +282,7 @@ def _ex_route_let(state):
 def _ex_route_move(state):
     command = TokenCommand('move')
     command.addressable = True
+    command.cooperates_with_global = True
 
     state.skip(' ')
     state.ignore()
@@ -290,6 +298,19 @@ def _ex_route_new(state):
     return _literal_route(state, 'new')
 
 
+def _ex_route_normal(state):
+    command = _literal_route(state, 'normal', forcable=True, addressable=True, cooperates_with_global=True)
+
+    state.skip(' ')
+    state.ignore()
+
+    command.params['keys'] = state.expect_match(
+        r'.+$',
+        on_error=lambda: Exception('E471: Argument required')).group(0)
+
+    return command
+
+
 def _ex_route_nnoremap(state):
     return _create_map_route(state, 'nnoremap')
 
@@ -473,6 +494,7 @@ def _ex_route_split(state):
 def _ex_route_substitute(state):
     command = TokenCommand('substitute')
     command.addressable = True
+    command.cooperates_with_global = True
 
     delim = state.consume()
 
@@ -570,6 +592,14 @@ def _ex_route_unvsplit(state):
     return _literal_route(state, 'unvsplit')
 
 
+def _ex_route_vglobal(state):
+    # The :vglobal command is the same as :global!.
+    command = _create_global_route(state, 'vglobal')
+    command.forced = True
+
+    return command
+
+
 def _ex_route_vnoremap(state):
     return _create_map_route(state, 'vnoremap')
 
@@ -703,7 +733,6 @@ def _ex_route_yank(state):
     return command
 
 
-# TODO: compile regexes. ??
 ex_routes = OrderedDict()  # type: dict
 ex_routes[r'!(?=.+)'] = _ex_route_shell_out
 ex_routes[r'&&?'] = _ex_route_double_ampersand
@@ -731,6 +760,7 @@ ex_routes[r'm(?:ove)?(?=[^a]|$)'] = _ex_route_move
 ex_routes[r'new'] = _ex_route_new
 ex_routes[r'nn(?:oremap)?'] = _ex_route_nnoremap
 ex_routes[r'noh(?:lsearch)?'] = _ex_route_nohlsearch
+ex_routes[r'norm(?:al)?'] = _ex_route_normal
 ex_routes[r'no(?:remap)?'] = _ex_route_noremap
 ex_routes[r'nun(?:map)?'] = _ex_route_nunmap
 ex_routes[r'ono(?:remap)?'] = _ex_route_onoremap
@@ -759,8 +789,10 @@ ex_routes[r'tabN(?:ext)?'] = _ex_route_tabprevious
 ex_routes[r'tabo(?:nly)?'] = _ex_route_tabonly
 ex_routes[r'tabp(?:revious)?'] = _ex_route_tabprevious
 ex_routes[r'tabr(?:ewind)?'] = _ex_route_tabfirst
+ex_routes[r't(?=[^a-zA-Z]|$)'] = _ex_route_copy
 ex_routes[r'unm(?:ap)?'] = _ex_route_unmap
 ex_routes[r'unvsplit'] = _ex_route_unvsplit
+ex_routes[r'v(?:global)?(?=[^a-zA-Z]|$)'] = _ex_route_vglobal
 ex_routes[r'vn(?:oremap)?'] = _ex_route_vnoremap
 ex_routes[r'vs(?:plit)?'] = _ex_route_vsplit
 ex_routes[r'vu(?:nmap)?'] = _ex_route_vunmap
@@ -771,3 +803,120 @@ ex_routes[r'wq(?=[^a-zA-Z]|$)?'] = _ex_route_wq
 ex_routes[r'xa(?:ll)?'] = _ex_route_wqall
 ex_routes[r'x(?:it)?'] = _ex_route_exit
 ex_routes[r'y(?:ank)?'] = _ex_route_yank
+
+
+def _abbreviations(name):
+    # type: (str) -> list
+    # Returns all the abbreviations of a name in the Vim help notation, for
+    # example "bf[irst]" -> ["bf", "bfi", "bfir", "bfirs", "bfirst"].
+    required, _, optional = name.partition('[')
+    optional = optional.rstrip(']')
+
+    return [required + optional[:i] for i in range(len(optional) + 1)]
+
+
+def _group_end(pattern, i):
+    # type: (str, int) -> int
+    # Returns the index after the group that begins at index i of the pattern.
+    depth = 0
+    while i < len(pattern):
+        if pattern[i] == '\\':
+            i += 1
+        elif pattern[i] == '(':
+            depth += 1
+        elif pattern[i] == ')':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+
+    raise ValueError('unbalanced ex route pattern: {}'.format(pattern))
+
+
+def _route_names(pattern):
+    # type: (str) -> list
+    # Returns the command names of a route pattern in the Vim help notation:
+    # the part in brackets is optional, so "bf[irst]" is "bf", "bfi", ...,
+    # "bfirst". For example "bf(?:irst)?" -> ["bf[irst]"], and
+    # "(?:files|ls|buffers)!?" -> ["files", "ls", "buffers"]. The lookarounds,
+    # a trailing "!", and whitespace are not part of the names.
+    names = ['']
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == '(':
+            end = _group_end(pattern, i)
+            optional = pattern[end:end + 1] == '?'
+            if pattern.startswith(('(?=', '(?!'), i):
+                parts = ['']
+            else:
+                group = pattern[i + 3 if pattern.startswith('(?:', i) else i + 1:end - 1]
+                parts = ['[' + group + ']'] if optional else group.split('|')
+            names = [name + part for name in names for part in parts]
+            i = end + 1 if optional else end
+        elif pattern[i] == '\\':
+            i += 2
+        elif pattern[i:i + 2] == '!?':
+            i += 2
+        elif pattern[i + 1:i + 2] == '?':
+            names = [name + '[' + pattern[i] + ']' for name in names]
+            i += 2
+        else:
+            names = [name + pattern[i] for name in names]
+            i += 1
+
+    return names
+
+
+def _build_ex_route_table():
+    # type: () -> dict
+    # Returns a table of all the command name abbreviations to the route
+    # pattern (compiled) and the route function.
+    table = {}
+    for pattern, function in ex_routes.items():
+        route = (re.compile(pattern), function)
+        for name in _route_names(pattern):
+            for abbreviation in _abbreviations(name):
+                # Vim accepts all the abbreviations, but a route only accepts
+                # the ones its pattern matches in full e.g. "bf" and "bfirst",
+                # but not "bfi".
+                if not any(m and m.end() >= len(abbreviation)
+                           for m in (route[0].match(abbreviation), route[0].match(abbreviation + ' '))):
+                    continue
+
+                if abbreviation in table:
+                    raise ValueError('ambiguous ex command abbreviation: {}'.format(abbreviation))
+
+                table[abbreviation] = route
+
+    return table
+
+
+_ex_route_table = _build_ex_route_table()
+
+_ASCII_LETTERS = frozenset(ascii_letters)
+
+
+def ex_route_lookup(source, position):
+    # Generates the routes for the command name at the position in the source,
+    # most specific first: the route for the whole run of letters, and then
+    # the routes for shorter and shorter prefixes of it. Like Vim, a few
+    # commands can be followed directly by their arguments e.g. "dx" deletes
+    # into register x.
+    #
+    # Yields:
+    #   tuple: A (compiled pattern, route) tuple.
+    end = position
+    length = len(source)
+    while end < length and source[end] in _ASCII_LETTERS:
+        end += 1
+
+    if end == position:
+        end += 1
+
+    previous = None
+    while end > position:
+        route = _ex_route_table.get(source[position:end])
+        if route and route is not previous:
+            yield route
+            previous = route
+        end -= 1
@@ -16,6 +16,17 @@
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
 
+from bisect import bisect_left
+from bisect import insort
+import threading
+
+from sublime import set_timeout_async
+
+from NeoVintageous.nv.journal import journal_append
+from NeoVintageous.nv.journal import journal_load
+from NeoVintageous.nv.regex import regex_compile
+
+
 # TODO Implement 'history' option so that the number of history entries
 # remembered can be configured.
 _MAX_ITEMS = 10000
@@ -49,30 +60,177 @@ _NAME2TYPE = {
 }
 
 
+class _HistoryItems(dict):
+
+    # A dict of entry number -> item that also keeps a reverse item -> number
+    # index (to find duplicates) and a sorted list of the numbers (to index
+    # entries relative to the most recent one), so that none of the history
+    # operations need to scan the whole history.
+    #
+    # Only __setitem__ and __delitem__ keep the indexes in sync, use those to
+    # mutate the items.
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._numbers = []  # type: list
+        self._index = {}  # type: dict
+        for number, item in sorted(dict(*args, **kwargs).items()):
+            self[number] = item
+
+    def __setitem__(self, number, item):
+        if number in self:
+            del self[number]
+
+        super().__setitem__(number, item)
+
+        if not self._numbers or number > self._numbers[-1]:
+            self._numbers.append(number)
+        else:
+            insort(self._numbers, number)
+
+        if self._index.get(item, -1) < number:
+            self._index[item] = number
+
+    def __delitem__(self, number):
+        item = self[number]
+        super().__delitem__(number)
+        del self._numbers[bisect_left(self._numbers, number)]
+        if self._index.get(item) == number:
+            del self._index[item]
+
+    def number_of(self, item):
+        # type: (str) -> int
+        # Returns:
+        #   int: The number of the entry for item, or None if not found.
+        return self._index.get(item)
+
+    def number_at(self, position):
+        # type: (int) -> int
+        # Raises:
+        #   IndexError: If there is no entry at the position.
+        return self._numbers[position]
+
+    def numbers(self):
+        # type: () -> list
+        # Returns:
+        #   list: The entry numbers, oldest first.
+        return self._numbers
+
+
 _storage = {
     _HIST_CMD: {
         'num': 0,
-        'items': {}
+        'items': _HistoryItems()
     },
     _HIST_SEARCH: {
         'num': 0,
-        'items': {}
+        'items': _HistoryItems()
     },
     _HIST_EXPR: {
         'num': 0,
-        'items': {}
+        'items': _HistoryItems()
     },
     _HIST_INPUT: {
         'num': 0,
-        'items': {}
+        'items': _HistoryItems()
     },
     _HIST_DEBUG: {
         'num': 0,
-        'items': {}
+        'items': _HistoryItems()
     }
 }  # type: dict
 
 
+# The history is persisted to a file as a journal of operations, see
+# nv/journal.py. The operations are queued and appended by the worker thread,
+# and the file is only read (and compacted) on first use of the history rather
+# than at startup.
+_file = None  # type: str
+_loaded = True
+
+# Operations not yet appended to the file.
+_pending = []  # type: list
+
+# Guards _pending and the file, which the worker thread uses too.
+_lock = threading.RLock()
+
+
+def history_set_file(path):
+    # type: (str) -> None
+    # Set the file to persist the history to.
+    #
+    # The file is loaded lazily, the first time the history is used.
+    global _file, _loaded
+
+    with _lock:
+        _file = path
+        _loaded = path is None
+        del _pending[:]
+
+
+def _load():
+    # type: () -> None
+    global _loaded
+
+    if _loaded:
+        return
+
+    _loaded = True
+
+    with _lock:
+        journal_load(_file, _replay, _snapshot)
+
+
+def _replay(op):
+    # type: (list) -> None
+    name = op[0]
+    if name == 'a':
+        _add(op[1], op[2])
+    elif name == 'd':
+        _del(op[1], op[2])
+    elif name == 'c':
+        _clear(op[1])
+    elif name == 'n':
+        _storage[op[1]]['num'] = op[2]
+    elif name == 's':
+        _storage[op[1]]['items'][op[2]] = op[3]
+
+
+def _snapshot():
+    # type: () -> list
+    ops = []
+    for history_type, storage in sorted(_storage.items()):
+        ops.append(['n', history_type, storage['num']])
+        for number in storage['items'].numbers():
+            ops.append(['s', history_type, number, storage['items'][number]])
+
+    return ops
+
+
+def _journal(*op):
+    # type: (...) -> None
+    if _file is None:
+        return
+
+    with _lock:
+        scheduled = bool(_pending)
+        _pending.append(op)
+
+    if not scheduled:
+        set_timeout_async(_flush, 0)
+
+
+def _flush():
+    # type: () -> None
+    # Append the pending operations to the journal.
+    with _lock:
+        ops = _pending[:]
+        del _pending[:]
+
+        if ops and _file is not None:
+            journal_append(_file, ops)
+
+
 def _char2type(char):
     # type: (str) -> int
     try:
@@ -140,25 +298,49 @@ def history_add(history, item):
     if _MAX_ITEMS == 0:
         return 0
 
+    _load()
+
     history_type = history_get_type(history)
 
-    pending_deletes = [k for k, v in _storage[history_type]['items'].items() if v == item]
-    for pending_delete in pending_deletes:
-        del _storage[history_type]['items'][pending_delete]
+    _add(history_type, item)
+    _journal('a', history_type, item)
 
-    _storage[history_type]['num'] += 1
-    _storage[history_type]['items'][_storage[history_type]['num']] = item
+    return 1
 
-    if len(_storage[history_type]['items']) > _MAX_ITEMS:
-        del _storage[history_type]['items'][min(_storage[history_type]['items'].keys())]
 
-    return 1
+def _add(history_type, item):
+    # type: (int, str) -> None
+    storage = _storage[history_type]
+    items = storage['items']
+
+    duplicate = items.number_of(item)
+    if duplicate is not None:
+        del items[duplicate]
+
+    storage['num'] += 1
+    items[storage['num']] = item
+
+    if len(items) > _MAX_ITEMS:
+        del items[items.number_at(0)]
+
+
+def _del(history_type, number):
+    # type: (int, int) -> None
+    del _storage[history_type]['items'][number]
+
+
+def _clear(history_type=None):
+    # type: (int) -> None
+    for key in _storage:
+        if history_type is None or key == history_type:
+            _storage[key] = {'num': 0, 'items': _HistoryItems()}
 
 
 def history_clear():
     # type: () -> None
-    for key in _storage:
-        _storage[key] = {'num': 0, 'items': {}}
+    _load()
+    _clear()
+    _journal('c', None)
 
 
 def history_del(history, item=None):
@@ -171,6 +353,9 @@ def history_del(history, item=None):
     # If item evaluates to an int, it will be interpreted as an index, see
     # |history-indexing|. The respective entry will be removed if it exists.
     #
+    # If item is a str, it is interpreted as a regular expression. All entries
+    # matching the expression will be removed.
+    #
     # Args:
     #   :history (str): See |hist-names| for the possible values of history.
     #   :item (str):
@@ -182,25 +367,31 @@ def history_del(history, item=None):
     if history_type == _HIST_INVALID:
         return 0
 
+    _load()
+
+    items = _storage[history_type]['items']
+
     if item is None:
-        _storage[history_type]['num'] = 0
-        _storage[history_type]['items'] = {}
+        _clear(history_type)
+        _journal('c', history_type)
         ret = 1
     else:
         if isinstance(item, int):
             try:
-                if item >= 0:
-                    del _storage[history_type]['items'][item]
-                    ret = 1
-                else:
-                    keys = sorted(_storage[history_type]['items'].keys())
-                    key_index = keys[item]
-                    del _storage[history_type]['items'][key_index]
-                    ret = 1
+                number = item if item >= 0 else items.number_at(item)
+                _del(history_type, number)
+                _journal('d', history_type, number)
+                ret = 1
             except (KeyError, IndexError):
                 ret = 0
         else:
-            raise NotImplementedError('history_del(history, item) where item is regular expression')
+            search = regex_compile(item).search
+            matches = [number for number in items.numbers() if search(items[number])]
+            for number in matches:
+                _del(history_type, number)
+                _journal('d', history_type, number)
+
+            ret = 1 if matches else 0
 
     return ret
 
@@ -224,14 +415,16 @@ def history_get(history, index=-1):
     if history_type == _HIST_INVALID:
         return ''
 
+    _load()
+
+    items = _storage[history_type]['items']
+
     try:
         # A positive int represents the absolute index of an entry.
         if index >= 0:
-            ret = _storage[history_type]['items'][index]
+            ret = items[index]
         else:
-            keys = sorted(_storage[history_type]['items'].keys())
-            key_index = keys[index]
-            ret = _storage[history_type]['items'][key_index]
+            ret = items[items.number_at(index)]
 
     except Exception:
         ret = ''
@@ -241,6 +434,8 @@ def history_get(history, index=-1):
 
 def history_len(history):
     # type: (str) -> int
+    _load()
+
     return len(_storage[history_get_type(history)]['items'])
 
 
@@ -258,9 +453,11 @@ def history_nr(history):
     if history_type == _HIST_INVALID:
         return -1
 
-    items = _storage[history_type]['items'].keys()
+    _load()
+
+    items = _storage[history_type]['items']
     if len(items) > 0:
-        num = max(items)
+        num = items.number_at(-1)
     else:
         num = -1
 
@@ -288,6 +485,8 @@ def history(name):
 
         history_types = [history_type]
 
+    _load()
+
     buf = []
 
     type2name = {
@@ -305,7 +504,7 @@ def history(name):
 
         # TODO initial padding should be size of max history width
         buf.append('%6s  %s history' % ('#', name))
-        for i, number in enumerate(sorted(contents, reverse=False), start=1):
+        for i, number in enumerate(contents.numbers(), start=1):
             if i == count:
                 buf.append('>%5d  %s' % (number, contents[number]))
             else:
@@ -0,0 +1,81 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import logging
+import os
+
+_log = logging.getLogger(__name__)
+
+
+# A journal is a file of operations, one JSON list per line. Changes are
+# appended to it, which is cheap, and it is replayed to restore the state it
+# records. When it has grown to many times the size of that state it is
+# rewritten as a snapshot of the state.
+
+# A journal is compacted on load when it has more than this many lines per
+# line of the snapshot.
+_COMPACT_RATIO = 4
+
+
+def journal_load(path, replay, snapshot):
+    # type: (...) -> None
+    # Replay the operations in a journal file. Invalid lines, for example a
+    # line truncated by a crash, are skipped. The file is compacted when it has
+    # grown too large: snapshot() returns the operations to rewrite it with.
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except EnvironmentError:
+        return
+
+    for line in lines:
+        try:
+            replay(json.loads(line))
+        except (ValueError, TypeError, KeyError, IndexError):
+            _log.debug('skipping invalid journal entry in %s: %s', path, line)
+
+    ops = snapshot()
+    if len(lines) > _COMPACT_RATIO * max(len(ops), 1):
+        _rewrite(path, ops)
+
+
+def journal_append(path, ops):
+    # type: (str, list) -> None
+    try:
+        try:
+            f = open(path, 'a', encoding='utf-8')
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            f = open(path, 'a', encoding='utf-8')
+
+        with f:
+            f.write(''.join(json.dumps(op) + '\n' for op in ops))
+    except EnvironmentError as e:
+        _log.debug('could not write journal %s: %s', path, e)
+
+
+def _rewrite(path, ops):
+    # type: (str, list) -> None
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(op) + '\n' for op in ops))
+
+        os.replace(tmp_path, path)
+    except EnvironmentError as e:
+        _log.debug('could not compact journal %s: %s', path, e)
@@ -15,11 +15,20 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+import json
+
 from NeoVintageous.nv.polyfill import erase_window_status
 from NeoVintageous.nv.polyfill import set_window_status
+from NeoVintageous.nv.viminfo import viminfo_get
+from NeoVintageous.nv.viminfo import viminfo_set
 
 _state = {}  # type: dict
 
+# The macros persisted by the last session, by register name. Windows that
+# haven't recorded a macro in a register fall back to these. None until they
+# are first needed.
+_restored = None  # type: dict
+
 
 def _get(window, key=None, default=None):
     try:
@@ -52,6 +61,7 @@ def start_recording(window, register_name):
     state = _get(window)
     state['recording'] = True
     state['recording_steps'] = []
+    state['recording_args'] = {}
     state['recording_register_name'] = register_name
 
     set_window_status(window, 'vim-recorder', 'recording @%s' % register_name)
@@ -66,9 +76,12 @@ def stop_recording(window):
             state['recorded'] = {}
 
         state['recorded'][name] = _get_steps(window)
+        state.get('plans', {}).pop(name, None)
+        viminfo_set('macros', name, state['recorded'][name])
 
     state['recording'] = False
     state['recording_steps'] = []
+    state['recording_args'] = {}
     state['recording_register_name'] = None
 
     erase_window_status(window, 'vim-recorder')
@@ -80,7 +93,23 @@ def get_recorded(window, name):
     try:
         return state['recorded'][name]
     except KeyError:
-        return None
+        return _get_restored().get(name)
+
+
+def _get_restored():
+    global _restored
+
+    if _restored is None:
+        _restored = {}
+        for name, steps in viminfo_get('macros').items():
+            try:
+                interned = {}  # type: dict
+                _restored[name] = tuple((str(cmd), _intern_args(interned, args), bool(motion))
+                                        for cmd, args, motion in steps)
+            except (TypeError, ValueError):
+                pass
+
+    return _restored
 
 
 def get_last_used_register_name(window):
@@ -92,8 +121,39 @@ def set_last_used_register_name(window, name):
     state['last_used_register_name'] = name
 
 
+def get_replay_plan(window, name):
+    # Returns the recorded steps of a macro compiled for replaying, or None if
+    # nothing is recorded in the register. See _compile_plan().
+    state = _get(window)
+    plans = state.setdefault('plans', {})
+
+    try:
+        return plans[name]
+    except KeyError:
+        steps = get_recorded(window, name)
+        if steps is None:
+            return None
+
+        plan = plans[name] = _compile_plan(steps)
+
+        return plan
+
+
+def with_xpos(args, target, xpos):
+    # Returns a copy of step args with the xpos set for the target. The args of
+    # recorded steps are shared, so they are never changed in place.
+    args = dict(args)
+    if target == 'motion':
+        motion = args['motion'] = dict(args['motion'])
+        motion['motion_args'] = dict(motion['motion_args'], xpos=xpos)
+    else:
+        args['xpos'] = xpos
+
+    return args
+
+
 # TODO Refactor to remove State dependency
-def add_step(state, cmd, args):
+def add_step(state, cmd, args, motion=False):
     window = state.view.window()
 
     if is_recording(window):
@@ -107,8 +167,66 @@ def add_step(state, cmd, args):
             if 'recording_steps' not in state:
                 state['recording_steps'] = []
 
-            state['recording_steps'].append((cmd, args))
+            state['recording_steps'].append((cmd, _intern_args(state, args), motion))
+
+
+def _intern_args(state, args):
+    # Steps are recorded with a copy of their args, and steps with equal args
+    # share the same copy, e.g. the args of every "j" in a recording. Sharing
+    # keeps long recordings compact. The copy also means that changes the
+    # commands make to their args when they are run don't leak into the macro.
+    key = json.dumps(args, sort_keys=True)
+    interned = state.setdefault('recording_args', {})
+
+    try:
+        return interned[key]
+    except KeyError:
+        args = interned[key] = json.loads(key)
+
+        return args
 
 
 def _get_steps(window):
-    return list(_get(window, 'recording_steps', []))
+    return tuple(_get(window, 'recording_steps', []))
+
+
+def _xpos_target(args):
+    if 'xpos' in args:
+        return 'args'
+
+    motion = args.get('motion')
+    if motion and 'xpos' in motion.get('motion_args', {}):
+        return 'motion'
+
+    return None
+
+
+def _compile_plan(steps):
+    # Compiles the recorded steps of a macro into a plan for replaying them.
+    #
+    # Each item in the plan is a tuple of (cmd, args, motion, xpos, keep_xpos).
+    #
+    # Args:
+    #   steps (tuple): The recorded (cmd, args, motion) steps.
+    #
+    # Returns:
+    #   tuple:
+    #       cmd (str): The command name.
+    #       args (dict): The shared command args (don't change them).
+    #       motion (bool): True if the step is a motion without an action.
+    #           Motions can be run by the view directly.
+    #       xpos (str|None): Where the step takes an xpos: "args" for the args,
+    #           "motion" for the args of its motion, or None.
+    #       keep_xpos (bool): True if the xpos of the previous step should be
+    #           kept, because the previous step was a motion that only moves
+    #           the cursor up or down e.g. "jj" keeps the column like Vim.
+    plan = []
+    for cmd, args, motion in steps:
+        plan.append([cmd, args, motion, _xpos_target(args), False])
+
+    # The replay repeats the plan, so the step before the first is the last.
+    for i, step in enumerate(plan):
+        previous = plan[i - 1]
+        step[4] = bool(step[3] and previous[2] and previous[3] == 'args')
+
+    return tuple(tuple(step) for step in plan)
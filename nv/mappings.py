@@ -31,14 +31,104 @@ from NeoVintageous.nv.vim import VISUAL_LINE
 
 _log = logging.getLogger(__name__)
 
+
+class _TrieNode:
+
+    __slots__ = ('children', 'count')
+
+    def __init__(self):
+        self.children = {}  # type: dict
+        # Number of mappings whose lhs passes through (or ends at) this node.
+        self.count = 0
+
+
+class _MappingsTrie(dict):
+
+    # A dict of lhs -> rhs mappings that also indexes the lhs's in a prefix
+    # tree, so that full match, partial match and incomplete queries are a
+    # single walk down the tree, instead of a scan of every mapping.
+    #
+    # Only __setitem__, __delitem__ and clear() keep the index in sync, use
+    # those to mutate the mappings.
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._root = _TrieNode()
+        for lhs, rhs in dict(*args, **kwargs).items():
+            self[lhs] = rhs
+
+    def __setitem__(self, lhs, rhs):
+        if lhs not in self:
+            node = self._root
+            node.count += 1
+            for char in lhs:
+                try:
+                    child = node.children[char]
+                except KeyError:
+                    child = node.children[char] = _TrieNode()
+                child.count += 1
+                node = child
+
+        super().__setitem__(lhs, rhs)
+
+    def __delitem__(self, lhs):
+        super().__delitem__(lhs)
+
+        node = self._root
+        node.count -= 1
+        for char in lhs:
+            child = node.children[char]
+            child.count -= 1
+            if child.count == 0:
+                # No other mapping shares the rest of the path.
+                del node.children[char]
+                break
+            node = child
+
+    def clear(self):
+        super().clear()
+        self._root = _TrieNode()
+
+    def _walk(self, prefix):
+        node = self._root
+        for char in prefix:
+            try:
+                node = node.children[char]
+            except KeyError:
+                return None
+
+        return node
+
+    def has_prefix(self, prefix):
+        # type: (str) -> bool
+        node = self._walk(prefix)
+
+        return node is not None and node.count > 0
+
+    def iter_prefix(self, prefix):
+        # Yield every lhs that starts with *prefix*.
+        node = self._walk(prefix)
+        if node is None or node.count == 0:
+            return
+
+        stack = [(prefix, node)]
+        while stack:
+            lhs, node = stack.pop()
+            if lhs in self:
+                yield lhs
+
+            for char, child in node.children.items():
+                stack.append((lhs + char, child))
+
+
 _mappings = {
-    INSERT: {},
-    NORMAL: {},
-    OPERATOR_PENDING: {},
-    SELECT: {},
-    VISUAL_BLOCK: {},
-    VISUAL_LINE: {},
-    VISUAL: {}
+    INSERT: _MappingsTrie(),
+    NORMAL: _MappingsTrie(),
+    OPERATOR_PENDING: _MappingsTrie(),
+    SELECT: _MappingsTrie(),
+    VISUAL_BLOCK: _MappingsTrie(),
+    VISUAL_LINE: _MappingsTrie(),
+    VISUAL: _MappingsTrie()
 }  # type: dict
 
 
@@ -51,12 +141,16 @@ class Mapping:
 
 def _find_partial_matches(mode, lhs):
     # type: (str, str) -> list
-    return [x for x in _mappings[mode] if x.startswith(lhs)]
+    return list(_mappings[mode].iter_prefix(lhs))
+
+
+def _has_partial_matches(mode, lhs):
+    # type: (str, str) -> bool
+    return _mappings[mode].has_prefix(lhs)
 
 
 def _find_full_match(mode, lhs):
-    if lhs in _mappings[mode]:
-        return _mappings[mode][lhs]
+    return _mappings[mode].get(lhs)
 
 
 def _normalise_lhs(lhs):
@@ -80,7 +174,7 @@ def mappings_remove(mode, lhs):
 def mappings_clear():
     # type: () -> None
     for mode in _mappings:
-        _mappings[mode] = {}
+        _mappings[mode].clear()
 
 
 def _seq_to_mapping(mode, seq):
@@ -95,23 +189,12 @@ def mappings_is_incomplete(mode, seq):
     if full_match:
         return False
 
-    partial_matches = _find_partial_matches(mode, seq)
-    if partial_matches:
-        return True
-
-    return False
+    return _has_partial_matches(mode, seq)
 
 
 def mappings_can_resolve(mode, sequence):
-    full_match = _find_full_match(mode, sequence)
-    if full_match:
-        return True
-
-    partial_matches = _find_partial_matches(mode, sequence)
-    if partial_matches:
-        return True
-
-    return False
+    # A full match is also a partial match of itself.
+    return _has_partial_matches(mode, sequence)
 
 
 def mappings_resolve(state, sequence=None, mode=None, check_user_mappings=True):
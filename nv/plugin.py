@@ -55,5 +55,10 @@ def register(seq, modes, *args, **kwargs):
         for mode in modes:
             mappings[mode][seq] = cls(*args, **kwargs)
             classes[cls.__name__] = cls
+
+        # The keys module imports this one, so it's imported here.
+        from NeoVintageous.nv.vi.keys import seq_cache_clear
+        seq_cache_clear()
+
         return cls
     return inner
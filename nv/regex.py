@@ -0,0 +1,153 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import namedtuple
+from collections import OrderedDict
+import re
+
+from sublime import IGNORECASE
+from sublime import LITERAL
+
+
+# Maximum number of entries in the cache. The least recently used entries are
+# evicted first.
+_CACHE_SIZE = 256
+
+_cache = OrderedDict()  # type: OrderedDict
+
+_hits = 0
+_misses = 0
+
+RegexCacheInfo = namedtuple('RegexCacheInfo', 'hits misses maxsize currsize')
+
+
+def _cached(key, factory):
+    global _hits, _misses
+
+    try:
+        value = _cache[key]
+    except KeyError:
+        _misses += 1
+        value = _cache[key] = factory()
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    else:
+        _hits += 1
+        _cache.move_to_end(key)
+
+    return value
+
+
+def regex_compile(pattern, flags=0):
+    # type: (str, int) -> object
+    # Returns a compiled python regular expression. Raises re.error if the
+    # pattern is invalid (errors are not cached).
+    return _cached(('re', pattern, flags), lambda: re.compile(pattern, flags))
+
+
+# The parts of the Sublime Text (boost) syntax that python doesn't support, or
+# that mean something else in python, and that can't be translated:
+#
+#   * escapes other than the ones both agree on, for example \Q...\E, \h, \K,
+#     \x{...}, and \Z (the end of the buffer or before a final newline)
+#   * POSIX classes, collating elements, and equivalence classes: [[:digit:]]
+#   * named groups (?<name>...) and (?'name'...), atomic groups (?>...), and
+#     branch resets (?|...)
+#   * possessive quantifiers: *+ ++ ?+ {n,m}+
+#
+# Some patterns that python does support are matched too, for example [*+],
+# which only means they are searched with view.find() instead.
+_UNSUPPORTED_FIND_SYNTAX = re.compile(r'''
+    (?<!\\)(?:\\\\)*
+    (?:
+        \\(?:[^aAbBdDfnrsStwWx1-9<>z\W]|x(?![0-9a-fA-F]{2}))
+        | \[[:.=]
+        | \(\?(?:<[^=!]|['>|])
+        | [*+?}]\+
+    )
+''', re.VERBOSE)
+
+
+def _find_regex(pattern, flags):
+    # type: (str, int) -> object
+    if flags & LITERAL:
+        pattern = re.escape(pattern)
+    else:
+        if _UNSUPPORTED_FIND_SYNTAX.search(pattern):
+            raise re.error('unsupported syntax: %s' % pattern)
+
+        # The parts of the Sublime Text (boost) syntax that python doesn't
+        # support: the word boundaries and the end of the buffer.
+        pattern = re.sub(r'(?<!\\)((?:\\\\)*)\\<', '\\1\\\\b(?=\\\\w)', pattern)
+        pattern = re.sub(r'(?<!\\)((?:\\\\)*)\\>', '\\1\\\\b(?<=\\\\w)', pattern)
+        pattern = re.sub(r'(?<!\\)((?:\\\\)*)\\z', '\\1\\\\Z', pattern)
+
+    return re.compile(pattern, re.MULTILINE | (re.IGNORECASE if flags & IGNORECASE else 0))
+
+
+def regex_compile_find(pattern, flags=0):
+    # type: (str, int) -> object
+    # Returns a compiled python regular expression that matches what
+    # view.find() matches for the pattern and find flags. Raises re.error if
+    # the pattern is invalid, or uses syntax that can't be translated to python
+    # (errors are not cached).
+    return _cached(('find', pattern, flags), lambda: _find_regex(pattern, flags))
+
+
+def _search_flags(pattern, magic, ignorecase):
+    # type: (str, bool, bool) -> int
+    flags = 0
+
+    if not magic:
+        flags |= LITERAL
+    elif pattern:
+        # Is the pattern as regular expression or a literal? For example, in
+        # "magic" mode, simple strings like "]" should be treated as a literal
+        # and "[0-9]" should be treated as a regular expression.
+
+        if re.match('^[a-zA-Z0-9_\\[\\]]+$', pattern):
+            if '[' not in pattern or ']' not in pattern:
+                flags |= LITERAL
+        elif re.match('^[a-zA-Z0-9_\\(\\)]+$', pattern):
+            if '(' not in pattern or ')' not in pattern:
+                flags |= LITERAL
+
+    if ignorecase:
+        flags |= IGNORECASE
+
+    return flags
+
+
+def regex_search_flags(pattern, magic=True, ignorecase=False):
+    # type: (str, bool, bool) -> int
+    # Returns the Sublime Text find flags for a search pattern given the magic
+    # and ignorecase options.
+    return _cached(('flags', pattern, magic, ignorecase), lambda: _search_flags(pattern, magic, ignorecase))
+
+
+def regex_cache_info():
+    # type: () -> RegexCacheInfo
+    return RegexCacheInfo(_hits, _misses, _CACHE_SIZE, len(_cache))
+
+
+def regex_cache_clear():
+    # type: () -> None
+    global _hits, _misses
+
+    _cache.clear()
+    _hits = 0
+    _misses = 0
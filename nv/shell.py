@@ -15,10 +15,14 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+import os
 import sys
+import threading
 
 from sublime import platform
-from sublime import Region
+from sublime import set_timeout
+
+from NeoVintageous.nv.vim import status_message
 
 _PLATFORM = platform()
 
@@ -32,33 +36,186 @@ else:
     raise ImportError('no os specific module found')
 
 
+# Size in characters of the chunks written to the command's stdin, and in bytes
+# of the chunks read back from its stdout.
+_CHUNK_SIZE = 65536
+
+# Commands that finish within this many seconds are applied straight away, as
+# if they had run synchronously. Anything slower continues in the background
+# and can be cancelled by pressing <Esc>.
+_SYNC_TIMEOUT = 0.5
+
+# Milliseconds between checks for completion of a background command.
+_POLL_INTERVAL = 50
+
+# Running (background) jobs keyed by view id.
+_jobs = {}  # type: dict
+
+# Finished jobs waiting to be applied by the _nv_shell_apply command, keyed by
+# view id. The output is handed over in-process rather than as command args to
+# avoid serialising what can be many megabytes of text to JSON and back.
+_done = {}  # type: dict
+
+
+class _Job(threading.Thread):
+
+    # Runs a shell command on a worker thread. The input is written to the
+    # command's stdin in chunks from a second thread while this thread reads
+    # stdout incrementally, so neither pipe can fill up and deadlock the child,
+    # and the UI thread is never blocked on the child process.
+
+    def __init__(self, proc, text, decoder, on_done):
+        super().__init__(daemon=True)
+        self.proc = proc
+        self.text = text
+        self.decoder = decoder
+        self.on_done = on_done
+        self.chunks = []
+        self.cancelled = False
+
+    def run(self):
+        writer = None
+        if self.text:
+            writer = threading.Thread(target=self._write, daemon=True)
+            writer.start()
+        else:
+            self.proc.stdin.close()
+
+        fd = self.proc.stdout.fileno()
+        while True:
+            data = os.read(fd, _CHUNK_SIZE)
+            if not data:
+                break
+
+            self.chunks.append(self.decoder.decode(data))
+
+        self.chunks.append(self.decoder.decode(b'', True))
+        self.proc.stdout.close()
+        self.proc.wait()
+
+        if writer:
+            writer.join()
+
+    def _write(self):
+        stdin = self.proc.stdin
+        try:
+            for i in range(0, len(self.text), _CHUNK_SIZE):
+                if self.cancelled:
+                    break
+
+                stdin.write(self.text[i:i + _CHUNK_SIZE].encode('utf-8'))
+        except OSError:
+            # The command exited or closed its stdin without reading all of
+            # the input e.g. "head". That's not an error.
+            pass
+        finally:
+            try:
+                stdin.close()
+            except OSError:
+                pass
+
+    def cancel(self):
+        self.cancelled = True
+        try:
+            _shell.kill_filter(self.proc)
+        except OSError:
+            pass
+
+    def output(self):
+        # type: () -> str
+        output = ''.join(self.chunks)
+        if _PLATFORM == 'windows':
+            output = output.replace('\r\n', '\n')
+
+        return output
+
+
+def _start(view, cmd, text, on_done):
+    # type: (...) -> None
+    # Runs cmd with text (if any) as its input. When the command finishes
+    # on_done(view, edit, output) is called from within a text command.
+    if view.id() in _jobs:
+        return status_message('a shell command is already running (press <Esc> to cancel)')
+
+    job = _Job(_shell.popen_filter(view, cmd), text, _shell.get_decoder(), on_done)
+    job.start()
+    job.join(_SYNC_TIMEOUT)
+
+    if not job.is_alive():
+        return _finish(view, job)
+
+    # The view is made read-only while the command runs so that the regions
+    # being filtered can't change underneath it.
+    _jobs[view.id()] = (job, view.is_read_only())
+    view.set_read_only(True)
+    status_message('running {} (press <Esc> to cancel)'.format(cmd))
+    set_timeout(lambda: _poll(view, job), _POLL_INTERVAL)
+
+
+def _poll(view, job):
+    # type: (...) -> None
+    if not view.is_valid():
+        job.cancel()
+        del _jobs[view.id()]
+        return
+
+    if job.is_alive():
+        set_timeout(lambda: _poll(view, job), _POLL_INTERVAL)
+        return
+
+    _, read_only = _jobs.pop(view.id())
+    view.set_read_only(read_only)
+
+    if job.cancelled:
+        return status_message('shell command cancelled')
+
+    _finish(view, job)
+
+
+def _finish(view, job):
+    # type: (...) -> None
+    _done[view.id()] = job
+    view.run_command('_nv_shell_apply')
+
+
+def apply_output(view, edit):
+    # type: (...) -> None
+    job = _done.pop(view.id(), None)
+    if job:
+        job.on_done(view, edit, job.output())
+
+
+def cancel(view):
+    # type: (...) -> bool
+    try:
+        job, _ = _jobs[view.id()]
+    except KeyError:
+        return False
+
+    job.cancel()
+
+    return True
+
+
 # TODO [review] Function looks unused.
 def run_and_wait(view, cmd):
     # type: (...) -> None
     _shell.run_and_wait(view, cmd)
 
 
-def run_and_read(view, cmd):
-    # type: (...) -> str
-    return _shell.run_and_read(view, cmd)
+def read(view, cmd, on_done):
+    # type: (...) -> None
+    _start(view, cmd, None, on_done)
 
 
-def filter_thru_shell(view, edit, regions, cmd):
+def filter_thru_shell(view, region, cmd):
     # type: (...) -> None
-    filter_func = _shell.filter_region
-
-    # Maintain text size delta as we replace each selection going forward. We
-    # can't simply go in reverse because cursor positions will be incorrect.
-    accumulated_delta = 0
-    new_points = []
-    for r in regions:
-        r_shifted = Region(r.begin() + accumulated_delta, r.end() + accumulated_delta)
-        rv = filter_func(view, view.substr(r_shifted), cmd).rstrip() + '\n'
-        view.replace(edit, r_shifted, rv)
-        new_points.append(r_shifted.a)
-        accumulated_delta += len(rv) - r_shifted.size()
-
-    # Switch to normal mode and move cursor(s) to beginning of replacement(s).
-    view.run_command('_enter_normal_mode')
-    view.sel().clear()
-    view.sel().add_all(new_points)
+    def _on_done(view, edit, output):
+        view.replace(edit, region, output.rstrip() + '\n')
+
+        # Switch to normal mode and move cursor to beginning of replacement.
+        view.run_command('_enter_normal_mode')
+        view.sel().clear()
+        view.sel().add(region.a)
+
+    _start(view, cmd, view.substr(region), _on_done)
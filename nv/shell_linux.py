@@ -23,11 +23,15 @@ def run_and_wait(view, cmd):
     shell_unixlike.run_and_wait(view, cmd, 'VintageousEx_linux_terminal')
 
 
-def run_and_read(view, cmd):
-    # type: (...) -> str
-    return shell_unixlike.run_and_read(view, cmd)
+def popen_filter(view, command):
+    # type: (...) -> subprocess.Popen
+    return shell_unixlike.popen_filter(view, command, 'VintageousEx_linux_shell')
 
 
-def filter_region(view, text, command):
-    # type: (...) -> str
-    return shell_unixlike.filter_region(view, text, command, 'VintageousEx_linux_shell')
+def kill_filter(proc):
+    # type: (...) -> None
+    shell_unixlike.kill_filter(proc)
+
+
+def get_decoder():
+    return shell_unixlike.get_decoder()
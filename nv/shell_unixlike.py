@@ -15,7 +15,9 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+import codecs
 import os
+import signal
 import subprocess
 
 
@@ -30,32 +32,31 @@ def run_and_wait(view, cmd, terminal_setting_name):
     ]).wait()
 
 
-def run_and_read(view, cmd):
-    # type: (...) -> str
-    out, err = subprocess.Popen([cmd],
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE,
-                                shell=True).communicate()
-
-    try:
-        return (out or err).decode('utf-8')
-    except AttributeError:
-        return ''
-
-
-def filter_region(view, text, command, shell_setting_name):
-    # type: (...) -> str
+def popen_filter(view, command, shell_setting_name):
+    # type: (...) -> subprocess.Popen
     shell = view.settings().get(shell_setting_name)
     shell = shell or os.path.expandvars("$SHELL")
 
     # Redirect STDERR to STDOUT to capture both.
     # This seems to be the behavior of vim as well.
-    p = subprocess.Popen([shell, '-c', command],
-                         stdin=subprocess.PIPE,
-                         stdout=subprocess.PIPE,
-                         stderr=subprocess.STDOUT)
-
-    # Pass in text as input: saves having to deal with quoting stuff.
-    out, _ = p.communicate(text.encode('utf-8'))
-
-    return out.decode('utf-8', errors='backslashreplace')
+    #
+    # The text is passed in as input: saves having to deal with quoting stuff.
+    #
+    # The command is started in a new session so that it can be killed along
+    # with any processes it spawned, see kill_filter().
+    return subprocess.Popen([shell, '-c', command],
+                            stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT,
+                            start_new_session=True)
+
+
+def kill_filter(proc):
+    # type: (subprocess.Popen) -> None
+    # Killing only the shell would leave the commands of a pipeline running
+    # and holding the stdout pipe open.
+    os.killpg(proc.pid, signal.SIGKILL)
+
+
+def get_decoder():
+    return codecs.getincrementaldecoder('utf-8')(errors='backslashreplace')
@@ -15,9 +15,8 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
-import os
+import codecs
 import subprocess
-import tempfile
 
 
 try:
@@ -48,39 +47,20 @@ def run_and_wait(view, cmd):
     subprocess.Popen(['cmd.exe', '/c', cmd + '&& pause']).wait()
 
 
-def run_and_read(view, cmd):
-    # type: (...) -> str
-    out, err = subprocess.Popen(['cmd.exe', '/c', cmd],
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE,
-                                shell=True,
-                                startupinfo=get_startup_info()).communicate()
+def popen_filter(view, command):
+    # type: (...) -> subprocess.Popen
+    return subprocess.Popen(['cmd.exe', '/c', command],
+                            stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT,
+                            startupinfo=get_startup_info())
 
-    try:
-        return (out or err).decode(get_oem_cp()).replace('\r\n', '\n')
-    except AttributeError:
-        return ''
 
+def kill_filter(proc):
+    # type: (subprocess.Popen) -> None
+    # Kill the whole process tree, not just cmd.exe.
+    subprocess.call(['taskkill', '/F', '/T', '/PID', str(proc.pid)], startupinfo=get_startup_info())
 
-def filter_region(view, txt, command):
-    # type: (...) -> str
-    try:
-        contents = tempfile.NamedTemporaryFile(suffix='.txt', delete=False)
-        contents.write(txt.encode('utf-8'))
-        contents.close()
-
-        script = tempfile.NamedTemporaryFile(suffix='.bat', delete=False)
-        script.write(('@echo off\ntype %s | %s' % (contents.name, command)).encode('utf-8'))
-        script.close()
-
-        p = subprocess.Popen([script.name],
-                             stdout=subprocess.PIPE,
-                             stderr=subprocess.PIPE,
-                             startupinfo=get_startup_info())
-
-        out, err = p.communicate()
-
-        return (out or err).decode(get_oem_cp()).replace('\r\n', '\n')[:-1].strip()
-    finally:
-        os.remove(script.name)
-        os.remove(contents.name)
+
+def get_decoder():
+    return codecs.getincrementaldecoder('cp' + get_oem_cp())(errors='replace')
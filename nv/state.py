@@ -22,14 +22,12 @@ from sublime import active_window
 from sublime import Region
 
 from NeoVintageous.nv import macros
-from NeoVintageous.nv import plugin
 from NeoVintageous.nv.utils import col_at
 from NeoVintageous.nv.utils import is_ignored_but_command_mode
 from NeoVintageous.nv.utils import is_view
 from NeoVintageous.nv.utils import row_at
 from NeoVintageous.nv.utils import save_previous_selection
-from NeoVintageous.nv.vi import cmd_defs
-from NeoVintageous.nv.vi import settings
+from NeoVintageous.nv.utils import timed_stage
 from NeoVintageous.nv.vi.cmd_base import ViCommandDefBase
 from NeoVintageous.nv.vi.cmd_base import ViMotionDef
 from NeoVintageous.nv.vi.cmd_base import ViOperatorDef
@@ -58,6 +56,86 @@ from NeoVintageous.nv.vim import VISUAL_LINE
 _log = logging.getLogger(__name__)
 
 
+class _ViewState(object):
+
+    # In-process command state for a view.
+    #
+    # These are read and written many times per keystroke so they are held as
+    # plain attributes rather than round-tripped through view.settings(). Only
+    # the mode is written back to the view settings, so that it survives plugin
+    # reloads (see init_state()).
+
+    __slots__ = (
+        'action',
+        'action_count',
+        'glue_until_normal_mode',
+        'mode',
+        'motion',
+        'motion_count',
+        'must_capture_register_name',
+        'non_interactive',
+        'normal_insert_count',
+        'partial_sequence',
+        'processing_notation',
+        'register',
+        'repeat_data',
+        'sequence',
+        'xpos',
+    )
+
+    def __init__(self, mode=None):
+        self.action = None
+        self.action_count = ''
+        self.glue_until_normal_mode = False
+        self.mode = mode or UNKNOWN
+        self.motion = None
+        self.motion_count = ''
+        self.must_capture_register_name = False
+        self.non_interactive = False
+        self.normal_insert_count = '1'
+        self.partial_sequence = ''
+        self.processing_notation = False
+        self.register = '"'
+        self.repeat_data = None
+        self.sequence = ''
+        self.xpos = 0
+
+
+_view_states = {}  # type: dict
+
+
+def _get_view_state(view):
+    # type: (...) -> _ViewState
+    try:
+        return _view_states[view.id()]
+    except KeyError:
+        persisted = view.settings().get('vintage')
+        mode = persisted.get('mode') if isinstance(persisted, dict) else None
+        view_state = _view_states[view.id()] = _ViewState(mode)
+
+        return view_state
+
+
+def clear_view_state(view):
+    # type: (...) -> None
+    # Discard the in-process state for the view, for example when the view is
+    # closed or the 'vintage' view setting is erased.
+    try:
+        del _view_states[view.id()]
+    except KeyError:
+        pass
+
+
+def _copy_command(command):
+    # Command definitions resolved from the key mappings are shared instances,
+    # so the state keeps a private copy (equivalent to the serialised
+    # representation) that is safe to mutate e.g. when accepting input.
+    if command is None:
+        return None
+
+    return command.__class__.from_json(command.serialize()['data'])
+
+
 class State(object):
     """
     Manage global Vim state. Accumulates command data, etc.
@@ -70,7 +148,10 @@ class State(object):
 
           state = State(view)
 
-    Note: `State` internally uses view.settings() and window.settings() to persist data.
+    Note: `State` internally uses view.settings() and window.settings() to
+    persist data. The per-keystroke command data (mode, sequences, action,
+    motion, counts, register, etc.) is held in-process per view and only the
+    mode is written back to the view settings.
     """
 
     registers = Registers()
@@ -78,11 +159,19 @@ class State(object):
 
     def __init__(self, view):
         self.view = view
+        self._view_state = _get_view_state(view)
+        self._settings = None
+
+    @property
+    def settings(self):
         # We use several types of settings:
         #   - vi-specific (settings.vi),
         #   - regular ST view settings (settings.view) and
         #   - window settings (settings.window).
-        self.settings = SettingsManager(self.view)
+        if self._settings is None:
+            self._settings = SettingsManager(self.view)
+
+        return self._settings
 
     @property
     def glue_until_normal_mode(self):
@@ -95,11 +184,11 @@ class State(object):
         This property is *VOLATILE*; it shouldn't be persisted between
         sessions.
         """
-        return self.settings.vi['_vintageous_glue_until_normal_mode'] or False
+        return self._view_state.glue_until_normal_mode or False
 
     @glue_until_normal_mode.setter
     def glue_until_normal_mode(self, value):
-        self.settings.vi['_vintageous_glue_until_normal_mode'] = value
+        self._view_state.glue_until_normal_mode = value
 
     @property
     def processing_notation(self):
@@ -111,11 +200,11 @@ class State(object):
         #
         # This property is *VOLATILE*; it shouldn't be persisted between
         # sessions.
-        return self.settings.vi['_vintageous_processing_notation'] or False
+        return self._view_state.processing_notation or False
 
     @processing_notation.setter
     def processing_notation(self, value):
-        self.settings.vi['_vintageous_processing_notation'] = value
+        self._view_state.processing_notation = value
 
     # FIXME: This property seems to do the same as processing_notation.
     @property
@@ -127,12 +216,12 @@ class State(object):
         #
         # This property is *VOLATILE*; it shouldn't be persisted between
         # sessions.
-        return self.settings.vi['_vintageous_non_interactive'] or False
+        return self._view_state.non_interactive or False
 
     @non_interactive.setter
     def non_interactive(self, value):
         assert isinstance(value, bool), 'bool expected'
-        self.settings.vi['_vintageous_non_interactive'] = value
+        self._view_state.non_interactive = value
 
     @property
     def last_character_search(self):
@@ -183,12 +272,12 @@ class State(object):
         # type: () -> bool
         # Returns:
         #   True if State is expecting a register name next, False otherwise.
-        return self.settings.vi['must_capture_register_name'] or False
+        return self._view_state.must_capture_register_name or False
 
     @must_capture_register_name.setter
     def must_capture_register_name(self, value):
         # type: (bool) -> None
-        self.settings.vi['must_capture_register_name'] = value
+        self._view_state.must_capture_register_name = value
 
     @property
     def last_buffer_search(self):
@@ -231,36 +320,36 @@ class State(object):
         These commands enter insert mode. If passed a count, they must repeat
         the commands run while in insert mode.
         """
-        return self.settings.vi['normal_insert_count'] or '1'
+        return self._view_state.normal_insert_count or '1'
 
     @normal_insert_count.setter
     def normal_insert_count(self, value):
-        self.settings.vi['normal_insert_count'] = value
+        self._view_state.normal_insert_count = value
 
     @property
     def sequence(self):
         # type: () -> str
         # Sequence of keys provided by the user.
-        return self.settings.vi['sequence'] or ''
+        return self._view_state.sequence or ''
 
     @sequence.setter
     def sequence(self, value):
         # type: (str) -> None
         _log.debug('sequence >>>%s<<<', value)
-        self.settings.vi['sequence'] = value
+        self._view_state.sequence = value
 
     @property
     def partial_sequence(self):
         # type: () -> str
         # Sometimes we need to store a partial sequence to obtain the commands'
         # full name. Such is the case of `gD`, for example.
-        return self.settings.vi['partial_sequence'] or ''
+        return self._view_state.partial_sequence or ''
 
     @partial_sequence.setter
     def partial_sequence(self, value):
         # type: (str) -> None
         _log.debug('partial sequence >>>%s<<<', value)
-        self.settings.vi['partial_sequence'] = value
+        self._view_state.partial_sequence = value
 
     @property
     def mode(self):
@@ -270,65 +359,53 @@ class State(object):
         # It isn't guaranteed that the underlying view's .sel() will be in a
         # consistent state (for example, that it will at least have one non-
         # empty region in visual mode.
-        return self.settings.vi['mode'] or UNKNOWN
+        return self._view_state.mode or UNKNOWN
 
     @mode.setter
     def mode(self, value):
         # type: (str) -> None
-        self.settings.vi['mode'] = value
+        if value != self._view_state.mode:
+            self._view_state.mode = value
+            # The mode is the only command data that is persisted.
+            self.settings.vi['mode'] = value
 
     @property
     def action(self):
-        action = self.settings.vi['action'] or None
-        if action:
-            cls = getattr(cmd_defs, action['name'], None)
-            if cls is None:
-                cls = plugin.classes.get(action['name'], None)
-            if cls is None:
-                ValueError('unknown action: %s' % action)
-            return cls.from_json(action['data'])
+        return self._view_state.action
 
     @action.setter
     def action(self, value):
-        serialized = value.serialize() if value else None
-        self.settings.vi['action'] = serialized
+        self._view_state.action = _copy_command(value) if value else None
 
     @property
     def motion(self):
-        motion = self.settings.vi['motion'] or None
-
-        if motion:
-            cls = getattr(cmd_defs, motion['name'])
-
-            return cls.from_json(motion['data'])
+        return self._view_state.motion
 
     @motion.setter
     def motion(self, value):
-        serialized = value.serialize() if value else None
-        self.settings.vi['motion'] = serialized
+        self._view_state.motion = _copy_command(value) if value else None
 
     @property
     def motion_count(self):
-        return self.settings.vi['motion_count'] or ''
+        return self._view_state.motion_count or ''
 
     @motion_count.setter
     def motion_count(self, value):
         assert value == '' or value.isdigit(), 'bad call'
-        self.settings.vi['motion_count'] = value
+        self._view_state.motion_count = value
 
     @property
     def action_count(self):
-        return self.settings.vi['action_count'] or ''
+        return self._view_state.action_count or ''
 
     @action_count.setter
     def action_count(self, value):
         assert value == '' or value.isdigit(), 'bad call'
-        self.settings.vi['action_count'] = value
+        self._view_state.action_count = value
 
     @property
-    @settings.volatile
     def repeat_data(self):
-        return self.settings.vi['repeat_data'] or None
+        return self._view_state.repeat_data or None
 
     @repeat_data.setter
     def repeat_data(self, value):
@@ -340,7 +417,7 @@ class State(object):
         assert isinstance(value, tuple) or isinstance(value, list), 'bad call'
         assert len(value) == 4, 'bad call'
         _log.debug('set repeat data: %s', value)
-        self.settings.vi['repeat_data'] = value
+        self._view_state.repeat_data = value
 
     @property
     def count(self):
@@ -392,13 +469,13 @@ class State(object):
         # Accessor for the current xpos for carets.
         # Returns:
         #   int: Default is 0.
-        return self.settings.vi['xpos'] or 0
+        return self._view_state.xpos or 0
 
     @xpos.setter
     def xpos(self, value):
         # type: (int) -> None
         assert isinstance(value, int), '`value` must be an int'
-        self.settings.vi['xpos'] = value
+        self._view_state.xpos = value
 
     @property
     def register(self):
@@ -406,12 +483,12 @@ class State(object):
         # Accessor for the current open register (as requested by the user).
         # Returns:
         #   str: Default is '"'.
-        return self.settings.vi['register'] or '"'
+        return self._view_state.register or '"'
 
     @register.setter
     def register(self, value):
         assert len(str(value)) == 1, '`value` must be a character'
-        self.settings.vi['register'] = value
+        self._view_state.register = value
         self.must_capture_register_name = False
 
     @property
@@ -754,10 +831,11 @@ class State(object):
             return
 
         if self.action and self.motion:
-            action_cmd = self.action.translate(self)
-            _log.debug('action_cmd = %s', action_cmd)
-            motion_cmd = self.motion.translate(self)
-            _log.debug('motion_cmd = %s', motion_cmd)
+            with timed_stage(eval_timing_hook, 'translate'):
+                action_cmd = self.action.translate(self)
+                _log.debug('action_cmd = %s', action_cmd)
+                motion_cmd = self.motion.translate(self)
+                _log.debug('motion_cmd = %s', motion_cmd)
 
             _log.debug('changing to INTERNAL_NORMAL...')
             self.mode = INTERNAL_NORMAL
@@ -779,8 +857,11 @@ class State(object):
                 # until we enter normal mode again.
                 run_window_command('mark_undo_groups_for_gluing')
 
-            macros.add_step(self, action_cmd['action'], args)
-            run_window_command(action_cmd['action'], args)
+            with timed_stage(eval_timing_hook, 'macros'):
+                macros.add_step(self, action_cmd['action'], args)
+
+            with timed_stage(eval_timing_hook, 'dispatch'):
+                run_window_command(action_cmd['action'], args)
 
             if not self.non_interactive:
                 if self.action.repeatable:
@@ -792,16 +873,20 @@ class State(object):
             return
 
         if self.motion:
-            motion_cmd = self.motion.translate(self)
+            with timed_stage(eval_timing_hook, 'translate'):
+                motion_cmd = self.motion.translate(self)
 
-            macros.add_step(self, motion_cmd['motion'], motion_cmd['motion_args'])
+            with timed_stage(eval_timing_hook, 'macros'):
+                macros.add_step(self, motion_cmd['motion'], motion_cmd['motion_args'], motion=True)
 
             # All motions are subclasses of ViTextCommandBase, so it's safe to
             # run the command via the current view.
-            run_motion(self.view, motion_cmd)
+            with timed_stage(eval_timing_hook, 'dispatch'):
+                run_motion(self.view, motion_cmd)
 
         if self.action:
-            action_cmd = self.action.translate(self)
+            with timed_stage(eval_timing_hook, 'translate'):
+                action_cmd = self.action.translate(self)
 
             if self.mode == NORMAL:
                 _log.debug('is NORMAL, changing to INTERNAL_NORMAL...')
@@ -834,8 +919,11 @@ class State(object):
             visual_repeat_data = self.get_visual_repeat_data()
             action = self.action
 
-            macros.add_step(self, action_cmd['action'], action_cmd['action_args'])
-            run_action(active_window(), action_cmd)
+            with timed_stage(eval_timing_hook, 'macros'):
+                macros.add_step(self, action_cmd['action'], action_cmd['action_args'])
+
+            with timed_stage(eval_timing_hook, 'dispatch'):
+                run_action(active_window(), action_cmd)
 
             if not (self.processing_notation and self.glue_until_normal_mode):
                 if action.repeatable:
@@ -849,6 +937,14 @@ class State(object):
         self.reset_command_data()
 
 
+# Benchmarks can set this to a callable that is called with the name of a
+# State.eval() stage ('translate', 'macros', or 'dispatch') and the time it
+# took (in seconds). The 'dispatch' stage includes the stages of any keys that
+# the command feeds itself, for example '.' and '@q'. The stages are only timed
+# while it is set.
+eval_timing_hook = None
+
+
 def init_state(view):
     # type: (...) -> None
     # Initialise view state.
@@ -866,6 +962,7 @@ def init_state(view):
                 view.settings().set('inverse_caret_state', False)
 
             view.settings().erase('vintage')
+            clear_view_state(view)
         except Exception:
             # TODO [review] Exception handling
             _log.debug('error initialising irregular view i.e. console, widget, panel, etc.')
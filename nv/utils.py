@@ -33,9 +33,11 @@
 
 from contextlib import contextmanager
 import re
+import time
 
 from sublime import Region
 
+from NeoVintageous.nv.vi.lines import get_line_index
 from NeoVintageous.nv.vi.settings import get_visual_block_direction
 from NeoVintageous.nv.vi.settings import set_visual_block_direction
 from NeoVintageous.nv.vim import DIRECTION_DOWN
@@ -128,6 +130,131 @@ def regions_transformer_reversed(view, f):
     _regions_transformer(reversed(list(view.sel())), view, f, False)
 
 
+# Below this number of selections the callbacks query the view directly:
+# reading the whole buffer up front only pays off when there are many.
+_BATCH_MIN_SELECTIONS = 32
+
+
+class _SettingsSnapshot():
+
+    # The view settings, read at most once per key.
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._values = {}  # type: dict
+
+    def __getattr__(self, name):
+        return getattr(self.settings, name)
+
+    def get(self, key, default=None):
+        if key not in self._values:
+            self._values[key] = self.settings.get(key)
+
+        value = self._values[key]
+
+        return default if value is None else value
+
+
+class _ViewSnapshot():
+
+    # A read-only stand-in for the view that answers the text, line and row
+    # queries from the line index of the buffer. Anything else is passed on to the
+    # view. Motions that are run over thousands of selections otherwise make
+    # several api calls per selection.
+
+    def __init__(self, view):
+        self.view = view
+        self._index = get_line_index(view)
+        self._text = self._index.text
+        self._size = len(self._text)
+        self._folded_regions = None
+        self._settings = None
+
+    def __getattr__(self, name):
+        return getattr(self.view, name)
+
+    def _starts(self):
+        # type: () -> list
+        return self._index.starts
+
+    def _row(self, pt):
+        # type: (int) -> int
+        return self._index.row_at(pt)
+
+    def size(self):
+        # type: () -> int
+        return self._size
+
+    def substr(self, x):
+        if isinstance(x, Region):
+            return self._text[max(0, x.begin()):max(0, x.end())]
+
+        if 0 <= x < self._size:
+            return self._text[x]
+
+        return '\x00'
+
+    def rowcol(self, pt):
+        # type: (int) -> tuple
+        row = self._row(pt)
+
+        return (row, max(0, min(pt, self._size)) - self._starts()[row])
+
+    def text_point(self, row, col):
+        # type: (int, int) -> int
+        starts = self._starts()
+        row = max(0, int(row))
+        if row >= len(starts):
+            return self._size
+
+        return min(starts[row] + int(col), self._size)
+
+    def line(self, x):
+        if isinstance(x, Region):
+            return Region(self.line(x.begin()).a, self.line(x.end()).b)
+
+        starts = self._starts()
+        row = self._row(x)
+        if row + 1 < len(starts):
+            return Region(starts[row], starts[row + 1] - 1)
+
+        return Region(starts[row], self._size)
+
+    def full_line(self, x):
+        if isinstance(x, Region):
+            return Region(self.line(x.begin()).a, self.full_line(x.end()).b)
+
+        line = self.line(x)
+
+        return Region(line.a, min(line.b + 1, self._size))
+
+    def settings(self):
+        if self._settings is None:
+            self._settings = _SettingsSnapshot(self.view.settings())
+
+        return self._settings
+
+    def folded_regions(self):
+        # type: () -> list
+        if self._folded_regions is None:
+            self._folded_regions = self.view.folded_regions()
+
+        return self._folded_regions
+
+
+def regions_transformer_batched(view, f):
+    # type: (...) -> None
+    # Like regions_transformer(), but with many selections the callback is
+    # given a snapshot of the view instead of the view itself, so it must
+    # only read from it. The new selections are still added in one go.
+    sels = list(view.sel())
+    if len(sels) >= _BATCH_MIN_SELECTIONS:
+        snapshot = _ViewSnapshot(view)
+        _regions_transformer(sels, snapshot, f, False)
+    else:
+        _regions_transformer(sels, view, f, False)
+
+
 def _transform_first_non_blank(view, s):
     return Region(next_non_blank(view, view.line(s.begin()).a))
 
@@ -340,6 +467,42 @@ def adding_regions(view, name, regions, scope_name):
     view.erase_regions(name)
 
 
+class _StageTimer():
+
+    def __init__(self, hook, stage):
+        self.hook = hook
+        self.stage = stage
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is None:
+            self.hook(self.stage, time.perf_counter() - self.start_time)
+
+
+class _NullStageTimer():
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_null_stage_timer = _NullStageTimer()
+
+
+def timed_stage(hook, stage):
+    # Returns a context manager that calls hook with the stage name and the
+    # time (in seconds) its block took. When there is no hook the stage isn't
+    # timed at all, so that it costs next to nothing in the key press path.
+    if hook:
+        return _StageTimer(hook, stage)
+
+    return _null_stage_timer
+
+
 def extract_file_name(view):
     sel = view.sel()[0]
     line = view.substr(view.line(sel))
@@ -1010,10 +1173,29 @@ def calculate_xpos(view, start, xpos):
     return (pt, chars)
 
 
+# The pattern and flags of the highlighted search keyed by view id. Only the
+# matches around the visible region are highlighted, see hilite_search(), so
+# the pattern is kept to find all the matches on demand.
+_search_highlighting = {}  # type: dict
+
+
+def set_search_highlighting(view, pattern, flags):
+    _search_highlighting[view.id()] = (pattern, flags)
+
+
+def get_search_highlighting(view):
+    return _search_highlighting.get(view.id())
+
+
 def clear_search_highlighting(view):
     view.erase_regions('vi_search')
     view.erase_regions('vi_search_current')
+    _search_highlighting.pop(view.id(), None)
 
 
 def get_search_regions(view):
-    return view.get_regions('vi_search')
+    highlighting = get_search_highlighting(view)
+    if not highlighting:
+        return []
+
+    return view.find_all(*highlighting)
@@ -66,11 +66,22 @@ def get(name):
     return _variables.get(name, _defaults.get(name))
 
 
+def _seq_cache_clear():
+    # type: () -> None
+    # Key names such as <leader> are expanded when sequences are resolved, so
+    # the resolved sequences are cleared when the variables change. The keys
+    # module imports this one, so it's imported here.
+    from NeoVintageous.nv.vi.keys import seq_cache_clear
+    seq_cache_clear()
+
+
 def set(name, value):
     # type: (...) -> None
     _variables[name] = value
+    _seq_cache_clear()
 
 
 def variables_clear():
     # type: () -> None
     _variables.clear()
+    _seq_cache_clear()
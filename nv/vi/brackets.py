@@ -0,0 +1,219 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from bisect import bisect_left
+import re
+
+from sublime import Region
+
+
+_PAIRS = {
+    '(': ')',
+    '[': ']',
+    '{': '}',
+    '<': '>',
+}
+
+_CLOSING = {v: k for k, v in _PAIRS.items()}
+
+# A bracket preceded by an odd number of backslashes is escaped.
+_RXC_BRACKET = re.compile(r'(\\*)([()\[\]{}<>])')
+
+# Bracket indexes keyed by view id. An index is rebuilt lazily the first time
+# it's queried after the view has been modified.
+_indexes = {}  # type: dict
+
+
+class _BracketPairs:
+
+    # A stack-based pairing table for one type of bracket. All lists are
+    # parallel to the sorted list of (unescaped) bracket points:
+    #
+    #   opening   Whether the bracket is an opening bracket.
+    #   match     Index of the matching bracket, or -1 if it's unbalanced.
+    #   enclosing Index of the innermost opening bracket that is still open
+    #             immediately after the bracket, or -1.
+    #
+    # The parent of an opening bracket at index i is enclosing[i - 1], which
+    # means any level of nesting around a point is found by a bisect followed
+    # by walking up the parents.
+
+    __slots__ = ('points', 'opening', 'match', 'enclosing', 'unbalanced_closing')
+
+    def __init__(self):
+        self.points = []
+        self.opening = []
+        self.match = []
+        self.enclosing = []
+
+        # Points of closing brackets that have no opening bracket.
+        self.unbalanced_closing = []
+
+    def _parent(self, i):
+        # type: (int) -> int
+        return self.enclosing[i - 1] if i > 0 else -1
+
+    def index_of(self, pt):
+        # type: (int) -> int
+        i = bisect_left(self.points, pt)
+        if i < len(self.points) and self.points[i] == pt:
+            return i
+
+        return -1
+
+    def enclosing_opening(self, pt, count=1):
+        # type: (int, int) -> int
+        # Returns the index of the count-th opening bracket that encloses pt,
+        # excluding a bracket at pt itself, or -1.
+        i = bisect_left(self.points, pt) - 1
+        if i < 0:
+            return -1
+
+        i = self.enclosing[i]
+        for _ in range(count - 1):
+            if i == -1:
+                break
+
+            i = self._parent(i)
+
+        return i
+
+    def enclosing_closing(self, pt, count=1):
+        # type: (int, int) -> int
+        # Returns the point of the count-th closing bracket at or after pt that
+        # closes a bracket opened before pt, or -1.
+        i = bisect_left(self.points, pt) - 1
+        i = self.enclosing[i] if i >= 0 else -1
+        while count > 0 and i != -1:
+            if count == 1:
+                j = self.match[i]
+
+                return self.points[j] if j != -1 else -1
+
+            i = self._parent(i)
+            count -= 1
+
+        # The remaining levels are closing brackets that were never opened.
+        j = bisect_left(self.unbalanced_closing, pt) + count - 1
+        if i == -1 and j < len(self.unbalanced_closing):
+            return self.unbalanced_closing[j]
+
+        return -1
+
+
+def _build(text):
+    # type: (str) -> dict
+    # Pairs up all the brackets in text in one linear pass.
+    index = {}
+    for opening in _PAIRS:
+        index[opening] = (_BracketPairs(), [])
+
+    for m in _RXC_BRACKET.finditer(text):
+        if len(m.group(1)) % 2:
+            continue
+
+        char = m.group(2)
+        pt = m.end() - 1
+
+        try:
+            pairs, stack = index[char]
+            is_opening = True
+        except KeyError:
+            pairs, stack = index[_CLOSING[char]]
+            is_opening = False
+
+        i = len(pairs.points)
+        pairs.points.append(pt)
+        pairs.opening.append(is_opening)
+
+        if is_opening:
+            pairs.match.append(-1)
+            stack.append(i)
+        elif stack:
+            j = stack.pop()
+            pairs.match[j] = i
+            pairs.match.append(j)
+        else:
+            pairs.match.append(-1)
+            pairs.unbalanced_closing.append(pt)
+
+        pairs.enclosing.append(stack[-1] if stack else -1)
+
+    return {k: v[0] for k, v in index.items()}
+
+
+def _get_pairs(view, bracket):
+    # type: (...) -> _BracketPairs
+    change_count = view.change_count()
+
+    try:
+        index_change_count, index = _indexes[view.id()]
+    except KeyError:
+        index_change_count, index = None, None
+
+    if index_change_count != change_count:
+        index = _build(view.substr(Region(0, view.size())))
+        _indexes[view.id()] = (change_count, index)
+
+    return index[_CLOSING.get(bracket, bracket)]
+
+
+def clear_bracket_index(view):
+    # type: (...) -> None
+    _indexes.pop(view.id(), None)
+
+
+def find_enclosing_opening_bracket(view, pt, bracket, count=1):
+    # type: (...) -> int
+    # Returns the point of the count-th unbalanced opening bracket before pt,
+    # or None. The bracket can be either character of the pair.
+    pairs = _get_pairs(view, bracket)
+    i = pairs.enclosing_opening(pt, count)
+
+    return pairs.points[i] if i != -1 else None
+
+
+def find_enclosing_closing_bracket(view, pt, bracket, count=1):
+    # type: (...) -> int
+    # Returns the point of the count-th unbalanced closing bracket at or after
+    # pt, or None. The bracket can be either character of the pair.
+    pt = _get_pairs(view, bracket).enclosing_closing(pt, count)
+
+    return pt if pt != -1 else None
+
+
+def find_matching_bracket(view, pt):
+    # type: (...) -> int
+    # Returns the point of the bracket that pairs with the one at pt, or None.
+    char = view.substr(pt)
+    if char not in _PAIRS and char not in _CLOSING:
+        return None
+
+    pairs = _get_pairs(view, char)
+    i = pairs.index_of(pt)
+    if i == -1 or pairs.match[i] == -1:
+        return None
+
+    return pairs.points[pairs.match[i]]
+
+
+def is_unescaped_opening_bracket(view, pt, bracket):
+    # type: (...) -> bool
+    pairs = _get_pairs(view, bracket)
+    i = pairs.index_of(pt)
+
+    return i != -1 and pairs.opening[i]
@@ -216,6 +216,23 @@ class ViReindent(ViOperatorDef):
         }
 
 
+@assign(seqs.BANG, _ACTION_MODES)
+class ViFilter(ViOperatorDef):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scroll_into_view = True
+        self.motion_required = True
+
+    def translate(self, state):
+        return {
+            'action': '_vi_bang',
+            'action_args': {
+                'mode': state.mode,
+                'count': state.count
+            }
+        }
+
+
 @assign(seqs.GREATER_THAN, _ACTION_MODES)
 class ViIndent(ViOperatorDef):
     def __init__(self, *args, **kwargs):
@@ -539,6 +556,22 @@ class ViReindentLine(ViOperatorDef):
         }
 
 
+@assign(seqs.BANG_BANG, _ACTION_MODES)
+class ViFilterLine(ViOperatorDef):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scroll_into_view = True
+
+    def translate(self, state):
+        return {
+            'action': '_vi_bang_bang',
+            'action_args': {
+                'mode': state.mode,
+                'count': state.count
+            }
+        }
+
+
 @assign(seqs.LESS_THAN_LESS_THAN, _ACTION_MODES)
 class ViUnindentLine(ViOperatorDef):
     def __init__(self, *args, **kwargs):
@@ -29,6 +29,32 @@ from NeoVintageous.nv.vim import VISUAL_BLOCK
 from NeoVintageous.nv.vim import VISUAL_LINE
 
 
+# The same few hundred sequences are resolved on almost every keystroke, so
+# the mapped commands and bare command names are memoized. The caches are
+# cleared when a command is registered or assigned, and when variables change.
+# They're also cleared when they grow past the cache size, which can happen
+# because counts are part of the sequences.
+_SEQ_CACHE_SIZE = 1000
+
+_seq_to_command_cache = {}  # type: dict
+_bare_command_names = {}  # type: dict
+
+
+def seq_cache_clear():
+    # type: () -> None
+    _seq_to_command_cache.clear()
+    _bare_command_names.clear()
+
+
+def _resolve_seq(seq, mode):
+    # Return a tuple of the plugin command and the command mapped for seq and
+    # mode, either of which may be None.
+    plugin_command = plugin.mappings[mode].get(seq) if mode in plugin.mappings else None
+    command = mappings[mode].get(seq) if mode in mappings else None
+
+    return plugin_command, command
+
+
 def seq_to_command(view, seq, mode):
     # Return the command definition mapped for seq and mode.
     #
@@ -40,17 +66,24 @@ def seq_to_command(view, seq, mode):
     # Returns:
     #   Mapping:
     #   ViMissingCommandDef: If not found.
-    if mode in plugin.mappings:
-        plugin_command = plugin.mappings[mode].get(seq)
-        if plugin_command:
-            is_enabled_attr = hasattr(plugin_command, 'is_enabled')
-            if not is_enabled_attr or (is_enabled_attr and plugin_command.is_enabled(view.settings())):
-                return plugin_command
-
-    if mode in mappings:
-        command = mappings[mode].get(seq)
-        if command:
-            return command
+    try:
+        plugin_command, command = _seq_to_command_cache[(mode, seq)]
+    except KeyError:
+        plugin_command, command = _resolve_seq(seq, mode)
+        if len(_seq_to_command_cache) >= _SEQ_CACHE_SIZE:
+            _seq_to_command_cache.clear()
+
+        _seq_to_command_cache[(mode, seq)] = (plugin_command, command)
+
+    # Whether a plugin is enabled depends on the view settings, so it's checked
+    # every time rather than cached.
+    if plugin_command:
+        is_enabled_attr = hasattr(plugin_command, 'is_enabled')
+        if not is_enabled_attr or (is_enabled_attr and plugin_command.is_enabled(view.settings())):
+            return plugin_command
+
+    if command:
+        return command
 
     return ViMissingCommandDef()
 
@@ -240,6 +273,19 @@ class KeySequenceTokenizer(object):
         return variables.get(c) if variables.is_key_name(c) else c
 
 
+def _to_bare_command_name(seq):
+    # type: (str) -> str
+    if seq == '0':
+        return seq
+
+    # Account for d2d and similar sequences.
+    new_seq = list(KeySequenceTokenizer(
+        re.sub(r'^(?:".)?(?:[1-9]+)?', '', seq)
+    ).iter_tokenize())
+
+    return ''.join(k for k in new_seq if not k.isdigit())
+
+
 def to_bare_command_name(seq):
     # type: (str) -> str
     #
@@ -250,15 +296,16 @@ def to_bare_command_name(seq):
     #   str: The command sequence with register and counts strips e.g. 2daw ->
     #       daw, "a2d2aw -> daw, etc. The special case '0' is returned
     #       unmodified.
-    if seq == '0':
-        return seq
+    try:
+        return _bare_command_names[seq]
+    except KeyError:
+        bare_command_name = _to_bare_command_name(seq)
+        if len(_bare_command_names) >= _SEQ_CACHE_SIZE:
+            _bare_command_names.clear()
 
-    # Account for d2d and similar sequences.
-    new_seq = list(KeySequenceTokenizer(
-        re.sub(r'^(?:".)?(?:[1-9]+)?', '', seq)
-    ).iter_tokenize())
+        _bare_command_names[seq] = bare_command_name
 
-    return ''.join(k for k in new_seq if not k.isdigit())
+        return bare_command_name
 
 
 def assign(seq, modes, *args, **kwargs):
@@ -277,5 +324,6 @@ def assign(seq, modes, *args, **kwargs):
     def inner(cls):
         for mode in modes:
             mappings[mode][seq] = cls(*args, **kwargs)
+        seq_cache_clear()
         return cls
     return inner
@@ -0,0 +1,302 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from bisect import bisect_left
+from bisect import bisect_right
+import re
+
+from sublime import Region
+
+
+_RXC_NEWLINE = re.compile('\n')
+# Matches the newline before each empty line, except the first and last lines.
+_RXC_BEFORE_EMPTY_LINE = re.compile('\n(?=\n)')
+
+# The number of rows summarised by each minimum in an indentation table.
+_INDENT_CHUNK_SIZE = 64
+
+# The indentation of a blank line: wider than any line.
+_BLANK = float('inf')
+
+# Line indexes keyed by view id. An index is rebuilt lazily the first time it's
+# queried after the view has been modified.
+_indexes = {}  # type: dict
+
+
+class _LineIndex:
+
+    # The start point of every line of a buffer, and the start point of every
+    # empty line, so that row and line queries are a bisect instead of a walk
+    # over the rows with an api call for each one.
+    #
+    # Consecutive empty lines are consecutive points, so a run of empty lines
+    # is the stretch of the list where point - index is constant, and the end
+    # of a run is found by a bisect too.
+
+    __slots__ = ('text', 'starts', '_empty_lines', '_indentation')
+
+    def __init__(self, text):
+        self.text = text
+        self.starts = [0] + [m.end() for m in _RXC_NEWLINE.finditer(text)]
+        self._empty_lines = None
+        self._indentation = None
+
+    def size(self):
+        # type: () -> int
+        return len(self.text)
+
+    def last_row(self):
+        # type: () -> int
+        return len(self.starts) - 1
+
+    def row_at(self, pt):
+        # type: (int) -> int
+        return bisect_right(self.starts, max(0, min(pt, len(self.text)))) - 1
+
+    def row_to_pt(self, row):
+        # type: (int) -> int
+        # Like view.text_point(row, 0).
+        if row >= len(self.starts):
+            return len(self.text)
+
+        return self.starts[max(0, row)]
+
+    def line(self, row):
+        # type: (int) -> Region
+        if row + 1 < len(self.starts):
+            return Region(self.starts[row], self.starts[row + 1] - 1)
+
+        return Region(self.starts[row], len(self.text))
+
+    def line_length(self, row):
+        # type: (int) -> int
+        return self.line(row).size()
+
+    def is_empty(self, row):
+        # type: (int) -> bool
+        return self.line_length(row) == 0
+
+    def empty_lines(self):
+        # type: () -> list
+        # The start points of the empty lines.
+        if self._empty_lines is None:
+            text = self.text
+            empty_lines = [m.end() for m in _RXC_BEFORE_EMPTY_LINE.finditer(text)]
+            if not text or text[0] == '\n':
+                empty_lines.insert(0, 0)
+
+            if text.endswith('\n'):
+                empty_lines.append(len(text))
+
+            self._empty_lines = empty_lines
+
+        return self._empty_lines
+
+    def indentation(self):
+        # type: () -> _Indentation
+        if self._indentation is None:
+            self._indentation = _Indentation(self.text.split('\n'))
+
+        return self._indentation
+
+    def _empty_line_index(self, row):
+        # type: (int) -> int
+        # The index of the row in the empty lines, or -1 if it isn't empty.
+        empty_lines = self.empty_lines()
+        pt = self.starts[row]
+        i = bisect_left(empty_lines, pt)
+        if i < len(empty_lines) and empty_lines[i] == pt:
+            return i
+
+        return -1
+
+    def next_empty_row(self, row):
+        # type: (int) -> int
+        # Returns the first empty row after row, or -1.
+        empty_lines = self.empty_lines()
+        i = bisect_right(empty_lines, self.starts[row])
+        if i < len(empty_lines):
+            return self.row_at(empty_lines[i])
+
+        return -1
+
+    def prev_empty_row(self, row):
+        # type: (int) -> int
+        # Returns the last empty row before row, or -1.
+        empty_lines = self.empty_lines()
+        i = bisect_left(empty_lines, self.starts[row]) - 1
+        if i >= 0:
+            return self.row_at(empty_lines[i])
+
+        return -1
+
+    def next_non_empty_row(self, row):
+        # type: (int) -> int
+        # Returns the first non-empty row after row, or -1.
+        row += 1
+        if row > self.last_row():
+            return -1
+
+        i = self._empty_line_index(row)
+        if i == -1:
+            return row
+
+        # Skip to the end of the run of empty lines.
+        empty_lines = self.empty_lines()
+        offset = empty_lines[i] - i
+        lo, hi = i, len(empty_lines) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if empty_lines[mid] - mid == offset:
+                lo = mid
+            else:
+                hi = mid - 1
+
+        row += lo - i + 1
+
+        return row if row <= self.last_row() else -1
+
+    def prev_non_empty_row(self, row):
+        # type: (int) -> int
+        # Returns the last non-empty row before row, or -1.
+        row -= 1
+        if row < 0:
+            return -1
+
+        i = self._empty_line_index(row)
+        if i == -1:
+            return row
+
+        # Skip to the start of the run of empty lines.
+        empty_lines = self.empty_lines()
+        offset = empty_lines[i] - i
+        lo, hi = 0, i
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if empty_lines[mid] - mid == offset:
+                hi = mid
+            else:
+                lo = mid + 1
+
+        row -= i - lo + 1
+
+        return row if row >= 0 else -1
+
+
+class _Indentation:
+
+    # The width of the leading whitespace of every line, and the blank lines (a
+    # line that is only whitespace). Blank lines have a width of _BLANK in the
+    # widths list, so that the lines with an indent less than some width are
+    # the non-blank lines with a width less than it.
+    #
+    # The minimum width of every chunk of _INDENT_CHUNK_SIZE rows is kept, so
+    # looking for the next line with less indent skips whole chunks at a time.
+
+    __slots__ = ('widths', 'blank_rows', '_mins')
+
+    def __init__(self, lines):
+        self.widths = []  # type: list
+        self.blank_rows = []  # type: list
+        for row, line in enumerate(lines):
+            stripped = len(line.lstrip())
+            if stripped:
+                self.widths.append(len(line) - stripped)
+            else:
+                self.widths.append(_BLANK)
+                self.blank_rows.append(row)
+
+        self._mins = [
+            min(self.widths[i:i + _INDENT_CHUNK_SIZE]) for i in range(0, len(self.widths), _INDENT_CHUNK_SIZE)
+        ]
+
+    def _next_narrower_row(self, row, indent):
+        # type: (int, int) -> int
+        widths = self.widths
+        chunk = row // _INDENT_CHUNK_SIZE
+        for r in range(row, min((chunk + 1) * _INDENT_CHUNK_SIZE, len(widths))):
+            if widths[r] < indent:
+                return r
+
+        for chunk in range(chunk + 1, len(self._mins)):
+            if self._mins[chunk] < indent:
+                for r in range(chunk * _INDENT_CHUNK_SIZE, len(widths)):
+                    if widths[r] < indent:
+                        return r
+
+        return -1
+
+    def _prev_narrower_row(self, row, indent):
+        # type: (int, int) -> int
+        widths = self.widths
+        chunk = row // _INDENT_CHUNK_SIZE
+        for r in range(row, chunk * _INDENT_CHUNK_SIZE - 1, -1):
+            if widths[r] < indent:
+                return r
+
+        for chunk in range(chunk - 1, -1, -1):
+            if self._mins[chunk] < indent:
+                for r in range((chunk + 1) * _INDENT_CHUNK_SIZE - 1, -1, -1):
+                    if widths[r] < indent:
+                        return r
+
+        return -1
+
+    def next_delimiter(self, row, indent, blank=False):
+        # type: (int, int, bool) -> int
+        # Returns the first delimiter at or after row, or -1. A delimiter of a
+        # block at indent is a non-blank line with less indent, or, if blank is
+        # true, a blank line.
+        r = self._next_narrower_row(row, indent)
+        if blank:
+            i = bisect_left(self.blank_rows, row)
+            if i < len(self.blank_rows) and (r == -1 or self.blank_rows[i] < r):
+                r = self.blank_rows[i]
+
+        return r
+
+    def prev_delimiter(self, row, indent, blank=False):
+        # type: (int, int, bool) -> int
+        # Returns the last delimiter at or before row, or -1.
+        r = self._prev_narrower_row(row, indent)
+        if blank:
+            i = bisect_right(self.blank_rows, row) - 1
+            if i >= 0 and self.blank_rows[i] > r:
+                r = self.blank_rows[i]
+
+        return r
+
+
+def get_line_index(view):
+    # type: (...) -> _LineIndex
+    change_count = view.change_count()
+
+    try:
+        index_change_count, index = _indexes[view.id()]
+    except KeyError:
+        index_change_count, index = None, None
+
+    if index_change_count != change_count:
+        index = _LineIndex(view.substr(Region(0, view.size())))
+        _indexes[view.id()] = (change_count, index)
+
+    return index
+
+
+def clear_line_index(view):
+    # type: (...) -> None
+    _indexes.pop(view.id(), None)
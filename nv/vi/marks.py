@@ -18,24 +18,68 @@
 from sublime import Region
 
 from NeoVintageous.nv.jumplist import jumplist_back
+from NeoVintageous.nv.viminfo import viminfo_del
+from NeoVintageous.nv.viminfo import viminfo_get
+from NeoVintageous.nv.viminfo import viminfo_set
 
-# store: window, view, rowcol
+# store: file name, buffer id, rowcol
+#
+# Marks are keyed by the file name and buffer id of the view rather than by
+# the view, so that they don't keep closed views alive, and so that marks in
+# files can be persisted between sessions. The buffer id of a restored mark is
+# None, buffer ids don't survive a restart.
 
 _MARKS = {}
 
+# True once the marks persisted by the last session have been restored.
+_restored = False
+
+
+def _restore():
+    global _restored
+
+    if _restored:
+        return
+
+    _restored = True
+
+    for name, value in viminfo_get('marks').items():
+        try:
+            file_name, row, col = value
+            _MARKS.setdefault(name, (str(file_name), None, (int(row), int(col))))
+        except (TypeError, ValueError):
+            pass
+
+
+def _location(view, pt):
+    return view.file_name(), view.buffer_id(), view.rowcol(pt)
+
+
+def _is_same_buffer(view, file_name, buffer_id):
+    if buffer_id is not None:
+        return view.buffer_id() == buffer_id
+
+    return bool(file_name) and view.file_name() == file_name
+
 
 class Marks(object):
 
     def __get__(self, instance, owner):
         self.state = instance
+        _restore()
 
         return self
 
     def add(self, name, view):
         # TODO: support multiple selections
-        # TODO: Use id attribute; references might change.
-        win, view, rowcol = view.window(), view, view.rowcol(view.sel()[0].b)
-        _MARKS[name] = win, view, rowcol
+        file_name, buffer_id, rowcol = _MARKS[name] = _location(view, view.sel()[0].b)
+
+        # Marks in untitled buffers are lost on restart, so the mark persisted
+        # from before, if any, mustn't be restored either.
+        if file_name:
+            viminfo_set('marks', name, (file_name, rowcol[0], rowcol[1]))
+        else:
+            viminfo_del('marks', name)
 
     def get_as_encoded_address(self, name, exact=False):
         """
@@ -47,36 +91,34 @@ class Marks(object):
           If `true`, the exact position of the mark is returned. Otherwise,
           the relevant row's 0 column is returned.
         """
-        win, view, rowcol = None, None, None
         if name == "'" or name == "`":
             # Note: We might get a selection outside the current view, which
             # deviates from vim behaviour.
             view, selections = jumplist_back(self.state.view)
-            if len(selections) > 0:
-                win = view.window()
-                # TODO: support multiple selections
-                rowcol = view.rowcol(selections[0].b)
+            if not selections:
+                return None
+
+            # TODO: support multiple selections
+            file_name, buffer_id, rowcol = _location(view, selections[0].b)
+        else:
+            try:
+                file_name, buffer_id, rowcol = _MARKS[name]
+            except KeyError:
+                return None
+
+        if not exact:
+            rowcol = (rowcol[0], 0)
+
+        # Marks set in the same buffer as the current one are returned as regions. Marks in other
+        # buffers are returned as encoded addresses that Sublime Text understands.
+        view = self.state.view
+        if _is_same_buffer(view, file_name, buffer_id):
+            return Region(view.text_point(*rowcol))
+
+        rowcol_encoded = ':'.join(str(i) for i in rowcol)
+
+        # FIXME: Remove buffers when they are closed.
+        if file_name:
+            return "{0}:{1}".format(file_name, rowcol_encoded)
         else:
-            win, view, rowcol = _MARKS.get(name, (None,) * 3)
-
-        if win:
-            if exact:
-                rowcol_encoded = ':'.join(str(i) for i in rowcol)
-            else:
-                rowcol_encoded = ':'.join(str(i) for i in (rowcol[0], 0))
-
-            fname = view.file_name()
-
-            # Marks set in the same view as the current one are returned as regions. Marks in other
-            # views are returned as encoded addresses that Sublime Text understands.
-            if view and view.view_id == self.state.view.view_id:
-                if not exact:
-                    rowcol = (rowcol[0], 0)
-
-                return Region(view.text_point(*rowcol))
-            else:
-                # FIXME: Remove buffers when they are closed.
-                if fname:
-                    return "{0}:{1}".format(fname, rowcol_encoded)
-                else:
-                    return "<untitled {0}>:{1}".format(view.buffer_id(), rowcol_encoded)
+            return "<untitled {0}>:{1}".format(buffer_id, rowcol_encoded)
@@ -20,6 +20,7 @@ import itertools
 
 from sublime import get_clipboard
 from sublime import set_clipboard
+from sublime import set_timeout
 
 try:
     from Default.paste_from_history import g_clipboard_history as _clipboard_history
@@ -36,6 +37,9 @@ except Exception:
     def update_clipboard_history(text):
         print('NeoVintageous: could not update clipboard history: import error')
 
+from NeoVintageous.nv.viminfo import viminfo_del
+from NeoVintageous.nv.viminfo import viminfo_get
+from NeoVintageous.nv.viminfo import viminfo_set
 from NeoVintageous.nv.vim import is_visual_mode
 from NeoVintageous.nv.vim import VISUAL
 from NeoVintageous.nv.vim import VISUAL_LINE
@@ -114,33 +118,174 @@ _SPECIAL = (
 
 _ALL = _SPECIAL + _NUMBERED + _NAMED
 
+# The registers that are persisted between sessions. The numbered registers 1
+# to 9 are persisted separately, see _numbered_keys.
+_PERSISTENT = _NAMED + (_LAST_YANK, _SMALL_DELETE, _UNNAMED)
 
+# Registers with more lines or characters than this are not persisted, like the
+# "<" and "s" items of Vim's 'viminfo' option (the Vim defaults are <50,s10).
+_PERSISTENT_MAX_LINES = 50
+_PERSISTENT_MAX_SIZE = 10240
+
+
+# Register values are stored as tuples of strings. Tuples are never changed in
+# place, so registers that hold the same text share the same tuple e.g. a yank
+# stores one tuple in both the unnamed register and register 0.
 _data = {'0': None, '1-9': deque([None] * 9, maxlen=9)}  # type: dict
 _linewise = {}  # type: dict
 
+# The viminfo keys of the values of the numbered registers 1 to 9, in the
+# "numbered_registers" section. Each value is persisted once under a new key,
+# and the order of the keys under "1-9", so a delete only writes the value
+# shifted into register 1 and the keys, not all nine values.
+_numbered_keys = deque([None] * 9, maxlen=9)  # type: deque
+_next_numbered_key = 0
+
+# The values waiting to be written to the system clipboard. Writes are deferred
+# to the end of the current command, so a command that sets several registers
+# only writes the clipboard, and the clipboard history, once.
+_pending_clipboard = None  # type: tuple
+
+# True once the registers persisted by the last session have been restored.
+_restored = False
+
 
 def _set_register_linewise(name, linewise):
     _linewise[name] = linewise
 
 
 def _reset_data():
+    global _pending_clipboard
+    _pending_clipboard = None
     _data.clear()
     _data['0'] = None
     _data['1-9'] = deque([None] * 9, maxlen=9)
+    _numbered_keys.extend([None] * 9)
 
 
 def _shift_numbered_register(content):
+    dropped = _numbered_keys[-1]
     _data['1-9'].appendleft(content)
+    _numbered_keys.appendleft(_save_numbered(content))
+    _save_numbered_keys(dropped)
 
 
 def _set_numbered_register(number, values):
-    _data['1-9'][int(number) - 1] = values
+    index = int(number) - 1
+    dropped = _numbered_keys[index]
+    _data['1-9'][index] = values
+    _numbered_keys[index] = _save_numbered(values)
+    _save_numbered_keys(dropped)
 
 
 def _get_numbered_register(number):
     return _data['1-9'][int(number) - 1]
 
 
+def _is_persistable(values):
+    if not values:
+        return True
+
+    return (sum(len(value) for value in values) <= _PERSISTENT_MAX_SIZE and
+            sum(len(value.splitlines()) for value in values) <= _PERSISTENT_MAX_LINES)
+
+
+def _save(name):
+    # The values are immutable tuples, so they can be serialized later by the
+    # worker thread that writes the viminfo file.
+    if name in _PERSISTENT:
+        values = _data.get(name)
+        if _is_persistable(values):
+            viminfo_set('registers', name, (values, _linewise.get(name, False)))
+        else:
+            # Don't restore an older value instead.
+            viminfo_del('registers', name)
+
+
+def _save_numbered(values):
+    # Returns the key the values are persisted under, or None if they aren't.
+    global _next_numbered_key
+
+    if not values or not _is_persistable(values):
+        return None
+
+    key = str(_next_numbered_key)
+    _next_numbered_key += 1
+    viminfo_set('numbered_registers', key, values)
+
+    return key
+
+
+def _save_numbered_keys(dropped):
+    if dropped is not None:
+        viminfo_del('numbered_registers', dropped)
+
+    viminfo_set('registers', '1-9', tuple(_numbered_keys))
+
+
+def _restore():
+    global _restored, _next_numbered_key
+
+    if _restored:
+        return
+
+    _restored = True
+
+    numbered = viminfo_get('numbered_registers')
+    for key in numbered:
+        try:
+            _next_numbered_key = max(_next_numbered_key, int(key) + 1)
+        except ValueError:
+            pass
+
+    for name, value in viminfo_get('registers').items():
+        try:
+            if name == '1-9':
+                for i, key in enumerate(value[:9]):
+                    values = numbered.pop(key, None) if key is not None else None
+                    if values:
+                        _data['1-9'][i] = tuple(map(str, values))
+                        _numbered_keys[i] = key
+            elif name in _PERSISTENT:
+                values, linewise = value
+                if values:
+                    _data[name] = tuple(map(str, values))
+                    _linewise[name] = bool(linewise)
+        except (TypeError, ValueError):
+            pass
+
+    # Values no longer in a numbered register.
+    for key in numbered:
+        viminfo_del('numbered_registers', key)
+
+
+def _set_clipboard_deferred(values):
+    global _pending_clipboard
+
+    scheduled = _pending_clipboard is not None
+    _pending_clipboard = values
+    if not scheduled:
+        set_timeout(_flush_clipboard, 0)
+
+
+def _flush_clipboard():
+    global _pending_clipboard
+
+    values = _pending_clipboard
+    _pending_clipboard = None
+    if values is not None:
+        text = '\n'.join(values)
+        set_clipboard(text)
+        update_clipboard_history(text)
+
+
+def _get_clipboard():
+    # A pending write is flushed first so that reads see the latest value.
+    _flush_clipboard()
+
+    return get_clipboard()
+
+
 def _is_register_linewise(register):
     return _linewise.get(register, False)
 
@@ -201,20 +346,20 @@ class Registers:
     def __get__(self, instance, owner):
         self.view = instance.view
         self.settings = instance.settings
+        _restore()
 
         return self
 
-    def _maybe_set_sys_clipboard(self, name, value):
+    def _maybe_set_sys_clipboard(self, name, values):
         if (name in _CLIPBOARD or self.settings.view['vintageous_use_sys_clipboard'] is True):
-            value = '\n'.join(value)
-            set_clipboard(value)
-            update_clipboard_history(value)
+            _set_clipboard_deferred(values)
 
     # Set a register.
     # In order to honor multiple selections in Sublime Text, we need to store
     # register data as lists, one per selection. The paste command will then
     # make the final decision about what to insert into the buffer when faced
-    # with unbalanced selection number / available register data.
+    # with unbalanced selection number / available register data. Values given
+    # as a tuple must already be strings, they are stored without a copy.
     def _set(self, name, values, linewise=False):
         name = str(name)
 
@@ -226,28 +371,34 @@ class Registers:
         if not _is_writable_register(name):
             return None  # Vim fails silently.
 
-        assert isinstance(values, list), "Register values must be inside a list."
+        assert isinstance(values, (list, tuple)), "Register values must be inside a list."
 
-        values = [str(v) for v in values]
+        if not isinstance(values, tuple):
+            values = tuple(map(str, values))
 
         if name.isdigit() and name != '0':
             _set_numbered_register(name, values)
         else:
             _data[name] = values
             _linewise[name] = linewise
+            _save(name)
 
         if name not in (_EXPRESSION,):
             self._set_unnamed(values, linewise)
             self._maybe_set_sys_clipboard(name, values)
 
     def _set_unnamed(self, values, linewise=False):
-        assert isinstance(values, list)
-        _data[_UNNAMED] = [str(v) for v in values]
+        assert isinstance(values, (list, tuple))
+        if not isinstance(values, tuple):
+            values = tuple(map(str, values))
+
+        _data[_UNNAMED] = values
         _linewise[_UNNAMED] = linewise
+        _save(_UNNAMED)
 
     def set_expression(self, values):
         # Coerce all values into strings.
-        _data[_EXPRESSION] = [str(v) for v in values]
+        _data[_EXPRESSION] = tuple(map(str, values))
 
     def _append(self, name, suffixes):
         assert len(name) == 1, "Register names must be 1 char long."
@@ -255,9 +406,10 @@ class Registers:
 
         existing_values = _data.get(name.lower(), '')
         new_values = itertools.zip_longest(existing_values, suffixes, fillvalue='')
-        new_values = [(prefix + suffix) for (prefix, suffix) in new_values]
+        new_values = tuple((prefix + suffix) for (prefix, suffix) in new_values)
 
         _data[name.lower()] = new_values
+        _save(name.lower())
 
         self._set_unnamed(new_values)
         self._maybe_set_sys_clipboard(name, new_values)
@@ -268,25 +420,36 @@ class Registers:
         #
         # Returns:
         #   (list|str|None)
+        values = self._get_values(name)
+        if isinstance(values, tuple):
+            return list(values)
+
+        return values
+
+    def _get_values(self, name=_UNNAMED):
+        # Like _get(), but returns the stored tuple of values without a copy.
+        #
+        # Returns:
+        #   (tuple|str|None)
         name = str(name)
 
         assert len(name) == 1, "Register names must be 1 char long."
 
         if name == _CURRENT_FILE_NAME:
             try:
-                return [self.view.file_name()]
+                return (self.view.file_name(),)
             except AttributeError:
                 return ''
 
         if name in _CLIPBOARD:
-            return [get_clipboard()]
+            return (_get_clipboard(),)
 
         if ((name not in (_UNNAMED, _SMALL_DELETE)) and (name in _SPECIAL)):
             return
 
         # Special case lumped among these --user always wants the sys clipboard
         if ((name == _UNNAMED) and (self.settings.view['vintageous_use_sys_clipboard'] is True)):
-            return [get_clipboard()]
+            return (_get_clipboard(),)
 
         # If the expression register holds a value and we're requesting the
         # unnamed register, return the expression register and clear it
@@ -327,7 +490,8 @@ class Registers:
         else:
             linewise_if_multiline = False
 
-        selected_text = self._get_selected_text(linewise=linewise)
+        # One tuple is shared by all the registers that are set.
+        selected_text = tuple(self._get_selected_text(linewise=linewise))
 
         multiline = False
         for fragment in selected_text:
@@ -371,34 +535,31 @@ class Registers:
         if not register:
             register = _UNNAMED
 
-        values = self._get(register)
+        values = self._get_values(register)
         linewise = _is_register_linewise(register)
 
-        filtered = []
+        if not values:
+            return (), linewise
 
-        if values:
+        # The stored values are returned as they are, unless the mode needs
+        # them adjusted.
+        if is_visual_mode(mode):
             # Populate unnamed register with the text we're about to paste into
             # (the text we're about to replace), but only if there was something
             # in requested register (not empty), and we're in VISUAL mode.
-            if is_visual_mode(mode):
-                current_content = self._get_selected_text(linewise=(mode == VISUAL_LINE))
-                if current_content:
-                    self._set(_UNNAMED, current_content, linewise=(mode == VISUAL_LINE))
-
-            for value in values:
-                if mode == VISUAL:
-                    if linewise and value and value[0] != '\n':
-                        value = '\n' + value
+            current_content = self._get_selected_text(linewise=(mode == VISUAL_LINE))
+            if current_content:
+                self._set(_UNNAMED, current_content, linewise=(mode == VISUAL_LINE))
 
-                if mode == VISUAL_LINE:
-                    # Pasting characterwise content in visual line mode needs an
-                    # extra newline to account for visual line eol newline.
-                    if not linewise:
-                        value += '\n'
+            if mode == VISUAL and linewise:
+                values = tuple(('\n' + value) if value and value[0] != '\n' else value for value in values)
 
-                filtered.append(value)
+            # Pasting characterwise content in visual line mode needs an extra
+            # newline to account for visual line eol newline.
+            elif mode == VISUAL_LINE and not linewise:
+                values = tuple(value + '\n' for value in values)
 
-        return filtered, linewise
+        return values, linewise
 
     def _get_selected_text(self, new_line_at_eof=False, linewise=False):
         # Inspect settings and populate registers as needed.
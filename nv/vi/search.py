@@ -15,15 +15,49 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from bisect import bisect_left
+from bisect import bisect_right
 import re
 
 from sublime import IGNORECASE
-from sublime import LITERAL
 from sublime import Region
+from sublime import set_timeout
 import sublime_plugin
 
+from NeoVintageous.nv.regex import regex_compile_find
+from NeoVintageous.nv.regex import regex_search_flags
 from NeoVintageous.nv.ui import ui_region_flags
 from NeoVintageous.nv.utils import clear_search_highlighting
+from NeoVintageous.nv.utils import get_search_highlighting
+from NeoVintageous.nv.utils import set_search_highlighting
+from NeoVintageous.nv.vim import status_message
+
+
+# Number of lines above and below the visible region that are highlighted along
+# with it, so that scrolling a little doesn't need any new highlighting.
+_HILITE_MARGIN = 100
+
+# Milliseconds between checks for the visible region having scrolled outside of
+# the highlighted lines.
+_HILITE_POLL_INTERVAL = 200
+
+# Milliseconds to wait for typing to pause before highlighting the matches of a
+# search that is being typed.
+_INCSEARCH_DEBOUNCE = 100
+
+# The highlighted extent of each view, keyed by view id.
+_hilite_extents = {}  # type: dict
+
+# Pending incsearch highlighting, keyed by view id.
+_incsearch_pending = {}  # type: dict
+
+# The matches of the last pattern searched for in each view, keyed by view id,
+# see _get_search_matches().
+_search_matches = {}  # type: dict
+
+# Number of characters in the first chunk searched by a reverse search. Each
+# following chunk is twice the size of the previous one.
+_REVERSE_SEARCH_CHUNK_SIZE = 4096
 
 
 # Polyfill to workaround Sublime view.find() return value issue:
@@ -90,12 +124,61 @@ def find_all_in_range(view, term, start, end, flags=0):
         start = m.end()
 
 
+def _get_search_matches(view, pattern, flags):
+    # type: (...) -> tuple
+    # Returns the begin and end points of the non-empty matches of the pattern,
+    # in order, from one search of the whole buffer. They are kept until the
+    # buffer changes or another pattern is searched for in the view, so that
+    # repeating a search, with or without a count, doesn't search again.
+    key = (view.change_count(), pattern, flags)
+    cached = _search_matches.get(view.id())
+    if cached and cached[0] == key:
+        return cached[1], cached[2]
+
+    begins = []
+    ends = []
+    for match in view.find_all(pattern, flags):
+        if not match.empty():
+            begins.append(match.begin())
+            ends.append(match.end())
+
+    _search_matches[view.id()] = (key, begins, ends)
+
+    return begins, ends
+
+
+def clear_search_matches(view):
+    # type: (...) -> None
+    _search_matches.pop(view.id(), None)
+
+
+def show_search_count(view, pattern, flags, match):
+    # type: (...) -> None
+    # Shows the number of the match and the total number of matches e.g.
+    # "[3/120]", like Vim does.
+    begins, ends = _get_search_matches(view, pattern, flags)
+    i = bisect_left(begins, match.begin())
+    if i < len(begins) and begins[i] == match.begin():
+        status_message('[%d/%d]', i + 1, len(begins))
+
+
 def find_wrapping(view, term, start, end, flags=0, times=1):
     try:
         current_sel = view.sel()[0]
     except IndexError:
         return
 
+    if end >= view.size():
+        # The next match is looked up in the matches of the whole buffer, and
+        # the count wraps around the end of the buffer as many times as needed.
+        begins, ends = _get_search_matches(view, term, flags)
+        if not begins:
+            return
+
+        i = (bisect_left(begins, start) + times - 1) % len(begins)
+
+        return Region(begins[i], ends[i])
+
     for x in range(times):
         match = find_in_range(view, term, start, end, flags)
         # make sure we wrap around the end of the buffer
@@ -121,6 +204,16 @@ def reverse_find_wrapping(view, term, start, end, flags=0, times=1):
     except IndexError:
         return
 
+    if start <= 0:
+        # See find_wrapping().
+        begins, ends = _get_search_matches(view, term, flags)
+        if not begins:
+            return
+
+        i = (bisect_right(ends, end) - times) % len(begins)
+
+        return Region(begins[i], ends[i])
+
     # Search wrapping around the end of the buffer.
     for x in range(times):
         match = reverse_search(view, term, start, end, flags)
@@ -155,6 +248,87 @@ def find_last_in_range(view, term, start, end, flags=0):
     return last_found
 
 
+def _reverse_search(view, term, start, end, flags):
+    # type: (...) -> Region
+    # Returns the last match that begins at or after @start and ends at or
+    # before @end, or None.
+    #
+    # The buffer is searched backwards from @end in chunks of whole lines,
+    # each chunk twice the size of the previous one. Each chunk is searched
+    # forward from its beginning in the text from the beginning of the chunk
+    # to @end, so a match that begins in a chunk and ends in the one after it
+    # is found, but the search never runs past @end. Doubling the chunks
+    # bounds the text searched when no match is found nearby. Empty matches
+    # are skipped.
+    #
+    # Patterns that python can't compile are searched with view.find(), which
+    # searches on to the end of the buffer.
+    if start < 0 or end > view.size():
+        return None
+
+    try:
+        search = regex_compile_find(term, flags).search
+    except re.error:
+        search = None
+
+    # The rest of the line at @end is searched too, so that the anchors and
+    # word boundaries at @end match as they do in the buffer.
+    text = view.substr(Region(end, view.full_line(end).b)) if search else ''
+    chunk_end = end
+    chunk_size = _REVERSE_SEARCH_CHUNK_SIZE
+    searched_from_start = False
+    while True:
+        chunk_begin = max(start, view.line(max(start, chunk_end - chunk_size)).a)
+        if search:
+            # The text begins at the beginning of a line for the anchors.
+            text_begin = view.line(chunk_begin).a
+            text = view.substr(Region(text_begin, chunk_end)) + text
+
+        last_match = None
+        line_end = -1
+        pt = chunk_begin
+        while pt <= end:
+            if search:
+                found = search(text, pt - text_begin)
+                match = Region(text_begin + found.start(), text_begin + found.end()) if found else None
+            else:
+                match = view_find(view, term, pt, flags)
+
+            if match is None or match.a >= chunk_end or match.b > end:
+                break
+
+            if match.empty():
+                pt = match.b + 1
+                continue
+
+            last_match = match
+            pt = match.b
+
+            # Each line is searched from its beginning, as Vim does, so a
+            # match that spans lines doesn't hide the ones on the next line.
+            if match.a > line_end:
+                line_end = view.line(match.a).b
+            if pt > line_end:
+                pt = line_end + 1
+
+        if last_match:
+            return last_match
+
+        if chunk_begin <= start:
+            return None
+
+        # Nothing was found after the chunk either, so if nothing is found
+        # from the start there is no need to search the chunks in between.
+        if not search and match is None and not searched_from_start:
+            if view_find(view, term, start, flags) is None:
+                return None
+
+            searched_from_start = True
+
+        chunk_end = chunk_begin
+        chunk_size *= 2
+
+
 # The @start position is linewise.
 #
 # The @end position is NOT linewise.
@@ -183,31 +357,10 @@ def reverse_search(view, term, start, end, flags=0):
     start = start if (start is not None) else 0
     end = end if (end is not None) else view.size()
 
-    if start < 0 or end > view.size():
+    if start < 0:
         return None
 
-    lo_line = view.full_line(start)
-    hi_line = view.full_line(end)
-
-    while True:
-        low_row, hi_row = view.rowcol(lo_line.a)[0], view.rowcol(hi_line.a)[0]
-        middle_row = (low_row + hi_row) // 2
-
-        middle_line = view.full_line(view.text_point(middle_row, 0))
-
-        lo_region = Region(lo_line.a, middle_line.b)
-        hi_region = Region(middle_line.b, min(hi_line.b, end))
-
-        if find_in_range(view, term, hi_region.a, hi_region.b, flags):
-            lo_line = view.full_line(middle_line.b)
-        elif find_in_range(view, term, lo_region.a, lo_region.b, flags):
-            hi_line = view.full_line(middle_line.a)
-        else:
-            return None
-
-        if lo_line == hi_line:
-            # we found the line we were looking for, now extract the match.
-            return find_last_in_range(view, term, hi_line.a, min(hi_line.b, end), flags)
+    return _reverse_search(view, term, view.line(start).a, end, flags)
 
 
 def reverse_search_by_pt(view, term, start, end, flags=0):
@@ -217,31 +370,116 @@ def reverse_search_by_pt(view, term, start, end, flags=0):
     start = start if (start is not None) else 0
     end = end if (end is not None) else view.size()
 
-    if start < 0 or end > view.size():
-        return None
+    return _reverse_search(view, term, start, end, flags)
 
-    lo_line = view.full_line(start)
-    hi_line = view.full_line(end)
 
-    while True:
-        low_row, hi_row = view.rowcol(lo_line.a)[0], view.rowcol(hi_line.a)[0]
-        middle_row = (low_row + hi_row) // 2
+def _get_hilite_extent(view):
+    # type: (...) -> Region
+    visible = view.visible_region()
+    last_row = view.rowcol(view.size())[0]
+    begin_row = max(0, view.rowcol(visible.begin())[0] - _HILITE_MARGIN)
+    end_row = min(last_row, view.rowcol(visible.end())[0] + _HILITE_MARGIN)
 
-        middle_line = view.full_line(view.text_point(middle_row, 0))
+    return Region(view.text_point(begin_row, 0), view.full_line(view.text_point(end_row, 0)).b)
 
-        lo_region = Region(lo_line.a, middle_line.b)
-        hi_region = Region(middle_line.b, min(hi_line.b, end))
 
-        if find_in_range(view, term, hi_region.a, hi_region.b, flags):
-            lo_line = view.full_line(middle_line.b)
-        elif find_in_range(view, term, lo_region.a, lo_region.b, flags):
-            hi_line = view.full_line(middle_line.a)
-        else:
-            return None
+def _get_current_matches(view, regions):
+    # type: (...) -> list
+    # The matches are sorted and don't overlap, so the only match that can
+    # contain a selection is the last one that begins at or before it.
+    begins = [r.begin() for r in regions]
+    current = []
+    for sel in view.sel():
+        i = bisect_right(begins, sel.begin()) - 1
+        if i >= 0 and regions[i].contains(sel):
+            current.append(regions[i])
+
+    return current
 
-        if lo_line == hi_line:
-            # we found the line we were looking for, now extract the match.
-            return find_last_in_range(view, term, max(hi_line.a, start), min(hi_line.b, end), flags)
+
+def _poll_hilite(view, extent):
+    # type: (...) -> None
+    # Follows the visible region, extending the highlighting when the view is
+    # scrolled outside of the highlighted lines or the buffer is modified. The
+    # polling stops once the highlighting is cleared or superseded.
+    if _hilite_extents.get(view.id()) is not extent:
+        return
+
+    highlighting = get_search_highlighting(view)
+    if not highlighting or not view.is_valid():
+        del _hilite_extents[view.id()]
+        if highlighting:
+            # The view was closed.
+            clear_search_highlighting(view)
+
+        return
+
+    change_count, region = extent
+    if change_count != view.change_count() or not region.contains(view.visible_region()):
+        hilite_search(view, *highlighting)
+    else:
+        set_timeout(lambda: _poll_hilite(view, extent), _HILITE_POLL_INTERVAL)
+
+
+def hilite_search(view, pattern, flags):
+    # type: (...) -> None
+    if not view.settings().get('vintageous_hlsearch'):
+        return
+
+    highlighting = (pattern, flags)
+    extent = _hilite_extents.get(view.id())
+
+    if highlighting == get_search_highlighting(view) and extent and extent[0] == view.change_count() and \
+            extent[1].contains(view.visible_region()):
+        # Still highlighted e.g. "n" was pressed, so only the current match
+        # needs updating.
+        regions = view.get_regions('vi_search')
+    else:
+        extent = (view.change_count(), _get_hilite_extent(view))
+        regions = view_find_all_in_range(view, pattern, extent[1].begin(), extent[1].end(), flags)
+        set_search_highlighting(view, pattern, flags)
+        _hilite_extents[view.id()] = extent
+        set_timeout(lambda: _poll_hilite(view, extent), _HILITE_POLL_INTERVAL)
+
+        # The scopes are prefixed with common color scopes so that color
+        # schemes have sane default colors. Color schemes can progressively
+        # enhance support by using the nv_* scopes.
+        view.add_regions(
+            'vi_search',
+            regions,
+            scope='string neovintageous_search_occ',
+            flags=ui_region_flags(view.settings().get('neovintageous_search_occ_style'))
+        )
+
+    view.add_regions(
+        'vi_search_current',
+        _get_current_matches(view, regions),
+        scope='support.function neovintageous_search_cur',
+        flags=ui_region_flags(view.settings().get('neovintageous_search_cur_style'))
+    )
+
+
+def hilite_incsearch(view, pattern, flags):
+    # type: (...) -> None
+    # Highlighting the matches of a search that is being typed is deferred
+    # until typing pauses, so that fast typing doesn't search on every key.
+    token = object()
+    _incsearch_pending[view.id()] = token
+
+    def _hilite():
+        if _incsearch_pending.get(view.id()) is token:
+            del _incsearch_pending[view.id()]
+            if pattern:
+                hilite_search(view, pattern, flags)
+            else:
+                clear_search_highlighting(view)
+
+    set_timeout(_hilite, _INCSEARCH_DEBOUNCE)
+
+
+def cancel_hilite_incsearch(view):
+    # type: (...) -> None
+    _incsearch_pending.pop(view.id(), None)
 
 
 # TODO [refactor] Move to commands module
@@ -250,66 +488,22 @@ class BufferSearchBase(sublime_plugin.TextCommand):
         super().__init__(*args, **kwargs)
 
     def calculate_flags(self, pattern=None):
-        flags = 0
-
         settings = self.view.settings()
 
-        if settings.get('vintageous_magic') is False:
-            flags |= LITERAL
-        elif pattern:
-            # Is the pattern as regular expression or a literal? For example, in
-            # "magic" mode, simple strings like "]" should be treated as a
-            # literal and "[0-9]" should be treated as a regular expression.
-
-            if re.match('^[a-zA-Z0-9_\\[\\]]+$', pattern):
-                if '[' not in pattern or ']' not in pattern:
-                    flags |= LITERAL
-            elif re.match('^[a-zA-Z0-9_\\(\\)]+$', pattern):
-                if '(' not in pattern or ')' not in pattern:
-                    flags |= LITERAL
-
-        if settings.get('vintageous_ignorecase') is True:
-            flags |= IGNORECASE
-
-        return flags
+        return regex_search_flags(
+            pattern,
+            magic=settings.get('vintageous_magic') is not False,
+            ignorecase=settings.get('vintageous_ignorecase') is True
+        )
 
     def build_pattern(self, query):
         return query
 
     def hilite(self, query):
-        regions = self.view.find_all(
-            self.build_pattern(query),
-            self.calculate_flags(query)
-        )
+        hilite_search(self.view, self.build_pattern(query), self.calculate_flags(query))
 
-        if not regions:
-            clear_search_highlighting(self.view)
-            return
-
-        sels = self.view.sel()
-        regions_current = []
-        for region in regions:
-            for sel in sels:
-                if region.contains(sel):
-                    regions_current.append(region)
-
-        # The scopes are prefixed with common color scopes so that color schemes
-        # have sane default colors. Color schemes can progressively enhance
-        # support by using the nv_* scopes.
-        if self.view.settings().get('vintageous_hlsearch'):
-            self.view.add_regions(
-                'vi_search',
-                regions,
-                scope='string neovintageous_search_occ',
-                flags=ui_region_flags(self.view.settings().get('neovintageous_search_occ_style'))
-            )
-
-            self.view.add_regions(
-                'vi_search_current',
-                regions_current,
-                scope='support.function neovintageous_search_cur',
-                flags=ui_region_flags(self.view.settings().get('neovintageous_search_cur_style'))
-            )
+    def show_count(self, query, match):
+        show_search_count(self.view, self.build_pattern(query), self.calculate_flags(query), match)
 
 
 # TODO [refactor] Move to commands module
@@ -318,14 +512,10 @@ class ExactWordBufferSearchBase(BufferSearchBase):
         super().__init__(*args, **kwargs)
 
     def calculate_flags(self, pattern=None):
-        flags = 0
-
-        settings = self.view.settings()
-
-        if settings.get('vintageous_ignorecase') is True:
-            flags |= IGNORECASE
+        if self.view.settings().get('vintageous_ignorecase') is True:
+            return IGNORECASE
 
-        return flags
+        return 0
 
     def get_query(self):
         # TODO: make sure we swallow any leading white space.
@@ -24,6 +24,8 @@ B = 'b'
 BACKSLASH = '<bslash>'
 BACKSPACE = '<bs>'
 BACKTICK = '`'
+BANG = '!'
+BANG_BANG = '!!'
 BAR = '<bar>'
 BIG_A = 'A'
 BIG_B = 'B'
@@ -0,0 +1,228 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from bisect import bisect_right
+import re
+
+from sublime import Region
+
+from NeoVintageous.nv.regex import regex_compile
+
+
+# The tokens of a document that matter for pairing tags. Comments, CDATA
+# sections, doctypes and processing instructions are matched so that any tags
+# in them are skipped. Attribute values can contain ">", and a tag can span
+# lines, but it can't contain a "<" outside of an attribute value.
+_RXC_TOKEN = re.compile(
+    r'<!--.*?-->'
+    r'|<!\[CDATA\[.*?\]\]>'
+    r'|<[!?][^>]*>'
+    r'|<(/?)([0-9A-Za-z][-.:\w]*)((?:[^<>"\']|"[^"]*"|\'[^\']*\')*)>',
+    re.DOTALL)
+
+# Elements that never have an end tag in HTML.
+_VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'command', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem', 'meta',
+    'param', 'source', 'track', 'wbr'
+))
+
+# Elements whose content is not markup in HTML, so a "<" in it is not a tag.
+_RAW_TEXT_ELEMENTS = frozenset(('script', 'style'))
+
+_OPENING = 0
+_CLOSING = 1
+_EMPTY = 2
+
+# Tag indexes keyed by view id. An index is rebuilt lazily the first time it's
+# queried after the view has been modified.
+_indexes = {}  # type: dict
+
+
+class _TagPairs:
+
+    # A stack-based pairing table for the tags of a document. All lists are
+    # parallel to the list of tags in document order:
+    #
+    #   begins    The start point of the tag.
+    #   ends      The end point of the tag.
+    #   names     The name of the tag, as written.
+    #   kinds     _OPENING, _CLOSING, or _EMPTY for a self-closing tag or (in
+    #             HTML) a void element.
+    #   match     Index of the matching tag, or -1 if it's unbalanced.
+    #   enclosing Index of the innermost opening tag that is still open
+    #             immediately after the tag and that has an end tag, or -1.
+    #
+    # An end tag closes the innermost open element of the same name, and any
+    # elements opened inside that one are left unbalanced. Elements that are
+    # balanced are properly nested, so the parent of an opening tag at index i
+    # is enclosing[i - 1], which means any level of nesting around a point is
+    # found by a bisect followed by walking up the parents.
+
+    __slots__ = ('begins', 'ends', 'names', 'kinds', 'match', 'enclosing')
+
+    def __init__(self):
+        self.begins = []  # type: list
+        self.ends = []  # type: list
+        self.names = []  # type: list
+        self.kinds = []  # type: list
+        self.match = []  # type: list
+        self.enclosing = []  # type: list
+
+    def _parent(self, i):
+        # type: (int) -> int
+        return self.enclosing[i - 1] if i > 0 else -1
+
+    def closest(self, pt):
+        # type: (int) -> int
+        # Returns the index of the last tag that starts at or before pt, or -1.
+        return bisect_right(self.begins, pt) - 1
+
+    def containing(self, pt, count=1):
+        # type: (int, int) -> int
+        # Returns the index of the opening tag of the count-th balanced element
+        # that contains pt, or -1. A point on a balanced tag is contained by the
+        # element of the tag.
+        i = self.closest(pt)
+        if i == -1:
+            return -1
+
+        if pt < self.ends[i] and self.match[i] != -1:
+            i = i if self.kinds[i] == _OPENING else self.match[i]
+        else:
+            i = self.enclosing[i]
+
+        for _ in range(count - 1):
+            if i == -1:
+                break
+
+            i = self._parent(i)
+
+        return i
+
+
+def _build(text, html=True):
+    # type: (str, bool) -> _TagPairs
+    # Pairs up all the tags in text in one pass over the tokens.
+    pairs = _TagPairs()
+    begins = pairs.begins
+    ends = pairs.ends
+    names = pairs.names
+    kinds = pairs.kinds
+    match = pairs.match
+    stack = []  # type: list
+    enclosing = []  # type: list
+
+    # The tokens are matched from pos. Tokenizing starts over at the end of the
+    # content of an HTML raw text element.
+    pos = 0
+    while pos is not None:
+        tokens = _RXC_TOKEN.finditer(text, pos)
+        pos = None
+        for m in tokens:
+            closing, name, attributes = m.group(1, 2, 3)
+            if not name:
+                continue
+
+            key = name.lower()
+            i = len(begins)
+            begins.append(m.start())
+            ends.append(m.end())
+            names.append(name)
+            match.append(-1)
+
+            if closing:
+                kinds.append(_CLOSING)
+                for k in range(len(stack) - 1, -1, -1):
+                    if stack[k][0] == key:
+                        j = stack[k][1]
+                        match[j] = i
+                        match[i] = j
+                        del stack[k:]
+                        break
+
+            elif attributes.endswith('/') or (html and key in _VOID_ELEMENTS):
+                kinds.append(_EMPTY)
+
+            else:
+                kinds.append(_OPENING)
+                stack.append((key, i))
+                if html and key in _RAW_TEXT_ELEMENTS:
+                    end_tag = regex_compile('</' + key + '\\b', re.IGNORECASE).search(text, m.end())
+                    if end_tag:
+                        pos = end_tag.start()
+
+                    break
+
+    # Balanced elements are properly nested, so the innermost open one can be
+    # tracked with a second stack once all the tags are paired.
+    for i, j in enumerate(pairs.match):
+        if j != -1:
+            if pairs.kinds[i] == _OPENING:
+                enclosing.append(i)
+            else:
+                enclosing.pop()
+
+        pairs.enclosing.append(enclosing[-1] if enclosing else -1)
+
+    return pairs
+
+
+def _get_pairs(view):
+    # type: (...) -> _TagPairs
+    # Void elements and raw text are HTML only, they don't apply to XML.
+    key = (view.change_count(), view.score_selector(0, 'text.xml') == 0)
+
+    try:
+        index_key, index = _indexes[view.id()]
+    except KeyError:
+        index_key, index = None, None
+
+    if index_key != key:
+        index = _build(view.substr(Region(0, view.size())), html=key[1])
+        _indexes[view.id()] = (key, index)
+
+    return index
+
+
+def clear_tag_index(view):
+    # type: (...) -> None
+    _indexes.pop(view.id(), None)
+
+
+def find_closest_tag(view, pt):
+    # type: (...) -> Region
+    # Returns the region of the last tag that starts at or before pt, or None.
+    pairs = _get_pairs(view)
+    i = pairs.closest(pt)
+    if i == -1:
+        return None
+
+    return Region(pairs.begins[i], pairs.ends[i])
+
+
+def find_containing_tags(view, pt, count=1):
+    # type: (...) -> tuple
+    # Returns the regions of the opening and closing tags, and the name, of
+    # the count-th element that contains pt, or (None, None, None).
+    pairs = _get_pairs(view)
+    i = pairs.containing(pt, count)
+    if i == -1:
+        return None, None, None
+
+    j = pairs.match[i]
+
+    return Region(pairs.begins[i], pairs.ends[i]), Region(pairs.begins[j], pairs.ends[j]), pairs.names[j]
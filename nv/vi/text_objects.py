@@ -24,25 +24,25 @@ from sublime import CLASS_PUNCTUATION_END
 from sublime import CLASS_PUNCTUATION_START
 from sublime import CLASS_WORD_END
 from sublime import CLASS_WORD_START
-from sublime import IGNORECASE
 from sublime import Region
 
 from NeoVintageous.nv.utils import next_non_blank
 from NeoVintageous.nv.utils import prev_non_blank
 from NeoVintageous.nv.utils import prev_non_ws
+from NeoVintageous.nv.vi.brackets import find_enclosing_closing_bracket
+from NeoVintageous.nv.vi.brackets import find_enclosing_opening_bracket
+from NeoVintageous.nv.vi.brackets import is_unescaped_opening_bracket
+from NeoVintageous.nv.vi.lines import get_line_index
 from NeoVintageous.nv.vi.search import find_in_range
 from NeoVintageous.nv.vi.search import reverse_search_by_pt
+from NeoVintageous.nv.vi.tags import find_closest_tag
+from NeoVintageous.nv.vi.tags import find_containing_tags
 from NeoVintageous.nv.vi.units import word_starts
 
 
-RX_ANY_TAG = r'</?([0-9A-Za-z-]+).*?>'
-RX_ANY_TAG_NAMED_TPL = r'</?({0}) *?.*?>'
-RXC_ANY_TAG = re.compile(r'</?([0-9A-Za-z]+).*?>')
-# According to the HTML 5 editor's draft, only 0-9A-Za-z characters can be
-# used in tag names. TODO: This won't be enough in Dart Polymer projects,
-# for example.
-RX_ANY_START_TAG = r'<([0-9A-Za-z]+)(.*?)>'
-RX_ANY_END_TAG = r'</([0-9A-Za-z-]+).*?>'
+_RXC_BLANKS = re.compile('[ \t]*')
+_RXC_SENTENCE_END = re.compile('[\\.\\?\\!][\\)\\]"\']*\\s')
+_RXC_WHITESPACE = re.compile('\\s+')
 
 
 ANCHOR_NEXT_WORD_BOUNDARY = CLASS_WORD_START | CLASS_PUNCTUATION_START | CLASS_LINE_END
@@ -290,15 +290,23 @@ def get_text_object_region(view, s, text_object, inclusive=False, count=1):
         return s
 
     if type_ == TAG:
-        begin_tag, end_tag, _ = find_containing_tag(view, s.begin())
+        while True:
+            begin_tag, end_tag, _ = find_containing_tag(view, s.begin(), count)
 
-        if not (begin_tag and end_tag):
-            return s
+            if not (begin_tag and end_tag):
+                return s
 
-        if inclusive:
-            return Region(begin_tag.a, end_tag.b)
-        else:
-            return Region(begin_tag.b, end_tag.a)
+            if inclusive:
+                region = Region(begin_tag.a, end_tag.b)
+            else:
+                region = Region(begin_tag.b, end_tag.a)
+
+            # A selection that already covers the tag block is extended to the
+            # next one out.
+            if s.empty() or not s.contains(region):
+                return region
+
+            count += 1
 
     if type_ == PARAGRAPH:
         return find_paragraph_text_object(view, s, inclusive=inclusive, count=count)
@@ -400,109 +408,28 @@ def get_text_object_region(view, s, text_object, inclusive=False, count=1):
 
 
 def find_next_lone_bracket(view, start, items, unbalanced=0):
-    # TODO: Extract common functionality from here and the % motion instead of
-    # duplicating code.
-    new_start = start
-    for i in range(unbalanced or 1):
-        next_closing_bracket = find_in_range(
-            view,
-            items[1],
-            start=new_start,
-            end=view.size(),
-            flags=IGNORECASE
-        )
-
-        if next_closing_bracket is None:
-            # Unbalanced items; nothing we can do.
-            return
-
-        while view.substr(next_closing_bracket.begin() - 1) == '\\':
-            next_closing_bracket = find_in_range(view, items[1],
-                                                 start=next_closing_bracket.end(),
-                                                 end=view.size(),
-                                                 flags=IGNORECASE)
-            if next_closing_bracket is None:
-                return
-
-        new_start = next_closing_bracket.end()
-
-    if view.substr(start) == items[0][-1]:
-        start += 1
-
-    nested = 0
-    while True:
-        next_opening_bracket = find_in_range(view, items[0],
-                                             start=start,
-                                             end=next_closing_bracket.b,
-                                             flags=IGNORECASE)
-        if not next_opening_bracket:
-            break
+    # type: (...) -> Region
+    bracket = items[1][-1]
 
-        nested += 1
-        start = next_opening_bracket.end()
+    # A bracket at the start belongs to the pair we're looking for.
+    if is_unescaped_opening_bracket(view, start, items[0][-1]):
+        start += 1
 
-    if nested > 0:
-        return find_next_lone_bracket(view, next_closing_bracket.end(),
-                                      items,
-                                      nested)
-    else:
-        return next_closing_bracket
+    pt = find_enclosing_closing_bracket(view, start, bracket, unbalanced or 1)
+    if pt is not None:
+        return Region(pt, pt + 1)
 
 
 def find_prev_lone_bracket(view, start, tags, unbalanced=0):
-    # TODO: Extract common functionality from here and the % motion instead of
-    # duplicating code.
-
-    # XXX: refactor this
-    if view.substr(start) == (tags[0][1] if len(tags[0]) > 1 else tags[0]):
-        if not unbalanced and view.substr(start - 1) != '\\':
-            return Region(start, start + 1)
-
-    new_start = start
-    for i in range(unbalanced or 1):
-        prev_opening_bracket = reverse_search_by_pt(view, tags[0],
-                                                    start=0,
-                                                    end=new_start,
-                                                    flags=IGNORECASE)
-
-        if prev_opening_bracket is None:
-            # Unbalanced tags; nothing we can do.
-            return
-
-        while view.substr(prev_opening_bracket.begin() - 1) == '\\':
-            prev_opening_bracket = reverse_search_by_pt(
-                view,
-                tags[0],
-                start=0,
-                end=prev_opening_bracket.begin(),
-                flags=IGNORECASE
-            )
-
-            if prev_opening_bracket is None:
-                return
-
-        new_start = prev_opening_bracket.begin()
-
-    nested = 0
-    while True:
-        next_closing_bracket = reverse_search_by_pt(view,
-                                                    tags[1],
-                                                    start=prev_opening_bracket.a,
-                                                    end=start,
-                                                    flags=IGNORECASE)
-        if not next_closing_bracket:
-            break
+    # type: (...) -> Region
+    bracket = tags[0][-1]
 
-        nested += 1
-        start = next_closing_bracket.begin()
+    if not unbalanced and is_unescaped_opening_bracket(view, start, bracket):
+        return Region(start, start + 1)
 
-    if nested > 0:
-        return find_prev_lone_bracket(view,
-                                      prev_opening_bracket.begin(),
-                                      tags,
-                                      nested)
-    else:
-        return prev_opening_bracket
+    pt = find_enclosing_opening_bracket(view, start, bracket, unbalanced or 1)
+    if pt is not None:
+        return Region(pt, pt + 1)
 
 
 def find_paragraph_text_object(view, s, inclusive=True, count=1):
@@ -526,21 +453,22 @@ def find_paragraph_text_object(view, s, inclusive=True, count=1):
 
 
 def find_sentences_forward(view, start, count=1):
-    def _find_sentence_forward(view, start):
-        char = view.substr(start)
-        if char == '\n':
-            next_sentence = view.find('\\s+', start)
+    text = get_line_index(view).text
+
+    def _find_sentence_forward(start):
+        if text[start:start + 1] == '\n':
+            next_sentence = _RXC_WHITESPACE.search(text, start)
         else:
-            next_sentence = view.find('[\\.\\?\\!][\\)\\]"\']*\\s', start)
+            next_sentence = _RXC_SENTENCE_END.search(text, start)
 
         if next_sentence:
-            return next_non_blank(view, next_sentence.b)
+            return _RXC_BLANKS.match(text, next_sentence.end()).end()
 
     start = start.b if isinstance(start, Region) else start
 
     new_start = start
     for i in range(count):
-        next_sentence = _find_sentence_forward(view, new_start)
+        next_sentence = _find_sentence_forward(new_start)
         if not next_sentence:
             break
 
@@ -634,11 +562,10 @@ def find_inner_paragraph(view, initial_loc):
 
 def find_indent_text_object(view, s, inclusive=True):
     """Implement the indent text object as specified at http://vim.wikia.com/wiki/Indent_text_object."""
-    begin = view.line(s)
-    end = view.line(s)
+    index = get_line_index(view)
 
-    start_line = view.line(s)
-    start_line_content = view.substr(start_line)
+    start_line = Region(index.line(index.row_at(s.begin())).a, index.line(index.row_at(s.end())).b)
+    start_line_content = index.text[start_line.a:start_line.b]
 
     # Do nothing when the line is whitespace-only
     if re.match("^\\s*$", start_line_content):
@@ -654,14 +581,12 @@ def find_indent_text_object(view, s, inclusive=True):
             # When the cursor is on a line with zero indent,
             # the selection will be delimited by blank lines
             # (that may or may not contain whitespaces).
-            pattern = None
             break_on_empty_lines = True
         else:
             # When the cursor is on a line with a non-zero indent,
             # the selection will be delimited by lines with
             # an indent that is less than the original line;
             # blank lines will be SELECTED.
-            pattern = "\\s{0," + str(whitespace_length - 1) + "}\\S"
             break_on_empty_lines = False
     else:
         # "i"
@@ -669,7 +594,6 @@ def find_indent_text_object(view, s, inclusive=True):
             # When the cursor is on a line with zero indent,
             # the selection will be delimited by blank lines
             # (that may or may not contain whitespaces).
-            pattern = None
             break_on_empty_lines = True
         else:
             # When the cursor is on a line with a non-zero indent,
@@ -677,50 +601,36 @@ def find_indent_text_object(view, s, inclusive=True):
             # an indent that is less than the original line;
             # blank lines will be IGNORED and thus,
             # become the delimiter if one is encountered.
-            pattern = "\\s{0," + str(whitespace_length - 1) + "}\\S"
             break_on_empty_lines = True
 
-    if pattern:
-        compiled_pattern = re.compile(pattern)
-
-        def should_break_on_line(line_content):
-            if break_on_empty_lines and not line_content.strip():
-                return True
+    indentation = index.indentation()
 
-            return "pattern_match" if compiled_pattern.match(line_content) else False
+    # Search backward until a delimiting line is found
+    row = index.row_at(s.a)
+    delimiter = indentation.prev_delimiter(row, whitespace_length, break_on_empty_lines)
+    if delimiter == row:
+        p = s.a
+    elif delimiter == -1:
+        p = 0
     else:
-        def should_break_on_line(line_content):
-            return not line_content.strip()
-
-    # Search backward until the pattern is matched
-    p = s.a
-    while True:
-        line = view.line(p)
-        line_content = view.substr(line)
-        if should_break_on_line(line_content):
-            break
-        elif line.begin() == 0:
-            p = 0
-            break
-
-        p = line.begin() - 1
+        p = index.line(delimiter).end()
 
     begin = p + 1 if p > 0 else p
 
-    # To get the value for end, we do the same thing, this time searching forward.
-    p = s.b
-    while True:
-        line = view.line(p)
-        line_content = view.substr(line)
-        if should_break_on_line(line_content):
-            break
-
-        p = line.end() + 1
-
-        if p >= view.size():
-            break
-
-    end = p - 1
+    # To get the value for end, we do the same thing, this time searching
+    # forward. An empty last line is never searched.
+    row = index.row_at(s.b)
+    last_row = index.last_row()
+    if last_row > 0 and index.row_to_pt(last_row) >= index.size():
+        last_row -= 1
+
+    delimiter = indentation.next_delimiter(row, whitespace_length, break_on_empty_lines)
+    if delimiter == row:
+        end = s.b - 1
+    elif delimiter != -1 and delimiter <= last_row:
+        end = index.row_to_pt(delimiter) - 1
+    else:
+        end = index.line(max(row, last_row)).end()
 
     return (begin, end)
 
@@ -794,48 +704,6 @@ def big_word_end_reverse(view, pt, count=1):
     return word_end_reverse(view, pt, count, big=True)
 
 
-def next_end_tag(view, pattern=RX_ANY_TAG, start=0, end=-1):
-    # Args:
-    #   view (sublime.View)
-    #   pattern (str)
-    #   start (int)
-    #   end (int)
-    #
-    # Returns:
-    #   tuple[Region, str, bool]
-    #   typle[None, None, None]
-    region = view.find(pattern, start, IGNORECASE)
-    if region.a == -1:
-        return None, None, None
-
-    match = re.search(pattern, view.substr(region))
-    if match:
-        return (region, match.group(1), match.group(0).startswith('</'))
-
-    return None, None, None
-
-
-def previous_begin_tag(view, pattern, start=0, end=0):
-    assert pattern, 'bad call'
-    region = reverse_search_by_pt(view, pattern, start, end, IGNORECASE)
-    if not region:
-        return None, None, None
-
-    match = re.search(pattern, view.substr(region))
-    if match:
-        return (region, match.group(1), match.group(0)[1] != '/')
-
-    return None, None, None
-
-
-def get_region_end(r):
-    return {'start': r.end()}
-
-
-def get_region_begin(r):
-    return {'start': 0, 'end': r.begin()}
-
-
 def get_closest_tag(view, pt):
     # Args:
     #   view (sublime.View)
@@ -844,92 +712,20 @@ def get_closest_tag(view, pt):
     # Returns:
     #   tuple[int, Region]
     #   tuple[None, None]
-    substr = view.substr
-    while pt > 0 and substr(pt) != '<':
-        pt -= 1
-
-    if substr(pt) != '<':
-        return None, None
-
-    next_tag = view.find(RX_ANY_TAG, pt)
-    if next_tag.a != pt:
+    closest_tag = find_closest_tag(view, pt)
+    if not closest_tag:
         return None, None
 
-    return pt, next_tag
+    return closest_tag.a, closest_tag
 
 
-def find_containing_tag(view, start):
+def find_containing_tag(view, start, count=1):
     # Args:
     #   view (sublime.View)
     #   start (int)
+    #   count (int)
     #
     # Returns:
     #   tuple[Region, Region, str]
     #   tuple[None, None, None]
-    _, closest_tag = get_closest_tag(view, start)
-
-    if not closest_tag:
-        return None, None, None
-
-    start = closest_tag.a if ((closest_tag.contains(start)) and
-                              (view.substr(closest_tag)[1] == '/')) else start
-
-    end_region, tag_name = next_unbalanced_tag(
-        view,
-        search=next_end_tag,
-        search_args={'pattern': RX_ANY_TAG, 'start': start},
-        restart_at=get_region_end
-    )
-
-    if not end_region:
-        return None, None, None
-
-    begin_region, _ = next_unbalanced_tag(
-        view,
-        search=previous_begin_tag,
-        search_args={
-            'pattern': RX_ANY_TAG_NAMED_TPL.format(tag_name),
-            'start': 0,
-            'end': end_region.a
-        },
-        restart_at=get_region_begin
-    )
-
-    if not end_region:
-        return None, None, None
-
-    return begin_region, end_region, tag_name
-
-
-def next_unbalanced_tag(view, search=None, search_args={}, restart_at=None, tags=[]):
-    # Args:
-    #   view (sublime.View)
-    #   search (callable)
-    #   search_args (dict)
-    #   restart_at (callable)
-    #   tags (list[str])
-    #
-    # Returns:
-    #   tuple[Region, str]
-    #   tuple[None, None]
-    assert search and restart_at, 'wrong call'
-    region, tag, is_end_tag = search(view, **search_args)
-
-    if not region:
-        return None, None
-
-    if not is_end_tag:
-        tags.append(tag)
-        search_args.update(restart_at(region))
-
-        return next_unbalanced_tag(view, search, search_args, restart_at, tags)
-
-    if not tags or (tag not in tags):
-        return region, tag
-
-    while tag != tags.pop():
-        continue
-
-    search_args.update(restart_at(region))
-
-    return next_unbalanced_tag(view, search, search_args, restart_at, tags)
+    return find_containing_tags(view, start, count)
@@ -17,6 +17,7 @@
 
 import re
 
+from sublime import CLASS_EMPTY_LINE
 from sublime import CLASS_LINE_END
 from sublime import CLASS_LINE_START
 from sublime import CLASS_PUNCTUATION_END
@@ -28,6 +29,7 @@ from sublime import Region
 from NeoVintageous.nv.utils import last_row
 from NeoVintageous.nv.utils import next_non_blank
 from NeoVintageous.nv.utils import row_at
+from NeoVintageous.nv.vi.lines import get_line_index
 
 
 _WORD_PATTERN = re.compile('\\w')
@@ -39,6 +41,217 @@ _CLASS_VI_INTERNAL_WORD_START = CLASS_WORD_START | CLASS_PUNCTUATION_START | CLA
 _CLASS_VI_WORD_END = CLASS_WORD_END | CLASS_PUNCTUATION_END
 _CLASS_VI_INTERNAL_WORD_END = CLASS_WORD_END | CLASS_PUNCTUATION_END
 
+# Sublime Text's default word separators, for views that don't have the setting.
+_DEFAULT_WORD_SEPARATORS = "./\\()\"'-:,.;<>~!@#$%^&*|+=[]{}`~?"
+
+# Size in characters of the first chunk of text fetched by a word motion. The
+# chunk is doubled each time a motion needs to look further.
+_CHUNK_SIZE = 1024
+
+# The classes that _Chunk can find. The characters of a chunk are translated to
+# one of: "\n" newline, " " blank, "p" punctuation (a word separator) or "w"
+# word, and each class is a pattern of the previous and the current character.
+_CLASS_PATTERNS = (
+    (CLASS_EMPTY_LINE, '(?<=\n)(?=\n)'),
+    (CLASS_LINE_END, '(?=\n)'),
+    (CLASS_LINE_START, '(?<=\n)'),
+    (CLASS_PUNCTUATION_END, '(?<=p)(?=[^p])'),
+    (CLASS_PUNCTUATION_START, '(?<=[^p])(?=p)'),
+    (CLASS_WORD_END, '(?<=w)(?=[^w])'),
+    (CLASS_WORD_START, '(?<=[^w])(?=w)'),
+)
+
+_CLASS_MASK = 0
+for _class, _pattern in _CLASS_PATTERNS:
+    _CLASS_MASK |= _class
+
+_class_regexes = {}  # type: dict
+_class_tables = {}  # type: dict
+
+
+class _ClassTable(dict):
+
+    # A str.translate() table that maps characters to their class. Characters
+    # that aren't blank or word separators are word characters, they are added
+    # to the table the first time they're seen.
+
+    def __init__(self, separators):
+        super().__init__()
+        for c in ' \t\x00':
+            self[ord(c)] = ' '
+
+        self[ord('\n')] = '\n'
+
+        for c in separators:
+            self.setdefault(ord(c), 'p')
+
+    def __missing__(self, key):
+        self[key] = 'w'
+
+        return 'w'
+
+
+def _class_table(separators):
+    try:
+        return _class_tables[separators]
+    except KeyError:
+        table = _class_tables[separators] = _ClassTable(separators)
+
+        return table
+
+
+def _class_regex(classes):
+    try:
+        return _class_regexes[classes]
+    except KeyError:
+        pattern = '|'.join(pattern for cls, pattern in _CLASS_PATTERNS if classes & cls)
+        regex = _class_regexes[classes] = re.compile(pattern)
+
+        return regex
+
+
+class _Chunk():
+
+    # A read-only stand-in for a view that answers the calls the word motions
+    # make (size, substr, classify, find_by_class, and line) from a chunk of
+    # text fetched once, instead of an API call each. The chunk starts one
+    # character before the start point, so the class of the start point is
+    # known, and grows forward as needed. Anything the chunk can't answer is
+    # passed on to the view.
+
+    def __init__(self, view, start):
+        self.view = view
+        self.separators = view.settings().get('word_separators') or _DEFAULT_WORD_SEPARATORS
+        self.table = _class_table(self.separators)
+        self.a = self.b = max(0, start - 1)
+        self.text = ''
+        self.classes = ''
+        self._size = view.size()
+        self._line = None
+        self._extend(start + _CHUNK_SIZE)
+
+    def _extend(self, b=None):
+        # Grow the chunk to end at b, or double it. Returns False at EOF.
+        if self.b >= self._size:
+            return False
+
+        if b is None:
+            b = self.b + max(_CHUNK_SIZE, self.b - self.a)
+
+        b = min(b, self._size)
+        text = self.view.substr(Region(self.b, b))
+        self.text += text
+        self.classes += text.translate(self.table)
+        self.b = b
+
+        return True
+
+    def size(self):
+        return self._size
+
+    def substr(self, x):
+        if isinstance(x, Region):
+            begin = max(0, x.begin())
+            end = min(x.end(), self._size)
+            while end > self.b and self._extend():
+                pass
+
+            if begin >= self.a:
+                return self.text[begin - self.a:end - self.a]
+
+            return self.view.substr(x)
+
+        if x >= self._size:
+            return '\x00'
+
+        while x >= self.b and self._extend():
+            pass
+
+        if self.a <= x < self.b:
+            return self.text[x - self.a]
+
+        return self.view.substr(x)
+
+    def line(self, pt):
+        pt = max(0, min(pt, self._size))
+        if pt < self.a:
+            return self.view.line(pt)
+
+        # The motions ask for the same line over and over, and a line can be
+        # very long e.g. minified code.
+        line = self._line
+        if line and line.a <= pt <= line.b:
+            return line
+
+        self._line = line = self._find_line(pt)
+
+        return line
+
+    def _find_line(self, pt):
+        i = self.text.rfind('\n', 0, pt - self.a)
+        if i >= 0:
+            a = self.a + i + 1
+        elif self.a == 0:
+            a = 0
+        else:
+            a = self.view.line(pt).a
+
+        while True:
+            i = self.text.find('\n', pt - self.a)
+            if i >= 0:
+                return Region(a, self.a + i)
+
+            if not self._extend():
+                return Region(a, self._size)
+
+    def classify(self, pt):
+        if pt <= self.a or pt > self._size:
+            return self.view.classify(pt)
+
+        while pt >= self.b and self._extend():
+            pass
+
+        # Only the classes in _CLASS_PATTERNS are set.
+        i = pt - self.a
+        prev = self.classes[i - 1]
+        curr = self.classes[i] if pt < self._size else '\n'
+
+        classes = 0
+        if prev == '\n':
+            classes |= CLASS_LINE_START
+            if curr == '\n':
+                classes |= CLASS_EMPTY_LINE
+
+        if curr == '\n':
+            classes |= CLASS_LINE_END
+
+        if prev != curr:
+            if curr == 'w':
+                classes |= CLASS_WORD_START
+            elif curr == 'p':
+                classes |= CLASS_PUNCTUATION_START
+
+            if prev == 'w':
+                classes |= CLASS_WORD_END
+            elif prev == 'p':
+                classes |= CLASS_PUNCTUATION_END
+
+        return classes
+
+    def find_by_class(self, pt, forward, classes, separators=''):
+        if (not forward or classes & ~_CLASS_MASK or pt < self.a or
+                (separators and separators != self.separators)):
+            return self.view.find_by_class(pt, forward=forward, classes=classes, separators=separators)
+
+        regex = _class_regex(classes)
+        while True:
+            match = regex.search(self.classes, pt + 1 - self.a)
+            if match and self.a + match.start() < self.b:
+                return self.a + match.start()
+
+            if not self._extend():
+                return self._size
+
 
 def at_eol(view, pt):
     return (view.classify(pt) & CLASS_LINE_END) == CLASS_LINE_END
@@ -117,6 +330,10 @@ def word_starts(view, start, count=1, internal=False):
     assert start >= 0
     assert count > 0
 
+    return _word_starts(_Chunk(view, start), start, count, internal)
+
+
+def _word_starts(view, start, count, internal):
     pt = start
     for i in range(count):
         # On the last motion iteration, we must do some special stuff if we are still on the
@@ -144,6 +361,11 @@ def big_word_starts(view, start, count=1, internal=False):
     assert start >= 0
     assert count > 0
 
+    return _big_word_starts(_Chunk(view, start), start, count, internal)
+
+
+def _big_word_starts(view, start, count, internal):
+    # type: (...) -> int
     pt = start
     for i in range(count):
         if internal and i == count - 1 and view.line(start) == view.line(pt):
@@ -170,6 +392,11 @@ def word_ends(view, start, count=1, big=False):
     # type: (...) -> int
     assert start >= 0 and count > 0, 'bad call'
 
+    return _word_ends(_Chunk(view, start), start, count, big)
+
+
+def _word_ends(view, start, count, big):
+    # type: (...) -> int
     pt = start
     if not view.substr(start).isspace():
         pt = start + 1
@@ -239,29 +466,30 @@ def inner_lines(view, s, count=1):
 
 
 def next_paragraph_start(view, pt, count=1, skip_empty=True):
-    if row_at(view, pt) == last_row(view):
-        if not view.line(view.size()).empty():
-            return view.size() - 1
+    index = get_line_index(view)
+    current_row = index.row_at(pt)
+    if current_row == index.last_row():
+        if not index.is_empty(current_row):
+            return index.size() - 1
 
-        return view.size()
+        return index.size()
 
     # skip empty rows before moving for the first time
-    current_row = row_at(view, pt)
-    if (view.line(view.text_point(current_row + 1, 0)).empty() and view.line(pt).empty()):
-        pt, _ = _next_non_empty_row(view, pt)
+    if index.is_empty(current_row + 1) and index.is_empty(current_row):
+        pt, _ = _next_non_empty_row(index, pt)
 
     for i in range(count):
-        pt, eof = _next_empty_row(view, pt)
+        pt, eof = _next_empty_row(index, pt)
         if eof:
-            if view.line(pt).empty():
+            if index.is_empty(index.last_row()):
                 return pt
 
             return pt - 1
 
         if skip_empty and (i != (count - 1)):
-            pt, eof = _next_non_empty_row(view, pt)
+            pt, eof = _next_non_empty_row(index, pt)
             if eof:
-                if not view.line(pt).empty():
+                if not index.is_empty(index.last_row()):
                     return pt - 1
 
                 return pt
@@ -269,74 +497,61 @@ def next_paragraph_start(view, pt, count=1, skip_empty=True):
     return pt
 
 
-def _next_empty_row(view, pt):
-    r = row_at(view, pt)
-    while True:
-        r += 1
-        pt = view.text_point(r, 0)
-        if row_at(view, pt) == last_row(view):
-            return view.size(), True
+def _next_empty_row(index, pt):
+    r = index.next_empty_row(index.row_at(pt))
+    if r == -1 or r >= index.last_row():
+        return index.size(), True
 
-        if view.line(pt).empty():
-            return pt, False
+    return index.row_to_pt(r), False
 
 
-def _next_non_empty_row(view, pt):
-    r = row_at(view, pt)
-    while True:
-        r += 1
-        reg = view.line(view.text_point(r, 0))
-        if r >= last_row(view):
-            return view.size(), True
+def _next_non_empty_row(index, pt):
+    r = index.next_non_empty_row(index.row_at(pt))
+    if r == -1 or r >= index.last_row():
+        return index.size(), True
 
-        if not reg.empty():
-            return reg.a, False
+    return index.row_to_pt(r), False
 
 
 def prev_paragraph_start(view, pt, count=1, skip_empty=True):
+    index = get_line_index(view)
+    current_row = index.row_at(pt)
+
     # first row?
-    if row_at(view, pt) == 0:
+    if current_row == 0:
         return 0
 
-    current_row = row_at(view, pt)
-    if (view.line(view.text_point(current_row - 1, 0)).empty() and view.line(view.text_point(current_row, 0)).empty()):
-        pt, bof = _prev_non_empty_row(view, pt)
+    if index.is_empty(current_row - 1) and index.is_empty(current_row):
+        pt, bof = _prev_non_empty_row(index, pt)
         if bof:
             return 0
 
     for i in range(count):
-        pt, bof = _prev_empty_row(view, pt)
+        pt, bof = _prev_empty_row(index, pt)
         if bof:
             return 0
 
         if skip_empty and (count > 1) and (i != count - 1):
-            pt, bof = _prev_non_empty_row(view, pt)
+            pt, bof = _prev_non_empty_row(index, pt)
             if bof:
                 return pt
 
-    return view.text_point(row_at(view, pt), 0)
+    return index.row_to_pt(index.row_at(pt))
 
 
-def _prev_empty_row(view, pt):
-    r = row_at(view, pt)
-    while True:
-        r -= 1
-        if r == 0:
-            return 0, True
+def _prev_empty_row(index, pt):
+    # The first row is never a match.
+    r = index.prev_empty_row(index.row_at(pt))
+    if r < 1:
+        return 0, True
 
-        pt = view.text_point(r, 0)
-        if view.line(pt).empty():
-            return pt, False
+    return index.row_to_pt(r), False
 
 
-def _prev_non_empty_row(view, pt):
-    r = row_at(view, pt)
-    while True:
-        r -= 1
-        reg = view.line(view.text_point(r, 0))
-        # stop if we hit the first row
-        if r <= 0:
-            return 0, True
-
-        if not reg.empty():
-            return reg.a, False
+def _prev_non_empty_row(index, pt):
+    # stop if we hit the first row
+    r = index.prev_non_empty_row(index.row_at(pt))
+    if r < 1:
+        return 0, True
+
+    return index.row_to_pt(r), False
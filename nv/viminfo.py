@@ -0,0 +1,163 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+
+from sublime import set_timeout_async
+
+from NeoVintageous.nv.journal import journal_append
+from NeoVintageous.nv.journal import journal_load
+
+
+# Persists registers, marks and macros between sessions, like Vim's viminfo
+# file. The state is stored in sections of key -> value, and written to the
+# file as a journal of operations (see nv/journal.py):
+#
+#   ["s", section, key, value]  set a key
+#   ["d", section, key]         delete a key
+#
+# Changes are queued and appended to the file on the worker thread, so saving
+# never blocks the UI. Changes to the same key before the queue is written are
+# merged into one line. The file is read on the worker thread after startup,
+# or on first use if that comes first, and compacted when it has grown to
+# many times the size of the state it holds.
+_file = None  # type: str
+_loaded = True
+
+_data = {}  # type: dict
+
+# Pending changes keyed by (section, key). A value of _DELETED deletes the key.
+_pending = {}  # type: dict
+_DELETED = object()
+
+# Guards _data, _pending and the file, which the worker thread uses too.
+_lock = threading.RLock()
+
+
+def viminfo_set_file(path):
+    # type: (str) -> None
+    # Set the file to persist to.
+    #
+    # The file is loaded in the background. Anything that needs it before then
+    # waits for it to load.
+    global _file, _loaded
+
+    with _lock:
+        _file = path
+        _loaded = path is None
+        _data.clear()
+        _pending.clear()
+
+    if path is not None:
+        set_timeout_async(_load, 0)
+
+
+def viminfo_get(section):
+    # type: (str) -> dict
+    # Returns a copy of the persisted keys and values of a section, including
+    # changes that are not written yet.
+    if _file is None:
+        return {}
+
+    with _lock:
+        _load()
+
+        values = dict(_data.get(section, {}))
+        for (pending_section, key), value in _pending.items():
+            if pending_section == section:
+                if value is _DELETED:
+                    values.pop(key, None)
+                else:
+                    values[key] = value
+
+        return values
+
+
+def viminfo_set(section, key, value):
+    # type: (str, str, object) -> None
+    # Persist a value. The value must be serializable to JSON.
+    _queue(section, key, value)
+
+
+def viminfo_del(section, key):
+    # type: (str, str) -> None
+    _queue(section, key, _DELETED)
+
+
+def _queue(section, key, value):
+    if _file is None:
+        return
+
+    with _lock:
+        scheduled = bool(_pending)
+        _pending[(section, key)] = value
+
+    if not scheduled:
+        set_timeout_async(_flush, 0)
+
+
+def _load():
+    # type: () -> None
+    global _loaded
+
+    with _lock:
+        if _loaded or _file is None:
+            return
+
+        _loaded = True
+
+        journal_load(_file, _replay, _snapshot)
+
+
+def _replay(op):
+    # type: (list) -> None
+    name = op[0]
+    if name == 's':
+        _data.setdefault(op[1], {})[op[2]] = op[3]
+    elif name == 'd':
+        _data.get(op[1], {}).pop(op[2], None)
+
+
+def _flush():
+    # type: () -> None
+    # Append the pending changes to the journal.
+    with _lock:
+        _load()
+
+        ops = []
+        for (section, key), value in _pending.items():
+            if value is _DELETED:
+                _data.get(section, {}).pop(key, None)
+                ops.append(['d', section, key])
+            else:
+                _data.setdefault(section, {})[key] = value
+                ops.append(['s', section, key, value])
+
+        _pending.clear()
+
+        if ops and _file is not None:
+            journal_append(_file, ops)
+
+
+def _snapshot():
+    # type: () -> list
+    ops = []
+    for section, keys in sorted(_data.items()):
+        for key, value in sorted(keys.items()):
+            ops.append(['s', section, key, value])
+
+    return ops
@@ -94,10 +94,17 @@ def _update_ignored_packages():
 
 def _cleanup_views():
 
-    # Resets cursor and mode. In the case of errors loading the plugin this can
-    # help prevent the normal functioning of editor becoming unusable e.g. the
-    # cursor getting stuck in a block shape or the mode getting stuck in normal
-    # or visual mode.
+    # Resets cursor and mode, and discards the in-process view state. In the
+    # case of errors loading the plugin this can help prevent the normal
+    # functioning of editor becoming unusable e.g. the cursor getting stuck in a
+    # block shape or the mode getting stuck in normal or visual mode.
+
+    # The state module may be one of the modules that failed to load.
+    try:
+        from NeoVintageous.nv.state import clear_view_state
+    except Exception:
+        def clear_view_state(view):
+            pass
 
     for window in sublime.windows():
         for view in window.views():
@@ -105,6 +112,7 @@ def _cleanup_views():
             settings.set('command_mode', False)
             settings.set('inverse_caret_state', False)
             settings.erase('vintage')
+            clear_view_state(view)
 
 
 def _init_backwards_compat_fixes():
@@ -183,6 +191,22 @@ def plugin_loaded():
         traceback.print_exc()
         loading_exeption = e
 
+    try:
+        from NeoVintageous.nv.history import history_set_file
+        history_set_file(os.path.join(sublime.cache_path(), 'NeoVintageous', 'history'))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        loading_exeption = e
+
+    try:
+        from NeoVintageous.nv.viminfo import viminfo_set_file
+        viminfo_set_file(os.path.join(sublime.cache_path(), 'NeoVintageous', 'viminfo'))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        loading_exeption = e
+
     if _startup_exception or loading_exeption:
 
         try:
@@ -0,0 +1,107 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Helpers shared by the benchmarks.
+#
+# The benchmarks time the current code only. To compare a change against the
+# code it replaces, save a baseline on the base commit and run the benchmark
+# again on the change:
+#
+#   >>> bench_name.run(save_baseline=True)  # On the base commit.
+#   >>> bench_name.run()
+#
+# Or, with the headless runner:
+#
+#   $ python -m NeoVintageous.tests.headless --bench NAME --save-baseline
+#   $ python -m NeoVintageous.tests.headless --bench NAME
+
+from timeit import default_timer
+import json
+import os
+
+import sublime
+
+
+def counting(calls, method):
+    # Returns the method wrapped to count its calls in calls[0].
+    def counted(*args, **kwargs):
+        calls[0] += 1
+
+        return method(*args, **kwargs)
+
+    return counted
+
+
+def timed(api, f, *args):
+    # Calls f with the args, counting the calls made to the sublime.View
+    # methods named in api.
+    #
+    # Returns:
+    #   tuple: The time f took (in seconds), the number of calls, and what f
+    #       returned.
+    calls = [0]
+    originals = [(name, getattr(sublime.View, name)) for name in api]
+    for name, method in originals:
+        setattr(sublime.View, name, counting(calls, method))
+    try:
+        start = default_timer()
+        result = f(*args)
+        elapsed = default_timer() - start
+    finally:
+        for name, method in originals:
+            setattr(sublime.View, name, method)
+
+    return elapsed, calls[0], result
+
+
+def baseline_file(name):
+    # Returns the file the benchmark called name saves its baseline to, in the
+    # NeoVintageous cache directory.
+    return os.path.join(sublime.cache_path(), 'NeoVintageous', name + '.json')
+
+
+def load_baseline(file_name):
+    try:
+        with open(file_name) as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return {}
+
+
+def write_baseline(file_name, results):
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    with open(file_name, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def format_baseline(baseline, case):
+    # Returns the time and calls of the case in the baseline, as saved from
+    # the (time, calls) results of a run.
+    if case not in baseline:
+        return 'baseline: -'
+
+    return 'baseline: %.4fs %6d calls' % tuple(baseline[case])
+
+
+def finish_baseline(title, file_name, results, save_baseline):
+    # Saves the results as the baseline, if asked to, and reports what was
+    # compared.
+    if save_baseline:
+        write_baseline(file_name, results)
+        print('%s: saved baseline to %s' % (title, file_name))
+    elif not os.path.exists(file_name):
+        print('%s: no baseline found at %s' % (title, file_name))
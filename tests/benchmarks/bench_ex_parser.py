@@ -0,0 +1,154 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmark for parsing ex command lines.
+#
+# Parses a corpus of real command lines (the kind found in a .neovintageousrc
+# and typed at the cmdline) with the command name table lookup, and with the
+# sequential matching of every route pattern that the scanner used
+# previously, both without the parsed command line cache. Then parses them
+# again through the cache.
+#
+# Run from the Sublime Text console:
+#
+#   >>> from NeoVintageous.tests.benchmarks import bench_ex_parser
+#   >>> bench_ex_parser.run()
+
+from timeit import default_timer
+from unittest import mock
+
+from NeoVintageous.nv.ex import scanner
+from NeoVintageous.nv.ex.parser import _parse_command_line
+from NeoVintageous.nv.ex.parser import parse_command_line
+from NeoVintageous.nv.ex.tokens import TokenEof
+from NeoVintageous.nv.ex_routes import ex_routes
+
+_REPEAT = 200
+
+_CORPUS = (
+    'nnoremap <leader>w :w<CR>',
+    'nnoremap <C-j> <C-w>j',
+    'nnoremap <C-k> <C-w>k',
+    'noremap Y y$',
+    'vnoremap < <gv',
+    'vnoremap > >gv',
+    'onoremap ie :<C-u>normal! ggVG<CR>',
+    'snoremap <BS> <BS>i',
+    'nunmap Q',
+    'let mapleader=,',
+    'set hlsearch',
+    'set ignorecase',
+    'setlocal wrap',
+    'w',
+    'wq',
+    'wall',
+    'wqall',
+    'q!',
+    'qall',
+    'x',
+    'e foo/bar.py',
+    'edit!',
+    'sp',
+    'vsplit',
+    'tabnext',
+    'tabclose',
+    'only',
+    'close',
+    'bnext',
+    'bprevious',
+    'ls',
+    'registers',
+    'noh',
+    'pwd',
+    'cd ~/projects',
+    '%s/foo/bar/g',
+    's/\\s\\+$//e',
+    '1,10s/a/b/',
+    "'<,'>s/x/y/g",
+    'g/pattern/d',
+    'v/keep/d',
+    '.,$d',
+    '10,20d x',
+    '5,8y',
+    '3,4m0',
+    '1,5t.',
+    '1,5co$',
+    "'a,'bsort u",
+    '%sort i',
+    'normal! dd',
+    'silent !make',
+    '!ls -la',
+    'r file.txt',
+    'help neovintageous',
+    'history',
+    'file',
+    'new',
+    'print',
+    'unvsplit',
+    '&&',
+)
+
+
+def _sequential_scan_command(state):
+    for route, command in ex_routes.items():
+        if state.match(route):
+            state.ignore()
+
+            cmd = command(state)
+
+            state.expect_eof(lambda: Exception("E492: Not an editor command: %s" % state.source))
+
+            return None, [cmd, TokenEof()]
+
+    raise Exception("E492: Not an editor command: %s" % state.source)
+
+
+def _time(parse):
+    start = default_timer()
+    for i in range(_REPEAT):
+        for source in _CORPUS:
+            parse(source)
+
+    return default_timer() - start
+
+
+def run():
+    for source in _CORPUS:
+        with mock.patch.object(scanner, '_scan_command', _sequential_scan_command):
+            before = _parse_command_line(source).command
+        after = _parse_command_line(source).command
+        if before != after:
+            raise AssertionError('{}: {} != {}'.format(source, before, after))
+
+    with mock.patch.object(scanner, '_scan_command', _sequential_scan_command):
+        before = _time(_parse_command_line)
+
+    after = _time(_parse_command_line)
+    cached = _time(parse_command_line)
+
+    lines = _REPEAT * len(_CORPUS)
+
+    print('ex parser: %d command lines' % lines)
+    print('  before (sequential routes): %.4fs (%.2fus/line)' % (before, before / lines * 1e6))
+    print('  after (name lookup):        %.4fs (%.2fus/line)' % (after, after / lines * 1e6))
+    print('  cached:                     %.4fs (%.2fus/line)' % (cached, cached / lines * 1e6))
+
+    return before, after, cached
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,235 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Keystroke throughput benchmark with a per-stage timing breakdown.
+#
+# Feeds repeatable scenarios through _nv_feed_key on a real view: typing
+# counts and motions, dw/ciw/. repetition, visual block edits, a macro replayed
+# over 10k lines, and :s and :g on a large buffer. The stages are recorded by
+# the feed key, State.eval(), and :substitute timing hooks:
+#
+#   total       The whole key press (or cmdline), as seen by the benchmark.
+#   key         Every _nv_feed_key call, including the keys fed by '.' etc.
+#   state       Loading and updating the view State.
+#   resolve     Mapping resolution.
+#   translate   Translating the command definitions into commands.
+#   macros      Adding steps to the macro recorder.
+#   dispatch    Running the motion or action.
+#   search      :substitute search.
+#   apply       :substitute apply.
+#
+# Each scenario is run a few times, and the lowest of each percentile is kept
+# to smooth out the noise. The percentiles are compared against a saved
+# baseline, and stages that got slower by more than the threshold are flagged.
+#
+# Run from the Sublime Text console:
+#
+#   >>> from NeoVintageous.tests.benchmarks import bench_feed_keys
+#   >>> bench_feed_keys.run(save_baseline=True)  # On the base commit.
+#   >>> bench_feed_keys.run()
+
+from timeit import default_timer
+from unittest import mock
+
+import sublime
+
+from NeoVintageous.nv import commands
+from NeoVintageous.nv import ex_cmds
+from NeoVintageous.nv import state
+from NeoVintageous.nv.ex_cmds import do_ex_cmdline
+from NeoVintageous.nv.state import State
+from NeoVintageous.nv.vi.keys import KeySequenceTokenizer
+from NeoVintageous.nv.vim import NORMAL
+from NeoVintageous.tests import benchmarks
+
+_STAGES = ('total', 'key', 'state', 'resolve', 'translate', 'macros', 'dispatch', 'search', 'apply')
+
+_PERCENTILES = (50, 90, 99)
+
+# Differences below this (in seconds) are treated as noise.
+_NOISE = 5e-6
+
+
+def _words(lines):
+    return ['%d alpha beta gamma delta epsilon' % i for i in range(lines)]
+
+
+def _matches(lines):
+    return ['line %d of some generated text%s' % (i, ' foo' if i % 10 == 0 else '') for i in range(lines)]
+
+
+# Each scenario is a name, the buffer lines, and a list of steps. A step is a
+# key sequence, or a tuple of ('insert', text) for text typed in insert mode,
+# or (':', cmdline) for an ex command.
+_SCENARIOS = (
+    ('counts and motions', _words(2000), ['3w', '2j', '5l', 'b', '$', '0', '10G', 'gg', '4e', '3k'] * 100),
+    ('dw ciw and repeat', _words(2000), ['dw', 'j', '.', 'ciw', ('insert', 'foo'), '<Esc>', 'j', '.', 'j'] * 100),
+    ('visual block edits', _words(2000), [
+        '<C-v>', '2j', 'l', 'x', '<C-v>', '2j', 'l', 'U', '<C-v>', '2j', 'I', ('insert', '--'), '<Esc>', '4j'] * 50),
+    ('macro replay', _words(10000), ['qq', '0', 'x', 'j', 'q', '9998@q']),
+    ('substitute and global', _matches(50000), [(':', ':%s/foo/bar/g'), (':', ':g/5$/s/line/LINE/'), 'u', 'u']),
+)
+
+
+def _run_step(window, step):
+    if isinstance(step, tuple):
+        kind, value = step
+        if kind == 'insert':
+            window.active_view().run_command('insert', {'characters': value})
+        else:
+            do_ex_cmdline(window, value)
+    else:
+        for key in KeySequenceTokenizer(step).iter_tokenize():
+            window.run_command('_nv_feed_key', {'key': key})
+
+
+def _run_scenario(lines, steps):
+    timings = {}  # type: dict
+
+    def _record(stage, seconds):
+        timings.setdefault(stage, []).append(seconds)
+
+    view = sublime.active_window().new_file()
+    try:
+        view.set_scratch(True)
+        view.run_command('append', {'characters': '\n'.join(lines) + '\n'})
+        view.sel().clear()
+        view.sel().add(0)
+        State(view).mode = NORMAL
+
+        with mock.patch.object(commands, 'feed_key_timing_hook', _record), \
+                mock.patch.object(state, 'eval_timing_hook', _record), \
+                mock.patch.object(ex_cmds, 'substitute_timing_hook',
+                                  lambda search, apply, *args: (_record('search', search), _record('apply', apply))):
+            for step in steps:
+                start = default_timer()
+                _run_step(view.window(), step)
+                _record('total', default_timer() - start)
+    finally:
+        view.close()
+
+    return timings
+
+
+def _percentile(sorted_samples, percent):
+    index = max(0, int(round(percent / 100.0 * len(sorted_samples))) - 1)
+
+    return sorted_samples[index]
+
+
+def _summarise(timings):
+    summary = {}
+    for stage, samples in timings.items():
+        samples = sorted(samples)
+        summary[stage] = {'n': len(samples)}
+        for percent in _PERCENTILES:
+            summary[stage]['p%d' % percent] = _percentile(samples, percent)
+
+    return summary
+
+
+def _best_of(summaries):
+    best = summaries[0]
+    for summary in summaries[1:]:
+        for stage, stats in summary.items():
+            for key, value in stats.items():
+                best[stage][key] = min(best[stage][key], value)
+
+    return best
+
+
+def _format_time(seconds):
+    if seconds >= 0.1:
+        return '%.3fs' % seconds
+
+    if seconds >= 0.0001:
+        return '%.2fms' % (seconds * 1e3)
+
+    return '%.1fus' % (seconds * 1e6)
+
+
+def _regressions(summary, baseline, threshold):
+    regressions = []
+    for stage, stats in summary.items():
+        if stage not in baseline:
+            continue
+
+        for percent in _PERCENTILES[:2]:
+            key = 'p%d' % percent
+            before = baseline[stage][key]
+            after = stats[key]
+            if after > before * (1 + threshold) and after - before > _NOISE:
+                regressions.append((stage, key, before, after))
+
+    return regressions
+
+
+def _print_summary(name, summary, baseline, regressions):
+    print('feed keys: %s' % name)
+    print('  %-10s %6s %10s %10s %10s %10s' % ('stage', 'n', 'p50', 'p90', 'p99', 'base p90'))
+    for stage in _STAGES:
+        if stage in summary:
+            stats = summary[stage]
+            print('  %-10s %6d %10s %10s %10s %10s' % (
+                stage, stats['n'], _format_time(stats['p50']), _format_time(stats['p90']),
+                _format_time(stats['p99']), _format_time(baseline[stage]['p90']) if stage in baseline else '-'))
+
+    for stage, key, before, after in regressions:
+        print('  REGRESSION %s %s %s -> %s' % (stage, key, _format_time(before), _format_time(after)))
+
+
+def run(save_baseline=False, baseline_file=None, threshold=0.25, repeat=3):
+    # Args:
+    #   save_baseline (bool): Save the results as the new baseline.
+    #   baseline_file (str): Defaults to bench_feed_keys.json in the
+    #       NeoVintageous cache directory.
+    #   threshold (float): How much slower (as a fraction) a stage's p50 or
+    #       p90 can be than the baseline before it is flagged as a regression.
+    #   repeat (int): How many times to run each scenario.
+    #
+    # Returns:
+    #   tuple: The results (the percentiles of each stage by scenario) and a
+    #       list of the regressions as (scenario, stage, percentile, before,
+    #       after) tuples.
+    if baseline_file is None:
+        baseline_file = benchmarks.baseline_file('bench_feed_keys')
+
+    baseline = {} if save_baseline else benchmarks.load_baseline(baseline_file)
+
+    results = {}
+    regressions = []
+    for name, lines, steps in _SCENARIOS:
+        summary = _best_of([_summarise(_run_scenario(lines, steps)) for i in range(repeat)])
+        scenario_baseline = baseline.get(name, {})
+        scenario_regressions = _regressions(summary, scenario_baseline, threshold)
+        _print_summary(name, summary, scenario_baseline, scenario_regressions)
+        results[name] = summary
+        regressions.extend((name,) + regression for regression in scenario_regressions)
+
+    if save_baseline:
+        benchmarks.write_baseline(baseline_file, results)
+        print('feed keys: saved baseline to %s' % baseline_file)
+    elif not baseline:
+        print('feed keys: no baseline found at %s' % baseline_file)
+    else:
+        print('feed keys: %d regression%s' % (len(regressions), '' if len(regressions) == 1 else 's'))
+
+    return results, regressions
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,107 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmark for the indent text objects, ai and ii.
+#
+# Times the text objects in a 20k line Python module, on a line at the top
+# level indent, on a line in a method, and on a line in a method that is as
+# long as the module. The indentation table is built the first time a text
+# object is used after the buffer is modified, so the text objects are timed
+# both with a fresh table and with a cached one, and the view API calls made
+# are counted. The fresh table is compared against a saved baseline.
+#
+# Run from the Sublime Text console:
+#
+#   >>> from NeoVintageous.tests.benchmarks import bench_indent_text_object
+#   >>> bench_indent_text_object.run(save_baseline=True)  # On the base commit.
+#   >>> bench_indent_text_object.run()
+
+import sublime
+
+from NeoVintageous.nv.vi import lines
+from NeoVintageous.nv.vi import text_objects
+from NeoVintageous.tests import benchmarks
+
+_LINES = 20000
+
+_API = ('line', 'size', 'substr')
+
+
+def _time(view, pt, inclusive):
+    return benchmarks.timed(_API, text_objects.find_indent_text_object, view, sublime.Region(pt), inclusive)
+
+
+def run(save_baseline=False, baseline_file=None):
+    # Args:
+    #   save_baseline (bool): Save the results as the new baseline.
+    #   baseline_file (str): Defaults to bench_indent_text_object.json in the
+    #       NeoVintageous cache directory.
+    #
+    # Returns:
+    #   dict: The time and the view API calls of each text object with a fresh
+    #       table.
+    if baseline_file is None:
+        baseline_file = benchmarks.baseline_file('bench_indent_text_object')
+
+    baseline = {} if save_baseline else benchmarks.load_baseline(baseline_file)
+
+    methods = []
+    for i in range(_LINES // 10):
+        methods.append('    def fizz_%d(self, buzz):\n' % i)
+        methods.extend('        buzz = buzz + %d\n' % j for j in range(8))
+        methods.append('\n')
+    text = 'class Fizz:\n' + ''.join(methods[:-1]) + 'fizz = Fizz()\n'
+
+    # The method that the long lines are in is the whole module.
+    long_method = '    def fizz(self, buzz):\n' + '        buzz = buzz + 1\n' * _LINES
+
+    results = {}
+
+    view = sublime.active_window().new_file()
+    try:
+        view.set_scratch(True)
+        view.run_command('append', {'characters': text})
+        size = view.size()
+        view.run_command('append', {'characters': long_method})
+        cases = (
+            ('top level', 0),
+            ('method', text.index('buzz + 4')),
+            ('long method', size + long_method.index('buzz + 1')),
+        )
+
+        print('indent text object: %d lines' % (_LINES * 2))
+        for name, pt in cases:
+            for inclusive in (True, False):
+                motion = ('a' if inclusive else 'i') + ' ' + name
+                lines.clear_line_index(view)
+                fresh_time, fresh_calls, fresh_region = _time(view, pt, inclusive)
+                cached_time, cached_calls, cached_region = _time(view, pt, inclusive)
+                assert fresh_region == cached_region, 'regions differ for %s' % motion
+                print('  %-13s fresh table: %.4fs %6d calls  cached table: %.6fs %d calls  %s' % (
+                    motion, fresh_time, fresh_calls, cached_time, cached_calls,
+                    benchmarks.format_baseline(baseline, motion)))
+                results[motion] = (fresh_time, fresh_calls)
+    finally:
+        view.close()
+
+    benchmarks.finish_baseline('indent text object', baseline_file, results, save_baseline)
+
+    return results
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,99 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Micro-benchmark for key sequence resolution.
+#
+# Resolves 100k keystrokes of common normal mode sequences through the same
+# calls that mappings_resolve() makes on every keystroke, once with the
+# memoized seq_to_command() and to_bare_command_name() and once without.
+#
+# Run from the Sublime Text console:
+#
+#   >>> from NeoVintageous.tests.benchmarks import bench_keys
+#   >>> bench_keys.run()
+
+from timeit import default_timer
+import random
+
+from NeoVintageous.nv.vi import cmd_defs  # noqa: F401
+from NeoVintageous.nv.vi.cmd_base import ViMissingCommandDef
+from NeoVintageous.nv.vi.keys import _resolve_seq
+from NeoVintageous.nv.vi.keys import _to_bare_command_name
+from NeoVintageous.nv.vi.keys import seq_cache_clear
+from NeoVintageous.nv.vi.keys import seq_to_command
+from NeoVintageous.nv.vi.keys import to_bare_command_name
+from NeoVintageous.nv.vim import NORMAL
+
+_KEYS = 100000
+
+_SEQUENCES = (
+    'h', 'j', 'k', 'l', 'w', 'b', 'e', '0', '$', 'gg', 'G', 'x', 'dd', 'yy',
+    'p', 'u', 'dw', 'cw', 'ciw', 'daw', '2j', '10k', '3dd', '"ayy', '"ap',
+    '<C-d>', '<C-u>', '<C-w>j', 'zz', 'ys', '.', 'n', 'N', '*', '%'
+)
+
+
+class _Settings(dict):
+    pass
+
+
+class _View():
+
+    def __init__(self):
+        self._settings = _Settings()
+
+    def settings(self):
+        return self._settings
+
+
+def _uncached_seq_to_command(view, seq, mode):
+    plugin_command, command = _resolve_seq(seq, mode)
+    if plugin_command:
+        if not hasattr(plugin_command, 'is_enabled') or plugin_command.is_enabled(view.settings()):
+            return plugin_command
+
+    return command or ViMissingCommandDef()
+
+
+def _feed(view, seqs, bare_command_name, resolve):
+    for seq in seqs:
+        resolve(view, bare_command_name(seq), NORMAL)
+
+
+def run(seed=0):
+    rnd = random.Random(seed)
+    seqs = [rnd.choice(_SEQUENCES) for _ in range(_KEYS)]
+    view = _View()
+
+    seq_cache_clear()
+    start = default_timer()
+    _feed(view, seqs, to_bare_command_name, seq_to_command)
+    cached_time = default_timer() - start
+
+    start = default_timer()
+    _feed(view, seqs, _to_bare_command_name, _uncached_seq_to_command)
+    uncached_time = default_timer() - start
+
+    print('keys: %d keystrokes of %d sequences' % (len(seqs), len(_SEQUENCES)))
+    print('  cached:   %.4fs (%.0f keys/s)' % (cached_time, len(seqs) / cached_time))
+    print('  uncached: %.4fs (%.0f keys/s)' % (uncached_time, len(seqs) / uncached_time))
+
+    return cached_time, uncached_time
+
+
+if __name__ == '__main__':
+    run()
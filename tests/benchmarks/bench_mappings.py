@@ -0,0 +1,120 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Micro-benchmark for user mapping resolution.
+#
+# Feeds 10k keys against 1k user mappings through the same queries that
+# _nv_feed_key makes on every keystroke, once against the prefix trie index
+# and once against a linear scan of the mappings (the previous
+# implementation).
+#
+# Run from the Sublime Text console:
+#
+#   >>> from NeoVintageous.tests.benchmarks import bench_mappings
+#   >>> bench_mappings.run()
+
+from timeit import default_timer
+from unittest import mock
+import random
+
+from NeoVintageous.nv.mappings import _MappingsTrie
+from NeoVintageous.nv.mappings import mappings_add
+from NeoVintageous.nv.mappings import mappings_can_resolve
+from NeoVintageous.nv.mappings import mappings_is_incomplete
+from NeoVintageous.nv.vim import NORMAL
+
+_MAPPINGS = 1000
+_KEYS = 10000
+
+
+def _generate_mappings(rnd):
+    mappings = {}
+    while len(mappings) < _MAPPINGS:
+        lhs = ',' + ''.join(rnd.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rnd.randint(1, 4)))
+        mappings[lhs] = ':echo "%s"<CR>' % lhs
+
+    return mappings
+
+
+def _generate_keys(rnd, mappings):
+    keys = []
+    lhs_list = sorted(mappings)
+    while len(keys) < _KEYS:
+        # Mostly keys that walk into mappings, with some plain vi keys.
+        if rnd.random() < 0.8:
+            keys.extend(rnd.choice(lhs_list))
+        else:
+            keys.append(rnd.choice('hjklwbe0$'))
+
+    return keys[:_KEYS]
+
+
+def _feed(keys, can_resolve, is_incomplete):
+    seq = ''
+    for key in keys:
+        can_resolve(NORMAL, seq + key)
+        seq += key
+        if not is_incomplete(NORMAL, seq):
+            seq = ''
+
+
+def _linear_can_resolve(mappings):
+    def can_resolve(mode, seq):
+        if mappings.get(seq):
+            return True
+
+        return bool([x for x in mappings if x.startswith(seq)])
+
+    return can_resolve
+
+
+def _linear_is_incomplete(mappings):
+    def is_incomplete(mode, seq):
+        if mappings.get(seq):
+            return False
+
+        return bool([x for x in mappings if x.startswith(seq)])
+
+    return is_incomplete
+
+
+def run(seed=0):
+    rnd = random.Random(seed)
+    mappings = _generate_mappings(rnd)
+    keys = _generate_keys(rnd, mappings)
+
+    with mock.patch.dict('NeoVintageous.nv.mappings._mappings', {NORMAL: _MappingsTrie()}):
+        for lhs, rhs in mappings.items():
+            mappings_add(NORMAL, lhs, rhs)
+
+        start = default_timer()
+        _feed(keys, mappings_can_resolve, mappings_is_incomplete)
+        trie_time = default_timer() - start
+
+    start = default_timer()
+    _feed(keys, _linear_can_resolve(mappings), _linear_is_incomplete(mappings))
+    linear_time = default_timer() - start
+
+    print('mappings: %d keys against %d mappings' % (len(keys), len(mappings)))
+    print('  trie:   %.4fs (%.2fus/key)' % (trie_time, trie_time / len(keys) * 1e6))
+    print('  linear: %.4fs (%.2fus/key)' % (linear_time, linear_time / len(keys) * 1e6))
+
+    return trie_time, linear_time
+
+
+if __name__ == '__main__':
+    run()
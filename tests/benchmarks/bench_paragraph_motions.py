@@ -0,0 +1,107 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmark for the paragraph motions, { and }.
+#
+# Times } from the top and { from the bottom of a 100k line buffer, over one
+# paragraph, over a thousand paragraphs, and across a single paragraph that
+# fills the buffer. The line index is built by the first motion after the
+# buffer is modified, so the motions are timed both with a fresh index and with
+# a cached one, and the view API calls made are counted. The fresh index is
+# compared against a saved baseline.
+#
+# Run from the Sublime Text console:
+#
+#   >>> from NeoVintageous.tests.benchmarks import bench_paragraph_motions
+#   >>> bench_paragraph_motions.run(save_baseline=True)  # On the base commit.
+#   >>> bench_paragraph_motions.run()
+
+import sublime
+
+from NeoVintageous.nv.vi import lines
+from NeoVintageous.nv.vi import units
+from NeoVintageous.tests import benchmarks
+
+_LINES = 100000
+
+_MOTIONS = (
+    ('} 1', 'next', 1),
+    ('} 1000', 'next', 1000),
+    ('{ 1', 'prev', 1),
+    ('{ 1000', 'prev', 1000),
+)
+
+_API = ('line', 'rowcol', 'size', 'substr', 'text_point')
+
+_PARAGRAPH_START = {'next': units.next_paragraph_start, 'prev': units.prev_paragraph_start}
+
+
+def _time(direction, view, pt, count):
+    return benchmarks.timed(_API, _PARAGRAPH_START[direction], view, pt, count, count > 1)
+
+
+def _bench(name, text, baseline, results):
+    view = sublime.active_window().new_file()
+    try:
+        view.set_scratch(True)
+        view.run_command('append', {'characters': text})
+
+        print('paragraph motions: %s, %d lines' % (name, _LINES))
+        for motion, direction, count in _MOTIONS:
+            case = '%s %s' % (name, motion)
+            pt = 0 if direction == 'next' else view.size()
+            lines.clear_line_index(view)
+            fresh_time, fresh_calls, fresh_target = _time(direction, view, pt, count)
+            cached_time, cached_calls, cached_target = _time(direction, view, pt, count)
+            assert fresh_target == cached_target, 'targets differ for %s' % motion
+            print('  %-6s fresh index: %.4fs %6d calls  cached index: %.6fs %d calls  %s' % (
+                motion, fresh_time, fresh_calls, cached_time, cached_calls, benchmarks.format_baseline(baseline, case)))
+            results[case] = (fresh_time, fresh_calls)
+    finally:
+        view.close()
+
+
+def run(save_baseline=False, baseline_file=None):
+    # Args:
+    #   save_baseline (bool): Save the results as the new baseline.
+    #   baseline_file (str): Defaults to bench_paragraph_motions.json in the
+    #       NeoVintageous cache directory.
+    #
+    # Returns:
+    #   dict: The time and the view API calls of each motion with a fresh
+    #       index.
+    if baseline_file is None:
+        baseline_file = benchmarks.baseline_file('bench_paragraph_motions')
+
+    baseline = {} if save_baseline else benchmarks.load_baseline(baseline_file)
+
+    paragraphs = ''.join(
+        'def fizz_%d(self, buzz):\n    return buzz + %d\n\n' % (i, i) if i % 3 == 2
+        else 'fizz_%d = %d\n' % (i, i) for i in range(_LINES))
+    single = ''.join('fizz_%d = %d\n' % (i, i) for i in range(_LINES))
+
+    results = {}
+    _bench('paragraphs', paragraphs, baseline, results)
+    _bench('one paragraph', single, baseline, results)
+
+    benchmarks.finish_baseline('paragraph motions', baseline_file, results, save_baseline)
+
+    return results
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,90 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmark for motions run over many selections.
+#
+# Times j, k, ^, $ and w with a cursor on each of 5000 lines, as after :g or
+# in multiple-cursor mode. For comparison it also times the same motions with
+# the callbacks querying the view directly, which is how the motions used to
+# work: several API calls per selection instead of one read of the buffer.
+# The API calls are counted too, because outside of Sublime Text the view is
+# not any slower than the snapshot.
+#
+# Run from the Sublime Text console:
+#
+#   >>> from NeoVintageous.tests.benchmarks import bench_regions_transformer
+#   >>> bench_regions_transformer.run()
+
+import sublime
+
+from NeoVintageous.nv import utils
+from NeoVintageous.nv.vim import NORMAL
+from NeoVintageous.tests import benchmarks
+
+_LINES = 5000
+
+_MOTIONS = ('_vi_j', '_vi_k', '_vi_hat', '_vi_dollar', '_vi_w')
+
+_API = ('classify', 'find_by_class', 'folded_regions', 'full_line', 'line', 'rowcol', 'settings', 'size', 'substr',
+        'text_point')
+
+
+def _run_motion(view, motion, batch_min_selections):
+    original_batch_min_selections = utils._BATCH_MIN_SELECTIONS
+    utils._BATCH_MIN_SELECTIONS = batch_min_selections
+    try:
+        view.run_command(motion, {'mode': NORMAL, 'count': 1})
+    finally:
+        utils._BATCH_MIN_SELECTIONS = original_batch_min_selections
+
+    return list(view.sel())
+
+
+def _time(view, motion, sels, batch_min_selections):
+    view.sel().clear()
+    view.sel().add_all(sels)
+
+    return benchmarks.timed(_API, _run_motion, view, motion, batch_min_selections)
+
+
+def run():
+    text = '    if (fizz) { buzz(x, y); }\n\tfoo_bar = baz.qux\n' * (_LINES // 2)
+
+    results = []
+
+    view = sublime.active_window().new_file()
+    try:
+        view.set_scratch(True)
+        view.run_command('append', {'characters': text})
+        sels = [sublime.Region(line.a + 2) for line in view.lines(sublime.Region(0, view.size() - 1))]
+
+        print('regions transformer: %d selections' % len(sels))
+        for motion in _MOTIONS:
+            before_time, before_calls, before_sels = _time(view, motion, sels, len(sels) + 1)
+            after_time, after_calls, after_sels = _time(view, motion, sels, 1)
+            assert before_sels == after_sels, 'selections differ for %s' % motion
+            print('  %-10s view: %.4fs %6d calls  snapshot: %.4fs %6d calls' % (
+                motion, before_time, before_calls, after_time, after_calls))
+            results.append((motion, before_time, after_time))
+    finally:
+        view.close()
+
+    return results
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,93 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmark for repeating a search with a count, as with 500n.
+#
+# Times n, 500n and 500N in a 50k line buffer with 1000 matches, and counts
+# the view API calls made. The first n fills the cache of matches, so it's
+# timed separately. The times are compared against a saved baseline.
+#
+# Run from the Sublime Text console:
+#
+#   >>> from NeoVintageous.tests.benchmarks import bench_repeat_search
+#   >>> bench_repeat_search.run(save_baseline=True)  # On the base commit.
+#   >>> bench_repeat_search.run()
+
+import sublime
+
+from NeoVintageous.nv.vi import search
+from NeoVintageous.tests import benchmarks
+
+_LINES = 50000
+
+_TERM = 'needle'
+
+_API = ('find', 'find_all', 'full_line', 'line', 'rowcol', 'size', 'text_point', 'word')
+
+
+def run(save_baseline=False, baseline_file=None):
+    # Args:
+    #   save_baseline (bool): Save the results as the new baseline.
+    #   baseline_file (str): Defaults to bench_repeat_search.json in the
+    #       NeoVintageous cache directory.
+    #
+    # Returns:
+    #   dict: The time and the view API calls of each case.
+    if baseline_file is None:
+        baseline_file = benchmarks.baseline_file('bench_repeat_search')
+
+    baseline = {} if save_baseline else benchmarks.load_baseline(baseline_file)
+
+    lines = ['    fizz_%d = buzz(%d)\n' % (i, i) for i in range(_LINES)]
+    for i in range(0, _LINES, _LINES // 1000):
+        lines[i] = '    %s_%d = buzz(%d)\n' % (_TERM, i, i)
+    text = ''.join(lines)
+
+    results = {}
+
+    view = sublime.active_window().new_file()
+    try:
+        view.set_scratch(True)
+        view.run_command('append', {'characters': text})
+        view.sel().clear()
+        view.sel().add(sublime.Region(view.size() // 2))
+        pt = view.size() // 2
+        size = view.size()
+
+        cases = (
+            ('n', search.find_wrapping, (view, _TERM, pt + 1, size, 0, 1)),
+            ('500n', search.find_wrapping, (view, _TERM, pt + 1, size, 0, 500)),
+            ('500N', search.reverse_find_wrapping, (view, _TERM, 0, pt, 0, 500)),
+        )
+
+        print('repeat search: %d lines, %d matches' % (_LINES, len(view.find_all(_TERM))))
+        search._search_matches.clear()
+        for name, f, args in cases:
+            elapsed, calls, match = benchmarks.timed(_API, f, *args)
+            assert match, 'no match for %s' % name
+            print('  %-4s %.4fs %6d calls  %s' % (name, elapsed, calls, benchmarks.format_baseline(baseline, name)))
+            results[name] = (elapsed, calls)
+    finally:
+        view.close()
+
+    benchmarks.finish_baseline('repeat search', baseline_file, results, save_baseline)
+
+    return results
+
+
+if __name__ == '__main__':
+    run()
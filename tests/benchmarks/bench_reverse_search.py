@@ -0,0 +1,95 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmark for the reverse search, as used by ?, N, and the text objects.
+#
+# Times a reverse search from the end of a 100k line buffer for a match on the
+# line above, a match near the top of the buffer, and no match at all, and
+# from the middle of the buffer for a match near the top with another one
+# below the cursor, and counts the view API calls made by each. The times are
+# compared against a saved baseline.
+#
+# Run from the Sublime Text console:
+#
+#   >>> from NeoVintageous.tests.benchmarks import bench_reverse_search
+#   >>> bench_reverse_search.run(save_baseline=True)  # On the base commit.
+#   >>> bench_reverse_search.run()
+
+import sublime
+
+from NeoVintageous.nv.vi import search
+from NeoVintageous.tests import benchmarks
+
+_LINES = 100000
+
+# The name, the term, the row searched backwards from (None for the end of the
+# buffer), and the row of the expected match (None for no match) of each
+# search.
+_SEARCHES = (
+    ('near', 'needle_near', None, _LINES - 2),
+    ('far', 'needle_far', None, 10),
+    ('none', 'needle_none', None, None),
+    ('mid', 'needle_mid', _LINES // 2, 20),
+)
+
+_API = ('find', 'full_line', 'line', 'rowcol', 'size', 'substr', 'text_point')
+
+
+def run(save_baseline=False, baseline_file=None):
+    # Args:
+    #   save_baseline (bool): Save the results as the new baseline.
+    #   baseline_file (str): Defaults to bench_reverse_search.json in the
+    #       NeoVintageous cache directory.
+    #
+    # Returns:
+    #   dict: The time and the view API calls of each search.
+    if baseline_file is None:
+        baseline_file = benchmarks.baseline_file('bench_reverse_search')
+
+    baseline = {} if save_baseline else benchmarks.load_baseline(baseline_file)
+
+    lines = ['    def fizz_%d(self, buzz): return buzz + %d\n' % (i, i) for i in range(_LINES)]
+    lines[10] = '    needle_far = 1\n'
+    lines[-2] = '    needle_near = 1\n'
+    lines[20] = '    needle_mid = 1\n'
+    lines[-10] = '    needle_mid = 2\n'
+    text = ''.join(lines)
+
+    results = {}
+
+    view = sublime.active_window().new_file()
+    try:
+        view.set_scratch(True)
+        view.run_command('append', {'characters': text})
+
+        print('reverse search: %d lines' % _LINES)
+        for name, term, row, match_row in _SEARCHES:
+            end = view.size() if row is None else view.text_point(row, 0)
+            elapsed, calls, match = benchmarks.timed(_API, search.reverse_search, view, term, 0, end)
+            assert (match and view.rowcol(match.a)[0]) == match_row, 'wrong match for %s' % name
+            print('  %-5s %.4fs %5d calls  %s' % (name, elapsed, calls, benchmarks.format_baseline(baseline, name)))
+            results[name] = (elapsed, calls)
+    finally:
+        view.close()
+
+    benchmarks.finish_baseline('reverse search', baseline_file, results, save_baseline)
+
+    return results
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,121 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmark for the per-keystroke State overhead.
+#
+# Replays the State property traffic of a typical _nv_feed_key call (append
+# to the sequence, check the register and input flags, set and read back the
+# motion, read the counts, reset the command data) against the in-process
+# view state, and against the settings backed storage that State used
+# previously, where every write copies the whole 'vintage' dict and every
+# read of the action or motion deserialises it.
+#
+# Run from the Sublime Text console:
+#
+#   >>> from NeoVintageous.tests.benchmarks import bench_state
+#   >>> bench_state.run()
+
+from timeit import default_timer
+
+import sublime
+
+from NeoVintageous.nv.state import State
+from NeoVintageous.nv.vi import cmd_defs
+from NeoVintageous.nv.vi.settings import SettingsManager
+from NeoVintageous.nv.vim import NORMAL
+
+_KEYS = 2000
+
+
+def _feed_key_state(view, key):
+    state = State(view)
+    mode = state.mode
+    state.sequence += key
+    if state.must_capture_register_name:
+        return
+    state.partial_sequence += key
+    state.motion = cmd_defs.ViMoveByWords()
+    state.action and state.motion
+    state.mode = mode
+    state.count
+    state.motion
+    state.action = None
+    state.motion = None
+    state.action_count = ''
+    state.motion_count = ''
+    state.sequence = ''
+    state.partial_sequence = ''
+    state.register = '"'
+    state.must_capture_register_name = False
+
+
+def _get_command(vi, name):
+    data = vi[name]
+    if data:
+        return getattr(cmd_defs, data['name']).from_json(data['data'])
+
+
+def _feed_key_settings(view, key):
+    vi = SettingsManager(view).vi
+    mode = vi['mode']
+    vi['sequence'] = (vi['sequence'] or '') + key
+    if vi['must_capture_register_name']:
+        return
+    vi['partial_sequence'] = (vi['partial_sequence'] or '') + key
+    vi['motion'] = cmd_defs.ViMoveByWords().serialize()
+    _get_command(vi, 'action') and _get_command(vi, 'motion')
+    vi['mode'] = mode
+    vi['action_count'] and vi['motion_count']
+    _get_command(vi, 'motion')
+    vi['action'] = None
+    vi['motion'] = None
+    vi['action_count'] = ''
+    vi['motion_count'] = ''
+    vi['sequence'] = ''
+    vi['partial_sequence'] = ''
+    vi['register'] = '"'
+    vi['must_capture_register_name'] = False
+
+
+def _time(view, feed_key):
+    start = default_timer()
+    for i in range(_KEYS):
+        feed_key(view, 'w')
+
+    return (default_timer() - start) / _KEYS
+
+
+def run():
+    view = sublime.active_window().new_file()
+    try:
+        view.set_scratch(True)
+        State(view).mode = NORMAL
+
+        before = _time(view, _feed_key_settings)
+        after = _time(view, _feed_key_state)
+    finally:
+        view.close()
+
+    print('state: per-key overhead over %d keys' % _KEYS)
+    print('  before (view settings): %.2fus/key' % (before * 1e6))
+    print('  after (view state):     %.2fus/key' % (after * 1e6))
+
+    return before, after
+
+
+if __name__ == '__main__':
+    run()
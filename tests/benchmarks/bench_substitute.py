@@ -0,0 +1,82 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmark for :substitute on a large buffer with few matches.
+#
+# Runs :%s/foo/bar/g on a 200k line buffer where only three lines match, and
+# reports the search and apply times from the substitute timing hook. For
+# comparison it also times the line by line substitution that :substitute
+# used previously (excluding the replacement of the whole range).
+#
+# Run from the Sublime Text console:
+#
+#   >>> from NeoVintageous.tests.benchmarks import bench_substitute
+#   >>> bench_substitute.run()
+
+from timeit import default_timer
+from unittest import mock
+import re
+
+import sublime
+
+from NeoVintageous.nv import ex_cmds
+from NeoVintageous.nv.ex_cmds import do_ex_cmdline
+
+_LINES = 200000
+
+
+def _line_by_line(view):
+    pattern = re.compile('foo', re.MULTILINE)
+    start = default_timer()
+    for line in view.lines(sublime.Region(0, view.size())):
+        pattern.sub('bar', view.substr(line), count=0)
+
+    return default_timer() - start
+
+
+def run():
+    lines = ['line %d of some generated text' % i for i in range(_LINES)]
+    for i in (1000, _LINES // 2, _LINES - 10):
+        lines[i] += ' foo'
+
+    timings = []
+
+    view = sublime.active_window().new_file()
+    try:
+        view.set_scratch(True)
+        view.run_command('append', {'characters': '\n'.join(lines) + '\n'})
+
+        before = _line_by_line(view)
+
+        with mock.patch.object(ex_cmds, 'substitute_timing_hook', lambda *args: timings.append(args)):
+            start = default_timer()
+            do_ex_cmdline(view.window(), ':%s/foo/bar/g')
+            total = default_timer() - start
+    finally:
+        view.close()
+
+    search, apply, substitutions, changed_lines = timings[0]
+
+    print('substitute: %d substitutions on %d lines of %d' % (substitutions, changed_lines, _LINES))
+    print('  line by line (search only): %.4fs' % before)
+    print('  :%%s total:                  %.4fs (search=%.4fs apply=%.4fs)' % (total, search, apply))
+
+    return before, total
+
+
+if __name__ == '__main__':
+    run()
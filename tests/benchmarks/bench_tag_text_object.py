@@ -0,0 +1,92 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmark for the tag text objects, at and it.
+#
+# Times the text objects in a 2MB XML document, in an element near the top of
+# it, and between two elements of the root element, which means the whole
+# document has to be searched. The tag index is built the first time a text
+# object is used after the buffer is modified, so the text objects are timed
+# both with a fresh index and with a cached one, and the view API calls made
+# are counted. The fresh index is compared against a saved baseline.
+#
+# Run from the Sublime Text console:
+#
+#   >>> from NeoVintageous.tests.benchmarks import bench_tag_text_object
+#   >>> bench_tag_text_object.run(save_baseline=True)  # On the base commit.
+#   >>> bench_tag_text_object.run()
+
+import sublime
+
+from NeoVintageous.nv.vi import tags
+from NeoVintageous.nv.vi import text_objects
+from NeoVintageous.tests import benchmarks
+
+_ELEMENTS = 40000
+
+_API = ('find', 'line', 'size', 'substr')
+
+
+def run(save_baseline=False, baseline_file=None):
+    # Args:
+    #   save_baseline (bool): Save the results as the new baseline.
+    #   baseline_file (str): Defaults to bench_tag_text_object.json in the
+    #       NeoVintageous cache directory.
+    #
+    # Returns:
+    #   dict: The time and the view API calls of each case with a fresh index.
+    if baseline_file is None:
+        baseline_file = benchmarks.baseline_file('bench_tag_text_object')
+
+    baseline = {} if save_baseline else benchmarks.load_baseline(baseline_file)
+
+    items = ''.join(
+        '  <item id="%d">\n    <name>fizz %d</name>\n    <value>buzz</value>\n  </item>\n' % (i, i)
+        for i in range(_ELEMENTS))
+    text = '<?xml version="1.0"?>\n<root>\n' + items + '</root>\n'
+
+    results = {}
+
+    view = sublime.active_window().new_file()
+    try:
+        view.set_scratch(True)
+        view.assign_syntax('Packages/XML/XML.sublime-syntax')
+        view.run_command('append', {'characters': text})
+        cases = (
+            ('near', text.index('fizz 1<')),
+            ('whole document', text.index('</item>') + len('</item>\n')),
+        )
+
+        print('tag text object: %d bytes' % len(text))
+        for name, pt in cases:
+            tags.clear_tag_index(view)
+            fresh_time, fresh_calls, fresh_tags = benchmarks.timed(_API, text_objects.find_containing_tag, view, pt)
+            cached_time, cached_calls, cached_tags = benchmarks.timed(_API, text_objects.find_containing_tag, view, pt)
+            assert fresh_tags == cached_tags, 'tags differ for %s' % name
+            print('  %-14s fresh index: %.4fs %6d calls  cached index: %.6fs %d calls  %s' % (
+                name, fresh_time, fresh_calls, cached_time, cached_calls, benchmarks.format_baseline(baseline, name)))
+            results[name] = (fresh_time, fresh_calls)
+    finally:
+        view.close()
+
+    benchmarks.finish_baseline('tag text object', baseline_file, results, save_baseline)
+
+    return results
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,77 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmark for the word motions with large counts on a long minified line.
+#
+# Times 1000w, 1000W, 1000e and 1000E from the start of a 200k character line
+# of minified code. For comparison it also times the same motions run against
+# the view directly, which is how the motions used to work: several API calls
+# per word instead of a few per motion.
+#
+# Run from the Sublime Text console:
+#
+#   >>> from NeoVintageous.tests.benchmarks import bench_word_motions
+#   >>> bench_word_motions.run()
+
+from timeit import default_timer
+
+import sublime
+
+from NeoVintageous.nv.vi import units
+
+_COUNT = 1000
+
+_MOTIONS = (
+    ('w', lambda v: units.word_starts(v, 0, _COUNT), lambda v: units._word_starts(v, 0, _COUNT, False)),
+    ('W', lambda v: units.big_word_starts(v, 0, _COUNT), lambda v: units._big_word_starts(v, 0, _COUNT, False)),
+    ('e', lambda v: units.word_ends(v, 0, _COUNT), lambda v: units._word_ends(v, 0, _COUNT, False)),
+    ('E', lambda v: units.big_word_ends(v, 0, _COUNT), lambda v: units._word_ends(v, 0, _COUNT, True)),
+)
+
+
+def _time(f, view):
+    start = default_timer()
+    target = f(view)
+
+    return default_timer() - start, target
+
+
+def run():
+    text = 'var a=function(b,c){return b.d(c)+e[f]};' * 5000
+
+    results = []
+
+    view = sublime.active_window().new_file()
+    try:
+        view.set_scratch(True)
+        view.run_command('append', {'characters': text + '\n'})
+
+        print('word motions: %d%s on a %d character line' % (_COUNT, ''.join(m[0] for m in _MOTIONS), len(text)))
+        for name, after, before in _MOTIONS:
+            before_time, before_target = _time(before, view)
+            after_time, after_target = _time(after, view)
+            assert before_target == after_target, 'targets differ for %s' % name
+            print('  %d%s view: %.4fs  chunk: %.4fs' % (_COUNT, name, before_time, after_time))
+            results.append((name, before_time, after_time))
+    finally:
+        view.close()
+
+    return results
+
+
+if __name__ == '__main__':
+    run()
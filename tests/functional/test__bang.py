@@ -0,0 +1,50 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from sublime import platform
+
+from NeoVintageous.tests import unittest
+
+
+@unittest.skipIf(platform() == 'windows', 'Test does not work on Windows')
+@unittest.mock.patch('NeoVintageous.nv.commands.ui_cmdline_prompt')
+class Test_bang(unittest.FunctionalTestCase):
+
+    def assertCmdline(self, ui_cmdline_prompt, expected):
+        self.assertEqual(ui_cmdline_prompt.call_args[1]['initial_text'], expected)
+
+    def submit(self, ui_cmdline_prompt, cmd):
+        kwargs = ui_cmdline_prompt.call_args[1]
+        kwargs['on_done'](kwargs['initial_text'] + cmd)
+
+    def test_n(self, ui_cmdline_prompt):
+        self.eq('1\n|c\nb\n2', 'n_!j')
+        self.assertCmdline(ui_cmdline_prompt, ':.,.+1!')
+        self.submit(ui_cmdline_prompt, 'sort')
+        self.assertNormal('1\n|b\nc\n2')
+
+    def test_n_count(self, ui_cmdline_prompt):
+        self.eq('1\n|c\nb\na\n2', 'n_2!j')
+        self.assertCmdline(ui_cmdline_prompt, ':.,.+2!')
+        self.submit(ui_cmdline_prompt, 'sort')
+        self.assertNormal('1\n|a\nb\nc\n2')
+
+    def test_v(self, ui_cmdline_prompt):
+        self.eq('1\nc|c\nb\na|a\n2', 'v_!', 'v_1\nc|c\nb\na|a\n2')
+        self.assertCmdline(ui_cmdline_prompt, ":'<,'>!")
+        self.submit(ui_cmdline_prompt, 'sort')
+        self.assertNormal('1\n|aa\nb\ncc\n2')
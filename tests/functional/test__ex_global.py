@@ -33,3 +33,26 @@ class Test_ex_global(unittest.FunctionalTestCase):
         self.eq('|fizz\n\nbuzz\nfizz\n\n\n\n\n\nbuzz\n', ':%global/^$/d', 'fizz\nbuzz\nfizz\n|buzz\n')
         self.eq('|1\n2\n3\n4\n5\n6\n7\n8\n9\n0', ':3,6g/^/d', '1\n2\n|7\n8\n9\n0')
         self.eq('|1\nx2\n3\n4\nx5\n6\nx7\nx8\n9\n0', ':3,7g/^x/d', '1\nx2\n3\n4\n6\n|x8\n9\n0')
+
+    def test_global_substitute(self):
+        self.eq('|a1\nb\na2\nc\na3\n', ':g/^a/s/\\d/N/', 'aN\nb\naN\nc\n|aN\n')
+        self.eq('|a1\nb\na2\nc\na3\n', ':2,4g/^a/s/\\d/N/', 'a1\nb\n|aN\nc\na3\n')
+
+    def test_global_move(self):
+        self.eq('|a1\nb\na2\nc\na3\n', ':g/^a/m0', '|a3\na2\na1\nb\nc\n')
+        self.eq('|1\n2\n3\n4\n', ':g/^/m0', '|4\n3\n2\n1\n')
+
+    def test_global_copy(self):
+        self.eq('|a1\nb\na2\nc\n', ':g/^a/t.', 'a1\na1\nb\na2\n|a2\nc\n')
+        self.eq('|a1\nb\na2\nc\n', ':g/^a/copy .', 'a1\na1\nb\na2\n|a2\nc\n')
+
+    def test_global_normal(self):
+        self.eq('|a1\nb\na2\n', ':g/^a/normal A;', 'a1;\nb\na2|;\n')
+
+    def test_global_inverse(self):
+        self.eq('|a1\nb\na2\nc\na3\n', ':g!/^a/s/$/!/', 'a1\nb!\na2\n|c!\na3\n')
+        self.eq('|a1\nb\na2\nc\na3\n', ':v/^a/s/$/!/', 'a1\nb!\na2\n|c!\na3\n')
+        self.eq('|a1\nb\na2\nc\na3\n', ':vglobal/^a/s/$/!/', 'a1\nb!\na2\n|c!\na3\n')
+
+    def test_global_skips_deleted_lines(self):
+        self.eq('|a\na\nb\n', ':g/^a/.,.+1d', '|b\n')
@@ -74,6 +74,11 @@ class Test_ex_substitute(unittest.FunctionalTestCase):
         self.eq('a\n|b\n\nc\n\nd\n\n', ':%substitute/$/,/', 'a,\nb,\n,\nc,\n,\nd,\n|,\n')
         self.eq('a\n|b\n\nc\n\nd\n\n', ':%substitute/$/,/g', 'a,\nb,\n,\nc,\n,\nd,\n|,\n')
 
+    def test_cursor_is_on_last_substituted_line_when_line_lengths_change(self):
+        self.eq('|a\na\na\n', ':%substitute/a/xxxxxxxx/', 'xxxxxxxx\nxxxxxxxx\n|xxxxxxxx\n')
+        self.eq('|abc\nabc\nabc', ':%substitute/abc/x/', 'x\nx\n|x')
+        self.eq('|a\nb\na\nb\n', ':%substitute/a/  x y z/', '  x y z\nb\n  |x y z\nb\n')
+
     @unittest.mock.patch('NeoVintageous.nv.vi.settings._session', {})
     @unittest.mock_status_message()
     def test_repeat_no_previous(self):
@@ -135,6 +135,8 @@ class TestTextObjectSelection(unittest.FunctionalTestCase):
         self.eq('x<p>a|bc</p>x', 'v_it', 'x<p>|abc|</p>x')
         self.eq('x<p>_<i>_</i>a|bc<i>_</i>d</p>x', 'v_it', 'x<p>|_<i>_</i>abc<i>_</i>d|</p>x')
         self.eq('fi|zz', 'v_it', 'fi|z|z')
+        self.eq('x<p>_<i>a|bc</i>d</p>x', 'v_2it', 'x<p>|_<i>abc</i>d|</p>x')
+        self.eq('x<p>_<i>|abc|</i>d</p>x', 'v_it', 'x<p>|_<i>abc</i>d|</p>x')
 
     def test_v_i_brace(self):
         for target in ('{', '}'):
@@ -87,3 +87,32 @@ class Test_n(unittest.FunctionalTestCase):
         self.feed('n_n')
         self.assertSearch('foo\n|abc|\nbar\nabcxmoo\n|abc|\nend')
         self.assertSearchCurrent('foo\n|abc|\nbar\nabcxmoo\nabc\nend')
+
+    def test_n_count_wraps_around(self):
+        self.normal('|foo\nabc\nbar\nabc\nmoo\nabc\nend')
+        self.setLastSearch('abc')
+        self.state.last_buffer_search_command = 'vi_slash'
+        self.feed('n_5n')
+        self.assertNormal('foo\nabc\nbar\n|abc\nmoo\nabc\nend')
+        self.feed('n_n')
+        self.assertNormal('foo\nabc\nbar\nabc\nmoo\n|abc\nend')
+        self.feed('n_30n')
+        self.assertNormal('foo\nabc\nbar\nabc\nmoo\n|abc\nend')
+        self.feed('n_31N')
+        self.assertNormal('foo\nabc\nbar\n|abc\nmoo\nabc\nend')
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search.status_message')
+    def test_n_shows_search_count(self, status_message):
+        self.normal('|foo\nabc\nbar\nabc\nmoo\nabc\nend')
+        self.setLastSearch('abc')
+        self.state.last_buffer_search_command = 'vi_slash'
+        self.feed('n_n')
+        status_message.assert_called_with('[%d/%d]', 1, 3)
+        self.feed('n_n')
+        status_message.assert_called_with('[%d/%d]', 2, 3)
+        self.feed('n_N')
+        status_message.assert_called_with('[%d/%d]', 1, 3)
+        self.feed('n_N')
+        status_message.assert_called_with('[%d/%d]', 3, 3)
+        self.feed('n_*')
+        status_message.assert_called_with('[%d/%d]', 1, 3)
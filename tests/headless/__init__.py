@@ -0,0 +1,97 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A headless stand-in for the Sublime Text plugin API.
+#
+# The modules in this package implement enough of the "sublime",
+# "sublime_plugin" and "sublime_api" modules, and the parts of the Default
+# package that the plugin imports, to load the plugin and run the test suite
+# and the benchmarks with a plain Python interpreter. The buffers are in memory
+# gap buffers, and the timers run on a virtual clock.
+#
+# Run from the directory that contains the NeoVintageous package:
+#
+#   $ python -m NeoVintageous.tests.headless
+#   $ python -m NeoVintageous.tests.headless --bench
+#
+# The fakes are only installed when the real modules are missing, so the test
+# suite still runs against the editor when it's run from Sublime Text.
+
+import importlib.util
+import os
+import sys
+import types
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _load_module(name):
+    # The modules are loaded under their editor names, so that their classes
+    # look the same as the real ones e.g. <class 'sublime.Region'>.
+    spec = importlib.util.spec_from_file_location(name, os.path.join(_DIR, name + '.py'))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def is_installed():
+    # type: () -> bool
+    sublime = sys.modules.get('sublime')
+
+    return sublime is not None and os.path.dirname(getattr(sublime, '__file__', '')) == _DIR
+
+
+def install():
+    # type: () -> None
+    if is_installed():
+        return
+
+    _load_module('sublime_api')
+    _load_module('sublime')
+    _load_module('sublime_plugin')
+
+    from NeoVintageous.tests.headless import _default
+
+    default = types.ModuleType('Default')
+    default.__path__ = []
+    history_list = types.ModuleType('Default.history_list')
+    history_list.get_jump_history = _default.get_jump_history
+    paste_from_history = types.ModuleType('Default.paste_from_history')
+    paste_from_history.g_clipboard_history = _default.g_clipboard_history
+    default.history_list = history_list
+    default.paste_from_history = paste_from_history
+
+    sys.modules['Default'] = default
+    sys.modules['Default.history_list'] = history_list
+    sys.modules['Default.paste_from_history'] = paste_from_history
+
+
+def load_plugin():
+    # type: () -> None
+    # Load the plugin the way the editor does: register its commands and
+    # event listeners, then call the plugin_loaded() hook.
+    install()
+
+    import sublime_plugin
+
+    if 'NeoVintageous.plugin' in sublime_plugin._plugins:
+        return
+
+    plugin = sublime_plugin.reload_plugin('NeoVintageous.plugin')
+    plugin.plugin_loaded()
@@ -0,0 +1,74 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Runs the test suite, and optionally the benchmarks, with the headless
+# Sublime Text API. See the package docs.
+
+import argparse
+import os
+import sys
+import unittest
+
+from NeoVintageous.tests.headless import load_plugin
+
+
+def _run_tests(pattern, verbosity, failfast):
+    tests_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    top_level_dir = os.path.dirname(os.path.dirname(tests_dir))
+    suite = unittest.defaultTestLoader.discover(tests_dir, pattern=pattern, top_level_dir=top_level_dir)
+    result = unittest.TextTestRunner(verbosity=verbosity, failfast=failfast).run(suite)
+
+    return result.wasSuccessful()
+
+
+def _run_benchmarks(names, save_baseline):
+    import importlib
+    import inspect
+    import pkgutil
+
+    from NeoVintageous.tests import benchmarks
+
+    for _, name, _ in pkgutil.iter_modules(benchmarks.__path__):
+        if name.startswith('bench_') and (not names or name[6:] in names or name in names):
+            print('==> {}'.format(name))
+            run = importlib.import_module('NeoVintageous.tests.benchmarks.' + name).run
+            if save_baseline and 'save_baseline' in inspect.signature(run).parameters:
+                run(save_baseline=True)
+            else:
+                run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m NeoVintageous.tests.headless')
+    parser.add_argument('-p', '--pattern', default='test*.py', help='test file pattern (default: test*.py)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='verbose test output')
+    parser.add_argument('-f', '--failfast', action='store_true', help='stop on the first failure')
+    parser.add_argument('--bench', nargs='*', metavar='NAME', help='run the benchmarks instead of the tests')
+    parser.add_argument('--save-baseline', action='store_true', help='save the benchmark results as the baseline')
+    args = parser.parse_args(argv)
+
+    load_plugin()
+
+    if args.bench is not None:
+        _run_benchmarks(args.bench, args.save_baseline)
+        return 0
+
+    return 0 if _run_tests(args.pattern, 2 if args.verbose else 1, args.failfast) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,813 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# The built-in commands of the headless editor. These are the Sublime Text
+# default commands that the plugin runs, implemented for plain text buffers.
+#
+# Text commands are called with the view, an edit token and the command args;
+# window commands are called with the window and the command args.
+
+import re
+import textwrap
+
+import sublime
+import sublime_api
+
+text_commands = {}  # type: dict
+window_commands = {}  # type: dict
+
+
+def _text_command(f):
+    text_commands[f.__name__.rstrip('_')] = f
+
+    return f
+
+
+def _window_command(f):
+    window_commands[f.__name__.rstrip('_')] = f
+
+    return f
+
+
+def _set_sel(view, regions):
+    sel = view.sel()
+    sel.clear()
+    sel.add_all(regions)
+
+
+def _leading_whitespace(view, pt):
+    line = view.line(pt)
+    text = view.substr(sublime.Region(line.a, pt))
+
+    return text[:len(text) - len(text.lstrip(' \t'))]
+
+
+def _indent_unit(view):
+    if view.settings().get('translate_tabs_to_spaces'):
+        return ' ' * view.settings().get('tab_size', 4)
+
+    return '\t'
+
+
+def _selected_lines(view):
+    rows = []
+    for s in view.sel():
+        end = s.end()
+        if end > s.begin() and view.line(end).a == end:
+            end -= 1
+
+        for line in view.lines(sublime.Region(s.begin(), end)):
+            if line not in rows:
+                rows.append(line)
+
+    return sorted(rows)
+
+
+def _replace_each(view, edit, transform):
+    # Replace each selection with the transformed text. The regions are
+    # processed in order, tracking the change in size so far, and the new
+    # selection is built from the returned cursor positions.
+    delta = 0
+    new_sel = []
+    for s in list(view.sel()):
+        begin = s.begin() + delta
+        end = s.end() + delta
+        text, cursor = transform(sublime.Region(begin, end))
+        view.replace(edit, sublime.Region(begin, end), text)
+        new_sel.append(sublime.Region(begin + cursor))
+        delta += len(text) - (end - begin)
+
+    _set_sel(view, new_sel)
+
+
+@_text_command
+def insert(view, edit, characters=''):
+    auto_indent = view.settings().get('auto_indent')
+
+    def transform(region):
+        text = characters
+        if auto_indent and text == '\n':
+            text += _leading_whitespace(view, region.begin())
+
+        return text, len(text)
+
+    _replace_each(view, edit, transform)
+
+
+@_text_command
+def append(view, edit, characters='', force=False, scroll_to_end=False):
+    view.insert(edit, view.size(), characters)
+
+
+@_text_command
+def left_delete(view, edit):
+    delta = 0
+    new_sel = []
+    for s in list(view.sel()):
+        begin = s.begin() + delta
+        end = s.end() + delta
+        if s.empty():
+            begin = max(0, begin - 1)
+
+        view.erase(edit, sublime.Region(begin, end))
+        new_sel.append(sublime.Region(begin))
+        delta -= end - begin
+
+    _set_sel(view, new_sel)
+
+
+@_text_command
+def right_delete(view, edit):
+    delta = 0
+    new_sel = []
+    for s in list(view.sel()):
+        begin = s.begin() + delta
+        end = s.end() + delta
+        if s.empty():
+            end = min(view.size(), end + 1)
+
+        view.erase(edit, sublime.Region(begin, end))
+        new_sel.append(sublime.Region(begin))
+        delta -= end - begin
+
+    _set_sel(view, new_sel)
+
+
+def _xpos(view, s):
+    if s.xpos >= 0:
+        return s.xpos
+
+    return view.text_to_layout(s.b)[0]
+
+
+def _visual_lines(view):
+    # The lines as they're laid out: when word wrap is enabled, lines wrap
+    # after one less than the wrap width number of characters.
+    lines = view.lines(sublime.Region(0, view.size()))
+    settings = view.settings()
+    width = settings.get('wrap_width', 0) if settings.get('word_wrap') is True else 0
+    if not width or width < 2:
+        return lines
+
+    visual_lines = []
+    for line in lines:
+        a = line.a
+        while line.b - a > width - 1:
+            visual_lines.append(sublime.Region(a, a + width - 1))
+            a += width - 1
+
+        visual_lines.append(sublime.Region(a, line.b))
+
+    return visual_lines
+
+
+def _move_lines(view, s, lines, extend):
+    visual_lines = _visual_lines(view)
+    row = 0
+    for i, line in enumerate(visual_lines):
+        if line.a <= s.b <= line.b:
+            row = i
+            if s.b < line.b:
+                break
+
+    xpos = _xpos(view, s)
+    if s.xpos < 0 and visual_lines[row].a != view.line(s.b).a:
+        xpos = (s.b - visual_lines[row].a) * view.em_width()
+
+    target = row + lines
+    if target < 0:
+        pt = 0
+    elif target >= len(visual_lines):
+        pt = view.size()
+    else:
+        line = visual_lines[target]
+        pt = min(line.a + int(xpos // view.em_width()), line.b)
+
+    if extend:
+        return sublime.Region(s.a, pt, xpos)
+
+    return sublime.Region(pt, pt, xpos)
+
+
+def _stop_classes(by, forward, word_begin=False, word_end=False, punct_begin=False, punct_end=False,
+                  empty_line=False):
+    if by in ('words', 'subwords'):
+        classes = sublime.CLASS_WORD_START | sublime.CLASS_PUNCTUATION_START | sublime.CLASS_LINE_END
+        if not forward:
+            classes = sublime.CLASS_WORD_START | sublime.CLASS_PUNCTUATION_START | sublime.CLASS_LINE_START
+    elif by in ('word_ends', 'subword_ends'):
+        classes = sublime.CLASS_WORD_END | sublime.CLASS_PUNCTUATION_END | sublime.CLASS_LINE_START
+        if forward:
+            classes = sublime.CLASS_WORD_END | sublime.CLASS_PUNCTUATION_END | sublime.CLASS_LINE_END
+    else:
+        classes = 0
+        if word_begin:
+            classes |= sublime.CLASS_WORD_START
+        if word_end:
+            classes |= sublime.CLASS_WORD_END
+        if punct_begin:
+            classes |= sublime.CLASS_PUNCTUATION_START
+        if punct_end:
+            classes |= sublime.CLASS_PUNCTUATION_END
+        if empty_line:
+            classes |= sublime.CLASS_EMPTY_LINE
+
+    if by.startswith('subword'):
+        classes |= sublime.CLASS_SUB_WORD_START if 'ends' not in by else sublime.CLASS_SUB_WORD_END
+
+    return classes
+
+
+@_text_command
+def move(view, edit, by='characters', forward=True, extend=False, amount=1, separators='', **kwargs):
+    new_sel = []
+    for s in view.sel():
+        if by == 'characters':
+            if not extend and not s.empty():
+                pt = s.end() if forward else s.begin()
+            else:
+                pt = min(view.size(), s.b + 1) if forward else max(0, s.b - 1)
+
+            new_sel.append(sublime.Region(s.a if extend else pt, pt))
+        elif by == 'lines':
+            new_sel.append(_move_lines(view, s, amount if forward else -amount, extend))
+        elif by == 'pages':
+            rows = int(view.viewport_extent()[1] // view.line_height())
+            new_sel.append(_move_lines(view, s, rows if forward else -rows, extend))
+        else:
+            classes = _stop_classes(by, forward, **kwargs)
+            pt = view.find_by_class(s.b, forward, classes, separators) if classes else s.b
+            new_sel.append(sublime.Region(s.a if extend else pt, pt))
+
+    _set_sel(view, new_sel)
+
+
+@_text_command
+def move_to(view, edit, to='eol', extend=False):
+    new_sel = []
+    for s in view.sel():
+        line = view.line(s.b)
+        if to == 'bol':
+            first = line.a + len(_leading_whitespace(view, line.b))
+            pt = line.a if s.b == first else first
+        elif to == 'hardbol':
+            pt = line.a
+        elif to in ('eol', 'hardeol'):
+            pt = line.b
+        elif to == 'bof':
+            pt = 0
+        elif to == 'eof':
+            pt = view.size()
+        else:
+            pt = s.b
+
+        new_sel.append(sublime.Region(s.a if extend else pt, pt))
+
+    _set_sel(view, new_sel)
+
+
+@_text_command
+def undo(view, edit):
+    sublime_api.undo(view)
+
+
+@_text_command
+def redo(view, edit):
+    sublime_api.redo(view)
+
+
+@_text_command
+def redo_or_repeat(view, edit):
+    sublime_api.redo(view)
+
+
+text_commands['soft_undo'] = undo
+text_commands['soft_redo'] = redo
+
+
+@_text_command
+def mark_undo_groups_for_gluing(view, edit):
+    sublime_api.mark_undo_groups_for_gluing(view)
+
+
+@_text_command
+def glue_marked_undo_groups(view, edit):
+    sublime_api.glue_marked_undo_groups(view)
+
+
+@_text_command
+def unmark_undo_groups_for_gluing(view, edit):
+    sublime_api.unmark_undo_groups_for_gluing(view)
+
+
+@_text_command
+def indent(view, edit):
+    unit = _indent_unit(view)
+    lines = _selected_lines(view)
+    for line in reversed(lines):
+        if line.empty() and len(lines) > 1:
+            continue
+
+        view.insert(edit, line.a, unit)
+
+
+@_text_command
+def unindent(view, edit):
+    tab_size = view.settings().get('tab_size', 4)
+    for line in reversed(_selected_lines(view)):
+        text = view.substr(line)
+        if text.startswith('\t'):
+            size = 1
+        else:
+            size = len(text[:tab_size]) - len(text[:tab_size].lstrip(' '))
+            if size < tab_size and text[size:size + 1] == '\t':
+                size += 1
+
+        if size:
+            view.erase(edit, sublime.Region(line.a, line.a + size))
+
+
+# The increase indent patterns of the syntaxes that the tests use.
+_INCREASE_INDENT_PATTERNS = {
+    'source.python': r':\s*(#.*)?$',
+    'source.c': r'\{\s*$',
+    'source.c++': r'\{\s*$',
+    'source.js': r'\{\s*$',
+}
+
+
+@_text_command
+def reindent(view, edit, force_indent=True, single_line=False):
+    # A line is indented to the level of the previous line, one more if the
+    # previous line matches the increase indent pattern of the syntax.
+    pattern = _INCREASE_INDENT_PATTERNS.get(view.scope_name(0).split()[0])
+    rows = [view.rowcol(line.a)[0] for line in _selected_lines(view)]
+    for row in rows:
+        line = view.line(view.text_point(row, 0))
+        text = view.substr(line)
+        if row == 0:
+            continue
+
+        previous = view.line(view.text_point(row - 1, 0))
+        indentation = _leading_whitespace(view, previous.b)
+        if pattern and re.search(pattern, view.substr(previous)):
+            indentation += _indent_unit(view)
+
+        current = text[:len(text) - len(text.lstrip(' \t'))]
+        if current != indentation:
+            view.replace(edit, sublime.Region(line.a, line.a + len(current)), indentation)
+
+
+def _case_command(view, edit, transform):
+    for s in reversed(list(view.sel())):
+        region = s if not s.empty() else view.word(s.b)
+        view.replace(edit, region, transform(view.substr(region)))
+
+
+@_text_command
+def swap_case(view, edit):
+    _case_command(view, edit, lambda text: text.swapcase())
+
+
+@_text_command
+def upper_case(view, edit):
+    _case_command(view, edit, lambda text: text.upper())
+
+
+@_text_command
+def lower_case(view, edit):
+    _case_command(view, edit, lambda text: text.lower())
+
+
+@_text_command
+def title_case(view, edit):
+    _case_command(view, edit, lambda text: text.title())
+
+
+def _permute(view, edit, permute):
+    sel = list(view.sel())
+    if len(sel) == 1 and sel[0].empty():
+        regions = [sublime.Region(0, view.size())]
+    else:
+        regions = [view.line(s) for s in sel]
+
+    for region in reversed(regions):
+        lines = view.substr(region).split('\n')
+        view.replace(edit, region, '\n'.join(permute(lines)))
+
+
+@_text_command
+def sort_lines(view, edit, case_sensitive=False, reverse=False, remove_duplicates=False):
+    def permute(lines):
+        lines = sorted(lines, key=None if case_sensitive else str.lower, reverse=reverse)
+        if remove_duplicates:
+            return _unique(lines)
+
+        return lines
+
+    _permute(view, edit, permute)
+
+
+def _unique(lines):
+    seen = set()
+    unique = []
+    for line in lines:
+        if line not in seen:
+            seen.add(line)
+            unique.append(line)
+
+    return unique
+
+
+@_text_command
+def permute_lines(view, edit, operation='reverse'):
+    if operation == 'unique':
+        _permute(view, edit, _unique)
+    elif operation == 'reverse':
+        _permute(view, edit, lambda lines: list(reversed(lines)))
+
+
+def _swap_line(view, edit, up):
+    sel = list(view.sel())
+    block = view.full_line(sublime.Region(sel[0].begin(), sel[-1].end()))
+    if up:
+        if block.a == 0:
+            return
+        other = view.full_line(block.a - 1)
+    else:
+        if block.b >= view.size():
+            return
+        other = view.full_line(block.b)
+
+    text = view.substr(block)
+    other_text = view.substr(other)
+    if not text.endswith('\n'):
+        text, other_text = text + '\n', other_text[:-1]
+    elif not other_text.endswith('\n'):
+        text, other_text = text[:-1], other_text + '\n'
+
+    shift = len(other_text) if not up else -len(other_text)
+    region = block.cover(other)
+    view.replace(edit, region, other_text + text if not up else text + other_text)
+    _set_sel(view, [sublime.Region(s.a + shift, s.b + shift) for s in sel])
+
+
+@_text_command
+def swap_line_up(view, edit):
+    _swap_line(view, edit, True)
+
+
+@_text_command
+def swap_line_down(view, edit):
+    _swap_line(view, edit, False)
+
+
+@_text_command
+def insert_snippet(view, edit, contents='', name=None):
+    match = re.search(r'\$0|\$\{0\}', contents)
+    cursor = match.start() if match else None
+    text = re.sub(r'\$\{\d+(?::([^}]*))?\}|\$\d+', lambda m: m.group(1) or '', contents)
+    if cursor is None:
+        cursor = len(text)
+
+    _replace_each(view, edit, lambda region: (text, cursor))
+
+
+def _paragraphs(view, region):
+    paragraphs = []
+    paragraph = []
+    for line in view.lines(region):
+        if view.substr(line).strip():
+            paragraph.append(line)
+        elif paragraph:
+            paragraphs.append(paragraph)
+            paragraph = []
+
+    if paragraph:
+        paragraphs.append(paragraph)
+
+    return [sublime.Region(p[0].a, p[-1].b) for p in paragraphs]
+
+
+@_text_command
+def wrap_lines(view, edit, width=0):
+    # The Default package command, simplified: each paragraph of the selected
+    # lines is refilled, keeping the indentation and line comment prefix of
+    # its first line.
+    settings = view.settings()
+    if not width:
+        width = settings.get('wrap_width') or (settings.get('rulers') or [78])[0]
+
+    tokens = dict((v['name'], v['value']) for v in view.meta_info('shellVariables', 0))
+    comment = (tokens.get('TM_COMMENT_START') or '').strip()
+
+    regions = []
+    for s in view.sel():
+        if s.empty():
+            regions.extend(p for p in _paragraphs(view, sublime.Region(0, view.size())) if p.contains(s.b))
+        else:
+            regions.extend(_paragraphs(view, view.line(s)))
+
+    for region in reversed(regions):
+        lines = view.substr(region).split('\n')
+        prefix = re.match(r'\s*' + ('(?:' + re.escape(comment) + r'\s*)?' if comment else ''), lines[0]).group(0)
+        stripped = prefix.strip()
+        words = []
+        for line in lines:
+            line = line.strip()
+            if stripped and line.startswith(stripped):
+                line = line[len(stripped):]
+
+            words.extend(line.split())
+
+        text = textwrap.fill(' '.join(words), width, initial_indent=prefix, subsequent_indent=prefix,
+                             break_long_words=False, break_on_hyphens=False)
+        view.replace(edit, region, text)
+
+
+@_text_command
+def scroll_lines(view, edit, amount=0, extend=False):
+    x, y = view.viewport_position()
+    view.set_viewport_position((x, y - amount * view.line_height()), False)
+
+
+@_text_command
+def fold(view, edit):
+    view.fold([s for s in view.sel() if not s.empty()])
+
+
+@_text_command
+def unfold(view, edit):
+    view.unfold(list(view.sel()))
+
+
+@_text_command
+def unfold_all(view, edit):
+    view.unfold(sublime.Region(0, view.size()))
+
+
+@_text_command
+def fold_all(view, edit):
+    pass
+
+
+@_text_command
+def toggle_comment(view, edit, block=False):
+    # Syntaxes without comments, like plain text, have no comment behaviours.
+    tokens = dict((v['name'], v['value']) for v in view.meta_info('shellVariables', 0))
+    if block:
+        start = tokens.get('TM_COMMENT_START_2', tokens.get('TM_COMMENT_START'))
+        end = tokens.get('TM_COMMENT_END_2', tokens.get('TM_COMMENT_END'))
+        if start and end:
+            for s in reversed(list(view.sel())):
+                if not s.empty():
+                    view.insert(edit, s.end(), end)
+                    view.insert(edit, s.begin(), start)
+
+        return
+
+    token = tokens.get('TM_COMMENT_START')
+    if not token or 'TM_COMMENT_END' in tokens:
+        return
+
+    lines = _selected_lines(view)
+    non_blank = [line for line in lines if view.substr(line).strip()]
+    stripped_token = token.rstrip()
+    if non_blank and all(view.substr(line).lstrip().startswith(stripped_token) for line in non_blank):
+        for line in reversed(non_blank):
+            text = view.substr(line)
+            begin = line.a + len(text) - len(text.lstrip())
+            size = len(token) if view.substr(sublime.Region(begin, line.b)).startswith(token) else len(stripped_token)
+            view.erase(edit, sublime.Region(begin, begin + size))
+
+        return
+
+    targets = non_blank or lines
+    column = min(len(_leading_whitespace(view, line.b)) for line in targets)
+    for line in reversed(targets):
+        view.insert(edit, line.a + column, token)
+
+
+@_text_command
+def select_all(view, edit):
+    _set_sel(view, [sublime.Region(0, view.size())])
+
+
+@_text_command
+def single_selection(view, edit):
+    _set_sel(view, [view.sel()[0]])
+
+
+@_text_command
+def split_selection_into_lines(view, edit):
+    regions = []
+    for s in view.sel():
+        regions.extend(view.split_by_newlines(s))
+
+    _set_sel(view, regions)
+
+
+@_text_command
+def expand_selection(view, edit, to='word'):
+    regions = []
+    for s in view.sel():
+        if to == 'line':
+            regions.append(view.full_line(s))
+        else:
+            regions.append(view.word(s))
+
+    _set_sel(view, regions)
+
+
+@_text_command
+def find_under_expand(view, edit):
+    sel = view.sel()
+    if all(s.empty() for s in sel):
+        regions = [view.word(s.b) for s in sel]
+        _set_sel(view, regions)
+        return
+
+    last = sel[-1]
+    text = view.substr(last)
+    found = view.find(text, last.end(), sublime.LITERAL)
+    if found.a == -1:
+        found = view.find(text, 0, sublime.LITERAL)
+
+    if found.a != -1:
+        sel.add(found)
+
+
+@_text_command
+def find_all_under(view, edit):
+    sel = view.sel()
+    text = view.substr(view.word(sel[0].b) if sel[0].empty() else sel[0])
+    if text:
+        _set_sel(view, view.find_all(text, sublime.LITERAL))
+
+
+@_text_command
+def select_lines(view, edit, forward=True):
+    s = list(view.sel())[-1 if forward else 0]
+    view.sel().add(_move_lines(view, sublime.Region(s.b), 1 if forward else -1, False))
+
+
+@_text_command
+def drag_select(view, edit, **kwargs):
+    pass
+
+
+@_text_command
+def hide_auto_complete(view, edit):
+    pass
+
+
+@_window_command
+def new_file(window):
+    window.new_file()
+
+
+@_window_command
+def close(window):
+    view = window.active_view()
+    if view:
+        view.close()
+
+
+window_commands['close_file'] = close
+
+
+@_window_command
+def close_all(window):
+    for view in window.views():
+        view.close()
+
+
+@_window_command
+def close_by_index(window, group=-1, index=-1):
+    views = window.views_in_group(group)
+    if 0 <= index < len(views):
+        views[index].close()
+
+
+@_window_command
+def select_by_index(window, index=0):
+    views = window.views_in_group(window.active_group())
+    if 0 <= index < len(views):
+        window.focus_view(views[index])
+
+
+def _cycle_view(window, step):
+    views = window.views_in_group(window.active_group())
+    view = window.active_view()
+    if view in views:
+        window.focus_view(views[(views.index(view) + step) % len(views)])
+
+
+@_window_command
+def next_view(window):
+    _cycle_view(window, 1)
+
+
+@_window_command
+def prev_view(window):
+    _cycle_view(window, -1)
+
+
+@_window_command
+def focus_group(window, group=0):
+    window.focus_group(group)
+
+
+@_window_command
+def move_to_group(window, group=0):
+    view = window.active_view()
+    if view:
+        window.set_view_index(view, group, len(window.views_in_group(group)))
+
+
+@_window_command
+def set_layout(window, **layout):
+    window.set_layout(layout)
+
+
+@_window_command
+def show_panel(window, panel='', toggle=False, **kwargs):
+    window._data().active_panel = panel
+
+
+@_window_command
+def hide_panel(window, cancel=False, panel=None):
+    data = window._data()
+    if data.input_panel:
+        view_id, on_done, on_change, on_cancel = data.input_panel
+        data.input_panel = None
+        sublime._views.pop(view_id, None)
+        if on_cancel:
+            on_cancel()
+
+    data.active_panel = None
+
+
+@_window_command
+def save(window, **kwargs):
+    view = window.active_view()
+    if view:
+        data = view._data()
+        data.saved_change_count = data.change_count
+        sublime_api.dispatch_event('on_post_save', view)
+
+
+@_window_command
+def save_all(window):
+    for view in window.views():
+        data = view._data()
+        data.saved_change_count = data.change_count
+
+
+@_window_command
+def toggle_side_bar(window):
+    window.set_sidebar_visible(not window.is_sidebar_visible())
+
+
+@_window_command
+def toggle_minimap(window):
+    window.set_minimap_visible(not window.is_minimap_visible())
+
+
+@_window_command
+def toggle_status_bar(window):
+    window.set_status_bar_visible(not window.is_status_bar_visible())
+
+
+@_window_command
+def toggle_tabs(window):
+    window.set_tabs_visible(not window.get_tabs_visible())
+
+
+@_window_command
+def toggle_menu(window):
+    window.set_menu_visible(not window.is_menu_visible())
+
+
+def _no_op(window, **kwargs):
+    pass
+
+
+for _name in ('clone_file', 'exit', 'focus_side_bar', 'goto_definition', 'hide_overlay', 'new_window',
+              'prompt_open_file', 'revert', 'show_overlay', 'close_window', 'create_pane', 'destroy_pane',
+              'close_pane', 'clone_file_to_pane', 'new_pane', 'travel_to_pane', 'carry_file_to_pane'):
+    window_commands[_name] = _no_op
@@ -0,0 +1,88 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Stand-ins for the parts of the Sublime Text Default package that the plugin
+# imports: the jump history and the clipboard history.
+
+
+class _JumpHistory():
+
+    def __init__(self):
+        self._history = []  # type: list
+        self._position = 0
+
+    def push_selection(self, view):
+        del self._history[self._position:]
+        self._history.append((view.id(), list(view.sel())))
+        self._history = self._history[-120:]
+        self._position = len(self._history)
+
+    def jump_back(self, view):
+        import sublime
+
+        if self._position == len(self._history):
+            self.push_selection(view)
+            self._position -= 1
+
+        while self._position > 0:
+            self._position -= 1
+            view_id, regions = self._history[self._position]
+            if view_id in sublime._views and (view_id != view.id() or regions != list(view.sel())):
+                return sublime.View(view_id), regions
+
+        return None, []
+
+    def jump_forward(self, view):
+        import sublime
+
+        while self._position < len(self._history) - 1:
+            self._position += 1
+            view_id, regions = self._history[self._position]
+            if view_id in sublime._views:
+                return sublime.View(view_id), regions
+
+        return None, []
+
+
+_jump_histories = {}  # type: dict
+
+
+def get_jump_history(window_id):
+    history = _jump_histories.get(window_id)
+    if history is None:
+        history = _jump_histories[window_id] = _JumpHistory()
+
+    return history
+
+
+class _ClipboardHistory():
+
+    def __init__(self):
+        self.storage = []  # type: list
+
+    def push_text(self, text):
+        if not text:
+            return
+
+        if text in self.storage:
+            self.storage.remove(text)
+
+        self.storage.insert(0, text)
+        del self.storage[15:]
+
+
+g_clipboard_history = _ClipboardHistory()
@@ -0,0 +1,1856 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A pure Python stand-in for the Sublime Text "sublime" module.
+#
+# The buffers are in memory gap buffers, and the windows, views, settings,
+# selections and regions behave like their Sublime Text counterparts closely
+# enough to run the vi engine, the ex commands and the functional tests
+# outside of the editor. See the package docs for how to use it.
+
+import bisect
+import json
+import os
+import re
+import sys
+import tempfile
+
+import sublime_api
+
+HOVER_TEXT = 1
+HOVER_GUTTER = 2
+HOVER_MARGIN = 3
+
+ENCODED_POSITION = 1
+TRANSIENT = 4
+FORCE_GROUP = 8
+IGNORECASE = 2
+LITERAL = 1
+MONOSPACE_FONT = 1
+KEEP_OPEN_ON_FOCUS_LOST = 2
+
+HTML = 1
+COOPERATE_WITH_AUTO_COMPLETE = 2
+HIDE_ON_MOUSE_MOVE = 4
+HIDE_ON_MOUSE_MOVE_AWAY = 8
+
+DRAW_EMPTY = 1
+HIDE_ON_MINIMAP = 2
+DRAW_EMPTY_AS_OVERWRITE = 4
+PERSISTENT = 16
+DRAW_OUTLINED = 32
+DRAW_NO_FILL = 32
+DRAW_NO_OUTLINE = 256
+DRAW_SOLID_UNDERLINE = 512
+DRAW_STIPPLED_UNDERLINE = 1024
+DRAW_SQUIGGLY_UNDERLINE = 2048
+HIDDEN = 128
+
+OP_EQUAL = 0
+OP_NOT_EQUAL = 1
+OP_REGEX_MATCH = 2
+OP_NOT_REGEX_MATCH = 3
+OP_REGEX_CONTAINS = 4
+OP_NOT_REGEX_CONTAINS = 5
+
+CLASS_WORD_START = 1
+CLASS_WORD_END = 2
+CLASS_PUNCTUATION_START = 4
+CLASS_PUNCTUATION_END = 8
+CLASS_SUB_WORD_START = 16
+CLASS_SUB_WORD_END = 32
+CLASS_LINE_START = 64
+CLASS_LINE_END = 128
+CLASS_EMPTY_LINE = 256
+
+INHIBIT_WORD_COMPLETIONS = 8
+INHIBIT_EXPLICIT_COMPLETIONS = 16
+
+DIALOG_CANCEL = 0
+DIALOG_YES = 1
+DIALOG_NO = 2
+
+UI_ELEMENT_SIDE_BAR = 1
+UI_ELEMENT_MINIMAP = 2
+UI_ELEMENT_TABS = 4
+UI_ELEMENT_STATUS_BAR = 8
+UI_ELEMENT_MENU = 16
+UI_ELEMENT_OPEN_FILES = 32
+
+LAYOUT_INLINE = 0
+LAYOUT_BELOW = 1
+LAYOUT_BLOCK = 2
+
+_DEFAULT_WORD_SEPARATORS = "./\\()\"'-:,.;<>~!@#$%^&*|+=[]{}`~?"
+
+# The values of the settings that the plugin reads from the default Sublime
+# Text preferences.
+_DEFAULT_PREFERENCES = {
+    'auto_indent': True,
+    'auto_match_enabled': True,
+    'caret_style': 'smooth',
+    'draw_white_space': 'selection',
+    'line_numbers': True,
+    'relative_line_numbers': False,
+    'scroll_past_end': True,
+    'tab_size': 4,
+    'translate_tabs_to_spaces': False,
+    'trim_automatic_white_space': True,
+    'word_separators': _DEFAULT_WORD_SEPARATORS,
+    'word_wrap': 'auto',
+}
+
+# The base scopes and comment tokens of the syntaxes that the tests use.
+# Syntaxes that aren't listed here have their scope read from the syntax
+# definition, if it's a resource of a known package.
+_SYNTAXES = {
+    'C': ('source.c', '// ', '/*', '*/'),
+    'C++': ('source.c++', '// ', '/*', '*/'),
+    'CSS': ('source.css', None, '/*', '*/'),
+    'HTML': ('text.html.basic', None, '<!-- ', ' -->'),
+    'JavaScript': ('source.js', '// ', '/*', '*/'),
+    'PHP': ('embedding.php text.html.basic', '// ', '/*', '*/'),
+    'Plain text': ('text.plain', None, None, None),
+    'Python': ('source.python', '# ', None, None),
+    'Ruby': ('source.ruby', '# ', None, None),
+    'ShellScript': ('source.shell.bash', '# ', None, None),
+    'XML': ('text.xml', None, '<!-- ', ' -->'),
+}
+
+_EM_WIDTH = 10.0
+_LINE_HEIGHT = 22.0
+_SCREEN_ROWS = 40
+
+
+class Region():
+
+    __slots__ = ['a', 'b', 'xpos']
+
+    def __init__(self, a, b=None, xpos=-1):
+        if b is None:
+            b = a
+
+        self.a = a
+        self.b = b
+        self.xpos = xpos
+
+    def __str__(self):
+        return '(' + str(self.a) + ', ' + str(self.b) + ')'
+
+    def __repr__(self):
+        return '(' + str(self.a) + ', ' + str(self.b) + ')'
+
+    def __len__(self):
+        return self.size()
+
+    def __eq__(self, rhs):
+        return isinstance(rhs, Region) and self.a == rhs.a and self.b == rhs.b
+
+    def __ne__(self, rhs):
+        return not self.__eq__(rhs)
+
+    def __hash__(self):
+        return hash((self.a, self.b))
+
+    def __lt__(self, rhs):
+        lhb = self.begin()
+        rhb = rhs.begin()
+
+        if lhb == rhb:
+            return self.end() < rhs.end()
+        else:
+            return lhb < rhb
+
+    def __contains__(self, v):
+        return self.contains(v)
+
+    def to_tuple(self):
+        return (self.a, self.b)
+
+    def empty(self):
+        return self.a == self.b
+
+    def begin(self):
+        return self.a if self.a < self.b else self.b
+
+    def end(self):
+        return self.b if self.a < self.b else self.a
+
+    def size(self):
+        return abs(self.a - self.b)
+
+    def contains(self, x):
+        if isinstance(x, Region):
+            return self.contains(x.a) and self.contains(x.b)
+        else:
+            return x >= self.begin() and x <= self.end()
+
+    def cover(self, rhs):
+        a = min(self.begin(), rhs.begin())
+        b = max(self.end(), rhs.end())
+
+        if self.a < self.b:
+            return Region(a, b)
+        else:
+            return Region(b, a)
+
+    def intersection(self, rhs):
+        if self.end() <= rhs.begin():
+            return Region(0)
+        if self.begin() >= rhs.end():
+            return Region(0)
+
+        return Region(max(self.begin(), rhs.begin()), min(self.end(), rhs.end()))
+
+    def intersects(self, rhs):
+        lb = self.begin()
+        le = self.end()
+        rb = rhs.begin()
+        re = rhs.end()
+
+        return (((lb == rb and le == re) or (rb > lb and rb < le) or (lb > rb and lb < re)))
+
+
+def _should_merge(x, y):
+    # Regions are merged when they overlap, or when an empty region is at or
+    # inside a non-empty one, or when they are equal.
+    if x.begin() == y.begin() and x.end() == y.end():
+        return True
+
+    if x.empty() or y.empty():
+        return x.contains(y.begin()) if y.empty() else y.contains(x.begin())
+
+    return x.begin() < y.end() and y.begin() < x.end()
+
+
+class Selection():
+
+    def __init__(self, view_id):
+        self.view_id = view_id
+
+    def __len__(self):
+        return len(self._regions())
+
+    def __getitem__(self, index):
+        regions = self._regions()
+        if index < -len(regions) or index >= len(regions):
+            raise IndexError()
+
+        return Region(regions[index].a, regions[index].b, regions[index].xpos)
+
+    def __delitem__(self, index):
+        del self._regions()[index]
+
+    def __eq__(self, rhs):
+        return rhs is not None and list(self) == list(rhs)
+
+    def __lt__(self, rhs):
+        return rhs is not None and list(self) < list(rhs)
+
+    def __bool__(self):
+        return self.view_id != 0
+
+    def __iter__(self):
+        return iter([Region(r.a, r.b, r.xpos) for r in self._regions()])
+
+    def __str__(self):
+        return str(list(self))
+
+    def __repr__(self):
+        return 'Selection(' + str(list(self)) + ')'
+
+    def _regions(self):
+        return _views[self.view_id].sel
+
+    def is_valid(self):
+        return self.view_id in _views
+
+    def clear(self):
+        del self._regions()[:]
+
+    def add(self, x):
+        if not isinstance(x, Region):
+            x = Region(x)
+
+        size = _views[self.view_id].buffer.size()
+        x = Region(max(0, min(x.a, size)), max(0, min(x.b, size)), x.xpos)
+
+        # The regions are sorted and don't overlap, so their ends are sorted
+        # too, and only the run of regions around the insertion point that
+        # reach x can merge with it.
+        regions = self._regions()
+        lo = hi = bisect.bisect_left(regions, x)
+        while lo > 0 and regions[lo - 1].end() >= x.begin():
+            lo -= 1
+        while hi < len(regions) and regions[hi].begin() <= x.end():
+            hi += 1
+
+        merged = [r for r in regions[lo:hi] if _should_merge(r, x)]
+        for r in merged:
+            regions.remove(r)
+            if r.a < r.b or (r.a == r.b and x.a <= x.b):
+                x = Region(min(r.begin(), x.begin()), max(r.end(), x.end()), x.xpos)
+            else:
+                x = Region(max(r.end(), x.end()), min(r.begin(), x.begin()), x.xpos)
+
+        bisect.insort(regions, x)
+
+    def add_all(self, regions):
+        for r in regions:
+            if isinstance(r, (list, tuple)):
+                r = Region(r[0], r[1])
+
+            self.add(r)
+
+    def subtract(self, region):
+        regions = self._regions()
+        for r in list(regions):
+            if r.intersects(region) or region.contains(r):
+                regions.remove(r)
+                if r.begin() < region.begin():
+                    bisect.insort(regions, Region(r.begin(), region.begin()))
+                if r.end() > region.end():
+                    bisect.insort(regions, Region(region.end(), r.end()))
+
+    def contains(self, region):
+        return any(r.contains(region) for r in self._regions())
+
+
+class _GapBuffer():
+
+    # A gap buffer of characters. The text before the gap is kept in order,
+    # and the text after the gap is kept in reverse order, so that moving the
+    # gap and editing at the gap are both list appends and pops. The flat text
+    # is only built when it's needed, and cached until the next edit.
+
+    def __init__(self):
+        self._before = []  # type: list
+        self._after = []  # type: list
+        self._text = ''
+        self._line_starts = [0]  # type: list
+        # Edits since the line starts were last looked up, or None if the
+        # line starts need to be found again from the text.
+        self._pending_edits = []  # type: list
+
+    def size(self):
+        return len(self._before) + len(self._after)
+
+    def _move_gap(self, pos):
+        before = self._before
+        after = self._after
+        gap = len(before)
+        if pos < gap:
+            moved = before[pos:]
+            del before[pos:]
+            moved.reverse()
+            after.extend(moved)
+        elif pos > gap:
+            n = pos - gap
+            moved = after[len(after) - n:]
+            del after[len(after) - n:]
+            moved.reverse()
+            before.extend(moved)
+
+    def insert(self, pos, text):
+        self._move_gap(pos)
+        self._before.extend(text)
+        self._edited(pos, pos, text)
+
+    def erase(self, begin, end):
+        self._move_gap(end)
+        del self._before[begin:]
+        self._edited(begin, end, '')
+
+    def _edited(self, begin, end, text):
+        self._text = None
+        # A few edits between lookups (typing, or a motion after an edit) are
+        # cheaper to apply to the line starts than finding all the newlines
+        # again, but many edits (a :substitute) are not.
+        pending = self._pending_edits
+        if pending is not None:
+            if len(pending) < 8:
+                pending.append((begin, end, text))
+            else:
+                self._pending_edits = None
+
+    def text(self):
+        if self._text is None:
+            self._text = ''.join(self._before) + ''.join(reversed(self._after))
+
+        return self._text
+
+    def substr(self, begin, end):
+        if self._text is not None:
+            return self._text[begin:end]
+
+        before = self._before
+        after = self._after
+        gap = len(before)
+        if end <= gap:
+            return ''.join(before[begin:end])
+
+        # The after list is reversed, so the slice is read back to front.
+        size = len(after)
+        text = ''.join(reversed(after[max(0, size - (end - gap)):size - max(0, begin - gap)]))
+        if begin < gap:
+            text = ''.join(before[begin:]) + text
+
+        return text
+
+    def char(self, pos):
+        if pos < 0 or pos >= self.size():
+            return '\x00'
+
+        gap = len(self._before)
+        if pos < gap:
+            return self._before[pos]
+
+        return self._after[len(self._after) - 1 - (pos - gap)]
+
+    def line_starts(self):
+        pending = self._pending_edits
+        if pending is None:
+            text = self.text()
+            starts = [0]
+            find = text.find
+            pos = find('\n')
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = find('\n', pos + 1)
+
+            self._line_starts = starts
+            self._pending_edits = []
+        elif pending:
+            starts = self._line_starts
+            for begin, end, text in pending:
+                i = bisect.bisect_right(starts, begin)
+                j = bisect.bisect_right(starts, end)
+                length = len(text) - (end - begin)
+                inserted = [begin + offset + 1 for offset, c in enumerate(text) if c == '\n']
+                starts[i:] = inserted + [start + length for start in starts[j:]]
+
+            del pending[:]
+
+        return self._line_starts
+
+
+class _ViewData():
+
+    def __init__(self, view_id, window_id):
+        self.view_id = view_id
+        self.window_id = window_id
+        self.buffer = _GapBuffer()
+        self.buffer_id = view_id
+        self.sel = [Region(0)]
+        self.regions = {}  # type: dict
+        self.settings = Settings(sublime_api.new_settings_id(), parent=_preferences())
+        self.status = {}  # type: dict
+        self.name = ''
+        self.file_name = None
+        self.scratch = False
+        self.read_only = False
+        self.change_count = 0
+        self.saved_change_count = 0
+        self.viewport_position = (0.0, 0.0)
+        self.folds = []  # type: list
+        self.overwrite_status = False
+        self.undo_stack = []  # type: list
+        self.redo_stack = []  # type: list
+        self.undo_glue_marks = []  # type: list
+        self.command_history = []  # type: list
+        self.command_depth = 0
+        self.syntax = 'Packages/Text/Plain text.tmLanguage'
+        self.is_panel = False
+        self.valid = True
+
+    def adjust(self, begin, end, length):
+        # Move the selection and the region keys through an edit that replaces
+        # begin to end with text of the given length.
+        def _point(p):
+            if p >= end:
+                return p - (end - begin) + length
+            if p > begin:
+                return min(p, begin + length)
+
+            return p
+
+        if begin == end:
+            def _insert_point(p):
+                return p + length if p >= begin else p
+
+            point = _insert_point
+        else:
+            point = _point
+
+        self.sel[:] = sorted(Region(point(r.a), point(r.b), r.xpos) for r in self.sel)
+
+        for key, (regions, scope, icon, flags) in self.regions.items():
+            self.regions[key] = ([Region(point(r.a), point(r.b)) for r in regions], scope, icon, flags)
+
+
+_views = {}  # type: dict
+_windows = {}  # type: dict
+_settings = {}  # type: dict
+_clipboard = ''
+_status_message = ''
+_packages_path = None
+
+
+def _preferences():
+    return load_settings('Preferences.sublime-settings')
+
+
+def _check_edit(edit):
+    if edit is None:
+        raise ValueError('Edit objects may not be used after the TextCommand\'s run method has returned')
+
+
+_POSIX_CLASSES = {
+    'alnum': 'a-zA-Z0-9',
+    'alpha': 'a-zA-Z',
+    'digit': '0-9',
+    'lower': 'a-z',
+    'space': '\\s',
+    'upper': 'A-Z',
+}
+
+
+def _translate_pattern(pattern, flags):
+    # Translate the parts of the Boost regular expression syntax that the
+    # plugin and the tests use and that Python doesn't support.
+    if flags & LITERAL:
+        return re.escape(pattern)
+
+    pattern = pattern.replace('\\<', '\\b(?=\\w)').replace('\\>', '\\b(?<=\\w)')
+    pattern = re.sub(r'(?<!\\)((?:\\\\)*)\\z', '\\1\\\\Z', pattern)
+
+    for name, chars in _POSIX_CLASSES.items():
+        pattern = pattern.replace('[:' + name + ':]', chars)
+
+    return pattern
+
+
+def _compile(pattern, flags):
+    re_flags = re.MULTILINE
+    if flags & IGNORECASE:
+        re_flags |= re.IGNORECASE
+
+    return re.compile(_translate_pattern(pattern, flags), re_flags)
+
+
+class View():
+
+    def __init__(self, id):
+        self.view_id = id
+        self.selection = Selection(id)
+        self.settings_object = None
+
+    def __len__(self):
+        return self.size()
+
+    def __eq__(self, other):
+        return isinstance(other, View) and other.view_id == self.view_id
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __bool__(self):
+        return self.view_id != 0
+
+    def __hash__(self):
+        return self.view_id
+
+    def __repr__(self):
+        return 'View(%r)' % self.view_id
+
+    def _data(self):
+        # Closed views behave like empty views, as they do in the editor.
+        data = _views.get(self.view_id)
+        if data is None:
+            data = _ViewData(self.view_id, None)
+
+        return data
+
+    def id(self):
+        return self.view_id
+
+    def buffer_id(self):
+        return self._data().buffer_id
+
+    def is_valid(self):
+        return self.view_id in _views
+
+    def is_primary(self):
+        return True
+
+    def window(self):
+        data = _views.get(self.view_id)
+        if data and data.window_id in _windows:
+            return Window(data.window_id)
+
+        return None
+
+    def file_name(self):
+        return self._data().file_name
+
+    def close(self):
+        window = self.window()
+        if window:
+            return window._close_view(self)
+
+        return False
+
+    def retarget(self, new_fname):
+        self._data().file_name = new_fname
+
+    def name(self):
+        return self._data().name
+
+    def set_name(self, name):
+        self._data().name = name
+
+    def reset_reference_document(self):
+        pass
+
+    def set_reference_document(self, reference):
+        pass
+
+    def is_loading(self):
+        return False
+
+    def is_dirty(self):
+        data = self._data()
+        return data.change_count != data.saved_change_count
+
+    def is_read_only(self):
+        return self._data().read_only
+
+    def set_read_only(self, read_only):
+        self._data().read_only = read_only
+
+    def is_scratch(self):
+        return self._data().scratch
+
+    def set_scratch(self, scratch):
+        self._data().scratch = scratch
+
+    def encoding(self):
+        return 'Undefined'
+
+    def set_encoding(self, encoding_name):
+        pass
+
+    def line_endings(self):
+        return 'Unix'
+
+    def set_line_endings(self, line_ending_name):
+        pass
+
+    def size(self):
+        return self._data().buffer.size()
+
+    def begin_edit(self, edit_token, cmd, args=None):
+        return Edit(edit_token)
+
+    def end_edit(self, edit):
+        edit.edit_token = 0
+
+    def is_in_edit(self):
+        return self._data().command_depth > 0
+
+    def _edit(self, begin, end, text):
+        data = self._data()
+        buffer = data.buffer
+        if end > begin:
+            buffer.erase(begin, end)
+        if text:
+            buffer.insert(begin, text)
+
+        data.change_count += 1
+        data.adjust(begin, end, len(text))
+        data.redo_stack = []
+
+    def insert(self, edit, pt, text):
+        _check_edit(edit)
+        if pt < 0 or pt > self.size():
+            raise ValueError('point out of bounds')
+
+        if '\t' in text and self.settings().get('translate_tabs_to_spaces'):
+            text = _expand_tabs(text, self.rowcol(pt)[1], self.settings().get('tab_size', 4))
+
+        self._edit(pt, pt, text)
+
+        return len(text)
+
+    def erase(self, edit, r):
+        _check_edit(edit)
+        begin = max(0, r.begin())
+        end = min(self.size(), r.end())
+        if end > begin:
+            self._edit(begin, end, '')
+
+    def replace(self, edit, r, text):
+        _check_edit(edit)
+        begin = max(0, r.begin())
+        end = min(self.size(), r.end())
+        self._edit(begin, end, text)
+
+    def change_count(self):
+        return self._data().change_count
+
+    def run_command(self, cmd, args=None):
+        sublime_api.view_run_command(self.view_id, cmd, args)
+
+    def sel(self):
+        return self.selection
+
+    def substr(self, x):
+        buffer = self._data().buffer
+        if isinstance(x, Region):
+            return buffer.substr(max(0, x.begin()), max(0, x.end()))
+
+        return buffer.char(x)
+
+    def find(self, pattern, start_pt, flags=0):
+        if start_pt < 0:
+            start_pt = 0
+
+        match = _compile(pattern, flags).search(self._data().buffer.text(), start_pt)
+        if match:
+            return Region(match.start(), match.end())
+
+        return Region(-1, -1)
+
+    def find_all(self, pattern, flags=0, format=None, extractions=None):
+        regions = []
+        for match in _compile(pattern, flags).finditer(self._data().buffer.text()):
+            regions.append(Region(match.start(), match.end()))
+            if format is not None and extractions is not None:
+                extractions.append(match.expand(format.replace('$', '\\')))
+
+        return regions
+
+    def settings(self):
+        return self._data().settings
+
+    def _syntax_info(self):
+        syntax = self._data().syntax
+        name = os.path.splitext(os.path.basename(syntax))[0]
+        info = _SYNTAXES.get(name)
+        if info is None:
+            try:
+                match = re.search('^scope: *(\\S+)', load_resource(syntax), re.MULTILINE)
+            except (IOError, ValueError):
+                match = None
+
+            info = (match.group(1) if match else 'text.plain', None, None, None)
+
+        return info
+
+    def meta_info(self, key, pt):
+        if key == 'shellVariables':
+            _, line, start, end = self._syntax_info()
+            variables = []
+            if line:
+                variables.append({'name': 'TM_COMMENT_START', 'value': line})
+            if start:
+                variables.append({'name': 'TM_COMMENT_START_2' if line else 'TM_COMMENT_START', 'value': start})
+                variables.append({'name': 'TM_COMMENT_END_2' if line else 'TM_COMMENT_END', 'value': end})
+
+            return variables
+
+        return None
+
+    def extract_tokens_with_scopes(self, r):
+        return [(r, self.scope_name(r.begin()))]
+
+    def extract_scope(self, pt):
+        return self.line(pt)
+
+    def scope_name(self, pt):
+        return self._syntax_info()[0] + ' '
+
+    def match_selector(self, pt, selector):
+        return _score_selector(self.scope_name(pt), selector) > 0
+
+    def score_selector(self, pt, selector):
+        return _score_selector(self.scope_name(pt), selector)
+
+    def find_by_selector(self, selector):
+        return []
+
+    def style(self):
+        return {}
+
+    def style_for_scope(self, scope):
+        return {}
+
+    def indented_region(self, pt):
+        return Region(pt)
+
+    def indentation_level(self, pt):
+        line = self.substr(self.line(pt))
+        tab_size = self.settings().get('tab_size', 4)
+        width = 0
+        for c in line:
+            if c == ' ':
+                width += 1
+            elif c == '\t':
+                width += tab_size - (width % tab_size)
+            else:
+                break
+
+        return width // tab_size
+
+    def has_non_empty_selection_region(self):
+        return any(not r.empty() for r in self.sel())
+
+    def lines(self, r):
+        lines = []
+        begin = r.begin()
+        end = r.end()
+        line = self.line(begin)
+        while True:
+            lines.append(line)
+            if line.b + 1 >= end or line.b >= self.size():
+                break
+
+            line = self.line(line.b + 1)
+
+        return lines
+
+    def split_by_newlines(self, r):
+        if r.empty():
+            return [r]
+
+        lines = []
+        begin = r.begin()
+        end = r.end()
+        for line in self.lines(r):
+            lines.append(Region(max(begin, line.a), min(end, line.b)))
+
+        return lines
+
+    def line(self, x):
+        if isinstance(x, Region):
+            return Region(self.line(x.begin()).a, self.line(x.end()).b)
+
+        size = self.size()
+        x = max(0, min(x, size))
+        starts = self._data().buffer.line_starts()
+        row = bisect.bisect_right(starts, x) - 1
+        a = starts[row]
+        b = starts[row + 1] - 1 if row + 1 < len(starts) else size
+
+        return Region(a, b)
+
+    def full_line(self, x):
+        if isinstance(x, Region):
+            return Region(self.line(x.begin()).a, self.full_line(x.end()).b)
+
+        line = self.line(x)
+
+        return Region(line.a, min(line.b + 1, self.size()))
+
+    def word(self, x):
+        if isinstance(x, Region):
+            return Region(self.word(x.begin()).a, self.word(x.end()).b)
+
+        separators = self.settings().get('word_separators', _DEFAULT_WORD_SEPARATORS)
+
+        def _class(c):
+            if c in ' \t\n\x00':
+                return 0
+            if c in separators:
+                return 1
+
+            return 2
+
+        size = self.size()
+        x = max(0, min(x, size))
+        char_class = _class(self.substr(x))
+        if char_class != 2 and x > 0 and _class(self.substr(x - 1)) == 2:
+            x -= 1
+            char_class = 2
+
+        if char_class == 0:
+            return Region(x)
+
+        a = x
+        while a > 0 and _class(self.substr(a - 1)) == char_class:
+            a -= 1
+
+        b = x
+        while b < size and _class(self.substr(b)) == char_class:
+            b += 1
+
+        return Region(a, b)
+
+    def classify(self, pt):
+        separators = self.settings().get('word_separators', _DEFAULT_WORD_SEPARATORS)
+
+        return _classify(self, pt, separators)
+
+    def find_by_class(self, pt, forward, classes, separators=''):
+        if not separators:
+            separators = self.settings().get('word_separators', _DEFAULT_WORD_SEPARATORS)
+
+        size = self.size()
+        if forward:
+            pt += 1
+            while pt < size:
+                if _classify(self, pt, separators) & classes:
+                    return pt
+                pt += 1
+
+            return size
+
+        pt -= 1
+        while pt > 0:
+            if _classify(self, pt, separators) & classes:
+                return pt
+            pt -= 1
+
+        return 0
+
+    def expand_by_class(self, x, classes, separators=''):
+        if not isinstance(x, Region):
+            x = Region(x)
+
+        a = self.find_by_class(x.begin(), False, classes, separators)
+        b = self.find_by_class(x.end(), True, classes, separators)
+
+        return Region(a, b)
+
+    def rowcol(self, tp):
+        tp = max(0, min(tp, self.size()))
+        starts = self._data().buffer.line_starts()
+        row = bisect.bisect_right(starts, tp) - 1
+
+        return (row, tp - starts[row])
+
+    def text_point(self, row, col):
+        row = int(row)
+        col = int(col)
+        starts = self._data().buffer.line_starts()
+        if row < 0:
+            row = 0
+        if row >= len(starts):
+            return self.size()
+
+        return min(starts[row] + col, self.size())
+
+    def visible_region(self):
+        row = int(self._data().viewport_position[1] // _LINE_HEIGHT)
+        begin = self.text_point(row, 0)
+        end = self.line(self.text_point(row + _SCREEN_ROWS - 1, 0)).b
+
+        return Region(begin, end)
+
+    def show(self, x, show_surrounds=True):
+        if isinstance(x, (Selection, list)):
+            x = x[0] if len(x) else Region(0)
+        if isinstance(x, Region):
+            x = x.b
+
+        row = self.rowcol(x)[0]
+        top = int(self._data().viewport_position[1] // _LINE_HEIGHT)
+        if row < top:
+            self.set_viewport_position((0.0, row * _LINE_HEIGHT), False)
+        elif row >= top + _SCREEN_ROWS:
+            self.set_viewport_position((0.0, (row - _SCREEN_ROWS + 1) * _LINE_HEIGHT), False)
+
+    def show_at_center(self, x):
+        if isinstance(x, Region):
+            x = x.b
+
+        row = self.rowcol(x)[0]
+        top = max(0, row - _SCREEN_ROWS // 2)
+        self.set_viewport_position((0.0, top * _LINE_HEIGHT), False)
+
+    def viewport_position(self):
+        return self._data().viewport_position
+
+    def set_viewport_position(self, xy, animate=True):
+        self._data().viewport_position = (float(xy[0]), float(max(0, xy[1])))
+
+    def viewport_extent(self):
+        return (80 * _EM_WIDTH, _SCREEN_ROWS * _LINE_HEIGHT)
+
+    def layout_extent(self):
+        return (80 * _EM_WIDTH, self.rowcol(self.size())[0] * _LINE_HEIGHT + _LINE_HEIGHT)
+
+    def text_to_layout(self, tp):
+        row, col = self.rowcol(tp)
+
+        return (col * _EM_WIDTH, row * _LINE_HEIGHT)
+
+    def text_to_window(self, tp):
+        x, y = self.text_to_layout(tp)
+        vx, vy = self.viewport_position()
+
+        return (x - vx, y - vy)
+
+    def layout_to_text(self, xy):
+        row = int(xy[1] // _LINE_HEIGHT)
+        col = int(xy[0] // _EM_WIDTH)
+        line = self.line(self.text_point(row, 0))
+
+        return min(line.a + col, line.b)
+
+    def window_to_layout(self, xy):
+        vx, vy = self.viewport_position()
+
+        return (xy[0] + vx, xy[1] + vy)
+
+    def window_to_text(self, xy):
+        return self.layout_to_text(self.window_to_layout(xy))
+
+    def line_height(self):
+        return _LINE_HEIGHT
+
+    def em_width(self):
+        return _EM_WIDTH
+
+    def is_folded(self, sr):
+        return any(r.contains(sr) for r in self._data().folds)
+
+    def folded_regions(self):
+        return list(self._data().folds)
+
+    def fold(self, x):
+        regions = x if isinstance(x, list) else [x]
+        folds = self._data().folds
+        new = [r for r in regions if r not in folds]
+        folds.extend(new)
+        folds.sort()
+
+        return bool(new)
+
+    def unfold(self, x):
+        regions = x if isinstance(x, list) else [x]
+        folds = self._data().folds
+        unfolded = [r for r in folds if any(r.intersects(x) or x.contains(r) for x in regions)]
+        for r in unfolded:
+            folds.remove(r)
+
+        return unfolded
+
+    def add_regions(self, key, regions, scope='', icon='', flags=0):
+        self._data().regions[key] = ([Region(r.a, r.b) for r in regions], scope, icon, flags)
+
+    def get_regions(self, key):
+        regions = self._data().regions.get(key)
+        if regions:
+            return [Region(r.a, r.b) for r in regions[0]]
+
+        return []
+
+    def erase_regions(self, key):
+        self._data().regions.pop(key, None)
+
+    def add_phantom(self, key, region, content, layout, on_navigate=None):
+        return 0
+
+    def erase_phantoms(self, key):
+        pass
+
+    def erase_phantom_by_id(self, pid):
+        pass
+
+    def query_phantom(self, pid):
+        return []
+
+    def query_phantoms(self, pids):
+        return []
+
+    def assign_syntax(self, syntax_file):
+        self._data().syntax = syntax_file
+
+    def set_syntax_file(self, syntax_file):
+        self._data().syntax = syntax_file
+
+    def syntax(self):
+        return self._data().syntax
+
+    def symbols(self):
+        return []
+
+    def get_symbols(self):
+        return []
+
+    def indexed_symbols(self):
+        return []
+
+    def set_status(self, key, value):
+        self._data().status[key] = value
+
+    def get_status(self, key):
+        return self._data().status.get(key, '')
+
+    def erase_status(self, key):
+        self._data().status.pop(key, None)
+
+    def extract_completions(self, prefix, tp=-1):
+        return []
+
+    def find_all_results(self):
+        return []
+
+    def find_all_results_with_text(self):
+        return []
+
+    def command_history(self, delta, modifying_only=False):
+        history = self._data().command_history
+        if modifying_only:
+            history = [h for h in history if h[3]]
+
+        index = len(history) - 1 + delta
+        if index < 0 or index >= len(history) or delta > 0:
+            return (None, None, 0)
+
+        return history[index][:3]
+
+    def overwrite_status(self):
+        return self._data().overwrite_status
+
+    def set_overwrite_status(self, value):
+        self._data().overwrite_status = value
+
+    def show_popup_menu(self, items, on_select, flags=0):
+        pass
+
+    def show_popup(self, content, flags=0, location=-1, max_width=320, max_height=240, on_navigate=None,
+                   on_hide=None):
+        pass
+
+    def update_popup(self, content):
+        pass
+
+    def is_popup_visible(self):
+        return False
+
+    def hide_popup(self):
+        pass
+
+    def is_auto_complete_visible(self):
+        return False
+
+
+def _expand_tabs(text, column, tab_size):
+    expanded = []
+    for c in text:
+        if c == '\t':
+            spaces = tab_size - (column % tab_size)
+            expanded.append(' ' * spaces)
+            column += spaces
+        else:
+            expanded.append(c)
+            column = 0 if c == '\n' else column + 1
+
+    return ''.join(expanded)
+
+
+def _classify(view, pt, separators):
+    size = view.size()
+    if pt < 0 or pt > size:
+        return 0
+
+    def _class(c):
+        if c in ' \t\n\x00':
+            return 0
+        if c in separators:
+            return 1
+
+        return 2
+
+    prev = view.substr(pt - 1) if pt > 0 else '\n'
+    curr = view.substr(pt) if pt < size else '\n'
+    prev_class = _class(prev) if pt > 0 else 0
+    curr_class = _class(curr) if pt < size else 0
+
+    classes = 0
+    if prev == '\n':
+        classes |= CLASS_LINE_START
+    if curr == '\n':
+        classes |= CLASS_LINE_END
+    if prev == '\n' and curr == '\n':
+        classes |= CLASS_EMPTY_LINE
+
+    if curr_class == 2 and prev_class != 2:
+        classes |= CLASS_WORD_START
+    if prev_class == 2 and curr_class != 2:
+        classes |= CLASS_WORD_END
+    if curr_class == 1 and prev_class != 1:
+        classes |= CLASS_PUNCTUATION_START
+    if prev_class == 1 and curr_class != 1:
+        classes |= CLASS_PUNCTUATION_END
+
+    if classes & CLASS_WORD_START or (curr_class == 2 and (prev == '_' or (prev.islower() and curr.isupper()))):
+        classes |= CLASS_SUB_WORD_START
+    if classes & CLASS_WORD_END or (prev_class == 2 and (curr == '_' or (prev.islower() and curr.isupper()))):
+        classes |= CLASS_SUB_WORD_END
+
+    return classes
+
+
+def _score_selector(scope_name, selector):
+    scopes = scope_name.split()
+    best = 0
+    for alternative in selector.split(','):
+        alternative = alternative.strip()
+        if not alternative:
+            continue
+
+        negative = [part.strip() for part in alternative.split(' - ')[1:]]
+        positive = alternative.split(' - ')[0].split()
+        if any(_score_selector(scope_name, n) for n in negative):
+            continue
+
+        score = 0
+        i = 0
+        for part in positive:
+            while i < len(scopes) and not (scopes[i] == part or scopes[i].startswith(part + '.')):
+                i += 1
+            if i == len(scopes):
+                score = 0
+                break
+
+            score += 1 << (3 * (i + 1))
+            i += 1
+
+        best = max(best, score)
+
+    return best
+
+
+class Edit():
+
+    def __init__(self, token):
+        self.edit_token = token
+
+    def __repr__(self):
+        return 'Edit(%r)' % self.edit_token
+
+
+class _WindowData():
+
+    def __init__(self, window_id):
+        self.window_id = window_id
+        self.views = []  # type: list
+        self.active_view_id = None
+        self.settings = Settings(sublime_api.new_settings_id())
+        self.panels = {}  # type: dict
+        self.active_panel = None
+        self.layout = {'cells': [[0, 0, 1, 1]], 'cols': [0.0, 1.0], 'rows': [0.0, 1.0]}
+        self.groups = {}  # type: dict
+        self.active_group = 0
+        self.input_panel = None
+        self.sidebar_visible = True
+        self.minimap_visible = True
+        self.status_bar_visible = True
+        self.menu_visible = True
+        self.tabs_visible = True
+        self.project_data = None
+        self.folders = []  # type: list
+
+
+class Window():
+
+    def __init__(self, id):
+        self.window_id = id
+        self.settings_object = None
+        self.template_settings_object = None
+
+    def __eq__(self, other):
+        return isinstance(other, Window) and other.window_id == self.window_id
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __bool__(self):
+        return self.window_id != 0
+
+    def __hash__(self):
+        return self.window_id
+
+    def __repr__(self):
+        return 'Window(%r)' % self.window_id
+
+    def _data(self):
+        return _windows[self.window_id]
+
+    def id(self):
+        return self.window_id
+
+    def is_valid(self):
+        return self.window_id in _windows
+
+    def hwnd(self):
+        return 0
+
+    def active_sheet(self):
+        return None
+
+    def active_view(self):
+        data = self._data()
+        if data.active_view_id in _views:
+            return View(data.active_view_id)
+
+        return None
+
+    def _new_view(self):
+        data = self._data()
+        view_id = sublime_api.new_view_id()
+        _views[view_id] = _ViewData(view_id, self.window_id)
+        group = data.active_group
+        data.groups.setdefault(group, []).append(view_id)
+        data.views.append(view_id)
+
+        return View(view_id)
+
+    def new_file(self, flags=0, syntax=''):
+        view = self._new_view()
+        if syntax:
+            view.assign_syntax(syntax)
+
+        self.focus_view(view)
+        sublime_api.dispatch_event('on_new', view)
+
+        return view
+
+    def open_file(self, fname, flags=0, group=-1):
+        path = fname
+        if flags & ENCODED_POSITION:
+            match = re.match(r'^(.*?)(?::(\d+))?(?::(\d+))?$', fname)
+            path = match.group(1)
+
+        view = self.find_open_file(path)
+        if view is None:
+            view = self._new_view()
+            data = view._data()
+            data.file_name = path
+            if os.path.isfile(path):
+                with open(path, encoding='utf-8', errors='replace') as f:
+                    data.buffer.insert(0, f.read())
+
+            sublime_api.dispatch_event('on_load', view)
+
+        self.focus_view(view)
+
+        return view
+
+    def find_open_file(self, fname):
+        for view_id in self._data().views:
+            if _views[view_id].file_name == fname:
+                return View(view_id)
+
+        return None
+
+    def num_groups(self):
+        return len(self._data().layout['cells'])
+
+    def active_group(self):
+        return self._data().active_group
+
+    def focus_group(self, idx):
+        data = self._data()
+        if 0 <= idx < self.num_groups():
+            data.active_group = idx
+            views = data.groups.get(idx)
+            if views:
+                data.active_view_id = views[-1]
+
+    def focus_view(self, view):
+        data = self._data()
+        if view and view.view_id in data.views:
+            previous = data.active_view_id
+            data.active_view_id = view.view_id
+            data.active_group = self.get_view_index(view)[0]
+            if previous != view.view_id:
+                if previous in _views:
+                    sublime_api.dispatch_event('on_deactivated', View(previous))
+
+                sublime_api.dispatch_event('on_activated', view)
+
+    def get_sheet_index(self, sheet):
+        return (-1, -1)
+
+    def get_view_index(self, view):
+        for group, views in self._data().groups.items():
+            if view.view_id in views:
+                return (group, views.index(view.view_id))
+
+        return (-1, -1)
+
+    def set_view_index(self, view, group, idx):
+        data = self._data()
+        for views in data.groups.values():
+            if view.view_id in views:
+                views.remove(view.view_id)
+
+        views = data.groups.setdefault(group, [])
+        views.insert(min(idx, len(views)), view.view_id)
+
+    def sheets(self):
+        return []
+
+    def views(self):
+        return [View(x) for x in self._data().views]
+
+    def active_sheet_in_group(self, group):
+        return None
+
+    def active_view_in_group(self, group):
+        views = self._data().groups.get(group)
+        if not views:
+            return None
+
+        if self._data().active_view_id in views:
+            return View(self._data().active_view_id)
+
+        return View(views[-1])
+
+    def sheets_in_group(self, group):
+        return []
+
+    def views_in_group(self, group):
+        return [View(x) for x in self._data().groups.get(group, [])]
+
+    def transient_sheet_in_group(self, group):
+        return None
+
+    def transient_view_in_group(self, group):
+        return None
+
+    def layout(self):
+        return self._data().layout
+
+    def get_layout(self):
+        return self.layout()
+
+    def set_layout(self, layout):
+        data = self._data()
+        data.layout = layout
+        groups = len(layout['cells'])
+        for group in list(data.groups):
+            if group >= groups:
+                data.groups.setdefault(groups - 1, []).extend(data.groups.pop(group))
+        if data.active_group >= groups:
+            data.active_group = groups - 1
+
+    def create_output_panel(self, name, unlisted=False):
+        data = self._data()
+        if data.panels.get(name) in _views:
+            return View(data.panels[name])
+
+        view_id = sublime_api.new_view_id()
+        view_data = _ViewData(view_id, self.window_id)
+        view_data.is_panel = True
+        view_data.settings.set('is_widget', True)
+        _views[view_id] = view_data
+        data.panels[name] = view_id
+
+        return View(view_id)
+
+    def find_output_panel(self, name):
+        view_id = self._data().panels.get(name)
+
+        return View(view_id) if view_id in _views else None
+
+    def destroy_output_panel(self, name):
+        view_id = self._data().panels.pop(name, None)
+        _views.pop(view_id, None)
+
+    def active_panel(self):
+        return self._data().active_panel
+
+    def panels(self):
+        return ['output.' + name for name in self._data().panels]
+
+    def get_output_panel(self, name):
+        return self.create_output_panel(name)
+
+    def show_input_panel(self, caption, initial_text, on_done, on_change, on_cancel):
+        data = self._data()
+        view_id = sublime_api.new_view_id()
+        view_data = _ViewData(view_id, self.window_id)
+        view_data.is_panel = True
+        view_data.settings.set('is_widget', True)
+        view_data.buffer.insert(0, initial_text)
+        view_data.sel = [Region(len(initial_text))]
+        _views[view_id] = view_data
+        data.input_panel = (view_id, on_done, on_change, on_cancel)
+        data.active_panel = 'input'
+
+        return View(view_id)
+
+    def show_quick_panel(self, items, on_select, flags=0, selected_index=-1, on_highlight=None):
+        self._data().active_panel = 'quick_panel'
+        sublime_api.quick_panels.append((items, on_select, selected_index, on_highlight))
+
+    def is_sidebar_visible(self):
+        return self._data().sidebar_visible
+
+    def set_sidebar_visible(self, flag):
+        self._data().sidebar_visible = flag
+
+    def is_minimap_visible(self):
+        return self._data().minimap_visible
+
+    def set_minimap_visible(self, flag):
+        self._data().minimap_visible = flag
+
+    def is_status_bar_visible(self):
+        return self._data().status_bar_visible
+
+    def set_status_bar_visible(self, flag):
+        self._data().status_bar_visible = flag
+
+    def get_tabs_visible(self):
+        return self._data().tabs_visible
+
+    def set_tabs_visible(self, flag):
+        self._data().tabs_visible = flag
+
+    def is_menu_visible(self):
+        return self._data().menu_visible
+
+    def set_menu_visible(self, flag):
+        self._data().menu_visible = flag
+
+    def folders(self):
+        return list(self._data().folders)
+
+    def project_file_name(self):
+        return None
+
+    def project_data(self):
+        return self._data().project_data
+
+    def set_project_data(self, v):
+        self._data().project_data = v
+
+    def run_command(self, cmd, args=None):
+        sublime_api.window_run_command(self.window_id, cmd, args)
+
+    def settings(self):
+        return self._data().settings
+
+    def template_settings(self):
+        return self._data().settings
+
+    def lookup_symbol_in_index(self, sym):
+        return []
+
+    def lookup_symbol_in_open_files(self, sym):
+        return []
+
+    def extract_variables(self):
+        variables = {'platform': platform().capitalize()}
+        view = self.active_view()
+        if view and view.file_name():
+            file_name = view.file_name()
+            variables['file'] = file_name
+            variables['file_path'] = os.path.dirname(file_name)
+            variables['file_name'] = os.path.basename(file_name)
+            variables['file_base_name'] = os.path.splitext(os.path.basename(file_name))[0]
+            variables['file_extension'] = os.path.splitext(file_name)[1][1:]
+
+        folders = self.folders()
+        if folders:
+            variables['folder'] = folders[0]
+
+        return variables
+
+    def status_message(self, msg):
+        status_message(msg)
+
+    def _close_view(self, view):
+        data = self._data()
+        if view.view_id not in data.views:
+            return False
+
+        sublime_api.dispatch_event('on_pre_close', view)
+        data.views.remove(view.view_id)
+        for views in data.groups.values():
+            if view.view_id in views:
+                views.remove(view.view_id)
+
+        _views.pop(view.view_id, None)
+        if data.active_view_id == view.view_id:
+            data.active_view_id = None
+            views = data.groups.get(data.active_group) or data.views
+            if views:
+                self.focus_view(View(views[-1]))
+
+        sublime_api.dispatch_event('on_close', view)
+
+        return True
+
+
+class Settings():
+
+    def __init__(self, id, parent=None):
+        self.settings_id = id
+        self._values = {}  # type: dict
+        self._parent = parent
+        self._on_change = {}  # type: dict
+
+    def get(self, key, default=None):
+        if key in self._values:
+            return self._values[key]
+        if self._parent is not None:
+            return self._parent.get(key, default)
+
+        return default
+
+    def has(self, key):
+        return key in self._values or (self._parent is not None and self._parent.has(key))
+
+    def set(self, key, value):
+        self._values[key] = value
+        for callback in list(self._on_change.values()):
+            callback()
+
+    def erase(self, key):
+        self._values.pop(key, None)
+        for callback in list(self._on_change.values()):
+            callback()
+
+    def add_on_change(self, tag, callback):
+        self._on_change[tag] = callback
+
+    def clear_on_change(self, tag):
+        self._on_change.pop(tag, None)
+
+    def to_dict(self):
+        values = self._parent.to_dict() if self._parent is not None else {}
+        values.update(self._values)
+
+        return values
+
+
+def _load_json_with_comments(content):
+    content = re.sub(r'^\s*//.*$', '', content, flags=re.MULTILINE)
+    content = re.sub(r',(\s*[}\]])', '\\1', content)
+
+    return json.loads(content)
+
+
+def load_settings(base_name):
+    settings = _settings.get(base_name)
+    if settings is None:
+        settings = Settings(sublime_api.new_settings_id())
+        if base_name == 'Preferences.sublime-settings':
+            settings._values.update(_DEFAULT_PREFERENCES)
+
+        for resource in find_resources(base_name):
+            try:
+                settings._values.update(_load_json_with_comments(load_resource(resource)))
+            except ValueError:
+                pass
+
+        _settings[base_name] = settings
+
+    return settings
+
+
+def save_settings(base_name):
+    pass
+
+
+def set_timeout(f, timeout_ms=0):
+    sublime_api.set_timeout(f, timeout_ms)
+
+
+def set_timeout_async(f, timeout_ms=0):
+    sublime_api.set_timeout(f, timeout_ms)
+
+
+def error_message(msg):
+    sublime_api.messages.append(('error', msg))
+
+
+def message_dialog(msg):
+    sublime_api.messages.append(('message', msg))
+
+
+def ok_cancel_dialog(msg, ok_title=''):
+    sublime_api.messages.append(('ok_cancel', msg))
+
+    return True
+
+
+def yes_no_cancel_dialog(msg, yes_title='', no_title=''):
+    sublime_api.messages.append(('yes_no_cancel', msg))
+
+    return DIALOG_YES
+
+
+def status_message(msg):
+    global _status_message
+    _status_message = msg
+
+
+def get_clipboard(size_limit=16777216):
+    return _clipboard
+
+
+def set_clipboard(text):
+    global _clipboard
+    _clipboard = text
+
+
+def log_commands(flag):
+    pass
+
+
+def log_input(flag):
+    pass
+
+
+def log_result_regex(flag):
+    pass
+
+
+def log_indexing(flag):
+    pass
+
+
+def log_build_systems(flag):
+    pass
+
+
+def score_selector(scope_name, selector):
+    return _score_selector(scope_name, selector)
+
+
+def run_command(cmd, args=None):
+    sublime_api.run_command(cmd, args)
+
+
+def version():
+    return '3211'
+
+
+def platform():
+    if sys.platform.startswith('win'):
+        return 'windows'
+    if sys.platform.startswith('darwin'):
+        return 'osx'
+
+    return 'linux'
+
+
+def arch():
+    return 'x64'
+
+
+def channel():
+    return 'stable'
+
+
+def executable_path():
+    return sys.executable
+
+
+def _data_path():
+    path = os.path.join(tempfile.gettempdir(), 'NeoVintageous-headless')
+    if not os.path.isdir(path):
+        os.makedirs(path)
+
+    return path
+
+
+def packages_path():
+    return _packages_path or os.path.join(_data_path(), 'Packages')
+
+
+def installed_packages_path():
+    return os.path.join(_data_path(), 'Installed Packages')
+
+
+def cache_path():
+    return os.path.join(_data_path(), 'Cache')
+
+
+def _resource_roots():
+    # The packages known to the headless editor: the package under test, and
+    # any packages in the packages path.
+    roots = {}
+    package = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    roots['NeoVintageous'] = package
+
+    path = packages_path()
+    if os.path.isdir(path):
+        for name in os.listdir(path):
+            if os.path.isdir(os.path.join(path, name)) and name not in roots:
+                roots[name] = os.path.join(path, name)
+
+    return roots
+
+
+def find_resources(pattern):
+    import fnmatch
+
+    resources = []
+    for name, root in sorted(_resource_roots().items()):
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != '__pycache__']
+            for filename in filenames:
+                if fnmatch.fnmatch(filename, pattern):
+                    rel = os.path.relpath(os.path.join(dirpath, filename), root).replace(os.sep, '/')
+                    resources.append('Packages/' + name + '/' + rel)
+
+    return resources
+
+
+def load_resource(name):
+    return load_binary_resource(name).decode('utf-8')
+
+
+def load_binary_resource(name):
+    parts = name.split('/')
+    if len(parts) < 3 or parts[0] != 'Packages':
+        raise IOError('resource not found')
+
+    root = _resource_roots().get(parts[1])
+    if not root:
+        raise IOError('resource not found')
+
+    with open(os.path.join(root, *parts[2:]), 'rb') as f:
+        return f.read()
+
+
+def expand_variables(val, variables):
+    if isinstance(val, str):
+        return re.sub(r'\$\{?(\w+)\}?', lambda m: variables.get(m.group(1), m.group(0)), val)
+
+    return val
+
+
+def active_window():
+    return Window(sublime_api.active_window_id())
+
+
+def windows():
+    return [Window(x) for x in sorted(_windows)]
+
+
+def get_macro():
+    return []
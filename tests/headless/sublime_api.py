@@ -0,0 +1,303 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A pure Python stand-in for the Sublime Text "sublime_api" module.
+#
+# In the editor, the sublime module is a thin wrapper over sublime_api. In the
+# headless editor, the sublime module keeps the buffers, and this module does
+# the rest: the command dispatch, the event listeners, the undo history and
+# the timers.
+
+import heapq
+import itertools
+import traceback
+
+messages = []  # type: list
+quick_panels = []  # type: list
+
+_ids = itertools.count(1)
+_timers = []  # type: list
+_timer_sequence = itertools.count()
+_clock = 0
+_depth = 0
+_active_window_id = None
+
+
+def new_view_id():
+    return next(_ids)
+
+
+def new_settings_id():
+    return next(_ids)
+
+
+def active_window_id():
+    global _active_window_id
+
+    import sublime
+
+    if _active_window_id not in sublime._windows:
+        _active_window_id = next(_ids)
+        sublime._windows[_active_window_id] = sublime._WindowData(_active_window_id)
+
+    return _active_window_id
+
+
+def set_timeout(f, timeout_ms=0):
+    # Timers run on a virtual clock. Callbacks without a delay run as soon as
+    # the outermost command returns; delayed callbacks run when the clock is
+    # advanced past them, see advance().
+    heapq.heappush(_timers, (_clock + max(0, timeout_ms), next(_timer_sequence), f))
+    if _depth == 0 and timeout_ms <= 0:
+        run_timers(0)
+
+
+def run_timers(ms=None):
+    # Run the timers that are due within the given number of milliseconds. If
+    # no time is given then all pending timers are run.
+    global _clock
+
+    deadline = _clock + ms if ms is not None else None
+    while _timers and (deadline is None or _timers[0][0] <= deadline):
+        due, _, f = heapq.heappop(_timers)
+        _clock = max(_clock, due)
+        try:
+            f()
+        except Exception:
+            traceback.print_exc()
+
+    if deadline is not None:
+        _clock = max(_clock, deadline)
+
+
+def dispatch_event(name, view, *args):
+    import sublime_plugin
+
+    result = None
+    for listener in list(sublime_plugin.event_listeners):
+        callback = getattr(listener, name, None)
+        if callback is None:
+            continue
+
+        try:
+            value = callback(view, *args)
+        except Exception:
+            traceback.print_exc()
+            continue
+
+        if value is not None and result is None:
+            result = value
+
+    return result
+
+
+def _snapshot(view):
+    data = view._data()
+
+    return (data.buffer.text(), [(r.a, r.b, r.xpos) for r in data.sel])
+
+
+def _restore(view, snapshot):
+    import sublime
+
+    data = view._data()
+    text, sel = snapshot
+    if data.buffer.text() != text:
+        data.buffer.erase(0, data.buffer.size())
+        data.buffer.insert(0, text)
+        data.change_count += 1
+
+    data.sel[:] = [sublime.Region(a, b, xpos) for a, b, xpos in sel]
+
+
+def _record(view, cmd, args, before, change_count):
+    data = view._data()
+    modifying = data.change_count != change_count
+    history = data.command_history
+    if (cmd == 'insert' and history and history[-1][0] == 'insert' and modifying and history[-1][3] and
+            args and 'characters' in args):
+        characters = history[-1][1]['characters'] + args['characters']
+        history[-1] = ('insert', {'characters': characters}, 1, True)
+    else:
+        history.append((cmd, args, 1, modifying))
+        del history[:-100]
+
+    if modifying:
+        data.undo_stack.append((before, _snapshot(view)))
+        data.redo_stack = []
+
+
+_UNRECORDED = frozenset([
+    'glue_marked_undo_groups',
+    'mark_undo_groups_for_gluing',
+    'redo',
+    'soft_redo',
+    'soft_undo',
+    'undo',
+    'unmark_undo_groups_for_gluing',
+])
+
+
+def undo(view):
+    data = view._data()
+    if data.undo_stack:
+        before, after = data.undo_stack.pop()
+        _restore(view, before)
+        data.redo_stack.append((before, after))
+
+
+def redo(view):
+    data = view._data()
+    if data.redo_stack:
+        before, after = data.redo_stack.pop()
+        _restore(view, after)
+        data.undo_stack.append((before, after))
+
+
+def mark_undo_groups_for_gluing(view):
+    data = view._data()
+    data.undo_glue_marks.append(len(data.undo_stack))
+
+
+def glue_marked_undo_groups(view):
+    data = view._data()
+    if not data.undo_glue_marks:
+        return
+
+    mark = data.undo_glue_marks.pop()
+    groups = data.undo_stack[mark:]
+    if len(groups) > 1:
+        data.undo_stack[mark:] = [(groups[0][0], groups[-1][1])]
+
+
+def unmark_undo_groups_for_gluing(view):
+    data = view._data()
+    if data.undo_glue_marks:
+        data.undo_glue_marks.pop()
+
+
+def view_run_command(view_id, cmd, args=None):
+    global _depth
+
+    import sublime
+    import sublime_plugin
+    from NeoVintageous.tests.headless import _builtins
+
+    if view_id not in sublime._views:
+        return
+
+    view = sublime.View(view_id)
+    data = view._data()
+
+    rewrite = dispatch_event('on_text_command', view, cmd, args)
+    if rewrite:
+        cmd, args = rewrite
+
+    command = sublime_plugin.create_text_command(view, cmd)
+    builtin = _builtins.text_commands.get(cmd)
+    if command is None and builtin is None:
+        return
+
+    if command is not None and not command.is_enabled_(args):
+        return
+
+    outermost = data.command_depth == 0
+    if outermost and cmd not in _UNRECORDED:
+        before = _snapshot(view)
+        change_count = data.change_count
+
+    data.command_depth += 1
+    _depth += 1
+    try:
+        if command is not None:
+            command.run_(next(_ids), args)
+        else:
+            builtin(view, sublime.Edit(next(_ids)), **(args or {}))
+    except Exception:
+        traceback.print_exc()
+    finally:
+        _depth -= 1
+        if view_id in sublime._views:
+            data.command_depth -= 1
+            if outermost and cmd not in _UNRECORDED:
+                _record(view, cmd, args, before, change_count)
+
+    if view_id in sublime._views:
+        dispatch_event('on_post_text_command', view, cmd, args)
+
+    if _depth == 0:
+        run_timers(0)
+
+
+def window_run_command(window_id, cmd, args=None):
+    global _depth
+
+    import sublime
+    import sublime_plugin
+    from NeoVintageous.tests.headless import _builtins
+
+    if window_id not in sublime._windows:
+        return
+
+    window = sublime.Window(window_id)
+    command = sublime_plugin.create_window_command(window, cmd)
+    if command is None:
+        builtin = _builtins.window_commands.get(cmd)
+        if builtin is None:
+            # Unknown window commands are run as text commands on the active
+            # view, which is what the editor does.
+            view = window.active_view()
+            if view:
+                view.run_command(cmd, args)
+
+            return
+
+    _depth += 1
+    try:
+        if command is not None:
+            if command.is_enabled_(args):
+                command.run_(0, args)
+        else:
+            builtin(window, **(args or {}))
+    except Exception:
+        traceback.print_exc()
+    finally:
+        _depth -= 1
+
+    if _depth == 0:
+        run_timers(0)
+
+
+def run_command(cmd, args=None):
+    global _depth
+
+    import sublime_plugin
+
+    command = sublime_plugin.create_application_command(cmd)
+    if command is None:
+        return
+
+    _depth += 1
+    try:
+        command.run_(0, args)
+    except Exception:
+        traceback.print_exc()
+    finally:
+        _depth -= 1
+
+    if _depth == 0:
+        run_timers(0)
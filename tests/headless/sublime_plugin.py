@@ -0,0 +1,254 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A pure Python stand-in for the Sublime Text "sublime_plugin" module. It
+# keeps the registry of the loaded commands and event listeners, which the
+# headless sublime_api module dispatches to.
+
+import importlib
+import sys
+
+all_command_classes = [[], [], []]  # type: list
+all_callbacks = {}  # type: dict
+text_commands = {}  # type: dict
+window_commands = {}  # type: dict
+application_commands = {}  # type: dict
+event_listeners = []  # type: list
+
+_plugins = {}  # type: dict
+_text_command_instances = {}  # type: dict
+_window_command_instances = {}  # type: dict
+
+
+def _command_name(clsname):
+    name = clsname[0].lower()
+    last_upper = False
+    for c in clsname[1:]:
+        if c.isupper() and not last_upper:
+            name += '_'
+            name += c.lower()
+        else:
+            name += c
+        last_upper = c.isupper()
+
+    if name.endswith('_command'):
+        name = name[0:-8]
+
+    return name
+
+
+def unload_module(module):
+    if 'plugin_unloaded' in module.__dict__:
+        module.plugin_unloaded()
+
+    names, listeners = _plugins.pop(module.__name__, ([], []))
+    for name in names:
+        text_commands.pop(name, None)
+        window_commands.pop(name, None)
+        application_commands.pop(name, None)
+
+    event_listeners[:] = [x for x in event_listeners if x not in listeners]
+    _text_command_instances.clear()
+    _window_command_instances.clear()
+
+
+def reload_plugin(modulename):
+    if modulename in sys.modules:
+        module = sys.modules[modulename]
+        unload_module(module)
+        module = importlib.reload(module)
+    else:
+        module = importlib.import_module(modulename)
+
+    names = []
+    listeners = []
+    for item in vars(module).values():
+        if not isinstance(item, type):
+            continue
+
+        if issubclass(item, TextCommand) and item is not TextCommand:
+            registry = text_commands
+        elif issubclass(item, WindowCommand) and item is not WindowCommand:
+            registry = window_commands
+        elif issubclass(item, ApplicationCommand) and item is not ApplicationCommand:
+            registry = application_commands
+        elif issubclass(item, EventListener) and item is not EventListener:
+            listener = item()
+            event_listeners.append(listener)
+            listeners.append(listener)
+            continue
+        else:
+            continue
+
+        name = _command_name(item.__name__)
+        registry[name] = item
+        names.append(name)
+
+    _plugins[modulename] = (names, listeners)
+    _text_command_instances.clear()
+    _window_command_instances.clear()
+
+    return module
+
+
+def create_text_command(view, name):
+    cls = text_commands.get(name)
+    if cls is None:
+        return None
+
+    key = (view.id(), name)
+    cmd = _text_command_instances.get(key)
+    if cmd is None:
+        cmd = _text_command_instances[key] = cls(view)
+
+    return cmd
+
+
+def create_window_command(window, name):
+    cls = window_commands.get(name)
+    if cls is None:
+        return None
+
+    key = (window.id(), name)
+    cmd = _window_command_instances.get(key)
+    if cmd is None:
+        cmd = _window_command_instances[key] = cls(window)
+
+    return cmd
+
+
+def create_application_command(name):
+    cls = application_commands.get(name)
+
+    return cls() if cls else None
+
+
+def forget_view(view_id):
+    for key in [k for k in _text_command_instances if k[0] == view_id]:
+        del _text_command_instances[key]
+
+
+class Command():
+
+    def name(self):
+        return _command_name(self.__class__.__name__)
+
+    def filter_args(self, args):
+        if args and 'event' in args and not self.want_event():
+            args = args.copy()
+            del args['event']
+
+        return args
+
+    def is_enabled_(self, args):
+        try:
+            if args:
+                return self.is_enabled(**args)
+
+            return self.is_enabled()
+        except TypeError:
+            return self.is_enabled()
+
+    def is_enabled(self):
+        return True
+
+    def is_visible(self):
+        return True
+
+    def is_checked(self):
+        return False
+
+    def description(self):
+        return ''
+
+    def want_event(self):
+        return False
+
+
+class ApplicationCommand(Command):
+
+    def run_(self, edit_token, args):
+        args = self.filter_args(args)
+        if args:
+            return self.run(**args)
+
+        return self.run()
+
+    def run(self):
+        pass
+
+
+class WindowCommand(Command):
+
+    def __init__(self, window):
+        self.window = window
+
+    def run_(self, edit_token, args):
+        args = self.filter_args(args)
+        if args:
+            return self.run(**args)
+
+        return self.run()
+
+    def run(self):
+        pass
+
+
+class TextCommand(Command):
+
+    def __init__(self, view):
+        self.view = view
+
+    def run_(self, edit_token, args):
+        args = self.filter_args(args)
+        edit = self.view.begin_edit(edit_token, self.name(), args)
+        try:
+            if args:
+                return self.run(edit, **args)
+
+            return self.run(edit)
+        finally:
+            self.view.end_edit(edit)
+
+    def run(self, edit):
+        pass
+
+
+class EventListener():
+    pass
+
+
+class ViewEventListener():
+
+    @classmethod
+    def is_applicable(cls, settings):
+        return True
+
+    @classmethod
+    def applies_to_primary_view_only(cls):
+        return True
+
+    def __init__(self, view):
+        self.view = view
+
+
+class TextInputHandler():
+    pass
+
+
+class ListInputHandler():
+    pass
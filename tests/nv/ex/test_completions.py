@@ -15,8 +15,12 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+import os
+import tempfile
+
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.ex import completions
 from NeoVintageous.nv.ex.completions import _wants_fs_completions
 from NeoVintageous.nv.ex.completions import _wants_setting_completions
 
@@ -40,3 +44,79 @@ class TestWantsCompletions(unittest.TestCase):
         self.assertTrue(_wants_fs_completions(':w '))
         self.assertTrue(_wants_fs_completions(':write '))
         self.assertTrue(_wants_fs_completions(':write path'))
+
+
+class TestIterPaths(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        for name in ('foo.txt', 'foobar.txt', 'fizz.txt', '.hidden'):
+            with open(os.path.join(self.dir, name), 'w'):
+                pass
+        for name in ('fixtures', 'src'):
+            os.mkdir(os.path.join(self.dir, name))
+
+        completions._dir_cache.clear()
+        completions._FsCompletion.reset()
+
+    def tearDown(self):
+        completions._dir_cache.clear()
+        completions._FsCompletion.reset()
+        self.tmp.cleanup()
+        super().tearDown()
+
+    def paths(self, prefix=None, only_dirs=False):
+        return list(completions._iter_paths(prefix=prefix, from_dir=self.dir + '/', only_dirs=only_dirs))
+
+    def test_lists_from_dir(self):
+        self.assertEqual(self.paths(), ['fixtures/', 'fizz.txt', 'foo.txt', 'foobar.txt', 'src/'])
+        self.assertEqual(self.paths(only_dirs=True), ['fixtures/', 'src/'])
+
+    def test_prefix(self):
+        self.assertEqual(self.paths('fi'), ['fixtures/', 'fizz.txt'])
+        self.assertEqual(self.paths('fi', only_dirs=True), ['fixtures/'])
+        self.assertEqual(self.paths('foo'), ['foo.txt', 'foobar.txt'])
+        self.assertEqual(self.paths('x'), [])
+
+    def test_hidden_files_only_match_a_dot_prefix(self):
+        self.assertNotIn('.hidden', self.paths())
+        self.assertEqual(self.paths('.'), ['.hidden'])
+
+    def test_nested_prefix(self):
+        with open(os.path.join(self.dir, 'src', 'main.py'), 'w'):
+            pass
+
+        self.assertEqual(self.paths('src/'), ['src/main.py'])
+        self.assertEqual(self.paths('src/m'), ['src/main.py'])
+
+    def test_listing_is_cached_until_the_directory_changes(self):
+        with unittest.mock.patch('NeoVintageous.nv.ex.completions._scandir', wraps=completions._scandir) as scandir:
+            self.assertEqual(self.paths('foo'), ['foo.txt', 'foobar.txt'])
+            completions._FsCompletion.reset()
+            self.assertEqual(self.paths('foo'), ['foo.txt', 'foobar.txt'])
+            self.assertEqual(scandir.call_count, 1)
+
+            with open(os.path.join(self.dir, 'food.txt'), 'w'):
+                pass
+            mtime = os.stat(self.dir).st_mtime + 10
+            os.utime(self.dir, (mtime, mtime))
+
+            completions._FsCompletion.reset()
+            self.assertEqual(self.paths('foo'), ['foo.txt', 'foobar.txt', 'food.txt'])
+            self.assertEqual(scandir.call_count, 2)
+
+    def test_typing_more_narrows_the_last_matches(self):
+        self.assertEqual(self.paths('f'), ['fixtures/', 'fizz.txt', 'foo.txt', 'foobar.txt'])
+        with unittest.mock.patch('NeoVintageous.nv.ex.completions.os.stat') as stat:
+            self.assertEqual(self.paths('fo'), ['foo.txt', 'foobar.txt'])
+            self.assertEqual(self.paths('foob'), ['foobar.txt'])
+            self.assertEqual(stat.call_count, 0)
+
+    def test_lru_eviction(self):
+        with unittest.mock.patch('NeoVintageous.nv.ex.completions._DIR_CACHE_SIZE', 2):
+            for name in ('fixtures', 'src', ''):
+                completions._list_dir(os.path.join(self.dir, name))
+
+        self.assertEqual(list(completions._dir_cache), [os.path.join(self.dir, 'src'), os.path.join(self.dir, '')])
@@ -16,9 +16,12 @@
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
 import unittest
+from unittest import mock
 
+from NeoVintageous.nv.ex import parser
 from NeoVintageous.nv.ex.parser import _ParserState
 from NeoVintageous.nv.ex.parser import parse_command_line
+from NeoVintageous.nv.ex.parser import parse_command_line_cache_clear
 from NeoVintageous.nv.ex.parser import TokenComma
 from NeoVintageous.nv.ex.parser import TokenDigits
 from NeoVintageous.nv.ex.parser import TokenDollar
@@ -377,3 +380,49 @@ class TestParseLineRefParseWriteCommand(unittest.TestCase):
     def test_can_parse_alias(self):
         parsed = parse_command_line('w')
         self.assertEqual(parsed.command.content, 'write')
+
+
+class TestParseCommandLineCache(unittest.TestCase):
+
+    def setUp(self):
+        parse_command_line_cache_clear()
+
+    def tearDown(self):
+        parse_command_line_cache_clear()
+
+    def test_cached_parse_is_not_scanned_again(self):
+        first = parse_command_line('%s/a/b/g')
+        with mock.patch('NeoVintageous.nv.ex.parser._ParserState') as parser_state:
+            second = parse_command_line('%s/a/b/g')
+            self.assertEqual(parser_state.call_count, 0)
+
+        self.assertEqual(first.line_range, second.line_range)
+        self.assertEqual(first.command.target, 'substitute')
+        self.assertEqual(first.command.params, second.command.params)
+
+    def test_changes_to_params_dont_leak_into_the_cache(self):
+        first = parse_command_line('s/a/b/g')
+        first.command.params['view'] = 'x'
+        first.command.params['flags'].append('i')
+        first.command.forced = True
+
+        second = parse_command_line('s/a/b/g')
+        self.assertNotIn('view', second.command.params)
+        self.assertEqual(second.command.params['flags'], ['g'])
+        self.assertFalse(second.command.forced)
+
+    def test_errors_are_not_cached(self):
+        for i in range(2):
+            with self.assertRaisesRegex(Exception, 'E492: Not an editor command'):
+                parse_command_line('foobar')
+
+        self.assertEqual(len(parser._cache), 0)
+
+    def test_least_recently_used_are_evicted(self):
+        with mock.patch.object(parser, '_CACHE_SIZE', 2):
+            parse_command_line('1')
+            parse_command_line('2')
+            parse_command_line('1')
+            parse_command_line('3')
+
+        self.assertEqual(list(parser._cache), ['1', '3'])
@@ -257,7 +257,7 @@ class TestScanner(unittest.TestCase):
     def test_can_scan_empty_range(self):
         scanner = Scanner("s")
         tokens = list(scanner.scan())
-        self.assertEqual([TokenCommand('substitute', addressable=True), TokenEof()], tokens)
+        self.assertEqual([TokenCommand('substitute', addressable=True, cooperates_with_global=True), TokenEof()], tokens)  # noqa: E501
         self.assertEqual(1, scanner.state.position)
 
     def test_can_scan_dot_offset_search_forward(self):
@@ -293,19 +293,19 @@ class TestScannerCommandName(unittest.TestCase):
     def test_can_instantiate(self):
         scanner = Scanner("substitute")
         tokens = list(scanner.scan())
-        self.assertEqual([TokenCommand('substitute', addressable=True, params=None), TokenEof()], tokens)
+        self.assertEqual([TokenCommand('substitute', addressable=True, cooperates_with_global=True, params=None), TokenEof()], tokens)  # noqa: E501
 
     def test_can_scan_substitute_paramaters(self):
         scanner = Scanner("substitute:foo:bar:")
         tokens = list(scanner.scan())
         params = {"pattern": "foo", "replacement": "bar", "flags": [], "count": 1}
-        self.assertEqual([TokenCommand('substitute', addressable=True, params=params), TokenEof()], tokens)
+        self.assertEqual([TokenCommand('substitute', addressable=True, cooperates_with_global=True, params=params), TokenEof()], tokens)  # noqa: E501
 
     def test_can_scan_substitute_paramaters_with_flags(self):
         scanner = Scanner("substitute:foo:bar:r")
         tokens = list(scanner.scan())
         params = {"pattern": "foo", "replacement": "bar", "flags": ['r'], "count": 1}
-        self.assertEqual([TokenCommand('substitute', addressable=True, params=params), TokenEof()], tokens)
+        self.assertEqual([TokenCommand('substitute', addressable=True, cooperates_with_global=True, params=params), TokenEof()], tokens)  # noqa: E501
 
     def test_scan_can_fail_if_substitute_paramaters_flags_have_wrong_order(self):
         scanner = Scanner("substitute:foo:bar:r&")
@@ -315,13 +315,13 @@ class TestScannerCommandName(unittest.TestCase):
         scanner = Scanner("substitute:foo:bar: 10")
         tokens = list(scanner.scan())
         params = {"pattern": "foo", "replacement": "bar", "flags": [], "count": 10}
-        self.assertEqual([TokenCommand('substitute', addressable=True, params=params), TokenEof()], tokens)
+        self.assertEqual([TokenCommand('substitute', addressable=True, cooperates_with_global=True, params=params), TokenEof()], tokens)  # noqa: E501
 
     def test_can_scan_substitute_paramater_with_range(self):
         scanner = Scanner(r'%substitute:foo:bar: 10')
         tokens = list(scanner.scan())
         params = {"pattern": "foo", "replacement": "bar", "flags": [], "count": 10}
-        self.assertEqual([TokenPercent(), TokenCommand('substitute', addressable=True, params=params), TokenEof()], tokens)  # noqa: E501
+        self.assertEqual([TokenPercent(), TokenCommand('substitute', addressable=True, cooperates_with_global=True, params=params), TokenEof()], tokens)  # noqa: E501
 
 
 class TestScannerMarksScanner(unittest.TestCase):
@@ -480,8 +480,8 @@ class Test_scan_command(unittest.TestCase):
         self.assertRoute(['cd'], cmd('cd'))
         self.assertRoute(['close!', 'clo!'], cmd('close', forced=True))
         self.assertRoute(['close', 'clo'], cmd('close'))
-        self.assertRoute(['copy .', 'co .'], cmd('copy', params={'address': '.'}, addressable=True))
-        self.assertRoute(['copy .+3', 'co .+3'], cmd('copy', params={'address': '.+3'}, addressable=True))
+        self.assertRoute(['copy .', 'co .'], cmd('copy', params={'address': '.'}, addressable=True, cooperates_with_global=True))  # noqa: E501
+        self.assertRoute(['copy .+3', 'co .+3'], cmd('copy', params={'address': '.+3'}, addressable=True, cooperates_with_global=True))  # noqa: E501
         self.assertRoute(['cquit', 'cq'], cmd('cquit'))
         self.assertRoute(['delete x', 'd x'], cmd('delete', params={'count': None, 'register': 'x'}, addressable=True, cooperates_with_global=True))  # noqa: E501
         self.assertRoute(['delete', 'd'], cmd('delete', params={'count': None, 'register': '"'}, addressable=True, cooperates_with_global=True))  # noqa: E501
@@ -507,9 +507,11 @@ class Test_scan_command(unittest.TestCase):
         self.assertRoute(['history search', 'his search'], cmd('history', params={'name': 'search'}))
         self.assertRoute(['history', 'his'], cmd('history'))
         self.assertRoute(['let n=v'], cmd('let', params={'name': 'n', 'value': 'v'}))
-        self.assertRoute(['move 3', 'm 3'], cmd('move', params={'address': '3'}, addressable=True))
-        self.assertRoute(['move', 'm'], cmd('move', params={'address': '.'}, addressable=True))
+        self.assertRoute(['move 3', 'm 3'], cmd('move', params={'address': '3'}, addressable=True, cooperates_with_global=True))  # noqa: E501
+        self.assertRoute(['move', 'm'], cmd('move', params={'address': '.'}, addressable=True, cooperates_with_global=True))  # noqa: E501
         self.assertRoute(['new'], cmd('new'))
+        self.assertRoute(['normal dd', 'norm dd'], cmd('normal', params={'keys': 'dd'}, addressable=True, cooperates_with_global=True))  # noqa: E501
+        self.assertRoute(['normal! A;', 'norm! A;'], cmd('normal', params={'keys': 'A;'}, forced=True, addressable=True, cooperates_with_global=True))  # noqa: E501
         self.assertRoute(['nnoremap abc xyz', 'nn abc xyz'], cmd('nnoremap', params={'lhs': 'abc', 'rhs': 'xyz'}))
         self.assertRoute(['nnoremap', 'nn'], cmd('nnoremap'))
         self.assertRoute(['nohlsearch', 'noh'], cmd('nohlsearch'))
@@ -550,12 +552,14 @@ class Test_scan_command(unittest.TestCase):
         self.assertRoute(['sort', 'sor'], cmd('sort', addressable=True))
         self.assertRoute(['split file.txt', 'sp file.txt'], cmd('split', params={'file': 'file.txt'}))
         self.assertRoute(['split', 'sp'], cmd('split'))
-        self.assertRoute(['substitute', 's'], cmd('substitute', addressable=True))
-        self.assertRoute(['substitute/x/', 's/x/'], cmd('substitute', params={'pattern': 'x', 'replacement': '', 'flags': [], 'count': 1}, addressable=True))  # noqa: E501
-        self.assertRoute(['substitute/x//', 's/x//'], cmd('substitute', params={'pattern': 'x', 'replacement': '', 'flags': [], 'count': 1}, addressable=True))  # noqa: E501
-        self.assertRoute(['substitute/x/y/', 's/x/y/'], cmd('substitute', params={'pattern': 'x', 'replacement': 'y', 'flags': [], 'count': 1}, addressable=True))  # noqa: E501
-        self.assertRoute(['substitute/x/y/ic', 's/x/y/ic'], cmd('substitute', params={'pattern': 'x', 'replacement': 'y', 'flags': ['i', 'c'], 'count': 1}, addressable=True))  # noqa: E501
+        self.assertRoute(['substitute', 's'], cmd('substitute', addressable=True, cooperates_with_global=True))
+        self.assertRoute(['substitute/x/', 's/x/'], cmd('substitute', params={'pattern': 'x', 'replacement': '', 'flags': [], 'count': 1}, addressable=True, cooperates_with_global=True))  # noqa: E501
+        self.assertRoute(['substitute/x//', 's/x//'], cmd('substitute', params={'pattern': 'x', 'replacement': '', 'flags': [], 'count': 1}, addressable=True, cooperates_with_global=True))  # noqa: E501
+        self.assertRoute(['substitute/x/y/', 's/x/y/'], cmd('substitute', params={'pattern': 'x', 'replacement': 'y', 'flags': [], 'count': 1}, addressable=True, cooperates_with_global=True))  # noqa: E501
+        self.assertRoute(['substitute/x/y/ic', 's/x/y/ic'], cmd('substitute', params={'pattern': 'x', 'replacement': 'y', 'flags': ['i', 'c'], 'count': 1}, addressable=True, cooperates_with_global=True))  # noqa: E501
         self.assertRoute(['sunmap xyz', 'sunm xyz'], cmd('sunmap', params={'lhs': 'xyz'}))
+        self.assertRoute(['t .', 't.'], cmd('copy', params={'address': '.'}, addressable=True, cooperates_with_global=True))  # noqa: E501
+        self.assertRoute(['t0'], cmd('copy', params={'address': '0'}, addressable=True, cooperates_with_global=True))  # noqa: E501
         self.assertRoute(['tabclose!', 'tabc!'], cmd('tabclose', forced=True))
         self.assertRoute(['tabclose', 'tabc'], cmd('tabclose'))
         self.assertRoute(['tabfirst!', 'tabfir!', 'tabrewind!', 'tabr!'], cmd('tabfirst', forced=True))
@@ -570,6 +574,7 @@ class Test_scan_command(unittest.TestCase):
         self.assertRoute(['tabonly', 'tabo'], cmd('tabonly'))
         self.assertRoute(['unmap xyz', 'unm xyz'], cmd('unmap', params={'lhs': 'xyz'}))
         self.assertRoute(['unvsplit'], cmd('unvsplit'))
+        self.assertRoute(['vglobal/x/y', 'v/x/y'], cmd('vglobal', target='global', params={'pattern': 'x', 'cmd': 'y'}, forced=True, addressable=True))  # noqa: E501
         self.assertRoute(['vnoremap abc xyz', 'vn abc xyz'], cmd('vnoremap', params={'lhs': 'abc', 'rhs': 'xyz'}))
         self.assertRoute(['vnoremap', 'vn'], cmd('vnoremap'))
         self.assertRoute(['vsplit file.txt', 'vs file.txt'], cmd('vsplit', params={'file': 'file.txt'}))
@@ -628,6 +633,7 @@ class Test_scan_command(unittest.TestCase):
         ])
 
         self.assertRaisesExeption(['globala', 'ga'], ValueError, 'bad separator')
+        self.assertRaisesExeption(['normal', 'norm', 'normal!'], Exception, 'E471: Argument required')
         self.assertRaisesExeption(['globalx', 'gx'], ValueError, 'bad separator')
         self.assertRaisesExeption(['global"', 'g"'], ValueError, 'bad separator')
         self.assertRaisesExeption(['global\\', 'g\\'], ValueError, 'bad separator')
@@ -302,6 +302,30 @@ class TestFeedKey(unittest.ResetRegisters, unittest.FunctionalTestCase):
         self.feedkey('x')
         self.assertNormal('one\n|six\nseven')
 
+    def test_record_xpos_is_kept_by_consecutive_vertical_motions(self):
+        self.normal('a|bcd\nx\nabcd\nx\nabcd')
+        self.feedkeys(['q', 'x', 'j', 'j', 'q'])
+        self.assertNormal('abcd\nx\na|bcd\nx\nabcd')
+        self.feedkeys(['@', 'x'])
+        self.assertNormal('abcd\nx\nabcd\nx\na|bcd')
+
+    def test_record_count_stops_when_a_pass_makes_no_progress(self):
+        self.normal('|a1\na2\na3')
+        self.feedkeys(['q', 'x', '0', 'x', 'j', 'q'])
+        with unittest.mock.patch('NeoVintageous.nv.commands.ui_bell_count', return_value=0) as bell_count:
+            self.feedkeys(['9', '9', '@', 'x'])
+        self.assertNormal('1\n2\n|')
+        # Four passes of three steps, the last pass changed nothing.
+        self.assertEqual(bell_count.call_count, 13)
+
+    def test_record_count_stops_at_the_first_command_that_fails(self):
+        self.normal('|abcdefg')
+        self.feedkeys(['q', 'x', 'x', 'q'])
+        self.assertNormal('|bcdefg')
+        with unittest.mock.patch('NeoVintageous.nv.commands.ui_bell_count', side_effect=[0, 0, 0, 1, 1]):
+            self.feedkeys(['5', '@', 'x'])
+        self.assertNormal('|efg')
+
     def test_repeat(self):
         self.normal('one |two three four five six seven')
         self.feedkey('d')
@@ -23,6 +23,9 @@ from NeoVintageous.tests import unittest
 
 from NeoVintageous.nv.events import _is_command_mode
 from NeoVintageous.nv.events import _is_insert_mode
+from NeoVintageous.nv.events import NeoVintageousEvents
+from NeoVintageous.nv.utils import get_search_highlighting
+from NeoVintageous.nv.utils import set_search_highlighting
 
 
 class TestContextCheckers(unittest.ViewTestCase):
@@ -114,3 +117,11 @@ class TestContextCheckers(unittest.ViewTestCase):
         self.settings().set('command_mode', True)
         _is_insert_mode(self.view, operator=OP_EQUAL, operand=True, match_all=False)
         self.assertEqual(is_view.call_count, 1)
+
+
+class TestOnClose(unittest.ViewTestCase):
+
+    def test_clears_the_search_highlighting(self):
+        set_search_highlighting(self.view, 'ab', 0)
+        NeoVintageousEvents().on_close(self.view)
+        self.assertIsNone(get_search_highlighting(self.view))
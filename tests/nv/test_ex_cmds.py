@@ -15,6 +15,8 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+import re
+
 import sublime
 
 from NeoVintageous.tests import unittest
@@ -23,7 +25,9 @@ from NeoVintageous.nv.ex.nodes import RangeNode
 from NeoVintageous.nv.ex.tokens import TokenComma
 from NeoVintageous.nv.ex.tokens import TokenDigits
 from NeoVintageous.nv.ex.tokens import TokenDollar
+from NeoVintageous.nv.ex_cmds import _changed_span
 from NeoVintageous.nv.ex_cmds import _parse_user_cmdline
+from NeoVintageous.nv.ex_cmds import _substitute_lines
 from NeoVintageous.nv.ex_cmds import do_ex_cmdline
 from NeoVintageous.nv.ex_cmds import do_ex_command
 from NeoVintageous.nv.ex_cmds import do_ex_user_cmdline
@@ -669,3 +673,38 @@ class Test_parse_user_cmdline(unittest.TestCase):
         self.assert_parsed(':Name foo=', None)
         self.assert_parsed(':Name foo=<', None)
         self.assert_parsed(':Name$', None)
+
+
+class Test_substitute_lines(unittest.TestCase):
+
+    def _substitute(self, pattern, replacement, text, count=1):
+        return _substitute_lines(re.compile(pattern, re.MULTILINE), replacement, text, count)
+
+    def test_only_matching_lines_are_changed(self):
+        self.assertEqual(self._substitute('x', 'y', 'aa\nbxb\ncc\ndxxd\n'), ([(4, 5, 'y'), (11, 12, 'y')], 2))
+        self.assertEqual(self._substitute('x', 'y', 'aa\nbxb\ncc\ndxxd\n', 0), ([(4, 5, 'y'), (11, 13, 'yy')], 3))
+
+    def test_no_matches(self):
+        self.assertEqual(self._substitute('x', 'y', 'aa\nbb\n'), ([], 0))
+        self.assertEqual(self._substitute('x', 'x', 'aa\nbxb\n'), ([], 1))
+
+    def test_matches_do_not_span_lines(self):
+        self.assertEqual(self._substitute('a\\s+b', 'X', 'a\nb a b\n'), ([(4, 7, 'X')], 1))
+        self.assertEqual(self._substitute('\\n', 'X', 'a\nb\n'), ([], 0))
+
+    def test_eol(self):
+        self.assertEqual(self._substitute('$', ',', 'a\nb\n\nc'), (
+            [(1, 1, ','), (3, 3, ','), (4, 4, ','), (6, 6, ',')], 4))
+        self.assertEqual(self._substitute('$', ',', 'a\nb\n'), ([(1, 1, ','), (3, 3, ',')], 2))
+
+
+class Test_changed_span(unittest.TestCase):
+
+    def test_changed_span(self):
+        self.assertEqual(_changed_span('abc', 'abc'), (3, 3, ''))
+        self.assertEqual(_changed_span('abc', 'axc'), (1, 2, 'x'))
+        self.assertEqual(_changed_span('abc', 'abcd'), (3, 3, 'd'))
+        self.assertEqual(_changed_span('abc', 'zabc'), (0, 0, 'z'))
+        self.assertEqual(_changed_span('aaa', 'aa'), (2, 3, ''))
+        self.assertEqual(_changed_span('', 'x'), (0, 0, 'x'))
+        self.assertEqual(_changed_span('xyz', ''), (0, 3, ''))
@@ -29,7 +29,11 @@ from NeoVintageous.nv.ex_routes import _ex_route_noremap
 from NeoVintageous.nv.ex_routes import _ex_route_only
 from NeoVintageous.nv.ex_routes import _ex_route_onoremap
 from NeoVintageous.nv.ex_routes import _ex_route_substitute
+from NeoVintageous.nv.ex_routes import _abbreviations
 from NeoVintageous.nv.ex_routes import _ex_route_tabnext
+from NeoVintageous.nv.ex_routes import _ex_route_table
+from NeoVintageous.nv.ex_routes import _route_names
+from NeoVintageous.nv.ex_routes import ex_route_lookup
 from NeoVintageous.nv.ex_routes import ex_routes
 from NeoVintageous.nv.ex_routes import TokenCommand
 
@@ -132,7 +136,7 @@ class Test_ex_route_substitute(unittest.TestCase):
 
     def test_none(self):
         actual = _ex_route_substitute(_ScannerState(''))
-        self.assertEqual(actual, TokenCommand('substitute', addressable=True))
+        self.assertEqual(actual, TokenCommand('substitute', addressable=True, cooperates_with_global=True))
 
     def test_raises_exception(self):
         with self.assertRaisesRegex(ValueError, 'bad command'):
@@ -144,7 +148,7 @@ class Test_ex_route_substitute(unittest.TestCase):
     def _test_ex_route_substitute(self):
         self.assertEqual(
             _ex_route_substitute(_ScannerState('/abc/def/')),
-            TokenCommand('substitute', addressable=True, params={
+            TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': 'abc',
                 'replacement': 'def',
                 'count': 1,
@@ -155,7 +159,7 @@ class Test_ex_route_substitute(unittest.TestCase):
     def test_empty(self):
         self.assertEqual(
             _ex_route_substitute(_ScannerState('///')),
-            TokenCommand('substitute', addressable=True, params={
+            TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': '',
                 'replacement': '',
                 'count': 1,
@@ -166,7 +170,7 @@ class Test_ex_route_substitute(unittest.TestCase):
     def test_flags(self):
         self.assertEqual(
             _ex_route_substitute(_ScannerState('/abc/def/g')),
-            TokenCommand('substitute', addressable=True, params={
+            TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': 'abc',
                 'replacement': 'def',
                 'count': 1,
@@ -176,7 +180,7 @@ class Test_ex_route_substitute(unittest.TestCase):
 
         self.assertEqual(
             _ex_route_substitute(_ScannerState('/abc/def/i')),
-            TokenCommand('substitute', addressable=True, params={
+            TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': 'abc',
                 'replacement': 'def',
                 'count': 1,
@@ -186,7 +190,7 @@ class Test_ex_route_substitute(unittest.TestCase):
 
         self.assertEqual(
             _ex_route_substitute(_ScannerState('/abc/def/gi')),
-            TokenCommand('substitute', addressable=True, params={
+            TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': 'abc',
                 'replacement': 'def',
                 'count': 1,
@@ -197,7 +201,7 @@ class Test_ex_route_substitute(unittest.TestCase):
     def test_closing_delimiter_is_not_required(self):
         self.assertEqual(
             _ex_route_substitute(_ScannerState('/abc/def')),
-            TokenCommand('substitute', addressable=True, params={
+            TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': 'abc',
                 'replacement': 'def',
                 'count': 1,
@@ -255,7 +259,7 @@ class TestRoutes(unittest.TestCase):
         self.assertRoute('_ex_route_buffers', ['files', 'buffers', 'ls'])
         self.assertRoute('_ex_route_cd', ['cd'])
         self.assertRoute('_ex_route_close', ['close', 'clo'])
-        self.assertRoute('_ex_route_copy', ['copy', 'co'])
+        self.assertRoute('_ex_route_copy', ['copy', 'co', 't'])
         self.assertRoute('_ex_route_cquit', ['cquit', 'cq'])
         self.assertRoute('_ex_route_delete', ['delete', 'd'])
         self.assertRoute('_ex_route_edit', ['edit', 'e'])
@@ -267,6 +271,7 @@ class TestRoutes(unittest.TestCase):
         self.assertRoute('_ex_route_let', ['let '])
         self.assertRoute('_ex_route_move', ['move', 'm'])
         self.assertRoute('_ex_route_new', ['new'])
+        self.assertRoute('_ex_route_normal', ['normal', 'norm'])
         self.assertRoute('_ex_route_nnoremap', ['nnoremap', 'nn'])
         self.assertRoute('_ex_route_nohlsearch', ['nohlsearch', 'noh'])
         self.assertRoute('_ex_route_noremap', ['noremap', 'no'])
@@ -296,6 +301,7 @@ class TestRoutes(unittest.TestCase):
         self.assertRoute('_ex_route_tabonly', ['tabonly', 'tabo'])
         self.assertRoute('_ex_route_tabprevious', ['tabNext', 'tabN', 'tabprevious', 'tabp'])
         self.assertRoute('_ex_route_unmap', ['unmap', 'unm'])
+        self.assertRoute('_ex_route_vglobal', ['vglobal', 'v'])
         self.assertRoute('_ex_route_vnoremap', ['vnoremap', 'vn'])
         self.assertRoute('_ex_route_vsplit', ['vsplit', 'vs'])
         self.assertRoute('_ex_route_vunmap', ['vunmap', 'vu'])
@@ -304,3 +310,50 @@ class TestRoutes(unittest.TestCase):
         self.assertRoute('_ex_route_wqall', ['wqall', 'wqa', 'xall', 'xa'])
         self.assertRoute('_ex_route_write', ['write', 'w'])
         self.assertRoute('_ex_route_yank', ['yank', 'y'])
+
+
+class TestRouteTable(unittest.TestCase):
+
+    def test_abbreviations(self):
+        self.assertEqual(_abbreviations('cd'), ['cd'])
+        self.assertEqual(_abbreviations('bf[irst]'), ['bf', 'bfi', 'bfir', 'bfirs', 'bfirst'])
+
+    def test_route_names(self):
+        self.assertEqual(_route_names('cd'), ['cd'])
+        self.assertEqual(_route_names('bf(?:irst)?'), ['bf[irst]'])
+        self.assertEqual(_route_names('ou(nmap)?'), ['ou[nmap]'])
+        self.assertEqual(_route_names('(?:files|ls|buffers)!?'), ['files', 'ls', 'buffers'])
+        self.assertEqual(_route_names('q(?!a)(?:uit)?'), ['q[uit]'])
+        self.assertEqual(_route_names('e(?:dit)?(?= |$)?'), ['e[dit]'])
+        self.assertEqual(_route_names(r'w(?:rite)?(?=(?:!?(?:\+\+|>>| |$)))'), ['w[rite]'])
+        self.assertEqual(_route_names(r'let\s'), ['let'])
+        self.assertEqual(_route_names('&&?'), ['&[&]'])
+        self.assertEqual(_route_names('!(?=.+)'), ['!'])
+
+    def test_every_route_has_names(self):
+        self.assertEqual({pattern.pattern for pattern, command in _ex_route_table.values()}, set(ex_routes))
+
+    def test_every_name_matches_its_route(self):
+        for name, (pattern, command) in _ex_route_table.items():
+            match = pattern.match(name) or pattern.match(name + ' ')
+            self.assertIsNotNone(match, name)
+            self.assertTrue(match.group(0).startswith(name), name)
+            self.assertIs(command, ex_routes[pattern.pattern], name)
+
+    def _lookup(self, source, position=0):
+        return [command.__name__ for pattern, command in ex_route_lookup(source, position)]
+
+    def test_lookup(self):
+        self.assertEqual(self._lookup('write'), ['_ex_route_write'])
+        self.assertEqual(self._lookup('wq!'), ['_ex_route_wq', '_ex_route_write'])
+        self.assertEqual(self._lookup('%s/a/b/'), [])
+        self.assertEqual(self._lookup('%s/a/b/', 1), ['_ex_route_substitute'])
+        self.assertEqual(self._lookup('!ls'), ['_ex_route_shell_out'])
+        self.assertEqual(self._lookup('&&'), ['_ex_route_double_ampersand'])
+        self.assertEqual(self._lookup('tabNext'), ['_ex_route_tabprevious', '_ex_route_copy'])
+        self.assertEqual(self._lookup('zfoobar'), [])
+        self.assertEqual(self._lookup(''), [])
+
+    def test_lookup_falls_back_to_shorter_names(self):
+        self.assertEqual(self._lookup('dx'), ['_ex_route_delete'])
+        self.assertEqual(self._lookup('registersx'), ['_ex_route_registers', '_ex_route_read'])
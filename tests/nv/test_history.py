@@ -15,6 +15,9 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+import os
+import tempfile
+
 from NeoVintageous.tests import unittest
 
 from NeoVintageous.nv.history import _char2type
@@ -24,6 +27,7 @@ from NeoVintageous.nv.history import _HIST_EXPR
 from NeoVintageous.nv.history import _HIST_INPUT
 from NeoVintageous.nv.history import _HIST_INVALID
 from NeoVintageous.nv.history import _HIST_SEARCH
+from NeoVintageous.nv.history import _HistoryItems
 from NeoVintageous.nv.history import _name2type
 from NeoVintageous.nv.history import history
 from NeoVintageous.nv.history import history_add
@@ -33,6 +37,7 @@ from NeoVintageous.nv.history import history_get
 from NeoVintageous.nv.history import history_get_type
 from NeoVintageous.nv.history import history_len
 from NeoVintageous.nv.history import history_nr
+from NeoVintageous.nv.history import history_set_file
 from NeoVintageous.nv.history import history_update
 
 # We need to patch the entries storage dictionary so that out tests don't mess
@@ -40,9 +45,16 @@ from NeoVintageous.nv.history import history_update
 from NeoVintageous.nv.history import _storage as _storage_struct_
 
 
-# Reusable mappings test patcher (also passes a clean storage structure to tests).
-_patch_storage = unittest.mock.patch('NeoVintageous.nv.history._storage',
-                                     new_callable=lambda: {k: {'num': 0, 'items': {}} for k in _storage_struct_})
+# Reusable mappings test patcher (also passes a clean storage structure to
+# tests). The history file is also patched, so that tests don't write to the
+# userland history file.
+def _patch_storage(f):
+    f = unittest.mock.patch('NeoVintageous.nv.history._storage',
+                            new_callable=lambda: {k: {'num': 0, 'items': _HistoryItems()} for k in _storage_struct_})(f)
+    f = unittest.mock.patch('NeoVintageous.nv.history._file', None)(f)
+    f = unittest.mock.patch('NeoVintageous.nv.history._loaded', True)(f)
+
+    return f
 
 
 _patch_max_items = lambda n: unittest.mock.patch('NeoVintageous.nv.history._MAX_ITEMS', n)  # noqa: E731
@@ -170,7 +182,7 @@ class TestHistory(unittest.TestCase):
     @_patch_storage
     def test_history_del(self, _storage):
         _storage[_HIST_SEARCH]['num'] = 9
-        _storage[_HIST_SEARCH]['items'] = {1: 'a', 2: 'b', 3: 'c', 7: 'g', 9: 'i'}
+        _storage[_HIST_SEARCH]['items'] = _HistoryItems({1: 'a', 2: 'b', 3: 'c', 7: 'g', 9: 'i'})
 
         self.assertEqual(9, history_nr('/'))
         self.assertTrue(history_del('/', 2))
@@ -294,11 +306,12 @@ class TestHistory(unittest.TestCase):
             self.assertRegex(history('all'), "     #  [a-z]+ history\n     3  buffers\n>    4  ls")
             # TODO test history ranges e.g. `:history : 3,4`
 
-            # TODO Test for removing entries matching a pattern
-            # for i in range(1, 3):
-            #     history_add(test, 'text_' + str(i))
-            # self.assertTrue(history_del(test, 'text_\\d\\+'))
-            # self.assertEqual('ls', history_get(test, -1))
+            # Test for removing entries matching a pattern
+            for i in range(1, 3):
+                history_add(test, 'text_' + str(i))
+            self.assertTrue(history_del(test, 'text_\\d+'))
+            self.assertEqual('ls', history_get(test, -1))
+            self.assertFalse(history_del(test, 'text_\\d+'))
 
             # Test for freeing the entire history list
             for i in range(1, 7):
@@ -423,3 +436,145 @@ class TestHistory(unittest.TestCase):
         ), history('all'))
 
         self.assertEqual('', history('foobar'))
+
+    @_patch_storage
+    def test_history_add_moves_duplicate_to_newest(self, _storage):
+        self.assertTrue(history_add(':', 'a'))
+        self.assertTrue(history_add(':', 'b'))
+        self.assertTrue(history_add(':', 'c'))
+        self.assertTrue(history_add(':', 'a'))
+        self.assertEqual(_storage[_HIST_CMD], {'num': 4, 'items': {2: 'b', 3: 'c', 4: 'a'}})
+        self.assertEqual('a', history_get(':'))
+        self.assertEqual('c', history_get(':', -2))
+        self.assertEqual('b', history_get(':', -3))
+        self.assertEqual('', history_get(':', -4))
+
+
+class TestHistoryItems(unittest.TestCase):
+
+    def test_is_a_dict_of_number_to_item(self):
+        items = _HistoryItems({3: 'c', 1: 'a'})
+        items[7] = 'g'
+        self.assertEqual(items, {1: 'a', 3: 'c', 7: 'g'})
+        self.assertEqual(items.numbers(), [1, 3, 7])
+
+    def test_number_of(self):
+        items = _HistoryItems({1: 'a', 2: 'b'})
+        self.assertEqual(items.number_of('a'), 1)
+        self.assertEqual(items.number_of('b'), 2)
+        self.assertIsNone(items.number_of('c'))
+        del items[1]
+        self.assertIsNone(items.number_of('a'))
+
+    def test_number_at(self):
+        items = _HistoryItems({1: 'a', 4: 'd', 9: 'i'})
+        self.assertEqual(items.number_at(0), 1)
+        self.assertEqual(items.number_at(-1), 9)
+        self.assertEqual(items.number_at(-2), 4)
+        del items[4]
+        self.assertEqual(items.number_at(-2), 1)
+        with self.assertRaises(IndexError):
+            items.number_at(2)
+
+
+class TestHistoryFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.tmp_dir.name, 'NeoVintageous', 'history')
+
+        # Writes are run by the worker thread. Run them straight away.
+        self.set_timeout_async = unittest.mock.patch('NeoVintageous.nv.history.set_timeout_async',
+                                                     side_effect=lambda f, timeout_ms: f())
+        self.set_timeout_async.start()
+
+    def tearDown(self):
+        self.set_timeout_async.stop()
+        self.tmp_dir.cleanup()
+
+    def _reload(self, _storage):
+        for storage in _storage.values():
+            storage['num'] = 0
+            storage['items'] = _HistoryItems()
+
+        history_set_file(self.file)
+
+    @_patch_storage
+    def test_history_survives_reload(self, _storage):
+        history_set_file(self.file)
+        history_add(':', 'a')
+        history_add(':', 'b')
+        history_add(':', 'a')
+        history_add('/', 'x')
+        history_add('/', 'y')
+        history_del('/', -1)
+        history_add('@', 'i')
+        history_del('@')
+        expected = history('all')
+
+        self._reload(_storage)
+
+        self.assertEqual(history('all'), expected)
+        self.assertEqual(history_nr(':'), 3)
+        self.assertEqual(history_get(':'), 'a')
+        self.assertEqual(history_get('/'), 'x')
+
+    @_patch_storage
+    def test_history_file_is_loaded_lazily(self, _storage):
+        history_set_file(self.file)
+        history_add(':', 'a')
+
+        with unittest.mock.patch('NeoVintageous.nv.history._replay') as _replay:
+            self._reload(_storage)
+            self.assertFalse(_replay.called)
+            history_get(':')
+            self.assertTrue(_replay.called)
+
+    @_patch_storage
+    def test_history_file_is_compacted_on_load(self, _storage):
+        history_set_file(self.file)
+        for i in range(20):
+            history_add(':', 'a')
+            history_add(':', 'b')
+
+        self._reload(_storage)
+
+        self.assertEqual(history(':'), "     #  cmd history\n    39  a\n>   40  b")
+        with open(self.file) as f:
+            self.assertLess(len(f.readlines()), 10)
+
+        self._reload(_storage)
+
+        self.assertEqual(history(':'), "     #  cmd history\n    39  a\n>   40  b")
+        history_add(':', 'c')
+        self.assertEqual(history_nr(':'), 41)
+
+    @_patch_storage
+    def test_ignores_invalid_lines(self, _storage):
+        history_set_file(self.file)
+        history_add(':', 'a')
+        with open(self.file, 'a') as f:
+            f.write('["a", 1, "b"')
+
+        self._reload(_storage)
+
+        self.assertEqual(history_get(':'), 'a')
+
+    @_patch_storage
+    def test_writes_are_queued_for_the_worker_thread(self, _storage):
+        history_set_file(self.file)
+        self.set_timeout_async.stop()
+        with unittest.mock.patch('NeoVintageous.nv.history.set_timeout_async') as set_timeout_async:
+            history_add(':', 'a')
+            history_add(':', 'b')
+            self.assertFalse(os.path.exists(self.file))
+            self.assertEqual(set_timeout_async.call_count, 1)
+            set_timeout_async.call_args[0][0]()
+        self.set_timeout_async.start()
+
+        with open(self.file) as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+        self._reload(_storage)
+
+        self.assertEqual(history(':'), "     #  cmd history\n     1  a\n>    2  b")
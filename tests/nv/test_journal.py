@@ -0,0 +1,66 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.journal import journal_append
+from NeoVintageous.nv.journal import journal_load
+
+
+class TestJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.tmp_dir.name, 'NeoVintageous', 'journal')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def lines(self):
+        with open(self.file) as f:
+            return f.readlines()
+
+    def test_append_and_load(self):
+        journal_append(self.file, [['s', 'a', 1]])
+        journal_append(self.file, [['s', 'b', 2], ['d', 'a']])
+        ops = []
+        journal_load(self.file, ops.append, lambda: ops)
+        self.assertEqual(ops, [['s', 'a', 1], ['s', 'b', 2], ['d', 'a']])
+
+    def test_load_missing_file(self):
+        replay = unittest.mock.Mock()
+        journal_load(self.file, replay, list)
+        self.assertFalse(replay.called)
+
+    def test_load_skips_invalid_lines(self):
+        journal_append(self.file, [['s', 'a', 1]])
+        with open(self.file, 'a') as f:
+            f.write('["s", "b"')
+        ops = []
+        journal_load(self.file, ops.append, lambda: ops)
+        self.assertEqual(ops, [['s', 'a', 1]])
+
+    def test_load_compacts_large_journal(self):
+        journal_append(self.file, [['s', 'a', i] for i in range(8)])
+        journal_load(self.file, lambda op: None, lambda: [['s', 'a', 7], ['s', 'b', 0]])
+        self.assertEqual(len(self.lines()), 8)
+        journal_append(self.file, [['s', 'a', 8]])
+        journal_load(self.file, lambda op: None, lambda: [['s', 'a', 8], ['s', 'b', 0]])
+        self.assertEqual(self.lines(), ['["s", "a", 8]\n', '["s", "b", 0]\n'])
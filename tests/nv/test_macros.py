@@ -0,0 +1,79 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.macros import _compile_plan
+from NeoVintageous.nv.macros import _intern_args
+from NeoVintageous.nv.macros import with_xpos
+
+
+class TestInternArgs(unittest.TestCase):
+
+    def test_equal_args_are_shared(self):
+        state = {}
+        args = _intern_args(state, {'mode': 'mode_normal', 'count': 1, 'xpos': 0})
+        self.assertIs(_intern_args(state, {'xpos': 0, 'count': 1, 'mode': 'mode_normal'}), args)
+        self.assertIsNot(_intern_args(state, {'mode': 'mode_normal', 'count': 2, 'xpos': 0}), args)
+
+    def test_args_are_copied(self):
+        state = {}
+        original = {'mode': 'mode_normal', 'motion': {'motion': '_vi_j', 'motion_args': {'xpos': 0}}}
+        args = _intern_args(state, original)
+        self.assertEqual(args, original)
+        original['motion']['motion_args']['xpos'] = 3
+        self.assertEqual(args['motion']['motion_args']['xpos'], 0)
+
+
+class TestCompilePlan(unittest.TestCase):
+
+    def test_empty(self):
+        self.assertEqual(_compile_plan(()), ())
+
+    def test_xpos_targets(self):
+        j = {'mode': 'mode_normal', 'count': 1, 'xpos': 0}
+        dj = {'mode': 'mode_internal_normal', 'motion': {'motion': '_vi_j', 'motion_args': {'xpos': 0}}}
+        x = {'mode': 'mode_internal_normal', 'count': 1}
+        self.assertEqual(_compile_plan((('_vi_j', j, True), ('_vi_d', dj, False), ('_vi_x', x, False))), (
+            ('_vi_j', j, True, 'args', False),
+            ('_vi_d', dj, False, 'motion', True),
+            ('_vi_x', x, False, None, False),
+        ))
+
+    def test_consecutive_vertical_motions_keep_xpos(self):
+        j = {'mode': 'mode_normal', 'count': 1, 'xpos': 0}
+        w = {'mode': 'mode_normal', 'count': 1}
+        plan = _compile_plan((('_vi_w', w, True), ('_vi_j', j, True), ('_vi_j', j, True)))
+        self.assertEqual([step[4] for step in plan], [False, False, True])
+
+    def test_keep_xpos_wraps_around(self):
+        j = {'mode': 'mode_normal', 'count': 1, 'xpos': 0}
+        plan = _compile_plan((('_vi_j', j, True),))
+        self.assertEqual(plan, (('_vi_j', j, True, 'args', True),))
+
+
+class TestWithXpos(unittest.TestCase):
+
+    def test_args(self):
+        args = {'mode': 'mode_normal', 'xpos': 0}
+        self.assertEqual(with_xpos(args, 'args', 4), {'mode': 'mode_normal', 'xpos': 4})
+        self.assertEqual(args['xpos'], 0)
+
+    def test_motion(self):
+        args = {'mode': 'mode_internal_normal', 'motion': {'motion': '_vi_j', 'motion_args': {'xpos': 0}}}
+        self.assertEqual(with_xpos(args, 'motion', 4)['motion']['motion_args']['xpos'], 4)
+        self.assertEqual(args['motion']['motion_args']['xpos'], 0)
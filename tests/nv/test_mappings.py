@@ -18,6 +18,7 @@
 from NeoVintageous.tests import unittest
 
 from NeoVintageous.nv.mappings import _find_full_match
+from NeoVintageous.nv.mappings import _MappingsTrie
 from NeoVintageous.nv.mappings import _find_partial_matches
 from NeoVintageous.nv.mappings import _seq_to_mapping
 from NeoVintageous.nv.mappings import INSERT
@@ -45,7 +46,7 @@ from NeoVintageous.nv.mappings import _mappings as _mappings_struct_
 
 # Reusable mappings test patcher (also passes a clean mappings structure to tests).
 _patch_mappings = unittest.mock.patch('NeoVintageous.nv.mappings._mappings',
-                                      new_callable=lambda: {k: {} for k in _mappings_struct_})
+                                      new_callable=lambda: {k: _MappingsTrie() for k in _mappings_struct_})
 
 
 class TestMapping(unittest.TestCase):
@@ -347,6 +348,64 @@ class TestMappings(unittest.TestCase):
         self.assertFalse(mappings_is_incomplete(NORMAL, 'f'))
 
 
+class TestMappingsTrie(unittest.TestCase):
+
+    def test_is_a_dict_of_lhs_to_rhs(self):
+        trie = _MappingsTrie({'a': 'x', 'ab': 'y'})
+        self.assertEqual(trie, {'a': 'x', 'ab': 'y'})
+        trie['ac'] = 'z'
+        trie['a'] = 'w'
+        self.assertEqual(trie, {'a': 'w', 'ab': 'y', 'ac': 'z'})
+
+    def test_has_prefix(self):
+        trie = _MappingsTrie()
+        self.assertFalse(trie.has_prefix(''))
+        self.assertFalse(trie.has_prefix('a'))
+        trie['abc'] = 'x'
+        self.assertTrue(trie.has_prefix(''))
+        self.assertTrue(trie.has_prefix('a'))
+        self.assertTrue(trie.has_prefix('ab'))
+        self.assertTrue(trie.has_prefix('abc'))
+        self.assertFalse(trie.has_prefix('abcd'))
+        self.assertFalse(trie.has_prefix('b'))
+        self.assertFalse(trie.has_prefix('A'))
+
+    def test_iter_prefix(self):
+        trie = _MappingsTrie({'a': '1', 'ab': '2', 'abc': '3', 'b': '4', 'ba': '5'})
+        self.assertEqual(sorted(trie.iter_prefix('')), ['a', 'ab', 'abc', 'b', 'ba'])
+        self.assertEqual(sorted(trie.iter_prefix('a')), ['a', 'ab', 'abc'])
+        self.assertEqual(sorted(trie.iter_prefix('ab')), ['ab', 'abc'])
+        self.assertEqual(sorted(trie.iter_prefix('b')), ['b', 'ba'])
+        self.assertEqual(sorted(trie.iter_prefix('c')), [])
+
+    def test_delete_prunes_index(self):
+        trie = _MappingsTrie({'a': '1', 'abc': '2', 'abd': '3'})
+        del trie['abc']
+        self.assertTrue(trie.has_prefix('ab'))
+        self.assertFalse(trie.has_prefix('abc'))
+        del trie['abd']
+        self.assertFalse(trie.has_prefix('ab'))
+        self.assertTrue(trie.has_prefix('a'))
+        del trie['a']
+        self.assertFalse(trie.has_prefix(''))
+        self.assertEqual(trie._root.children, {})
+        self.assertEqual(trie, {})
+
+    def test_delete_raises_exception(self):
+        trie = _MappingsTrie({'ab': '1'})
+        with self.assertRaises(KeyError):
+            del trie['a']
+
+        self.assertTrue(trie.has_prefix('ab'))
+
+    def test_clear(self):
+        trie = _MappingsTrie({'a': '1', 'ab': '2'})
+        trie.clear()
+        self.assertEqual(trie, {})
+        self.assertFalse(trie.has_prefix(''))
+        self.assertFalse(trie.has_prefix('a'))
+
+
 class TestResolve(unittest.ViewTestCase):
 
     @_patch_mappings
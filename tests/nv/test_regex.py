@@ -0,0 +1,96 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from unittest import mock
+import re
+
+from sublime import IGNORECASE
+from sublime import LITERAL
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv import regex
+from NeoVintageous.nv.regex import regex_cache_clear
+from NeoVintageous.nv.regex import regex_cache_info
+from NeoVintageous.nv.regex import regex_compile
+from NeoVintageous.nv.regex import regex_compile_find
+from NeoVintageous.nv.regex import regex_search_flags
+
+
+class TestRegexCache(unittest.TestCase):
+
+    def setUp(self):
+        regex_cache_clear()
+
+    def tearDown(self):
+        regex_cache_clear()
+
+    def test_compile(self):
+        compiled = regex_compile('a+b', re.IGNORECASE)
+        self.assertTrue(compiled.match('AAB'))
+        self.assertIs(compiled, regex_compile('a+b', re.IGNORECASE))
+        self.assertIsNot(compiled, regex_compile('a+b'))
+        self.assertEqual(regex_cache_info(), (1, 2, regex._CACHE_SIZE, 2))
+
+    def test_compile_error_is_not_cached(self):
+        with self.assertRaises(re.error):
+            regex_compile('a(')
+
+        self.assertEqual(regex_cache_info().currsize, 0)
+
+    @mock.patch('NeoVintageous.nv.regex._CACHE_SIZE', 2)
+    def test_evicts_least_recently_used(self):
+        a = regex_compile('a')
+        regex_compile('b')
+        regex_compile('a')
+        regex_compile('c')
+        self.assertIs(a, regex_compile('a'))
+        self.assertEqual(regex_cache_info(), (2, 3, 2, 2))
+        regex_compile('b')
+        self.assertEqual(regex_cache_info(), (2, 4, 2, 2))
+
+    def test_compile_find(self):
+        self.assertEqual(regex_compile_find('a.c').findall('abc a.c\nABC'), ['abc', 'a.c'])
+        self.assertEqual(regex_compile_find('a.c', LITERAL).findall('abc a.c'), ['a.c'])
+        self.assertEqual(regex_compile_find('a.c', IGNORECASE).findall('abc a.c\nABC'), ['abc', 'a.c', 'ABC'])
+        self.assertEqual(regex_compile_find('^a').findall('ab\nab'), ['a', 'a'])
+        self.assertEqual(regex_compile_find('\\<a\\>').findall('a ab ba a'), ['a', 'a'])
+        self.assertEqual(regex_compile_find('\\\\<').findall('\\<'), ['\\<'])
+        self.assertEqual(regex_compile_find('a\\z').findall('a\na'), ['a'])
+        self.assertIs(regex_compile_find('a.c'), regex_compile_find('a.c'))
+
+    def test_compile_find_unsupported_syntax(self):
+        for pattern in ('[[:digit:]]', '\\Qa.b\\E', '(?<name>a)', '(?>a)', 'a++', 'a{2}+', '\\h', 'a\\Z'):
+            with self.assertRaises(re.error, msg=pattern):
+                regex_compile_find(pattern)
+
+        self.assertEqual(regex_compile_find('[[:digit:]]', LITERAL).findall('1 [[:digit:]]'), ['[[:digit:]]'])
+        self.assertEqual(regex_compile_find('(?<=a)b(?<!c)').findall('ab cb'), ['b'])
+        self.assertEqual(regex_compile_find('\\*+\\x41').findall('**A'), ['**A'])
+
+    def test_search_flags(self):
+        self.assertEqual(regex_search_flags('abc'), LITERAL)
+        self.assertEqual(regex_search_flags('a]'), LITERAL)
+        self.assertEqual(regex_search_flags('[0-9]'), 0)
+        self.assertEqual(regex_search_flags('(a)'), 0)
+        self.assertEqual(regex_search_flags('a.c'), 0)
+        self.assertEqual(regex_search_flags('a.c', magic=False), LITERAL)
+        self.assertEqual(regex_search_flags('a.c', ignorecase=True), IGNORECASE)
+        self.assertEqual(regex_search_flags('abc', ignorecase=True), LITERAL | IGNORECASE)
+        self.assertEqual(regex_cache_info().hits, 0)
+        regex_search_flags('abc', ignorecase=True)
+        self.assertEqual(regex_cache_info().hits, 1)
@@ -0,0 +1,89 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from sublime import platform
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv import shell
+
+
+@unittest.skipIf(platform() == 'windows', 'Test does not work on Windows')
+class TestJob(unittest.ViewTestCase):
+
+    def run_job(self, cmd, text):
+        job = shell._Job(shell._shell.popen_filter(self.view, cmd), text, shell._shell.get_decoder(), None)
+        job.start()
+
+        return job
+
+    def test_streams_input_larger_than_pipe_buffers(self):
+        job = self.run_job('sort | uniq -c', 'x\n' * 200000)
+        job.join(10)
+        self.assertFalse(job.is_alive())
+        self.assertRegex(job.output(), r'^\s*200000 x\n$')
+
+    def test_command_that_does_not_read_all_input(self):
+        job = self.run_job('head -n 1', 'a\nb\n' * 100000)
+        job.join(10)
+        self.assertFalse(job.is_alive())
+        self.assertEqual(job.output(), 'a\n')
+
+    def test_without_input_captures_stdout_and_stderr(self):
+        job = self.run_job('echo out; echo err >&2', None)
+        job.join(10)
+        self.assertEqual(job.output(), 'out\nerr\n')
+
+    def test_cancel_kills_pipeline(self):
+        job = self.run_job('cat | sleep 30', 'x')
+        job.cancel()
+        job.join(10)
+        self.assertFalse(job.is_alive())
+        self.assertTrue(job.cancelled)
+
+
+@unittest.skipIf(platform() == 'windows', 'Test does not work on Windows')
+@unittest.mock.patch('NeoVintageous.nv.shell.set_timeout')
+@unittest.mock.patch('NeoVintageous.nv.shell._SYNC_TIMEOUT', 0)
+class TestFilterInBackground(unittest.FunctionalTestCase):
+
+    def finish(self, set_timeout):
+        job, _ = shell._jobs[self.view.id()]
+        job.join(10)
+        self.assertFalse(job.is_alive())
+        set_timeout.call_args[0][0]()
+
+    def test_output_is_applied_when_the_command_finishes(self, set_timeout):
+        self.normal('1\n|c\nb\na\n2')
+        self.feed(':.,.+2!sleep 0.2; sort')
+        self.assertIn(self.view.id(), shell._jobs)
+        self.assertTrue(self.view.is_read_only())
+        self.assertContent('1\nc\nb\na\n2')
+        self.finish(set_timeout)
+        self.assertNotIn(self.view.id(), shell._jobs)
+        self.assertFalse(self.view.is_read_only())
+        self.assertNormal('1\n|a\nb\nc\n2')
+
+    def test_esc_cancels_the_command(self, set_timeout):
+        self.normal('1\n|c\nb\na\n2')
+        self.feed(':.,.+2!sleep 30; sort')
+        self.assertIn(self.view.id(), shell._jobs)
+        self.feed('<Esc>')
+        self.finish(set_timeout)
+        self.assertNotIn(self.view.id(), shell._jobs)
+        self.assertFalse(self.view.is_read_only())
+        self.assertNormal('1\n|c\nb\na\n2')
@@ -17,6 +17,7 @@
 
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.state import clear_view_state
 from NeoVintageous.nv.state import State
 from NeoVintageous.nv.vi import cmd_defs
 
@@ -276,3 +277,41 @@ class TestStateSetCommand(unittest.ViewTestCase):
         self.state.set_command(operator)
 
         self.assertEqual(self.state.mode, unittest.OPERATOR_PENDING)
+
+
+class TestStateViewState(unittest.ViewTestCase):
+
+    def test_is_shared_between_instances_for_the_same_view(self):
+        State(self.view).sequence = 'abc'
+        State(self.view).action_count = '3'
+        self.assertEqual(State(self.view).sequence, 'abc')
+        self.assertEqual(State(self.view).action_count, '3')
+
+    def test_only_mode_is_written_to_view_settings(self):
+        self.state.mode = unittest.VISUAL
+        self.state.sequence = 'abc'
+        self.state.register = 'a'
+        vintage = self.view.settings().get('vintage')
+        self.assertEqual(vintage['mode'], unittest.VISUAL)
+        self.assertNotIn('sequence', vintage)
+        self.assertNotIn('register', vintage)
+
+    def test_mode_is_restored_from_view_settings(self):
+        self.state.mode = unittest.VISUAL_LINE
+        self.state.sequence = 'abc'
+        clear_view_state(self.view)
+        self.assertEqual(self.state.mode, unittest.VISUAL_LINE)
+        self.assertEqual(self.state.sequence, '')
+
+    def test_action_and_motion_are_copies(self):
+        action = cmd_defs.ViReplaceCharacters()
+        motion = cmd_defs.ViMoveRightByChars()
+        self.state.action = action
+        self.state.motion = motion
+        self.assertIsInstance(self.state.action, cmd_defs.ViReplaceCharacters)
+        self.assertIsInstance(self.state.motion, cmd_defs.ViMoveRightByChars)
+        self.assertIsNot(self.state.action, action)
+        self.assertIsNot(self.state.motion, motion)
+        self.state.action.accept('x')
+        self.assertEqual(self.state.action.inp, 'x')
+        self.assertEqual(action.inp, '')
@@ -19,14 +19,18 @@ from sublime import Region
 
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.utils import _ViewSnapshot
 from NeoVintageous.nv.utils import extract_file_name
 from NeoVintageous.nv.utils import extract_url
 from NeoVintageous.nv.utils import resolve_visual_line_target
+from NeoVintageous.nv.utils import regions_transformer_batched
 from NeoVintageous.nv.utils import resolve_visual_target
+from NeoVintageous.nv.utils import timed_stage
 from NeoVintageous.nv.utils import translate_char
 from NeoVintageous.nv.utils import VisualBlockSelection
 from NeoVintageous.nv.vim import DIRECTION_DOWN
 from NeoVintageous.nv.vim import DIRECTION_UP
+from NeoVintageous.nv.vim import NORMAL
 
 
 class TestTranslateChar(unittest.TestCase):
@@ -125,6 +129,110 @@ class TestExtractUrl(unittest.ViewTestCase):
         self.assertExtractUrl('http://api-v1.example.com', 'http://api-v1.example.com.')
 
 
+class TestViewSnapshot(unittest.ViewTestCase):
+
+    def test_answers_as_the_view(self):
+        for text in ('', 'x', '\n', 'fizz\n\nbuzz\n', '\tfizz\n  buzz\n\n é'):
+            self.write(text)
+            snapshot = _ViewSnapshot(self.view)
+            size = self.view.size()
+            self.assertEqual(snapshot.size(), size)
+            for pt in range(-1, size + 2):
+                self.assertEqual(snapshot.substr(pt), self.view.substr(pt), 'substr %d' % pt)
+                self.assertEqual(snapshot.rowcol(pt), self.view.rowcol(pt), 'rowcol %d' % pt)
+                self.assertEqual(snapshot.line(pt), self.view.line(pt), 'line %d' % pt)
+                self.assertEqual(snapshot.full_line(pt), self.view.full_line(pt), 'full_line %d' % pt)
+                self.assertEqual(snapshot.line(Region(pt, size)), self.view.line(Region(pt, size)))
+                self.assertEqual(snapshot.substr(Region(pt, size)), self.view.substr(Region(pt, size)))
+
+            for row in range(-1, 6):
+                for col in (0, 1, 3):
+                    self.assertEqual(snapshot.text_point(row, col), self.view.text_point(row, col))
+
+    def test_settings_are_read_once(self):
+        self.write('fizz')
+        self.view.settings().set('tab_size', 3)
+        snapshot = _ViewSnapshot(self.view)
+        self.assertEqual(snapshot.settings().get('tab_size'), 3)
+        self.view.settings().set('tab_size', 5)
+        self.assertEqual(snapshot.settings().get('tab_size'), 3)
+        self.assertEqual(snapshot.settings().get('nv_unknown', 'x'), 'x')
+
+    def test_passes_anything_else_to_the_view(self):
+        self.write('fizz')
+        snapshot = _ViewSnapshot(self.view)
+        self.assertEqual(snapshot.id(), self.view.id())
+        self.assertEqual(snapshot.folded_regions(), [])
+
+
+class TestTimedStage(unittest.TestCase):
+
+    def test_calls_the_hook_with_the_stage_and_time(self):
+        timings = []
+        with timed_stage(lambda *args: timings.append(args), 'fizz'):
+            pass
+
+        self.assertEqual(len(timings), 1)
+        self.assertEqual(timings[0][0], 'fizz')
+        self.assertGreaterEqual(timings[0][1], 0)
+
+    def test_does_nothing_without_a_hook(self):
+        with timed_stage(None, 'fizz'):
+            pass
+
+    def test_does_not_time_a_stage_that_raises(self):
+        timings = []
+        with self.assertRaises(ValueError):
+            with timed_stage(lambda *args: timings.append(args), 'fizz'):
+                raise ValueError()
+
+        self.assertEqual(timings, [])
+
+
+class TestRegionsTransformerBatched(unittest.ViewTestCase):
+
+    def _transform(self, f):
+        regions_transformer_batched(self.view, f)
+
+    def test_uses_the_view_with_few_selections(self):
+        self.normal('f|izz\nb|uzz')
+        views = []
+
+        def f(view, s):
+            views.append(view)
+            return Region(view.line(s.b).b)
+
+        self._transform(f)
+        self.assertEqual(views, [self.view, self.view])
+        self.assertNormal('fizz|\nbuzz|')
+
+    @unittest.mock.patch('NeoVintageous.nv.utils._BATCH_MIN_SELECTIONS', 2)
+    def test_uses_a_snapshot_with_many_selections(self):
+        self.normal('f|izz\nb|uzz')
+        views = []
+
+        def f(view, s):
+            views.append(view)
+            return [Region(view.line(s.b).a), Region(view.line(s.b).b)]
+
+        self._transform(f)
+        self.assertEqual(len(views), 2)
+        self.assertIs(views[0], views[1])
+        self.assertIsInstance(views[0], _ViewSnapshot)
+        self.assertNormal('|fizz|\n|buzz|')
+
+    @unittest.mock.patch('NeoVintageous.nv.utils._BATCH_MIN_SELECTIONS', 2)
+    def test_motions(self):
+        self.normal('|  fizz buzz\n|\tfizz\n|x\n\n|  buzz\n')
+        self.view.run_command('_vi_j', {'mode': NORMAL, 'count': 1, 'xpos': 0})
+        self.assertNormal('  fizz buzz\n|\tfizz\n|x\n|\n  buzz\n|')
+        self.normal('|  fizz buzz\n|\tfizz\n|x\n\n|  buzz\n')
+        self.view.run_command('_vi_hat', {'mode': NORMAL})
+        self.assertNormal('  |fizz buzz\n\t|fizz\n|x\n\n  |buzz\n')
+        self.view.run_command('_vi_w', {'mode': NORMAL, 'count': 1})
+        self.assertNormal('  fizz |buzz\n\tfizz\n|x\n|\n  buzz\n|')
+
+
 class TestResolveVisualTarget(unittest.TestCase):
 
     def assertResolveVisualTarget(self, s, target, expected):
@@ -0,0 +1,125 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv import viminfo
+from NeoVintageous.nv.viminfo import viminfo_del
+from NeoVintageous.nv.viminfo import viminfo_get
+from NeoVintageous.nv.viminfo import viminfo_set
+from NeoVintageous.nv.viminfo import viminfo_set_file
+
+
+class TestViminfo(unittest.TestCase):
+
+    def setUp(self):
+        self.original_file = viminfo._file
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.tmp_dir.name, 'NeoVintageous', 'viminfo')
+
+        # Writes and loads are run by the worker thread. Run them straight away.
+        self.set_timeout_async = unittest.mock.patch('NeoVintageous.nv.viminfo.set_timeout_async',
+                                                     side_effect=lambda f, timeout_ms: f())
+        self.set_timeout_async.start()
+
+    def tearDown(self):
+        self.set_timeout_async.stop()
+        viminfo_set_file(self.original_file)
+        self.tmp_dir.cleanup()
+
+    def lines(self):
+        with open(self.file) as f:
+            return f.readlines()
+
+    def test_values_survive_reload(self):
+        viminfo_set_file(self.file)
+        viminfo_set('registers', 'a', [['fizz'], False])
+        viminfo_set('marks', 'a', ['/tmp/fizz.txt', 3, 2])
+        viminfo_set('marks', 'b', ['/tmp/buzz.txt', 1, 0])
+        viminfo_del('marks', 'b')
+
+        viminfo_set_file(self.file)
+
+        self.assertEqual(viminfo_get('registers'), {'a': [['fizz'], False]})
+        self.assertEqual(viminfo_get('marks'), {'a': ['/tmp/fizz.txt', 3, 2]})
+        self.assertEqual(viminfo_get('macros'), {})
+
+    def test_get_includes_pending_changes(self):
+        viminfo_set_file(self.file)
+        self.set_timeout_async.stop()
+        with unittest.mock.patch('NeoVintageous.nv.viminfo.set_timeout_async'):
+            viminfo_set('marks', 'a', ['/tmp/fizz.txt', 3, 2])
+            self.assertFalse(os.path.exists(self.file))
+            self.assertEqual(viminfo_get('marks'), {'a': ['/tmp/fizz.txt', 3, 2]})
+            viminfo_del('marks', 'a')
+            self.assertEqual(viminfo_get('marks'), {})
+        self.set_timeout_async.start()
+
+    def test_pending_changes_to_the_same_key_are_written_once(self):
+        viminfo_set_file(self.file)
+        self.set_timeout_async.stop()
+        with unittest.mock.patch('NeoVintageous.nv.viminfo.set_timeout_async') as set_timeout_async:
+            viminfo_set('registers', '"', [['fizz'], False])
+            viminfo_set('registers', '"', [['buzz'], False])
+            viminfo_set('registers', '0', [['buzz'], False])
+            self.assertEqual(set_timeout_async.call_count, 1)
+            set_timeout_async.call_args[0][0]()
+        self.set_timeout_async.start()
+
+        self.assertEqual(len(self.lines()), 2)
+
+    def test_file_is_loaded_in_the_background(self):
+        viminfo_set_file(self.file)
+        viminfo_set('registers', 'a', [['fizz'], False])
+
+        self.set_timeout_async.stop()
+        with unittest.mock.patch('NeoVintageous.nv.viminfo.set_timeout_async') as set_timeout_async:
+            viminfo_set_file(self.file)
+            self.assertTrue(set_timeout_async.called)
+            self.assertFalse(viminfo._data)
+            set_timeout_async.call_args[0][0]()
+            self.assertEqual(viminfo._data, {'registers': {'a': [['fizz'], False]}})
+        self.set_timeout_async.start()
+
+    def test_file_is_compacted_on_load(self):
+        viminfo_set_file(self.file)
+        for i in range(20):
+            viminfo_set('registers', 'a', [[str(i)], False])
+
+        viminfo_set_file(self.file)
+        viminfo_get('registers')
+
+        self.assertEqual(len(self.lines()), 1)
+        self.assertEqual(viminfo_get('registers'), {'a': [['19'], False]})
+
+    def test_ignores_invalid_lines(self):
+        viminfo_set_file(self.file)
+        viminfo_set('registers', 'a', [['fizz'], False])
+        with open(self.file, 'a') as f:
+            f.write('["s", "registers", "b"')
+
+        viminfo_set_file(self.file)
+
+        self.assertEqual(viminfo_get('registers'), {'a': [['fizz'], False]})
+
+    def test_no_file(self):
+        viminfo_set_file(None)
+        viminfo_set('registers', 'a', [['fizz'], False])
+        self.assertEqual(viminfo_get('registers'), {})
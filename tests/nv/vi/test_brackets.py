@@ -0,0 +1,71 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.vi.brackets import find_enclosing_closing_bracket
+from NeoVintageous.nv.vi.brackets import find_enclosing_opening_bracket
+from NeoVintageous.nv.vi.brackets import find_matching_bracket
+
+
+class TestFindMatchingBracket(unittest.ViewTestCase):
+
+    def test_pairs(self):
+        self.write('a(b[c]{d<e>})')
+        self.assertEqual(find_matching_bracket(self.view, 1), 12)
+        self.assertEqual(find_matching_bracket(self.view, 12), 1)
+        self.assertEqual(find_matching_bracket(self.view, 3), 5)
+        self.assertEqual(find_matching_bracket(self.view, 6), 11)
+        self.assertEqual(find_matching_bracket(self.view, 8), 10)
+        self.assertIsNone(find_matching_bracket(self.view, 0))
+
+    def test_unbalanced(self):
+        self.write('(()')
+        self.assertIsNone(find_matching_bracket(self.view, 0))
+        self.assertEqual(find_matching_bracket(self.view, 1), 2)
+
+    def test_escaped_brackets_are_ignored(self):
+        self.write('(\\)\\\\)')
+        self.assertEqual(find_matching_bracket(self.view, 0), 5)
+        self.assertIsNone(find_matching_bracket(self.view, 2))
+
+    def test_index_is_rebuilt_after_modification(self):
+        self.write('(x)')
+        self.assertEqual(find_matching_bracket(self.view, 0), 2)
+        self.write('((x))')
+        self.assertEqual(find_matching_bracket(self.view, 0), 4)
+
+
+class TestFindEnclosingBrackets(unittest.ViewTestCase):
+
+    def test_nested(self):
+        self.write('{ a { b { x } c } d }')
+        self.assertEqual(find_enclosing_opening_bracket(self.view, 10, '{'), 8)
+        self.assertEqual(find_enclosing_opening_bracket(self.view, 10, '{', 2), 4)
+        self.assertEqual(find_enclosing_opening_bracket(self.view, 10, '{', 3), 0)
+        self.assertIsNone(find_enclosing_opening_bracket(self.view, 10, '{', 4))
+        self.assertEqual(find_enclosing_closing_bracket(self.view, 10, '}'), 12)
+        self.assertEqual(find_enclosing_closing_bracket(self.view, 10, '}', 2), 16)
+        self.assertEqual(find_enclosing_closing_bracket(self.view, 10, '}', 3), 20)
+        self.assertIsNone(find_enclosing_closing_bracket(self.view, 10, '}', 4))
+
+    def test_unbalanced(self):
+        self.write('x } { y')
+        self.assertEqual(find_enclosing_closing_bracket(self.view, 0, '}'), 2)
+        self.assertIsNone(find_enclosing_closing_bracket(self.view, 3, '}'))
+        self.assertEqual(find_enclosing_opening_bracket(self.view, 7, '{'), 4)
+        self.assertIsNone(find_enclosing_opening_bracket(self.view, 2, '{'))
@@ -19,7 +19,10 @@ from unittest import mock
 import unittest
 
 from NeoVintageous.nv.vi.cmd_base import ViMissingCommandDef
+from NeoVintageous.nv import variables
 from NeoVintageous.nv.vi.keys import KeySequenceTokenizer
+from NeoVintageous.nv.vi.keys import assign
+from NeoVintageous.nv.vi.keys import seq_cache_clear
 from NeoVintageous.nv.vi.keys import seq_to_command
 from NeoVintageous.nv.vi.keys import to_bare_command_name
 
@@ -165,6 +168,13 @@ class TestFunctions(unittest.TestCase):
 
 class TestSeqToCommand(unittest.TestCase):
 
+    def setUp(self):
+        # The tests patch the mappings directly, bypassing the invalidation.
+        seq_cache_clear()
+
+    def tearDown(self):
+        seq_cache_clear()
+
     @mock.patch.dict('NeoVintageous.nv.vi.keys.mappings', {
         'a': {'s': 'asv'},
         'b': {'s': 'bsv', 't': 'tsv', 'ep': 'ep', 'dp2': 'dp2'}
@@ -215,3 +225,56 @@ class TestSeqToCommand(unittest.TestCase):
             def settings(self):
                 pass
         self.assertIsInstance(seq_to_command(seq='foobar', view=View(), mode='a'), ViMissingCommandDef)
+
+
+class TestSeqCache(unittest.TestCase):
+
+    def setUp(self):
+        seq_cache_clear()
+
+    def tearDown(self):
+        seq_cache_clear()
+
+    @mock.patch.dict('NeoVintageous.nv.vi.keys.mappings', {'a': {}})
+    def test_assign_invalidates_cache(self):
+        class View():
+            def settings(self):
+                pass
+
+        self.assertIsInstance(seq_to_command(seq='x', view=View(), mode='a'), ViMissingCommandDef)
+
+        class Command():
+            pass
+
+        assign('x', ('a',))(Command)
+
+        self.assertIsInstance(seq_to_command(seq='x', view=View(), mode='a'), Command)
+
+    @mock.patch('NeoVintageous.nv.vi.keys.plugin')
+    def test_plugin_enabled_is_not_cached(self, plugin):
+        class Plugin():
+            enabled = True
+
+            def is_enabled(self, settings):
+                return self.enabled
+
+        p = Plugin()
+        plugin.mappings = {'a': {'x': p}}
+
+        class View():
+            def settings(self):
+                pass
+
+        self.assertEqual(seq_to_command(seq='x', view=View(), mode='a'), p)
+        p.enabled = False
+        self.assertIsInstance(seq_to_command(seq='x', view=View(), mode='a'), ViMissingCommandDef)
+        p.enabled = True
+        self.assertEqual(seq_to_command(seq='x', view=View(), mode='a'), p)
+
+    @mock.patch.dict('NeoVintageous.nv.variables._variables', {}, clear=True)
+    def test_variables_invalidate_bare_command_names(self):
+        self.assertEqual('<bslash>d', to_bare_command_name('2<leader>d'))
+        variables.set('mapleader', ',')
+        self.assertEqual(',d', to_bare_command_name('2<leader>d'))
+        variables.variables_clear()
+        self.assertEqual('<bslash>d', to_bare_command_name('2<leader>d'))
@@ -0,0 +1,115 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.vi.lines import clear_line_index
+from NeoVintageous.nv.vi.lines import get_line_index
+
+
+class TestLineIndex(unittest.ViewTestCase):
+
+    def test_rows_and_points(self):
+        self.write('ab\n\ncde\n')
+        index = get_line_index(self.view)
+        self.assertEqual(index.size(), 8)
+        self.assertEqual(index.last_row(), 3)
+        for pt in range(-1, 10):
+            self.assertEqual(index.row_at(pt), self.view.rowcol(pt)[0], pt)
+
+        for row in range(-1, 6):
+            self.assertEqual(index.row_to_pt(row), self.view.text_point(row, 0), row)
+
+        self.assertEqual(index.line_length(0), 2)
+        self.assertEqual(index.line_length(1), 0)
+        self.assertEqual(index.line_length(2), 3)
+        self.assertEqual(index.line_length(3), 0)
+
+    def test_empty_lines(self):
+        self.write('')
+        self.assertEqual(get_line_index(self.view).empty_lines(), [0])
+        self.write('\n\na\n\n\nb\n')
+        self.assertEqual(get_line_index(self.view).empty_lines(), [0, 1, 4, 5, 8])
+        self.write('a\n\nb')
+        self.assertEqual(get_line_index(self.view).empty_lines(), [2])
+
+    def test_next_and_prev_empty_row(self):
+        self.write('a\n\nb\nc\n\n\nd')
+        index = get_line_index(self.view)
+        self.assertEqual(index.next_empty_row(0), 1)
+        self.assertEqual(index.next_empty_row(1), 4)
+        self.assertEqual(index.next_empty_row(5), -1)
+        self.assertEqual(index.prev_empty_row(6), 5)
+        self.assertEqual(index.prev_empty_row(4), 1)
+        self.assertEqual(index.prev_empty_row(1), -1)
+
+    def test_next_and_prev_non_empty_row(self):
+        self.write('\na\n\n\n\nb\n\n')
+        index = get_line_index(self.view)
+        self.assertEqual(index.next_non_empty_row(0), 1)
+        self.assertEqual(index.next_non_empty_row(1), 5)
+        self.assertEqual(index.next_non_empty_row(3), 5)
+        self.assertEqual(index.next_non_empty_row(5), -1)
+        self.assertEqual(index.prev_non_empty_row(7), 5)
+        self.assertEqual(index.prev_non_empty_row(5), 1)
+        self.assertEqual(index.prev_non_empty_row(1), -1)
+        self.assertEqual(index.prev_non_empty_row(0), -1)
+
+    def test_index_is_rebuilt_after_modification(self):
+        self.write('a\nb')
+        index = get_line_index(self.view)
+        self.assertIs(get_line_index(self.view), index)
+        self.write('a\n\nb')
+        self.assertIsNot(get_line_index(self.view), index)
+        self.assertEqual(get_line_index(self.view).next_empty_row(0), 1)
+
+    def test_clear_line_index(self):
+        self.write('a\nb')
+        index = get_line_index(self.view)
+        clear_line_index(self.view)
+        self.assertIsNot(get_line_index(self.view), index)
+
+
+class TestIndentation(unittest.ViewTestCase):
+
+    def test_widths(self):
+        self.write('a\n  b\n\t\tc\n   \n\nd')
+        indentation = get_line_index(self.view).indentation()
+        self.assertEqual(indentation.widths[:3], [0, 2, 2])
+        self.assertEqual(indentation.blank_rows, [3, 4])
+
+    def test_next_and_prev_delimiter(self):
+        self.write('a\n  b\n    c\n\n    d\n  e\nf')
+        indentation = get_line_index(self.view).indentation()
+        self.assertEqual(indentation.next_delimiter(2, 4), 5)
+        self.assertEqual(indentation.next_delimiter(2, 4, blank=True), 3)
+        self.assertEqual(indentation.next_delimiter(2, 1), 6)
+        self.assertEqual(indentation.next_delimiter(2, 0), -1)
+        self.assertEqual(indentation.next_delimiter(2, 0, blank=True), 3)
+        self.assertEqual(indentation.prev_delimiter(4, 4), 1)
+        self.assertEqual(indentation.prev_delimiter(4, 4, blank=True), 3)
+        self.assertEqual(indentation.prev_delimiter(4, 1), 0)
+        self.assertEqual(indentation.prev_delimiter(4, 0), -1)
+
+    def test_delimiters_across_chunks(self):
+        self.write('a\n' + '  b\n' * 10 + '\n' + '  c\n' * 10 + 'd')
+        with unittest.mock.patch('NeoVintageous.nv.vi.lines._INDENT_CHUNK_SIZE', 3):
+            indentation = get_line_index(self.view).indentation()
+            self.assertEqual(indentation.next_delimiter(1, 2), 22)
+            self.assertEqual(indentation.next_delimiter(1, 2, blank=True), 11)
+            self.assertEqual(indentation.prev_delimiter(21, 2), 0)
+            self.assertEqual(indentation.prev_delimiter(21, 2, blank=True), 11)
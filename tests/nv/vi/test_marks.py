@@ -21,23 +21,6 @@ from NeoVintageous.nv.state import State
 from NeoVintageous.nv.vi import marks
 
 
-class View():
-    def __init__(self, id_, fname, buffer_id=0):
-        self.view_id = id_
-        self.fname = fname
-        self._buffer_id = buffer_id
-
-    def file_name(self):
-        return self.fname
-
-    def buffer_id(self):
-        return self._buffer_id
-
-
-class Window():
-    pass
-
-
 class MarksTests(unittest.ViewTestCase):
 
     def setUp(self):
@@ -49,10 +32,7 @@ class MarksTests(unittest.ViewTestCase):
 
     def test_can_set_mark(self):
         self.marks.add('a', self.view)
-        expected_win, expected_view, expected_region = (self.view.window(), self.view, (0, 0))
-        actual_win, actual_view, actual_region = marks._MARKS['a']
-        self.assertEqual((actual_win.id(), actual_view.view_id, actual_region),
-                         (expected_win.id(), expected_view.view_id, expected_region))
+        self.assertEqual(marks._MARKS['a'], (self.view.file_name(), self.view.buffer_id(), (0, 0)))
 
     def test_can_retrieve_mark_in_the_current_buffer_as_tuple(self):
         self.marks.add('a', self.view)
@@ -67,16 +47,12 @@ class MarksTests(unittest.ViewTestCase):
         self.assertEqual(self.marks.get_as_encoded_address('a'), self.Region(24, 24))
 
     def test_can_retrieve_mark_in_a_different_buffer_as_encoded_mark(self):
-        view = View(id_=self.view.view_id + 1, fname=r'C:\foo.txt')
-
-        marks._MARKS['a'] = (Window(), view, (0, 0))
+        marks._MARKS['a'] = (r'C:\foo.txt', self.view.buffer_id() + 1, (0, 0))
         expected = "{0}:{1}".format(r'C:\foo.txt', "0:0")
         self.assertEqual(self.marks.get_as_encoded_address('a'), expected)
 
     def test_can_retrieve_mark_in_an_untitled_buffer_as_encoded_mark(self):
-        view = View(id_=self.view.view_id + 1, fname='', buffer_id=999)
-
-        marks._MARKS['a'] = (Window(), view, (0, 0))
+        marks._MARKS['a'] = (None, 999, (0, 0))
         expected = "<untitled {0}>:{1}".format(999, "0:0")
         self.assertEqual(self.marks.get_as_encoded_address('a'), expected)
 
@@ -84,7 +60,7 @@ class MarksTests(unittest.ViewTestCase):
     def test_can_retrieve_quote_mark(self, mock_jumplist_back):
         # Single quote mark should call jumplist_back for its region ignoring
         # any mark set for "'".
-        marks._MARKS['\''] = (Window(), self.view, (0, 0))
+        marks._MARKS['\''] = (self.view.file_name(), self.view.buffer_id(), (0, 0))
         mock_jumplist_back.return_value = (self.view, [self.Region(30, 30)])
         self.write(''.join(('foo bar\n') * 10))
 
@@ -95,9 +71,39 @@ class MarksTests(unittest.ViewTestCase):
     def test_can_retrieve_backtick_mark(self, mock_jumplist_back):
         # Backtick mark should call jumplist_back for its region ignoring any
         # mark set for "`". Here we set exact to true, emulating ``.
-        marks._MARKS['`'] = (Window(), self.view, (0, 0))
+        marks._MARKS['`'] = (self.view.file_name(), self.view.buffer_id(), (0, 0))
         mock_jumplist_back.return_value = (self.view, [self.Region(30, 30)])
         self.write(''.join(('foo bar\n') * 10))
 
         location = self.marks.get_as_encoded_address("`", exact=True)
         self.assertEqual(location, self.Region(30, 30))
+
+    def test_retrieving_unknown_mark_returns_none(self):
+        self.assertIsNone(self.marks.get_as_encoded_address('a'))
+
+    def test_restored_mark_in_the_current_file_as_region(self):
+        self.write(''.join(('foo bar\n') * 10))
+        marks._MARKS['a'] = ('/tmp/foo.txt', None, (3, 2))
+        with unittest.mock.patch.object(self.view, 'file_name', return_value='/tmp/foo.txt'):
+            self.assertEqual(self.marks.get_as_encoded_address('a', exact=True), self.Region(26))
+
+    def test_restored_mark_in_a_different_file_as_encoded_mark(self):
+        marks._MARKS['a'] = ('/tmp/foo.txt', None, (3, 2))
+        self.assertEqual(self.marks.get_as_encoded_address('a', exact=True), '/tmp/foo.txt:3:2')
+        self.assertEqual(self.marks.get_as_encoded_address('a'), '/tmp/foo.txt:3:0')
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.marks.viminfo_del')
+    @unittest.mock.patch('NeoVintageous.nv.vi.marks.viminfo_set')
+    def test_persists_mark_in_a_file(self, viminfo_set, viminfo_del):
+        with unittest.mock.patch.object(self.view, 'file_name', return_value='/tmp/foo.txt'):
+            self.marks.add('a', self.view)
+        viminfo_set.assert_called_once_with('marks', 'a', ('/tmp/foo.txt', 0, 0))
+        self.assertEqual(viminfo_del.call_count, 0)
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.marks.viminfo_del')
+    @unittest.mock.patch('NeoVintageous.nv.vi.marks.viminfo_set')
+    def test_mark_in_an_untitled_buffer_removes_persisted_mark(self, viminfo_set, viminfo_del):
+        with unittest.mock.patch.object(self.view, 'file_name', return_value=None):
+            self.marks.add('a', self.view)
+        viminfo_del.assert_called_once_with('marks', 'a')
+        self.assertEqual(viminfo_set.call_count, 0)
@@ -46,6 +46,7 @@ from NeoVintageous.nv.vi.registers import _SPECIAL
 from NeoVintageous.nv.vi.registers import _UNNAMED
 from NeoVintageous.nv.vi.registers import Registers
 from NeoVintageous.nv.vi.settings import SettingsManager
+from NeoVintageous.nv.vim import INTERNAL_NORMAL
 
 
 class TestConstants(unittest.TestCase):
@@ -577,3 +578,108 @@ class Test_op_yank(RegistersTestCase):
         self.assertEqual(self.registers['7'], None)
         self.assertEqual(self.registers['8'], None)
         self.assertEqual(self.registers['9'], None)
+
+    def test_op_yank_shares_values_between_registers(self):
+        self.visual('fi|zz bu|zz')
+        self.registers.op_yank()
+        self.assertIs(registers._data['"'], registers._data['0'])
+
+
+class Test_get_for_paste(RegistersTestCase):
+
+    def test_returns_stored_values(self):
+        self.registers['a'] = ['fizz', 'buzz']
+        values, linewise = self.registers.get_for_paste('a', INTERNAL_NORMAL)
+        self.assertIs(values, registers._data['a'])
+        self.assertFalse(linewise)
+
+    def test_empty_register(self):
+        self.assertEqual(self.registers.get_for_paste('a', INTERNAL_NORMAL), ((), False))
+
+
+class TestClipboard(RegistersTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.settings().set('vintageous_use_sys_clipboard', True)
+
+    @mock.patch('NeoVintageous.nv.vi.registers.update_clipboard_history')
+    @mock.patch('NeoVintageous.nv.vi.registers.set_clipboard')
+    @mock.patch('NeoVintageous.nv.vi.registers.set_timeout')
+    def test_writes_are_deferred_and_coalesced(self, set_timeout, set_clipboard, update_clipboard_history):
+        self.registers['a'] = ['fizz']
+        self.registers['b'] = ['fizz', 'buzz']
+        set_clipboard.assert_not_called()
+        self.assertEqual(set_timeout.call_count, 1)
+        set_timeout.call_args[0][0]()
+        set_clipboard.assert_called_once_with('fizz\nbuzz')
+        update_clipboard_history.assert_called_once_with('fizz\nbuzz')
+
+    @mock.patch('NeoVintageous.nv.vi.registers.set_timeout')
+    def test_reads_flush_pending_writes(self, set_timeout):
+        self.registers['a'] = ['fizz']
+        self.assertEqual(self.registers['"'], ['fizz'])
+        self.assertEqual(get_clipboard(), 'fizz')
+
+
+@mock.patch('NeoVintageous.nv.vi.registers.viminfo_del')
+@mock.patch('NeoVintageous.nv.vi.registers.viminfo_set')
+class TestPersistence(RegistersTestCase):
+
+    @mock.patch('NeoVintageous.nv.vi.registers._next_numbered_key', 7)
+    def test_shift_only_writes_the_shifted_value(self, viminfo_set, viminfo_del):
+        registers._shift_numbered_register(('fizz\n',))
+        registers._shift_numbered_register(('buzz\n',))
+        self.assertEqual(viminfo_set.call_args_list, [
+            mock.call('numbered_registers', '7', ('fizz\n',)),
+            mock.call('registers', '1-9', ('7', None, None, None, None, None, None, None, None)),
+            mock.call('numbered_registers', '8', ('buzz\n',)),
+            mock.call('registers', '1-9', ('8', '7', None, None, None, None, None, None, None)),
+        ])
+        viminfo_del.assert_not_called()
+
+    @mock.patch('NeoVintageous.nv.vi.registers._next_numbered_key', 0)
+    def test_shift_deletes_the_value_shifted_out_of_register_9(self, viminfo_set, viminfo_del):
+        for i in range(10):
+            registers._shift_numbered_register(('x\n%d' % i,))
+        viminfo_del.assert_called_once_with('numbered_registers', '0')
+        self.assertEqual(viminfo_set.call_args, mock.call('registers', '1-9', tuple('987654321')))
+
+    @mock.patch('NeoVintageous.nv.vi.registers._PERSISTENT_MAX_LINES', 2)
+    @mock.patch('NeoVintageous.nv.vi.registers._PERSISTENT_MAX_SIZE', 8)
+    def test_large_values_are_not_persisted(self, viminfo_set, viminfo_del):
+        self.registers['a'] = ['fizz']
+        viminfo_set.assert_any_call('registers', 'a', (('fizz',), False))
+        viminfo_set.reset_mock()
+        self.registers['a'] = ['fizzbuzz!']
+        self.registers['b'] = ['a\nb\nc']
+        self.registers['c'] = ['fizz', 'buzz!']
+        self.assertEqual(viminfo_del.call_args_list, [
+            mock.call('registers', 'a'),
+            mock.call('registers', '"'),
+            mock.call('registers', 'b'),
+            mock.call('registers', '"'),
+            mock.call('registers', 'c'),
+            mock.call('registers', '"'),
+        ])
+        viminfo_set.assert_not_called()
+        viminfo_set.reset_mock()
+        registers._shift_numbered_register(('a\nb\nc',))
+        viminfo_set.assert_called_once_with('registers', '1-9', (None,) * 9)
+
+    @mock.patch('NeoVintageous.nv.vi.registers._next_numbered_key', 0)
+    @mock.patch('NeoVintageous.nv.vi.registers._restored', False)
+    @mock.patch('NeoVintageous.nv.vi.registers.viminfo_get')
+    def test_restore(self, viminfo_get, viminfo_set, viminfo_del):
+        viminfo_get.side_effect = lambda section: {
+            'registers': {'a': [['fizz'], True], '1-9': ['3', None, '1']},
+            'numbered_registers': {'1': ['x\n1'], '2': ['x\n2'], '3': ['x\n3']},
+        }[section]
+        registers._restore()
+        self.assertEqual(registers._data['a'], ('fizz',))
+        self.assertTrue(_is_register_linewise('a'))
+        self.assertEqual(list(registers._data['1-9'])[:3], [('x\n3',), None, ('x\n1',)])
+        self.assertEqual(registers._next_numbered_key, 4)
+        viminfo_del.assert_called_once_with('numbered_registers', '2')
+        registers._shift_numbered_register(('x\n4',))
+        viminfo_set.assert_called_with('registers', '1-9', ('4', '3', None, '1', None, None, None, None, None))
@@ -19,11 +19,17 @@ from sublime import LITERAL
 
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.utils import clear_search_highlighting
+from NeoVintageous.nv.utils import get_search_regions
+from NeoVintageous.nv.vi import search
+from NeoVintageous.nv.vi.search import clear_search_matches
 from NeoVintageous.nv.vi.search import find_all_in_range
 from NeoVintageous.nv.vi.search import find_wrapping
+from NeoVintageous.nv.vi.search import hilite_search
 from NeoVintageous.nv.vi.search import reverse_find_wrapping
 from NeoVintageous.nv.vi.search import reverse_search
 from NeoVintageous.nv.vi.search import reverse_search_by_pt
+from NeoVintageous.nv.vi.search import show_search_count
 
 
 class TestFindWrapping(unittest.ViewTestCase):
@@ -43,6 +49,38 @@ class TestFindWrapping(unittest.ViewTestCase):
         self.select(4)
         self.assertEqual(self.Region(12, 15), find_wrapping(self.view, 'xxx', 4, self.view.size()))
 
+    def test_count_wraps_around_buffer(self):
+        self.write('xxx\naaa aaa xxx aaa')
+        self.select(4)
+        self.assertEqual(self.Region(4, 7), find_wrapping(self.view, 'aaa', 4, self.view.size(), times=1))
+        self.assertEqual(self.Region(16, 19), find_wrapping(self.view, 'aaa', 4, self.view.size(), times=3))
+        self.assertEqual(self.Region(4, 7), find_wrapping(self.view, 'aaa', 4, self.view.size(), times=4))
+        self.assertEqual(self.Region(8, 11), find_wrapping(self.view, 'aaa', 17, self.view.size(), times=2))
+        self.assertEqual(self.Region(8, 11), find_wrapping(self.view, 'aaa', 4, self.view.size(), times=500))
+
+    def test_matches_are_searched_for_once(self):
+        self.write('xxx\naaa aaa xxx aaa')
+        self.select(4)
+        with unittest.mock.patch.object(self.view, 'find_all', wraps=self.view.find_all) as find_all:
+            find_wrapping(self.view, 'aaa', 4, self.view.size())
+            find_wrapping(self.view, 'aaa', 8, self.view.size(), times=2)
+            reverse_find_wrapping(self.view, 'aaa', 0, 8, times=3)
+            self.assertEqual(find_all.call_count, 1)
+            find_wrapping(self.view, 'xxx', 4, self.view.size())
+            self.assertEqual(find_all.call_count, 2)
+            self.view.run_command('insert', {'characters': 'aaa '})
+            self.assertEqual(self.Region(4, 7), find_wrapping(self.view, 'aaa', 4, self.view.size()))
+            self.assertEqual(find_all.call_count, 3)
+
+    def test_clear_search_matches(self):
+        self.write('xxx\naaa aaa xxx aaa')
+        self.select(4)
+        find_wrapping(self.view, 'aaa', 4, self.view.size())
+        self.assertIn(self.view.id(), search._search_matches)
+        clear_search_matches(self.view)
+        self.assertNotIn(self.view.id(), search._search_matches)
+        clear_search_matches(self.view)
+
 
 class TestReverseFindWrapping(unittest.ViewTestCase):
 
@@ -53,6 +91,28 @@ class TestReverseFindWrapping(unittest.ViewTestCase):
         self.assertEqual(reverse_find_wrapping(self.view, 'buzz', 10, self.view.size()), self.Region(5, 9))
         self.assertEqual(reverse_find_wrapping(self.view, 'zz', 10, self.view.size()), self.Region(7, 9))
 
+    def test_count_wraps_around_buffer(self):
+        self.write('xxx\naaa aaa xxx aaa')
+        self.select(16)
+        self.assertEqual(reverse_find_wrapping(self.view, 'aaa', 0, 16), self.Region(8, 11))
+        self.assertEqual(reverse_find_wrapping(self.view, 'aaa', 0, 16, times=2), self.Region(4, 7))
+        self.assertEqual(reverse_find_wrapping(self.view, 'aaa', 0, 16, times=3), self.Region(16, 19))
+        self.assertEqual(reverse_find_wrapping(self.view, 'aaa', 0, 3, times=1), self.Region(16, 19))
+        self.assertEqual(reverse_find_wrapping(self.view, 'aaa', 0, 16, times=301), self.Region(8, 11))
+        self.assertIsNone(reverse_find_wrapping(self.view, 'yyy', 0, 16))
+
+
+class TestShowSearchCount(unittest.ViewTestCase):
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search.status_message')
+    def test_show_search_count(self, status_message):
+        self.write('xxx\naaa aaa xxx aaa')
+        show_search_count(self.view, 'aaa', 0, self.Region(8, 11))
+        status_message.assert_called_once_with('[%d/%d]', 2, 3)
+        status_message.reset_mock()
+        show_search_count(self.view, 'aaa', 0, self.Region(9, 11))
+        status_message.assert_not_called()
+
 
 class TestReverseSearchByPt(unittest.ViewTestCase):
 
@@ -199,6 +259,54 @@ class TestReverseSearch(unittest.ViewTestCase):
         self.assertEqual(reverse_search(self.view, 'a', -4, self.view.size()), None)
         self.assertEqual(reverse_search(self.view, 'a', 5, self.view.size() + 1), None)
 
+    def test_matches_that_span_lines(self):
+        self.write('fizz\nbuzz\n\n\nfizz')
+        self.assertEqual(reverse_search(self.view, 'z\nb', 0, self.view.size()), self.Region(3, 6))
+        self.assertEqual(reverse_search(self.view, '\n\n', 0, self.view.size()), self.Region(10, 12))
+        self.assertEqual(reverse_search(self.view, '\n\n', 0, 11), self.Region(9, 11))
+
+    def test_empty_matches_are_skipped(self):
+        self.write('xa\naax\na')
+        self.assertEqual(reverse_search(self.view, 'x*', 0, self.view.size()), self.Region(5, 6))
+        self.assertEqual(reverse_search(self.view, 'x*', 0, 5), self.Region(0, 1))
+        self.assertEqual(reverse_search(self.view, 'y*', 0, self.view.size()), None)
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search._REVERSE_SEARCH_CHUNK_SIZE', 2)
+    def test_does_not_search_past_end(self):
+        self.write('abc\nxxx\nyyy\nabcd\nabc')
+        with unittest.mock.patch.object(self.view, 'find', wraps=self.view.find) as find:
+            self.assertEqual(reverse_search(self.view, 'abc', 0, 12), self.Region(0, 3))
+            self.assertEqual(reverse_search(self.view, '^a', 0, 12), self.Region(0, 1))
+            self.assertEqual(reverse_search(self.view, '\\<abc\\>', 0, 20), self.Region(17, 20))
+            self.assertEqual(reverse_search(self.view, '\\<abc\\>', 0, 15), self.Region(0, 3))
+            self.assertEqual(reverse_search(self.view, 'c\\z', 0, 19), None)
+            self.assertEqual(reverse_search(self.view, 'c\\z', 0, 20), self.Region(19, 20))
+            self.assertEqual(reverse_search_by_pt(self.view, '^y', 9, 12), None)
+            self.assertEqual(reverse_search_by_pt(self.view, '^y', 8, 12), self.Region(8, 9))
+            self.assertEqual(find.call_count, 0)
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search._REVERSE_SEARCH_CHUNK_SIZE', 2)
+    def test_unsupported_syntax_is_searched_with_find(self):
+        self.write('a1\nxxx\nb2\nyyy')
+        with unittest.mock.patch.object(self.view, 'find', wraps=self.view.find) as find:
+            self.assertEqual(reverse_search(self.view, '[[:digit:]]', 0, self.view.size()), self.Region(8, 9))
+            self.assertEqual(reverse_search(self.view, '[[:digit:]]', 0, 8), self.Region(1, 2))
+            self.assertEqual(reverse_search(self.view, '[[:digit:]]', 3, 8), None)
+            self.assertGreater(find.call_count, 0)
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search._REVERSE_SEARCH_CHUNK_SIZE', 2)
+    def test_searches_in_chunks(self):
+        self.write('abc abc\nxxx\n\nabc\nyyy\nzzz\nab\nc')
+        self.assertEqual(reverse_search(self.view, 'abc', 0, self.view.size()), self.Region(13, 16))
+        self.assertEqual(reverse_search(self.view, 'abc', 0, 13), self.Region(4, 7))
+        self.assertEqual(reverse_search(self.view, 'abc', 12, 13), None)
+        self.assertEqual(reverse_search(self.view, 'b\nc', 0, self.view.size()), self.Region(26, 29))
+        self.assertEqual(reverse_search(self.view, 'zzz\nab', 0, self.view.size()), self.Region(21, 27))
+        self.assertEqual(reverse_search(self.view, 'c\nyyy', 0, self.view.size()), self.Region(15, 20))
+        self.assertEqual(reverse_search(self.view, 'nope', 0, self.view.size()), None)
+        self.assertEqual(reverse_search_by_pt(self.view, 'abc', 1, 13), self.Region(4, 7))
+        self.assertEqual(reverse_search_by_pt(self.view, 'abc', 5, 13), None)
+
 
 class TestFindAllInRange(unittest.ViewTestCase):
 
@@ -230,3 +338,49 @@ class TestFindAllInRange(unittest.ViewTestCase):
             self.Region(1, 2),
             self.Region(5, 6)
         ])
+
+
+class TestHiliteSearch(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.settings().set('vintageous_hlsearch', True)
+
+    def tearDown(self):
+        clear_search_highlighting(self.view)
+        super().tearDown()
+
+    def test_highlights_matches_and_current_match(self):
+        self.write('ab x ab\nab')
+        self.select([4, 9])
+        hilite_search(self.view, 'ab', 0)
+        self.assertEqual(self.view.get_regions('vi_search'), [self.Region(0, 2), self.Region(5, 7), self.Region(8, 10)])
+        self.assertEqual(self.view.get_regions('vi_search_current'), [self.Region(8, 10)])
+        self.select(5)
+        hilite_search(self.view, 'ab', 0)
+        self.assertEqual(self.view.get_regions('vi_search_current'), [self.Region(5, 7)])
+
+    def test_highlighting_is_limited_to_lines_around_visible_region(self):
+        self.write('ab\n' * 1000)
+        self.select(0)
+        hilite_search(self.view, 'ab', 0)
+        self.assertLess(len(self.view.get_regions('vi_search')), 1000)
+        self.assertEqual(len(get_search_regions(self.view)), 1000)
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search.set_timeout')
+    def test_polling_a_closed_view_clears_the_highlighting(self, set_timeout):
+        self.write('ab')
+        hilite_search(self.view, 'ab', 0)
+        poll = set_timeout.call_args[0][0]
+        self.assertIn(self.view.id(), search._hilite_extents)
+        with unittest.mock.patch.object(self.view, 'is_valid', return_value=False):
+            poll()
+        self.assertNotIn(self.view.id(), search._hilite_extents)
+        self.assertEqual(get_search_regions(self.view), [])
+
+    def test_no_highlighting_when_hlsearch_is_disabled(self):
+        self.settings().set('vintageous_hlsearch', False)
+        self.write('ab')
+        hilite_search(self.view, 'ab', 0)
+        self.assertEqual(self.view.get_regions('vi_search'), [])
+        self.assertEqual(get_search_regions(self.view), [])
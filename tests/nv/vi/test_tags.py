@@ -0,0 +1,92 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.vi.tags import clear_tag_index
+from NeoVintageous.nv.vi.tags import find_closest_tag
+from NeoVintageous.nv.vi.tags import find_containing_tags
+
+
+class TestFindContainingTags(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.view.set_syntax_file('Packages/HTML/HTML.tmLanguage')
+
+    def assertContainingTags(self, expected, pt, count=1):
+        begin, end, _ = find_containing_tags(self.view, pt, count)
+        self.assertEqual(expected, (begin.a, end.b) if begin else None)
+
+    def test_nested(self):
+        self.write('<a><b><c>x</c></b></a>')
+        self.assertContainingTags((6, 14), 9)
+        self.assertContainingTags((3, 18), 9, 2)
+        self.assertContainingTags((0, 22), 9, 3)
+        self.assertContainingTags(None, 9, 4)
+
+    def test_on_tags(self):
+        self.write('<a><b>x</b></a>')
+        self.assertContainingTags((3, 11), 3)
+        self.assertContainingTags((3, 11), 5)
+        self.assertContainingTags((3, 11), 7)
+        self.assertContainingTags((3, 11), 10)
+        self.assertContainingTags((0, 15), 11)
+
+    def test_self_closing_and_void_elements(self):
+        self.write('<p><img src="x"><br/><x-y /><input>x</p>')
+        for pt in range(3, 37):
+            self.assertContainingTags((0, 40), pt)
+
+    def test_void_elements_in_xml(self):
+        self.write('<item><link>x</link></item>')
+        self.assertContainingTags((0, 27), 12)
+        self.view.assign_syntax('Packages/XML/XML.sublime-syntax')
+        self.assertContainingTags((6, 20), 12)
+
+    def test_multiline_tags_and_attributes(self):
+        self.write('<p\n  title="a > b"\n  class=\'c\'>x</p>')
+        self.assertContainingTags((0, 36), 31)
+
+    def test_unbalanced_tags(self):
+        self.write('<div><p>x</span></div>')
+        self.assertContainingTags((0, 22), 8)
+        self.write('<div><p>x</div></p>')
+        self.assertContainingTags((0, 15), 8)
+
+    def test_tags_in_comments_and_raw_text_are_ignored(self):
+        self.write('<p><!-- </p> --><script>if (a <b) {}</script>x</p>')
+        self.assertContainingTags((0, 50), 46)
+        self.assertContainingTags((16, 45), 30)
+
+    def test_index_is_rebuilt_after_modification(self):
+        self.write('<a>x</a>')
+        self.assertContainingTags((0, 8), 3)
+        self.write('<b><a>x</a></b>')
+        self.assertContainingTags((0, 15), 1)
+        clear_tag_index(self.view)
+        self.assertContainingTags((3, 11), 6)
+
+
+class TestFindClosestTag(unittest.ViewTestCase):
+
+    def test_find_closest_tag(self):
+        self.write('x <a>x</a>')
+        self.assertIsNone(find_closest_tag(self.view, 1))
+        self.assertEqual(find_closest_tag(self.view, 2), self.Region(2, 5))
+        self.assertEqual(find_closest_tag(self.view, 6), self.Region(6, 10))
+        self.assertEqual(find_closest_tag(self.view, 10), self.Region(6, 10))
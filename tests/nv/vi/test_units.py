@@ -15,10 +15,24 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from sublime import CLASS_EMPTY_LINE
+from sublime import CLASS_LINE_END
+from sublime import CLASS_LINE_START
+from sublime import CLASS_PUNCTUATION_END
+from sublime import CLASS_PUNCTUATION_START
+from sublime import CLASS_WORD_END
+from sublime import CLASS_WORD_START
+
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.vi import units
+from NeoVintageous.nv.vi.units import _Chunk
+from NeoVintageous.nv.vi.units import big_word_ends
+from NeoVintageous.nv.vi.units import big_word_starts
 from NeoVintageous.nv.vi.units import next_paragraph_start
 from NeoVintageous.nv.vi.units import prev_paragraph_start
+from NeoVintageous.nv.vi.units import word_ends
+from NeoVintageous.nv.vi.units import word_starts
 
 
 class TestNextParagraphStart(unittest.ViewTestCase):
@@ -76,3 +90,108 @@ class TestPrevParagraphStart(unittest.ViewTestCase):
         self.normal('1\n\n4\n\n7\n\n0\n\n3\n')
         self.assertEqual(5, prev_paragraph_start(self.view, 14, count=3))
         self.assertEqual(0, prev_paragraph_start(self.view, 5, count=3))
+
+
+class TestChunk(unittest.ViewTestCase):
+
+    # The chunk must answer exactly as the view does.
+
+    _TEXT = 'fizz.buzz  (x_y, "z")\n\n\t  \nabc-def\té ghi\n'
+
+    def assertChunkEqualsView(self, start):
+        chunk = _Chunk(self.view, start)
+        size = self.view.size()
+        self.assertEqual(chunk.size(), size)
+        for pt in range(start, size + 1):
+            self.assertEqual(chunk.substr(pt), self.view.substr(pt), 'substr %d' % pt)
+            self.assertEqual(chunk.line(pt), self.view.line(pt), 'line %d' % pt)
+            self.assertEqual(chunk.substr(self.view.line(pt)), self.view.substr(self.view.line(pt)))
+            for classes in (units._CLASS_VI_WORD_START, units._CLASS_VI_INTERNAL_WORD_START,
+                            units._CLASS_VI_WORD_END, units.CLASS_LINE_END, units.CLASS_WORD_START):
+                self.assertEqual(chunk.classify(pt) & classes, self.view.classify(pt) & classes, 'classify %d' % pt)
+                self.assertEqual(chunk.find_by_class(pt, forward=True, classes=classes),
+                                 self.view.find_by_class(pt, forward=True, classes=classes),
+                                 'find_by_class %d %d' % (pt, classes))
+
+    def test_chunk(self):
+        self.normal(self._TEXT)
+        for start in (0, 1, 10, 22, 30):
+            self.assertChunkEqualsView(start)
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.units._CHUNK_SIZE', 2)
+    def test_chunk_grows(self):
+        self.normal(self._TEXT)
+        for start in (0, 1, 10, 22, 30):
+            self.assertChunkEqualsView(start)
+
+    def assertClassify(self, text, expected):
+        self.normal(text)
+        chunk = _Chunk(self.view, 1)
+        self.assertEqual([chunk.classify(pt) for pt in range(1, self.view.size() + 1)], expected)
+
+    # The expected classes are what Sublime Text's view.classify() returns,
+    # less the classes that the chunk doesn't find, e.g. the sub word classes.
+
+    def test_classify_punctuation(self):
+        self.assertClassify('a.(b) c', [
+            CLASS_WORD_END | CLASS_PUNCTUATION_START,
+            0,
+            CLASS_WORD_START | CLASS_PUNCTUATION_END,
+            CLASS_WORD_END | CLASS_PUNCTUATION_START,
+            CLASS_PUNCTUATION_END,
+            CLASS_WORD_START,
+            CLASS_LINE_END | CLASS_WORD_END,
+        ])
+
+    def test_classify_tabs_and_lines(self):
+        self.assertClassify('a\t\tb\n\t\n', [
+            CLASS_WORD_END,
+            0,
+            CLASS_WORD_START,
+            CLASS_LINE_END | CLASS_WORD_END,
+            CLASS_LINE_START,
+            CLASS_LINE_END,
+            CLASS_LINE_START | CLASS_LINE_END | CLASS_EMPTY_LINE,
+        ])
+
+    def test_classify_eof(self):
+        self.assertClassify('a.', [CLASS_WORD_END | CLASS_PUNCTUATION_START, CLASS_LINE_END | CLASS_PUNCTUATION_END])
+        self.assertClassify('a ', [CLASS_WORD_END, CLASS_LINE_END])
+        self.assertEqual(_Chunk(self.view, 1).substr(self.view.size()), '\x00')
+
+    def test_classify_non_ascii(self):
+        self.assertClassify('\xe9.\xfc \xdf-\u03bb', [
+            CLASS_WORD_END | CLASS_PUNCTUATION_START,
+            CLASS_WORD_START | CLASS_PUNCTUATION_END,
+            CLASS_WORD_END,
+            CLASS_WORD_START,
+            CLASS_WORD_END | CLASS_PUNCTUATION_START,
+            CLASS_WORD_START | CLASS_PUNCTUATION_END,
+            CLASS_LINE_END | CLASS_WORD_END,
+        ])
+
+    def test_classify_word_separators(self):
+        self.view.settings().set('word_separators', '.')
+        self.assertClassify('a-b.c', [
+            0,
+            0,
+            CLASS_WORD_END | CLASS_PUNCTUATION_START,
+            CLASS_WORD_START | CLASS_PUNCTUATION_END,
+            CLASS_LINE_END | CLASS_WORD_END,
+        ])
+
+    def test_word_separators(self):
+        self.normal('fizz-buzz.x')
+        self.view.settings().set('word_separators', '.')
+        self.assertEqual(word_starts(self.view, 0), 9)
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.units._CHUNK_SIZE', 4)
+    def test_large_counts(self):
+        self.normal('a.b c,d e\n\n  f g\n' * 20)
+        for count in (1, 5, 50, 500):
+            self.assertEqual(word_starts(self.view, 0, count),
+                             units._word_starts(self.view, 0, count, False), 'w %d' % count)
+            self.assertEqual(big_word_starts(self.view, 0, count),
+                             units._big_word_starts(self.view, 0, count, False), 'W %d' % count)
+            self.assertEqual(word_ends(self.view, 0, count), units._word_ends(self.view, 0, count, False))
+            self.assertEqual(big_word_ends(self.view, 0, count), units._word_ends(self.view, 0, count, True))
@@ -53,7 +53,13 @@ class ViewTestCase(unittest.TestCase):
     def setUp(self):
         self.view = _active_window().new_file()
 
+        # Don't persist the registers, marks, etc. set by tests.
+        self._viminfo_file = mock.patch('NeoVintageous.nv.viminfo._file', None)
+        self._viminfo_file.start()
+
     def tearDown(self):
+        self._viminfo_file.stop()
+
         if self.view:
             self.view.set_scratch(True)
             self.view.close()
@@ -960,9 +966,11 @@ def mock_mappings(*mappings):
     def wrapper(f):
 
         from NeoVintageous.nv.mappings import _mappings
+        from NeoVintageous.nv.mappings import _MappingsTrie
         from NeoVintageous.nv.mappings import mappings_add
 
-        @unittest.mock.patch('NeoVintageous.nv.mappings._mappings', new_callable=lambda: {k: {} for k in _mappings})
+        @unittest.mock.patch('NeoVintageous.nv.mappings._mappings',
+                             new_callable=lambda: {k: _MappingsTrie() for k in _mappings})
         def wrapped(self, *args, **kwargs):
             for mapping in mappings:
                 mappings_add(*mapping)
@@ -1096,6 +1104,9 @@ def mock_run_commands(*methods):
 # impact the existing tests.
 _SEQ2CMD = {
 
+    '!':            {'command': '_vi_bang'},  # noqa: E241
+    '!!':           {'command': '_vi_bang_bang'},  # noqa: E241
+    '!j':           {'command': '_vi_bang', 'args': {'motion': {'motion_args': {'count': 1, 'mode': INTERNAL_NORMAL}, 'motion': '_vi_j'}}},  # noqa: E241,E501
     '#':            {'command': '_vi_octothorp'},  # noqa: E241
     '$':            {'command': '_vi_dollar'},  # noqa: E241
     '%':            {'command': '_vi_percent', 'args': {'percent': None}},  # noqa: E241